@@ -0,0 +1,3 @@
+"""
+Benchmarking tools: local OpenAI stub, load tests and microbenchmarks
+"""
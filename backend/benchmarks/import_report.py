@@ -0,0 +1,90 @@
+"""
+Import-time report for application startup
+Runs `python -X importtime -c "import main"` in a fresh interpreter and summarizes where cold-start time goes
+
+Run:
+    python -m benchmarks.import_report --top 25
+    python -m benchmarks.import_report --module routes.jobs --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIRST_PARTY = ("main", "config", "schemas", "routes", "services", "middleware", "utils", "budget_schemas")
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    records = []
+    for line in stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            records.append(ImportRecord(match.group(4), int(match.group(1)), int(match.group(2)),
+                                        (len(match.group(3)) - 1) // 2))
+    return records
+
+
+def measure(module: str) -> Dict[str, object]:
+    """Import `module` in a fresh interpreter; returns wall time and -X importtime records."""
+    env = {**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "import-report"), "WARMUP_ENABLED": "false"}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return {"wall_s": time.perf_counter() - started, "records": parse_importtime(completed.stderr)}
+
+
+def top_level_totals(records: List[ImportRecord]) -> Dict[str, int]:
+    """Self time summed per top-level package (what each dependency costs in total)."""
+    totals: Dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_us
+    return dict(totals)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report application import (cold start) time")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to time (the median is reported)")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    walls = [run["wall_s"] for run in runs]
+    records: List[ImportRecord] = runs[-1]["records"]
+    root = next((r for r in records if r.module == args.module), None)
+
+    print(f"Interpreter start + import {args.module}: median {statistics.median(walls) * 1000:.0f} ms "
+          f"over {len(walls)} runs")
+    if root:
+        print(f"Import of {args.module} (cumulative): {root.cumulative_us / 1000:.0f} ms")
+
+    print(f"\nTop {args.top} packages by total self time:")
+    for package, self_us in sorted(top_level_totals(records).items(), key=lambda item: -item[1])[:args.top]:
+        marker = " (first party)" if package in FIRST_PARTY else ""
+        print(f"  {self_us / 1000:>8.1f} ms  {package}{marker}")
+
+    print(f"\nTop {args.top} first-party modules by cumulative time:")
+    first_party = [r for r in records if r.module.split(".")[0] in FIRST_PARTY and r.module != args.module]
+    for record in sorted(first_party, key=lambda r: -r.cumulative_us)[:args.top]:
+        print(f"  {record.cumulative_us / 1000:>8.1f} ms  {record.module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+End-to-end load test for the main API endpoints
+Drives the ASGI app in-process (httpx ASGITransport) or a running server over HTTP; reports throughput and latency percentiles
+
+Run (in-process, AI calls answered by a stub started on a free port):
+    python -m benchmarks.loadtest --start-stub --concurrency 1,8,32 --requests 200
+Run against a deployed server (start it with RATE_LIMIT_ENABLED=false and OPENAI_BASE_URL pointing at the stub):
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --scenarios calculate-summary,export-pdf
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_TIMEOUT = 120.0
+
+# ===========================================
+# SCENARIOS
+# ===========================================
+
+FINANCIAL_INPUT: Dict[str, Any] = {
+    "currency": "INR",
+    "monthly_income_primary": 100000,
+    "monthly_income_additional": 5000,
+    "expenses": {
+        "housing_rent": 25000, "groceries_food": 12000, "transport": 5000, "utilities": 4000,
+        "insurance": 3000, "entertainment": 4000, "subscriptions": 1500, "others": 6000,
+    },
+    "goals": {"monthly_savings_target": 20000, "emergency_fund_target": 300000},
+    "loans": [],
+}
+
+TRAVEL_INPUT: Dict[str, Any] = {
+    "originCity": "Mumbai", "originCountry": "India",
+    "destinationCity": "Paris", "destinationCountry": "France",
+    "startDate": "2026-05-04", "endDate": "2026-05-09",
+    "adults": 2, "children": 0, "infants": 0,
+    "travelStyle": "standard", "localTransport": "public", "homeCurrency": "USD",
+}
+
+BUDGET_INPUT: Dict[str, Any] = {
+    "monthly_income": 120000,
+    "city": "Bengaluru",
+    "city_tier": "tier_1",
+    "family_size": 3,
+    "lifestyle": "moderate",
+    "fixed_expenses": {"rent": 30000, "utilities": 4000, "insurance": 3000},
+    "variable_expenses": {"groceries": 12000, "transport": 5000, "dining_out": 4000},
+    "loans": [{"principal": 800000, "rate": 9.5, "tenure_months": 60}],
+    "goals": [{"name": "Emergency fund", "target": 400000, "target_months": 24}],
+    "mode": "smart_balanced",
+}
+
+DEBT_INPUT: Dict[str, Any] = {
+    "loans": [
+        {"loan_id": "car", "loan_type": "car", "loan_name": "Car Loan", "principal": 800000,
+         "interest_rate": 9.5, "tenure_months": 60, "current_balance": 550000, "monthly_emi": 16800},
+        {"loan_id": "card", "loan_type": "credit_card", "loan_name": "Credit Card", "principal": 150000,
+         "interest_rate": 28, "tenure_months": 24, "current_balance": 120000, "monthly_emi": 8000},
+        {"loan_id": "personal", "loan_type": "personal", "loan_name": "Personal Loan", "principal": 300000,
+         "interest_rate": 14, "tenure_months": 36, "current_balance": 210000, "monthly_emi": 10300},
+    ],
+    "extra_payment": 5000,
+}
+
+
+@dataclass
+class Scenario:
+    """One endpoint under test; `body` may use data fetched by prepare_context."""
+    name: str
+    method: str
+    path: str
+    body: Callable[[Dict[str, Any]], Any]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("calculate-summary", "POST", "/api/v1/calculate-summary", lambda ctx: FINANCIAL_INPUT),
+        Scenario("budget-generate", "POST", "/api/v1/ai/budget/generate", lambda ctx: BUDGET_INPUT),
+        Scenario("compare-debt-strategies", "POST", "/api/v1/compare-debt-strategies", lambda ctx: DEBT_INPUT),
+        Scenario("calculate-budget-hybrid", "POST", "/api/v1/ai/travel/calculate-budget-hybrid",
+                 lambda ctx: TRAVEL_INPUT),
+        Scenario("generate-itinerary", "POST", "/api/v1/ai/travel/generate-itinerary",
+                 lambda ctx: {"travelData": TRAVEL_INPUT, "budgetData": ctx["travel_expenses"]}),
+        Scenario("export-pdf", "POST", "/api/v1/export-pdf",
+                 lambda ctx: {"input": FINANCIAL_INPUT, "summary": ctx["summary"]}),
+    ]
+}
+
+
+async def prepare_context(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Fetch the data that dependent scenarios (PDF export, itinerary) post back."""
+    summary = await client.post("/api/v1/calculate-summary", json=FINANCIAL_INPUT)
+    summary.raise_for_status()
+    hybrid = await client.post("/api/v1/ai/travel/calculate-budget-hybrid", json=TRAVEL_INPUT)
+    hybrid.raise_for_status()
+    totals = hybrid.json()
+    expenses = {
+        "flights": totals["total_flight_cost"],
+        "accommodation": totals["total_hotel_cost"],
+        "food": totals["total_food_cost"],
+        "localTransport": totals["total_transport_cost"],
+        "activities": totals["total_activities_cost"],
+        "shopping": totals["shopping_cost"],
+        "visa": totals["visa_cost"],
+        "insurance": totals["insurance_cost"],
+        "miscellaneous": totals["miscellaneous_cost"],
+    }
+    return {"summary": summary.json(), "travel_expenses": expenses}
+
+
+# ===========================================
+# RUNNER
+# ===========================================
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+@dataclass
+class RunResult:
+    """Latency and throughput of one scenario at one concurrency level."""
+    scenario: str
+    concurrency: int
+    requests: int
+    duration_s: float
+    throughput_rps: float
+    latency_ms: Dict[str, float]
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+
+def summarize(
+    scenario: str, concurrency: int, latencies: List[float], statuses: Counter, duration: float
+) -> RunResult:
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if not str(status).startswith("2"))
+    return RunResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=len(latencies),
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration > 0 else 0.0,
+        latency_ms={
+            "min": round(ordered[0], 2) if ordered else 0.0,
+            "mean": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+            "p50": round(percentile(ordered, 50), 2),
+            "p95": round(percentile(ordered, 95), 2),
+            "p99": round(percentile(ordered, 99), 2),
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+        },
+        status_codes={str(status): count for status, count in sorted(statuses.items(), key=str)},
+        errors=errors,
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    context: Dict[str, Any],
+    concurrency: int,
+    total_requests: int,
+    warmup: int = 0,
+) -> RunResult:
+    """
+    Fire `total_requests` requests from `concurrency` workers (closed loop).
+
+    Args:
+        client: Client bound to the app or server under test
+        scenario: Endpoint to exercise
+        context: Data from prepare_context
+        concurrency: Number of in-flight requests
+        total_requests: Measured requests
+        warmup: Unmeasured requests sent first (fills caches, pools, lazy imports)
+    """
+    body = scenario.body(context)
+    for _ in range(warmup):
+        await client.request(scenario.method, scenario.path, json=body)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = total_requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, json=body)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return summarize(scenario.name, concurrency, latencies, statuses, time.perf_counter() - started)
+
+
+async def run_benchmarks(
+    client: httpx.AsyncClient,
+    scenario_names: List[str],
+    concurrency_levels: List[int],
+    total_requests: int,
+    warmup: int = 5,
+) -> List[RunResult]:
+    context = await prepare_context(client)
+    results: List[RunResult] = []
+    for name in scenario_names:
+        for concurrency in concurrency_levels:
+            result = await run_scenario(client, SCENARIOS[name], context, concurrency, total_requests, warmup)
+            print(format_result(result), flush=True)
+            results.append(result)
+    return results
+
+
+# ===========================================
+# REPORTING
+# ===========================================
+
+def format_result(result: RunResult) -> str:
+    latency = result.latency_ms
+    return (
+        f"{result.scenario:<26} c={result.concurrency:<4} {result.throughput_rps:>9.1f} req/s  "
+        f"p50={latency['p50']:>8.1f}ms p95={latency['p95']:>8.1f}ms p99={latency['p99']:>8.1f}ms  "
+        f"errors={result.errors}"
+    )
+
+
+def save_results(results: List[RunResult], mode: str, path: Optional[Path] = None) -> Path:
+    """Write a run to JSON (default: benchmarks/results/loadtest-<timestamp>.json)."""
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"loadtest-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    payload = {
+        "created_at": datetime.now().isoformat(),
+        "mode": mode,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def compare_results(baseline: Dict[str, Any], current: List[RunResult]) -> List[str]:
+    """Per scenario/concurrency change in throughput and p95 against an earlier saved run."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline.get("results", [])}
+    lines = []
+    for result in current:
+        before = previous.get((result.scenario, result.concurrency))
+        if not before or not before["throughput_rps"] or not before["latency_ms"]["p95"]:
+            continue
+        rps_change = (result.throughput_rps / before["throughput_rps"] - 1) * 100
+        p95_change = (result.latency_ms["p95"] / before["latency_ms"]["p95"] - 1) * 100
+        lines.append(
+            f"{result.scenario:<26} c={result.concurrency:<4} throughput {rps_change:+6.1f}%  p95 {p95_change:+6.1f}%"
+        )
+    return lines
+
+
+# ===========================================
+# ENTRY POINT
+# ===========================================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_server(port: int, latency: str) -> None:
+    """Serve benchmarks.openai_stub from a daemon thread and point the backend at it."""
+    import uvicorn
+
+    from benchmarks import openai_stub
+
+    openai_stub.config.latency = latency
+    server = uvicorn.Server(uvicorn.Config(openai_stub.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="openai-stub", daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+
+async def _main(args: argparse.Namespace) -> List[RunResult]:
+    scenario_names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(scenario_names) - set(SCENARIOS))
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    async with AsyncExitStack() as stack:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        else:
+            # Limits are per client IP, and every in-process request comes from the same one
+            os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+            sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+            from main import app
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout
+            )
+        await stack.enter_async_context(client)
+        return await run_benchmarks(client, scenario_names, concurrency_levels, args.requests, args.warmup)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="VegaKash.AI end-to-end load test")
+    parser.add_argument("--base-url", help="Server to test over HTTP (default: in-process ASGI app)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--start-stub", action="store_true", help="Answer AI calls with the local OpenAI stub")
+    parser.add_argument("--stub-latency", default="lognormal:800,0.4")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/loadtest-*.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if args.start_stub:
+        start_stub_server(_free_port(), args.stub_latency)
+
+    results = asyncio.run(_main(args))
+    path = save_results(results, "http" if args.base_url else "asgi", args.output)
+    print(f"Saved results to {path}")
+    if args.compare:
+        for line in compare_results(json.loads(args.compare.read_text()), results):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Microbenchmarks for the pure calculation kernels on the request path
+Parametrized by input size (loan counts, months, goal counts) and checked against a stored baseline
+
+Run:
+    python -m benchmarks.microbench                      # time every case, compare with the baseline
+    python -m benchmarks.microbench --save-baseline      # record the baseline on this machine
+    python -m benchmarks.microbench --filter multi_loan --threshold 0.10 --check   # exit 1 on regression
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from schemas import ExpensesInput, FinancialInput, GoalsInput, LoanDetail, LoanInput, MultiLoanInput
+from services.calculations import calculate_summary
+from services.multi_loan import compare_debt_strategies
+from utils.alert_detector import evaluate_alerts_batch, generate_alerts
+from utils.auto_loan_calculator import (
+    calculate_affordable_loan,
+    calculate_auto_loan_eligibility,
+    calculate_total_cost_of_ownership,
+)
+from utils.budget_calculator import allocate_budget, allocate_savings, calculate_emi
+from utils.goal_simulator import simulate_goals
+from utils.split_table import SPLIT_TABLE, compute_split
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "microbench.json"
+DEFAULT_THRESHOLD = 0.15  # Flag cases more than 15% slower than the baseline
+DEFAULT_REPEAT = 5
+MIN_RUN_SECONDS = 0.2  # Per repeat; timeit.autorange picks the loop count
+
+
+@dataclass
+class Case:
+    """One kernel at one input size."""
+    name: str
+    size: str
+    func: Callable[[], Any]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+# ===========================================
+# INPUT BUILDERS
+# ===========================================
+
+def _debt_loans(count: int, months: int) -> List[LoanDetail]:
+    loans = []
+    for i in range(count):
+        rate = 8 + (i * 7) % 20
+        balance = 50000 + 25000 * i
+        emi = balance * (rate / 1200) / (1 - (1 + rate / 1200) ** -months)
+        loans.append(LoanDetail(
+            loan_id=f"loan-{i}", loan_type="personal", loan_name=f"Loan {i}",
+            principal=balance * 1.2, interest_rate=rate, tenure_months=months,
+            current_balance=balance, monthly_emi=round(emi, 2),
+        ))
+    return loans
+
+
+def _financial_input(loan_count: int, months: int) -> FinancialInput:
+    return FinancialInput(
+        currency="INR",
+        monthly_income_primary=150000,
+        monthly_income_additional=10000,
+        expenses=ExpensesInput(housing_rent=30000, groceries_food=12000, transport=5000, utilities=4000,
+                               insurance=3000, entertainment=4000, subscriptions=1500, others=5000),
+        goals=GoalsInput(monthly_savings_target=20000, emergency_fund_target=300000),
+        loans=[
+            LoanInput(name=f"Loan {i}", input_mode="principal" if i % 2 else "emi",
+                      monthly_emi=None if i % 2 else 2000 + 100 * i,
+                      outstanding_principal=100000 + 10000 * i if i % 2 else None,
+                      interest_rate_annual=9 + i % 10, remaining_months=months)
+            for i in range(loan_count)
+        ],
+    )
+
+
+def _budget_loans(count: int, months: int) -> List[Dict[str, float]]:
+    return [{"principal": 200000 + 50000 * i, "rate": 9 + i % 8, "tenure_months": months} for i in range(count)]
+
+
+def _goals(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"name": f"Goal {i}", "target": 100000 * (i + 1), "target_months": 12 * (1 + i % 5), "priority": 1 + i % 5}
+        for i in range(count)
+    ]
+
+
+def _alert_profiles(count: int) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(count)
+    income = rng.uniform(20000, 300000, count)
+    return {
+        "income": income,
+        "rent": income * rng.uniform(0.1, 0.6, count),
+        "total_emi": income * rng.uniform(0, 0.5, count),
+        "total_expenses": income * rng.uniform(0.5, 1.2, count),
+        "wants_percent": rng.uniform(15, 50, count),
+        "wants_amount": income * 0.3,
+        "savings_amount": income * 0.2,
+        "savings_percent": rng.uniform(0, 30, count),
+        "emergency_fund": income * rng.uniform(0, 8, count),
+        "city_tier": rng.choice(["tier_1", "tier_2", "tier_3", "other"], count),
+        "budget_mode": rng.choice(["basic", "smart_balanced", "aggressive_savings"], count),
+        "has_multiple_loans": rng.random(count) < 0.3,
+    }
+
+
+# ===========================================
+# CASES
+# ===========================================
+
+def build_cases() -> List[Case]:
+    cases: List[Case] = []
+
+    # services/calculations.py
+    for loans in (0, 5, 20):
+        financial_input = _financial_input(loans, 120)
+        cases.append(Case("calculations.calculate_summary", f"loans={loans}",
+                          lambda fi=financial_input: calculate_summary(fi)))
+
+    # services/multi_loan.py: simulated month-by-month, so both dimensions matter
+    for loans, months in ((1, 36), (5, 60), (5, 240), (20, 120)):
+        multi_loan_input = MultiLoanInput(loans=_debt_loans(loans, months), extra_payment=5000)
+        cases.append(Case("multi_loan.compare_debt_strategies", f"loans={loans},months={months}",
+                          lambda mi=multi_loan_input: compare_debt_strategies(mi)))
+
+    # utils/budget_calculator.py
+    for goals in (0, 5, 25):
+        goal_list = _goals(goals)
+        cases.append(Case("budget_calculator.allocate_savings", f"goals={goals}",
+                          lambda g=goal_list: allocate_savings(30000, g)))
+    for loans, goals in ((0, 0), (5, 5), (20, 25)):
+        loan_list, goal_list = _budget_loans(loans, 120), _goals(goals)
+        cases.append(Case(
+            "budget_calculator.allocate_budget", f"loans={loans},goals={goals}",
+            lambda lo=loan_list, g=goal_list: allocate_budget(
+                150000, 75000, 45000, 30000,
+                {"rent": 30000, "utilities": 4000, "insurance": 3000},
+                {"groceries": 12000, "transport": 5000, "dining_out": 4000},
+                lo, g,
+            ),
+        ))
+    for months in (12, 120, 360):
+        loan = _budget_loans(1, months)[0]
+        cases.append(Case("budget_calculator.calculate_emi", f"months={months}", lambda lo=loan: calculate_emi(lo)))
+
+    # utils/split_table.py: 1.25 is on the table grid, 1.237 falls back to the memoized chain
+    for col_multiplier in (1.25, 1.237):
+        cases.append(Case("split_table.lookup", f"col={col_multiplier}",
+                          lambda c=col_multiplier: SPLIT_TABLE.lookup(c, "comfort", "aggressive_savings", 60000, 24000, 5000)))
+    cases.append(Case("split_table.compute_split", "col=1.25",
+                      lambda: compute_split(1.25, "comfort", "aggressive_savings", 60000, 24000, 5000)))
+
+    # utils/alert_detector.py
+    for loans in (0, 5, 20):
+        loan_list = _budget_loans(loans, 120)
+        cases.append(Case(
+            "alert_detector.generate_alerts", f"loans={loans}",
+            lambda lo=loan_list: generate_alerts(
+                income=80000, rent=32000, total_emi=2500.0 * len(lo), total_expenses=76000,
+                wants_percent=35, wants_amount=28000, savings_amount=4000, emergency_fund=20000,
+                city_tier="tier_1", loans=lo,
+            ),
+        ))
+    for profiles in (100, 10000):
+        columns = _alert_profiles(profiles)
+        cases.append(Case("alert_detector.evaluate_alerts_batch", f"profiles={profiles}",
+                          lambda c=columns: evaluate_alerts_batch(c)))
+
+    # utils/goal_simulator.py: cost grows with paths x horizon months
+    for paths, months in ((1000, 36), (5000, 120), (5000, 360)):
+        goal_list = [{"name": "Goal", "target": 100000.0 * months / 12, "target_months": months, "priority": 2}]
+        cases.append(Case("goal_simulator.simulate_goals", f"paths={paths},months={months}",
+                          lambda g=goal_list, p=paths: simulate_goals(g, 8000, 3000, 10000, paths=p)))
+
+    # utils/auto_loan_calculator.py
+    for months in (12, 60, 84):
+        cases.append(Case("auto_loan.calculate_auto_loan_eligibility", f"months={months}",
+                          lambda m=months: calculate_auto_loan_eligibility(120000, 15000, 1200000, 200000,
+                                                                          tenure_months=m)))
+        cases.append(Case("auto_loan.calculate_total_cost_of_ownership", f"months={months}",
+                          lambda m=months: calculate_total_cost_of_ownership(1200000, 1000000, 9.5, m)))
+        cases.append(Case("auto_loan.calculate_affordable_loan", f"months={months}",
+                          lambda m=months: calculate_affordable_loan(25000, 9.5, m)))
+    return cases
+
+
+# ===========================================
+# TIMING & BASELINE
+# ===========================================
+
+def time_case(case: Case, repeat: int = DEFAULT_REPEAT, min_run_seconds: float = MIN_RUN_SECONDS) -> Dict[str, float]:
+    """
+    Time one case; reports the best and median per-call time in microseconds.
+
+    The best of several repeats is the most stable figure on a shared machine,
+    so it is the one compared against the baseline.
+    """
+    timer = timeit.Timer(case.func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_run_seconds or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_run_seconds / elapsed) + 1))
+    runs = sorted(t / number * 1e6 for t in timer.repeat(repeat, number))
+    return {"best_us": round(runs[0], 3), "median_us": round(runs[len(runs) // 2], 3), "loops": number}
+
+
+def run_cases(cases: List[Case], repeat: int = DEFAULT_REPEAT, min_run_seconds: float = MIN_RUN_SECONDS) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        results[case.key] = time_case(case, repeat, min_run_seconds)
+        print(f"{case.key:<70} {results[case.key]['best_us']:>12.2f} µs", flush=True)
+    return results
+
+
+@dataclass
+class Comparison:
+    key: str
+    baseline_us: float
+    current_us: float
+    change: float  # Relative, e.g. 0.2 = 20% slower
+    regressed: bool
+
+
+def compare_to_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Comparison]:
+    """Compare best per-call times; cases missing from the baseline are skipped."""
+    comparisons = []
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before or not before.get("best_us"):
+            continue
+        change = current["best_us"] / before["best_us"] - 1
+        comparisons.append(Comparison(key, before["best_us"], current["best_us"], round(change, 4), change > threshold))
+    return comparisons
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[Dict[str, Dict[str, float]]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())["results"]
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: Path = BASELINE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the calculation kernels")
+    parser.add_argument("--filter", default="", help="Only run cases whose key contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=MIN_RUN_SECONDS, help="Seconds per repeat")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, 0.15 = 15%%")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any case regressed")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    cases = [case for case in build_cases() if args.filter in case.key]
+    results = run_cases(cases, args.repeat, args.min_time)
+
+    if args.output:
+        save_baseline(results, args.output)
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {}
+        baseline.update(results)
+        save_baseline(baseline, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    comparisons = compare_to_baseline(results, baseline, args.threshold)
+    print(f"\nAgainst baseline (threshold {args.threshold:.0%}):")
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison.regressed else ""
+        print(f"{comparison.key:<70} {comparison.change:+8.1%} {flag}")
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Local OpenAI-compatible chat-completions stub for offline load and latency testing
+Canned JSON for the pricing, plan and itinerary prompts, with configurable latency, errors, timeouts and streaming
+
+Run:
+    python -m benchmarks.openai_stub --port 8100 --latency lognormal:800,0.4 --error-rate 0.02
+Point the backend at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub; changeable at runtime via POST /stub/config."""
+    latency: str = "fixed:0"  # fixed:MS | uniform:MIN_MS,MAX_MS | normal:MEAN_MS,STDDEV_MS | lognormal:MEDIAN_MS,SIGMA
+    error_rate: float = 0.0  # Share of requests answered with 500
+    rate_limit_rate: float = 0.0  # Share of requests answered with 429
+    timeout_rate: float = 0.0  # Share of requests that hang for timeout_seconds
+    timeout_seconds: float = 120.0
+    stream_chunk_delay_ms: float = 5.0
+    seed: Optional[int] = None
+
+
+config = StubConfig(
+    latency=os.getenv("STUB_LATENCY", "fixed:0"),
+    error_rate=float(os.getenv("STUB_ERROR_RATE", "0")),
+    rate_limit_rate=float(os.getenv("STUB_RATE_LIMIT_RATE", "0")),
+    timeout_rate=float(os.getenv("STUB_TIMEOUT_RATE", "0")),
+)
+_random = random.Random(config.seed)
+_stats: Dict[str, int] = {"requests": 0, "errors": 0, "rate_limited": 0, "timeouts": 0, "streamed": 0}
+
+app = FastAPI(title="OpenAI Stub", docs_url=None, redoc_url=None)
+
+
+# ===========================================
+# LATENCY / FAULT INJECTION
+# ===========================================
+
+def sample_latency_ms(spec: str, rng: random.Random = _random) -> float:
+    """
+    Draw one latency (ms) from a distribution spec.
+
+    Examples: "fixed:250", "uniform:100,900", "normal:600,150", "lognormal:800,0.4"
+    (lognormal takes the median and the sigma of the underlying normal).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()] or [0.0]
+    if kind == "fixed":
+        latency = values[0]
+    elif kind == "uniform":
+        latency = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        latency = rng.gauss(values[0], values[1])
+    elif kind == "lognormal":
+        latency = rng.lognormvariate(0.0, values[1]) * values[0]
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return max(latency, 0.0)
+
+
+def _error(status: int, message: str, error_type: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": None}},
+    )
+
+
+# ===========================================
+# CANNED PAYLOADS
+# ===========================================
+
+def _first_number(pattern: str, text: str, default: float) -> float:
+    match = re.search(pattern, text)
+    return float(match.group(1).replace(",", "")) if match else default
+
+
+def _unit_prices() -> Dict[str, Any]:
+    return {
+        "flight_min": 420, "flight_max": 610, "hotel_per_night": 135, "food_per_day": 42,
+        "confidence": "medium", "reasoning": "Stubbed unit prices for load testing.",
+    }
+
+
+def _cost_estimates() -> Dict[str, Any]:
+    return {
+        "flight_cost_per_person": 520, "hotel_per_night": 130, "food_per_day_per_person": 40,
+        "transport_per_day_per_person": 15, "activities_per_day_per_person": 35,
+        "reasoning": "Stubbed cost estimates for load testing.",
+    }
+
+
+def _travel_budget() -> Dict[str, Any]:
+    return {
+        "flight_cost_per_person": 18000, "hotel_cost_per_night": 3500,
+        "food_cost_per_person_per_day": 800, "transport_cost_per_person_per_day": 400,
+        "activities_cost_per_person_per_day": 1200, "visa_cost_per_person": 0,
+        "insurance_cost_per_person": 900, "shopping_budget_total": 5000,
+        "miscellaneous_percentage": 5, "visa_type": "Visa on arrival",
+        "visa_guidance": "Stubbed visa guidance.", "reasoning": "Stubbed travel budget for load testing.",
+    }
+
+
+def _itinerary(prompt: str) -> Dict[str, Any]:
+    days = int(_first_number(r"Create a (\d+)-day", prompt, 3))
+    return {
+        f"day_{day}": {
+            "title": f"Day {day} - Old Town",
+            "overview": "Landmarks in the morning, markets in the afternoon.",
+            "morning_activity": {"name": "City Museum", "description": "Main collection.", "tips": ["Book ahead"]},
+            "lunch": {"dish_name": "Local thali", "description": "Regional staples.",
+                      "must_try_items": "Dal, roti, rice", "restaurant_type": "Family restaurant, centre"},
+            "afternoon_activity": {"name": "Central Market", "description": "Crafts and snacks.",
+                                   "tips": ["Carry cash"]},
+            "dinner": {"description": "Rooftop dinner", "evening_activity": "Sunset walk", "tips": ["Reserve"]},
+            "tips": ["Use public transport", "Start early"],
+        }
+        for day in range(1, min(days, 30) + 1)
+    }
+
+
+def _plan_v1() -> Dict[str, Any]:
+    return {
+        "summary_text": "Stubbed financial summary.",
+        "budget_breakdown": "Needs 50%, wants 30%, savings 20%.",
+        "expense_optimizations": ["Cook at home twice more per week"],
+        "savings_and_investment_plan": "Build a 6-month emergency fund, then start a monthly SIP.",
+        "debt_strategy": "Prepay the highest-interest loan first.",
+        "goal_plan": "Automate monthly transfers towards each goal.",
+        "action_items_30_days": ["Track every expense for 30 days"],
+        "disclaimer": "Educational guidance only.",
+    }
+
+
+def _plan_v2(prompt: str) -> Dict[str, Any]:
+    income = int(_first_number(r"Monthly Income: ₹(\d[\d,]*)", prompt, 100000))
+    needs, wants = int(income * 0.45), int(income * 0.25)
+    savings = income - needs - wants
+    return {
+        "plan_mode": "smart",
+        "metadata": {"city_tier": "tier_1", "col_multiplier": 1.0, "reasoning_summary": "Stubbed plan."},
+        "totals": {"income": income},
+        "split": {"needs_percent": 45, "wants_percent": 25, "savings_percent": 30},
+        "breakdown": {
+            "needs": {"rent": int(needs * 0.6), "groceries": needs - int(needs * 0.6)},
+            "wants": {"dining": wants},
+            "savings": {"emergency": int(savings * 0.5), "sips_investment": savings - int(savings * 0.5)},
+        },
+        "alerts": [],
+        "recommendations": ["Automate savings on payday"],
+        "explainers": {"why_split": "Stub.", "how_to_save": "Stub.", "city_impact": "Stub."},
+    }
+
+
+def canned_content(messages: List[Dict[str, Any]]) -> str:
+    """Pick the canned JSON answer matching the backend prompt."""
+    prompt = "\n".join(str(message.get("content", "")) for message in messages)
+    if '"flight_min"' in prompt:
+        payload = _unit_prices()
+    elif "flight_cost_per_person" in prompt and "food_per_day_per_person" in prompt:
+        payload = _cost_estimates()
+    elif "visa_cost_per_person" in prompt or "hotel_cost_per_night" in prompt:
+        payload = _travel_budget()
+    elif '"day_1"' in prompt:
+        payload = _itinerary(prompt)
+    elif "plan_mode" in prompt:
+        payload = _plan_v2(prompt)
+    elif "summary_text" in prompt:
+        payload = _plan_v1()
+    else:
+        payload = {"message": "stub response"}
+    return json.dumps(payload)
+
+
+def _usage(messages: List[Dict[str, Any]], content: str) -> Dict[str, int]:
+    # Roughly 4 characters per token, good enough for budget accounting tests
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+# ===========================================
+# ENDPOINTS
+# ===========================================
+
+async def _stream(completion_id: str, model: str, content: str) -> AsyncIterator[str]:
+    created = int(time.time())
+
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        body = {
+            "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for start in range(0, len(content), 40):
+        await asyncio.sleep(config.stream_chunk_delay_ms / 1000)
+        yield chunk({"content": content[start:start + 40]})
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> Any:
+    """OpenAI chat-completions API (non-streaming and `stream: true`)."""
+    body = await request.json()
+    _stats["requests"] += 1
+
+    roll = _random.random()
+    if roll < config.timeout_rate:
+        _stats["timeouts"] += 1
+        await asyncio.sleep(config.timeout_seconds)
+    elif roll < config.timeout_rate + config.rate_limit_rate:
+        _stats["rate_limited"] += 1
+        return _error(429, "Rate limit reached (stub)", "rate_limit_exceeded")
+    elif roll < config.timeout_rate + config.rate_limit_rate + config.error_rate:
+        _stats["errors"] += 1
+        return _error(500, "Injected server error (stub)", "server_error")
+
+    await asyncio.sleep(sample_latency_ms(config.latency) / 1000)
+
+    messages = body.get("messages", [])
+    model = body.get("model", "gpt-4o-mini")
+    content = canned_content(messages)
+    completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+
+    if body.get("stream"):
+        _stats["streamed"] += 1
+        return StreamingResponse(_stream(completion_id, model, content), media_type="text/event-stream")
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(messages, content),
+    }
+
+
+@app.get("/v1/models")
+async def list_models() -> Dict[str, Any]:
+    return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "stub"}]}
+
+
+@app.get("/stub/config")
+async def get_config() -> Dict[str, Any]:
+    return {"config": asdict(config), "stats": dict(_stats)}
+
+
+@app.post("/stub/config")
+async def update_config(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Change latency/fault settings between benchmark runs without restarting the stub."""
+    global _random
+    for key, value in changes.items():
+        if hasattr(config, key):
+            setattr(config, key, value)
+    if "latency" in changes:
+        sample_latency_ms(config.latency)  # Validate the spec
+    if "seed" in changes:
+        _random = random.Random(config.seed)
+    return await get_config()
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default=config.latency, help="e.g. fixed:200, uniform:100,900, lognormal:800,0.4")
+    parser.add_argument("--error-rate", type=float, default=config.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=config.rate_limit_rate)
+    parser.add_argument("--timeout-rate", type=float, default=config.timeout_rate)
+    parser.add_argument("--timeout-seconds", type=float, default=config.timeout_seconds)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    global _random
+    sample_latency_ms(args.latency)
+    config.latency = args.latency
+    config.error_rate = args.error_rate
+    config.rate_limit_rate = args.rate_limit_rate
+    config.timeout_rate = args.timeout_rate
+    config.timeout_seconds = args.timeout_seconds
+    config.seed = args.seed
+    _random = random.Random(args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Response serialization benchmark: FastAPI's default response_model path vs FastJSONResponse
+Times the same handler result served both ways through a minimal ASGI app
+
+Run:
+    python -m benchmarks.serialization --loans 20 --months 240 --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from benchmarks.microbench import _debt_loans, _financial_input
+from schemas import DebtStrategyComparison, MultiLoanInput, SummaryOutput
+from services.calculations import calculate_summary
+from services.json_response import FastJSONResponse
+from services.multi_loan import compare_debt_strategies
+
+
+def build_app(comparison: DebtStrategyComparison, summary: SummaryOutput) -> FastAPI:
+    """Two routes per payload: default JSONResponse + response_model validation, and the fast path."""
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/default/debt", response_model=DebtStrategyComparison)
+    async def default_debt() -> Any:
+        return comparison
+
+    @app.get("/fast/debt", response_model=DebtStrategyComparison)
+    async def fast_debt() -> FastJSONResponse:
+        return FastJSONResponse(comparison)
+
+    @app.get("/default/summary", response_model=SummaryOutput)
+    async def default_summary() -> Any:
+        return summary
+
+    @app.get("/fast/summary", response_model=SummaryOutput)
+    async def fast_summary() -> FastJSONResponse:
+        return FastJSONResponse(summary)
+
+    return app
+
+
+async def _time_requests(client: httpx.AsyncClient, path: str, requests: int) -> List[float]:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def run(loans: int, months: int, requests: int) -> Dict[str, Dict[str, float]]:
+    comparison = compare_debt_strategies(MultiLoanInput(loans=_debt_loans(loans, months), extra_payment=5000))
+    summary = calculate_summary(_financial_input(5, 120))
+    app = build_app(comparison, summary)
+
+    results: Dict[str, Dict[str, float]] = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for payload in ("debt", "summary"):
+            default = await client.get(f"/default/{payload}")
+            fast = await client.get(f"/fast/{payload}")
+            assert default.json() == fast.json(), f"{payload}: fast path output differs"
+            for variant in ("default", "fast"):
+                path = f"/{variant}/{payload}"
+                await _time_requests(client, path, 5)  # Warm-up
+                timings = await _time_requests(client, path, requests)
+                results[path] = {
+                    "median_ms": round(statistics.median(timings), 3),
+                    "best_ms": round(min(timings), 3),
+                    "bytes": len(fast.content),
+                }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare default and fast JSON response paths")
+    parser.add_argument("--loans", type=int, default=10)
+    parser.add_argument("--months", type=int, default=240)
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.loans, args.months, args.requests))
+    for payload in ("debt", "summary"):
+        default, fast = results[f"/default/{payload}"], results[f"/fast/{payload}"]
+        speedup = default["median_ms"] / fast["median_ms"] if fast["median_ms"] else 0
+        print(
+            f"{payload:<8} {fast['bytes']:>10,} bytes  default {default['median_ms']:>8.2f}ms  "
+            f"fast {fast['median_ms']:>8.2f}ms  ({speedup:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
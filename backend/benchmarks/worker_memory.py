@@ -0,0 +1,100 @@
+"""
+Gunicorn worker memory benchmark (Linux)
+Starts the production server with and without preload_app and compares per-worker RSS/PSS/private memory and time to ready
+
+Run:
+    python -m benchmarks.worker_memory --workers 4
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+# Touched after start so workers have served real traffic before being measured
+WARM_PATHS = ("/health", "/api/v1/ai/budget/countries", "/api/v1/stats")
+
+
+def read_smaps_rollup(pid: int) -> Dict[str, int]:
+    """Memory totals of a process in KiB, from /proc/<pid>/smaps_rollup."""
+    totals = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in SMAPS_FIELDS:
+                totals[key] = int(rest.split()[0])
+    return totals
+
+
+def child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            children.extend(int(child) for child in f.read().split())
+    return children
+
+
+def measure(preload: bool, workers: int, port: int, timeout: float = 60.0) -> Dict[str, float]:
+    env = {
+        **os.environ,
+        "GUNICORN_PRELOAD": "true" if preload else "false",
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "worker-memory-benchmark"),
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "-c", "gunicorn_config.py",
+         "-w", str(workers), "-b", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("server did not become ready")
+            if len(child_pids(server.pid)) == workers:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                    break
+                except OSError:
+                    pass
+            time.sleep(0.05)
+        ready_s = time.perf_counter() - started
+
+        for _ in range(workers * 5):  # Spread over workers by the kernel's accept balancing
+            for path in WARM_PATHS:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5).read()
+        time.sleep(2.0)  # Let background warm-up finish
+
+        samples = [read_smaps_rollup(pid) for pid in child_pids(server.pid)]
+        per_worker = {field: sum(s[field] for s in samples) / len(samples) / 1024 for field in SMAPS_FIELDS}
+        per_worker["Private"] = per_worker["Private_Clean"] + per_worker["Private_Dirty"]
+        return {"ready_s": ready_s, **per_worker}
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare gunicorn worker memory with and without preload_app")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8300)
+    args = parser.parse_args()
+
+    results = {label: measure(preload, args.workers, args.port) for label, preload in
+               (("no preload", False), ("preload + gc.freeze", True))}
+
+    print(f"{args.workers} workers, per-worker averages (MiB)")
+    print(f"{'':<22}{'ready s':>9}{'RSS':>9}{'PSS':>9}{'private':>9}{'shared':>9}")
+    for label, r in results.items():
+        shared = r["Shared_Clean"] + r["Shared_Dirty"]
+        print(f"{label:<22}{r['ready_s']:>9.2f}{r['Rss']:>9.1f}{r['Pss']:>9.1f}{r['Private']:>9.1f}{shared:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
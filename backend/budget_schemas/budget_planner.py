@@ -85,6 +85,9 @@ class BudgetGenerateRequest(BaseModel):
     loans: List[LoanInput] = Field(default_factory=list, max_items=5)
     goals: List[SavingsGoal] = Field(default_factory=list, max_items=5)
     mode: str = Field(default="smart_balanced", description="Budget mode (basic, aggressive_savings, smart_balanced)")
+    display_currencies: List[str] = Field(
+        default_factory=list, max_items=10, description="Also return the plan's amounts in these currencies"
+    )
 
 
 # ============================================
@@ -168,10 +171,19 @@ class BudgetPlan(BaseModel):
     metadata: Metadata
 
 
+class CurrencyConversions(BaseModel):
+    """Plan amounts converted into the requested display currencies"""
+    base_currency: str
+    rates_as_of: Optional[str] = Field(None, description="When the exchange rates were captured")
+    rates: Dict[str, float] = Field(..., description="Units of each currency per unit of base_currency")
+    amounts: Dict[str, Dict[str, Any]] = Field(..., description="Per currency: income, budget_amounts and categories")
+
+
 class BudgetGenerateResponse(BaseModel):
     """Budget generation API response"""
     success: bool = True
     plan: Optional[BudgetPlan] = None
+    conversions: Optional[CurrencyConversions] = None
     error: Optional[str] = None
 
 
@@ -193,6 +205,35 @@ class BudgetRebalanceResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BudgetRebalanceDeltaRequest(BaseModel):
+    """Incremental rebalance request: one slider event against an editing session"""
+    seq: Optional[int] = Field(default=None, description="Client sequence number (WebSocket channel)")
+    session_id: Optional[str] = Field(default=None, description="Session from a previous delta response")
+    changes: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Edited inputs: income, needs_percent, wants_percent, savings_percent",
+    )
+    # Full context, required to start a session (or restart one this server no longer holds)
+    edited_plan: Optional[Dict[str, Any]] = None
+    original_inputs: Optional[BudgetGenerateRequest] = None
+    city_tier: str = Field(default="tier_1")
+    col_multiplier: float = Field(default=1.0)
+
+
+class BudgetRebalanceDeltaResponse(BaseModel):
+    """Incremental rebalance response: only the plan fields the event changed"""
+    success: bool = True
+    session_id: str
+    revision: int = Field(..., description="Incremented whenever the session's outputs change")
+    full: bool = Field(default=False, description="True when `changed` holds every field (new session)")
+    # Dotted plan paths (e.g. "budget_amounts.needs", "alerts", "explanation") -> new value
+    changed: Dict[str, Any] = Field(default_factory=dict)
+    recomputed: int = Field(default=0, description="Dependency graph nodes recomputed for this event")
+    # WebSocket channel only
+    seq: Optional[int] = Field(default=None, description="Last client message sequence number applied")
+    coalesced: int = Field(default=1, description="Client edit messages merged into this update")
+
+
 class SavedBudget(BaseModel):
     """Saved budget in LocalStorage"""
     inputs: BudgetGenerateRequest
@@ -230,3 +271,76 @@ class BudgetGenerateRequest(BudgetGenerateRequest):
         if v not in valid_tiers:
             raise ValueError(f"City tier must be one of {valid_tiers}")
         return v
+
+
+# ============================================
+# BATCH GENERATION
+# ============================================
+
+class BudgetBatchRequest(BaseModel):
+    """Bulk budget generation request (cohort analytics, partner integrations)"""
+    profiles: List[BudgetGenerateRequest] = Field(..., min_items=1, max_items=1000)
+
+
+class BudgetBatchPlan(BaseModel):
+    """Allocation for one profile of a batch (no explanation text)"""
+    income: float
+    budget_split: BudgetSplit
+    budget_amounts: BudgetAmounts
+    categories: Categories
+    alert_codes: List[str] = Field(default_factory=list, description="Alerts raised, e.g. HIGH_RENT")
+
+
+class BudgetBatchResponse(BaseModel):
+    """Bulk budget generation response; plans are in request order"""
+    success: bool = True
+    count: int
+    plans: List[BudgetBatchPlan]
+
+
+# ============================================
+# GOAL SIMULATION
+# ============================================
+
+class GoalSimulationRequest(BaseModel):
+    """Monte Carlo goal feasibility request: the budget inputs (with goals) and simulation settings"""
+    inputs: BudgetGenerateRequest
+    paths: int = Field(default=5000, ge=100, le=20000, description="Number of simulated paths (fewer for long horizons, see paths_simulated)")
+    seed: int = Field(default=42, ge=0, description="Random seed (same seed, same result)")
+    
+    @validator('inputs')
+    def validate_goals(cls, v):
+        if not v.goals:
+            raise ValueError("At least one savings goal is required")
+        return v
+
+
+class BalancePercentiles(BaseModel):
+    """10th, 50th and 90th percentile of a simulated balance"""
+    p10: float
+    p50: float
+    p90: float
+
+
+class GoalProjection(BaseModel):
+    """Simulated outcome for one savings goal"""
+    name: str
+    target: float
+    target_months: int
+    probability: float = Field(..., ge=0, le=1, description="Share of paths reaching the inflated target")
+    monthly_contribution: float = Field(..., description="Goal bucket money going to this goal in month 1")
+    required_monthly: float = Field(..., description="Level monthly saving needed at expected returns")
+    balance: BalancePercentiles
+    median_shortfall: float
+
+
+class GoalSimulationResponse(BaseModel):
+    """Monte Carlo goal feasibility response"""
+    success: bool = True
+    goals: List[GoalProjection]
+    buckets: Dict[str, BalancePercentiles] = Field(..., description="SIP and FD/RD balances at the horizon")
+    horizon_months: int
+    paths_simulated: int
+    truncated: bool = Field(default=False, description="Time budget ran out before all paths were simulated")
+    seed: int
+    cached: bool = False
@@ -3,11 +3,14 @@ Configuration module for VegaKash.AI Backend
 Handles environment variables and application settings
 """
 import os
+from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from backend/.env (the only load_dotenv call).
+# main.py imports this module before any module that reads settings at import time.
+ENV_PATH = Path(__file__).parent / ".env"
+load_dotenv(dotenv_path=ENV_PATH)
 
 
 class Config:
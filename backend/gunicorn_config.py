@@ -1,6 +1,7 @@
 """
 Gunicorn configuration for production deployment
 """
+import gc
 import os
 import multiprocessing
 
@@ -9,12 +10,22 @@ bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+# Exported so the app knows it runs in several processes (e.g. shared SQLite job store)
+os.environ["WEB_CONCURRENCY"] = str(workers)
 worker_class = 'uvicorn.workers.UvicornWorker'
 worker_connections = 1000
 timeout = 120
 keepalive = 5
 
+# Import the app once in the master and fork workers from it: code, schemas and
+# reference tables are then shared copy-on-write instead of rebuilt in every worker
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+if preload_app:
+    # No collections while the app loads in the master; everything loaded is frozen before fork (see when_ready)
+    gc.disable()
+
 # Logging
 accesslog = '-'
 errorlog = '-'
@@ -32,6 +43,36 @@ user = None
 group = None
 tmp_upload_dir = None
 
+
+
+def on_starting(server):
+    """Clear metrics left by a previous run so /metrics only aggregates this run's workers."""
+    from services.metrics import clear_multiprocess_dir
+    clear_multiprocess_dir()
+
+
+def when_ready(server):
+    """
+    Runs in the master after the preloaded app is imported, before the first fork.
+
+    Fork-safe warm-up (SDK and PDF engine imports) happens here once for all workers,
+    then gc.freeze() moves every object into the permanent generation so worker
+    collections never write to (and un-share) the inherited pages.
+    """
+    if not preload_app:
+        return
+    from services.warmup import preload_for_fork
+    preload_for_fork()
+    gc.freeze()
+    gc.enable()
+
+
+def pre_fork(server, worker):
+    """Freeze anything the master allocated since the last fork (e.g. when replacing a worker)."""
+    if preload_app:
+        gc.freeze()
+
+
 # SSL (if needed)
 # keyfile = None
 # certfile = None
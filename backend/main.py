@@ -4,23 +4,36 @@ AI-powered Budget Planner & Savings Assistant
 """
 import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from pathlib import Path
-from typing import Dict
+from typing import AsyncIterator, Dict, Optional, Tuple
 
-from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from slowapi import Limiter, _rate_limit_exceeded_handler  # type: ignore
 from slowapi.errors import RateLimitExceeded  # type: ignore
 from slowapi.util import get_remote_address  # type: ignore
-
+from starlette.concurrency import run_in_threadpool
+
+import config  # noqa: F401  (loads .env before the modules below read their settings)
+from middleware.compression import DEFAULT_MINIMUM_SIZE, CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.rate_limiter import RateLimitMiddleware
+from middleware.security import (
+    MAX_REQUEST_SIZE,
+    LogSanitizationMiddleware,
+    RequestSizeLimitMiddleware,
+    SecurityHeadersMiddleware,
+)
+from middleware.server_timing import ServerTimingMiddleware
+from routes.admin import router as admin_router
 from routes.budget_planner import router as budget_planner_router
 from routes.feedback import router as feedback_router
 from routes.travel_planner import router as travel_planner_router
 from routes.auto_loan import router as auto_loan_router
+from routes.jobs import router as jobs_router
 from schemas import (
     AIPlanOutput,
     AIPlanOutputV2,
@@ -34,14 +47,26 @@ from schemas import (
 )
 from services.ai_planner import generate_ai_plan
 from services.ai_planner_v2 import generate_ai_plan_v2
+from services.cache import get_cache_stats
+from services.cache_prewarmer import prewarm_stats, start_cache_prewarmer, stop_cache_prewarmer
+from services.cache_snapshot import start_cache_snapshots, stop_cache_snapshots
 from services.calculations import calculate_summary
+from services.heavy_hitters import heavy_hitter_stats
+from services.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER, run_idempotent
+from services.json_response import FastJSONResponse
+from services.metrics import (
+    CONTENT_TYPE_LATEST,
+    RATE_LIMIT_REJECTIONS,
+    cache_hit_ratios,
+    render_metrics,
+    start_metrics_flusher,
+    stop_metrics_flusher,
+)
 from services.multi_loan import compare_debt_strategies
-from services.pdf_generator_reportlab import generate_pdf_bytes
+from services.pdf_export import generate_pdf_bytes
 from services.smart_recommendations import generate_smart_recommendations
-
-# Load environment variables from .env file (relative to this script)
-env_path = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=env_path)
+from services.pricing_store import pricing_stats, start_pricing_watcher, stop_pricing_watcher
+from services.warmup import start_warmup, warmup_stats
 
 # Verify API key is loaded
 api_key = os.getenv("OPENAI_API_KEY")
@@ -54,12 +79,6 @@ if api_key_loaded and api_key:
 else:
     print("⚠️  WARNING: OPENAI_API_KEY not found in environment!")
 
-# Import security middleware (commented out temporarily - will add after testing)
-# from middleware.security import (
-#     SecurityHeadersMiddleware,
-#     RequestSizeLimitMiddleware,
-#     LogSanitizationMiddleware
-# )
 
 # Configure logging
 logging.basicConfig(
@@ -68,8 +87,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Initialize rate limiter (RATE_LIMIT_ENABLED=false turns it off, e.g. for load tests)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+limiter = Limiter(key_func=get_remote_address, enabled=RATE_LIMIT_ENABLED)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup/shutdown: warm caches from the last snapshot, keep hot keys fresh, persist on exit."""
+    await start_metrics_flusher()
+    await start_cache_snapshots()
+    await start_cache_prewarmer()
+    await start_warmup()
+    await start_pricing_watcher()
+    yield
+    await stop_pricing_watcher()
+    await stop_cache_prewarmer()
+    await stop_cache_snapshots()
+    await stop_metrics_flusher()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -77,12 +113,33 @@ app = FastAPI(
     description="AI Budget Planner & Savings Assistant - Backend API",
     version="1.0.0",
     docs_url="/api/v1/docs",
-    redoc_url="/api/v1/redoc"
+    redoc_url="/api/v1/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add rate limiter to app state
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+    """Count slowapi rejections, then return slowapi's standard 429 response."""
+    RATE_LIMIT_REJECTIONS.inc(limiter="slowapi")
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)  # type: ignore
+
+# Request guards (inside CORS so rejections still carry CORS headers)
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_size=int(os.getenv("MAX_REQUEST_SIZE_BYTES", str(MAX_REQUEST_SIZE))),
+)
+# Per-IP sliding-window limits for every endpoint, on top of slowapi's per-route limits
+if os.getenv("RATE_LIMIT_MIDDLEWARE_ENABLED", "false").lower() == "true":
+    app.add_middleware(RateLimitMiddleware)
+if os.getenv("REQUEST_LOGGING_ENABLED", "false").lower() == "true":
+    app.add_middleware(LogSanitizationMiddleware)
 
 # Configure CORS
 # Allow frontend to access backend from different origins
@@ -124,30 +181,55 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
+    allow_headers=["Content-Type", "Authorization", "X-Requested-With", IDEMPOTENCY_HEADER],
+    expose_headers=[REPLAYED_HEADER, "Server-Timing", "ETag"],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
-# Add security middleware (commented out temporarily - will add after testing)
-# app.add_middleware(SecurityHeadersMiddleware)
-# app.add_middleware(RequestSizeLimitMiddleware)
-# app.add_middleware(LogSanitizationMiddleware)
+# Per-route request counters and latency histograms (served at /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Per-stage spans reported as Server-Timing headers (optionally exported, see services.tracing)
+app.add_middleware(ServerTimingMiddleware)
+
+# gzip/brotli for responses over the size threshold (precompressed static payloads pass through)
+if os.getenv("COMPRESSION_ENABLED", "true").lower() == "true":
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", str(DEFAULT_MINIMUM_SIZE))),
+    )
+
+# Security headers on every response, including CORS preflights and rejections (outermost)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    csp_exempt_paths=[app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url],
+    hsts=os.getenv("HSTS_ENABLED", "false").lower() == "true",
+)
 
 # Register Phase 2 routes
 app.include_router(budget_planner_router)
 app.include_router(travel_planner_router)
 app.include_router(feedback_router)
 app.include_router(auto_loan_router)
+app.include_router(jobs_router)
+app.include_router(admin_router)
 
 logger.info("✅ Budget Planner routes registered (Phase 2)")
 logger.info("✅ Travel Planner routes registered (Phase 3)")
 logger.info("✅ Feedback routes registered")
 logger.info("✅ Auto Loan Calculator routes registered")
+logger.info("✅ Background job routes registered")
+logger.info("✅ Admin diagnostics routes registered")
 
 
 @app.post("/api/v2/generate-ai-plan", response_model=AIPlanOutputV2)
 @limiter.limit("5/minute")  # type: ignore
-async def generate_ai_financial_plan_v2(request: Request, ai_request: AIPlanRequest) -> AIPlanOutputV2:
+async def generate_ai_financial_plan_v2(
+    request: Request,
+    response: Response,
+    ai_request: AIPlanRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> AIPlanOutputV2:
     """
     V2: Generate context-aware AI budget plan with city tier, lifestyle, and family size considerations
     Enhanced version with alerts, recommendations, and educational explainers
@@ -156,6 +238,7 @@ async def generate_ai_financial_plan_v2(request: Request, ai_request: AIPlanRequ
     Args:
         request: FastAPI request object (for rate limiting)
         ai_request: Contains financial input and calculated summary
+        idempotency_key: Optional key; retries with the same key reuse the first result
         
     Returns:
         AIPlanOutputV2 with structured budget plan, alerts, and recommendations
@@ -163,13 +246,20 @@ async def generate_ai_financial_plan_v2(request: Request, ai_request: AIPlanRequ
     try:
         logger.info(f"Generating V2 AI budget plan for IP: {get_remote_address(request)}")
         
-        # Generate V2 AI plan
-        ai_plan = generate_ai_plan_v2(ai_request.input, ai_request.summary)
+        # Generate V2 AI plan (deduplicated by Idempotency-Key)
+        ai_plan, replayed = await run_idempotent(
+            "ai_plan_v2", idempotency_key, ai_request,
+            lambda: run_in_threadpool(generate_ai_plan_v2, ai_request.input, ai_request.summary),
+        )
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
         
         logger.info("V2 AI plan generated successfully")
         
         return ai_plan
         
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Configuration error in V2: {e}")
         raise HTTPException(
@@ -282,16 +372,21 @@ async def get_system_stats() -> Dict[str, object]:
         System statistics including cache and rate limit info
     """
     try:
-        # cache_stats = get_cache_stats()  # Temporarily disabled
+        cache_stats = get_cache_stats()
+        cache_stats["namespaces"] = cache_hit_ratios()
         
         return {
             "status": "ok",
             "timestamp": datetime.now().isoformat(),
-            # "cache": cache_stats,  # Temporarily disabled
+            "cache": cache_stats,
             "ai": {
                 "configured": bool(os.getenv("OPENAI_API_KEY")),
                 "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini")
             },
+            "hot_keys": heavy_hitter_stats(),
+            "prewarm": prewarm_stats(),
+            "warmup": warmup_stats(),
+            "pricing": pricing_stats(),
             "version": "1.0.0"
         }
     except Exception as e:
@@ -302,10 +397,19 @@ async def get_system_stats() -> Dict[str, object]:
         }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint
+    Aggregates all workers when METRICS_MULTIPROC_DIR is set
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/api/calculate-summary", response_model=SummaryOutput)
 @app.post("/api/v1/calculate-summary", response_model=SummaryOutput)
 @limiter.limit("30/minute")  # type: ignore
-async def calculate_financial_summary(request: Request, financial_input: FinancialInput) -> SummaryOutput:
+async def calculate_financial_summary(request: Request, financial_input: FinancialInput) -> FastJSONResponse:
     """
     Calculate financial summary based on user input
     Performs rule-based calculations without AI
@@ -328,7 +432,7 @@ async def calculate_financial_summary(request: Request, financial_input: Financi
         logger.info(f"Summary calculated - Net Savings: ₹{summary.net_savings}, "
                    f"Savings Rate: {summary.savings_rate_percent}%")
         
-        return summary
+        return FastJSONResponse(summary)
         
     except Exception as e:
         logger.error(f"Error calculating summary: {e}", exc_info=True)
@@ -341,7 +445,12 @@ async def calculate_financial_summary(request: Request, financial_input: Financi
 @app.post("/api/generate-ai-plan", response_model=AIPlanOutput)
 @app.post("/api/v1/generate-ai-plan", response_model=AIPlanOutput)
 @limiter.limit("5/minute")  # type: ignore
-async def generate_ai_financial_plan(request: Request, ai_request: AIPlanRequest) -> AIPlanOutput:
+async def generate_ai_financial_plan(
+    request: Request,
+    response: Response,
+    ai_request: AIPlanRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> AIPlanOutput:
     """
     Generate personalized AI financial plan
     Uses OpenAI to create customized budget and savings recommendations
@@ -350,6 +459,7 @@ async def generate_ai_financial_plan(request: Request, ai_request: AIPlanRequest
     Args:
         request: FastAPI request object (for rate limiting)
         ai_request: Contains both financial input and calculated summary
+        idempotency_key: Optional key; retries with the same key reuse the first result
         
     Returns:
         AIPlanOutput with AI-generated recommendations
@@ -360,13 +470,20 @@ async def generate_ai_financial_plan(request: Request, ai_request: AIPlanRequest
     try:
         logger.info(f"Generating AI financial plan for IP: {get_remote_address(request)}")
         
-        # Generate AI plan
-        ai_plan = generate_ai_plan(ai_request.input, ai_request.summary)
+        # Generate AI plan (deduplicated by Idempotency-Key)
+        ai_plan, replayed = await run_idempotent(
+            "ai_plan_v1", idempotency_key, ai_request,
+            lambda: run_in_threadpool(generate_ai_plan, ai_request.input, ai_request.summary),
+        )
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
         
         logger.info("AI plan generated successfully")
         
         return ai_plan
         
+    except HTTPException:
+        raise
     except ValueError as e:
         # Configuration error (e.g., missing API key)
         logger.error(f"Configuration error: {e}")
@@ -393,7 +510,7 @@ async def generate_ai_financial_plan(request: Request, ai_request: AIPlanRequest
 
 @app.post("/api/v1/compare-debt-strategies", response_model=DebtStrategyComparison)
 @limiter.limit("10/minute")  # type: ignore
-async def compare_debt_strategies_endpoint(request: Request, multi_loan_input: MultiLoanInput) -> DebtStrategyComparison:
+async def compare_debt_strategies_endpoint(request: Request, multi_loan_input: MultiLoanInput) -> FastJSONResponse:
     """
     Compare debt snowball vs avalanche strategies
     
@@ -407,7 +524,7 @@ async def compare_debt_strategies_endpoint(request: Request, multi_loan_input: M
         logger.info(f"Comparing debt strategies for {len(multi_loan_input.loans)} loans")
         comparison = compare_debt_strategies(multi_loan_input)
         logger.info(f"Debt comparison complete - Interest saved: ₹{comparison.interest_saved}")
-        return comparison
+        return FastJSONResponse(comparison)
     except Exception as e:
         logger.error(f"Error comparing debt strategies: {e}", exc_info=True)
         raise HTTPException(
@@ -416,37 +533,53 @@ async def compare_debt_strategies_endpoint(request: Request, multi_loan_input: M
         )
 
 
+def _render_pdf(pdf_request: PDFExportRequest) -> Tuple[bytes, str]:
+    """Render the PDF export and pick its download filename."""
+    pdf_bytes = generate_pdf_bytes(
+        pdf_request.input,
+        pdf_request.summary,
+        pdf_request.ai_plan
+    )
+    filename = f"VegaKash_Financial_Plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return pdf_bytes, filename
+
+
 @app.post("/api/v1/export-pdf")
 @limiter.limit("10/minute")  # type: ignore
-async def export_financial_plan_pdf(request: Request, pdf_request: PDFExportRequest) -> Response:
+async def export_financial_plan_pdf(
+    request: Request,
+    pdf_request: PDFExportRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Response:
     """
     Export financial plan as PDF
     
     Args:
         pdf_request: Contains financial input, summary, and optional AI plan
+        idempotency_key: Optional key; retries with the same key reuse the rendered PDF
         
     Returns:
         PDF file as bytes
     """
     try:
         logger.info("Generating PDF export")
-        pdf_bytes = generate_pdf_bytes(
-            pdf_request.input,
-            pdf_request.summary,
-            pdf_request.ai_plan
+        (pdf_bytes, filename), replayed = await run_idempotent(
+            "export_pdf", idempotency_key, pdf_request,
+            lambda: run_in_threadpool(_render_pdf, pdf_request),
         )
         
-        filename = f"VegaKash_Financial_Plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        
         logger.info(f"PDF generated successfully: {filename}")
         
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+        if replayed:
+            headers[REPLAYED_HEADER] = "true"
         return Response(
             content=pdf_bytes,
             media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
+            headers=headers
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating PDF: {e}", exc_info=True)
         raise HTTPException(
@@ -0,0 +1,108 @@
+"""
+Response compression middleware
+gzip/brotli for responses above a size threshold, streaming-aware (pure ASGI)
+"""
+import zlib
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.compression import BROTLI_QUALITY, GZIP_LEVEL, brotli, choose_encoding, compress
+
+DEFAULT_MINIMUM_SIZE = 1024  # Smaller bodies are not worth the CPU or the header bytes
+# Already compressed or must reach the client unbuffered
+EXCLUDED_CONTENT_TYPES = ("application/pdf", "text/event-stream", "image/", "application/zip")
+
+
+def _stream_compressor(encoding: str) -> Any:
+    if encoding == "br":
+        return brotli.Compressor(quality=BROTLI_QUALITY)
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts (br, then gzip).
+
+    Single-message responses are compressed in one go once they reach
+    `minimum_size`. Streaming responses are compressed chunk by chunk and
+    flushed after each chunk, so clients still receive data as it is produced.
+    Responses that already carry a Content-Encoding (e.g. precompressed
+    static payloads) and excluded content types pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = DEFAULT_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Any = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                    or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message  # Held until the first body chunk decides
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(scope=start_message)
+                if not more_body and len(body) < self.minimum_size:
+                    # Small complete response: send as is
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                headers.add_vary_header("Accept-Encoding")
+                headers["Content-Encoding"] = encoding
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    start_message = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["Content-Length"]
+                compressor = _stream_compressor(encoding)
+                await send(start_message)
+                start_message = None
+
+            if encoding == "br":
+                chunk = compressor.process(body) + (compressor.flush() if more_body else compressor.finish())
+            else:
+                chunk = compressor.compress(body) + compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
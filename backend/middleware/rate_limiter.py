@@ -1,20 +1,24 @@
 """
 Rate limiting middleware for FastAPI
-Protects against abuse and controls API costs
+Protects against abuse and controls API costs (pure ASGI; enabled in main.py when RATE_LIMIT_MIDDLEWARE_ENABLED=true)
 """
+import json
+import logging
+import os
 import time
 from typing import Dict, Tuple
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
-import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.metrics import RATE_LIMIT_REJECTIONS
 
 logger = logging.getLogger(__name__)
 
 # Rate limit configuration
-RATE_LIMIT_REQUESTS = 10  # Maximum requests
-RATE_LIMIT_WINDOW = 60  # Time window in seconds (1 minute)
-AI_ENDPOINT_LIMIT = 3  # Special limit for AI endpoints per minute
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))  # Maximum requests
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))  # Time window in seconds (1 minute)
+AI_ENDPOINT_LIMIT = int(os.getenv("AI_ENDPOINT_LIMIT", "3"))  # Special limit for AI endpoints per minute
+EXEMPT_PATHS = {"/health", "/api/v1/health", "/ready", "/api/v1/ready", "/metrics", "/", "/favicon.ico"}
 
 # In-memory storage for rate limiting
 # Format: {ip: [(timestamp1, endpoint1), (timestamp2, endpoint2), ...]}
@@ -91,58 +95,84 @@ def _record_request(ip: str, endpoint: str, current_time: float) -> None:
     _rate_limit_store[ip].append((current_time, endpoint))
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Middleware to enforce rate limiting on API endpoints.
+
+    Rejected requests get a 429 before the app runs; allowed ones get
+    X-RateLimit-* headers added to the response start message.
     """
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request with rate limiting.
-        
+
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/endpoint handler
-            
-        Returns:
-            HTTP response
-            
-        Raises:
-            HTTPException: If rate limit is exceeded
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-        endpoint = request.url.path
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Skip rate limiting for health checks, metrics, preflights and static files
+        endpoint = scope.get("path", "")
+        if scope.get("method") == "OPTIONS" or endpoint in EXEMPT_PATHS or endpoint.startswith("/static"):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         current_time = time.time()
-        
-        # Skip rate limiting for health checks and static files
-        if endpoint in ["/health", "/", "/favicon.ico"] or endpoint.startswith("/static"):
-            return await call_next(request)
-        
+
         # Check rate limit
         is_limited, remaining = _is_rate_limited(client_ip, endpoint, current_time)
-        
+        reset = str(int(current_time + RATE_LIMIT_WINDOW)).encode()
+
         if is_limited:
             logger.warning(f"Rate limit exceeded for {client_ip} on {endpoint}")
-            raise HTTPException(
-                status_code=429,
-                detail={
+            RATE_LIMIT_REJECTIONS.inc(limiter="middleware")
+            body = json.dumps({
+                "detail": {
                     "error": "Rate limit exceeded",
                     "message": "Too many requests. Please try again later.",
-                    "retry_after_seconds": RATE_LIMIT_WINDOW
+                    "retry_after_seconds": RATE_LIMIT_WINDOW,
                 }
-            )
-        
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(RATE_LIMIT_WINDOW).encode()),
+                    (b"x-ratelimit-limit", str(RATE_LIMIT_REQUESTS).encode()),
+                    (b"x-ratelimit-remaining", b"0"),
+                    (b"x-ratelimit-reset", reset),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
         # Record this request
         _record_request(client_ip, endpoint, current_time)
-        
-        # Add rate limit headers to response
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT_REQUESTS)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + RATE_LIMIT_WINDOW))
-        
-        return response
+
+        rate_limit_headers = [
+            (b"x-ratelimit-limit", str(RATE_LIMIT_REQUESTS).encode()),
+            (b"x-ratelimit-remaining", str(remaining).encode()),
+            (b"x-ratelimit-reset", reset),
+        ]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *rate_limit_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 
 def get_rate_limit_stats() -> Dict[str, int]:
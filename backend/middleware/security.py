@@ -1,127 +1,181 @@
 """
 Security middleware for FastAPI
-Adds security headers and request validation
+Adds security headers and request validation (pure ASGI, no response buffering)
 """
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+import json
 import logging
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 # Request size limit (10 MB)
 MAX_REQUEST_SIZE = 10 * 1024 * 1024
 
+# Restrictive policy to prevent XSS attacks
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' data:; "
+    "connect-src 'self' https://api.openai.com; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'"
+)
+
+# Permissions policy (formerly Feature-Policy)
+PERMISSIONS_POLICY = (
+    "geolocation=(), "
+    "microphone=(), "
+    "camera=(), "
+    "payment=(), "
+    "usb=(), "
+    "magnetometer=()"
+)
+
+HSTS_VALUE = "max-age=31536000; includeSubDomains"
+
+
+def _client_host(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses.
     Protects against XSS, clickjacking, and other common attacks.
+
+    Headers are encoded once at startup and appended to the response start
+    message; headers the endpoint already set are left alone. The API docs
+    pages load Swagger/ReDoc assets from a CDN, so they are served without CSP.
     """
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """
-        Add security headers to response.
-        
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/endpoint handler
-            
-        Returns:
-            HTTP response with security headers
-        """
-        response = await call_next(request)
-        
-        # Content Security Policy (CSP)
-        # Restrictive policy to prevent XSS attacks
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self' https://api.openai.com; "
-            "frame-ancestors 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'"
-        )
-        
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # Enable XSS protection (legacy but still useful)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
-        # Enforce HTTPS (only in production)
-        # Uncomment when deployed with HTTPS
-        # response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        # Permissions policy (formerly Feature-Policy)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), "
-            "microphone=(), "
-            "camera=(), "
-            "payment=(), "
-            "usb=(), "
-            "magnetometer=()"
-        )
-        
-        return response
-
-
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
+
+    def __init__(self, app: ASGIApp, csp_exempt_paths: Iterable[Optional[str]] = (), hsts: bool = False):
+        self.app = app
+        self.csp_exempt_paths = {path for path in csp_exempt_paths if path}
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"x-frame-options", b"DENY"),  # Prevent clickjacking
+            (b"x-content-type-options", b"nosniff"),  # Prevent MIME type sniffing
+            (b"x-xss-protection", b"1; mode=block"),  # Legacy but still useful
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            (b"permissions-policy", PERMISSIONS_POLICY.encode()),
+        ]
+        if hsts:
+            # Only when served over HTTPS
+            headers.append((b"strict-transport-security", HSTS_VALUE.encode()))
+        self.headers = headers
+        self.csp_header = (b"content-security-policy", CONTENT_SECURITY_POLICY.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        extra = self.headers
+        if scope.get("path") not in self.csp_exempt_paths:
+            extra = [self.csp_header, *extra]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(header for header in extra if header[0] not in present)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestSizeLimitMiddleware:
     """
     Middleware to limit request body size.
     Protects against DoS attacks via large payloads.
+
+    A declared Content-Length over the limit is rejected before the app runs.
+    Chunked or under-declared bodies are counted as they stream through
+    receive(); the body is never buffered here.
     """
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """
-        Check request size before processing.
-        
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/endpoint handler
-            
-        Returns:
-            HTTP response
-            
-        Raises:
-            HTTPException: If request is too large
-        """
+
+    def __init__(self, app: ASGIApp, max_size: int = MAX_REQUEST_SIZE):
+        self.app = app
+        self.max_size = max_size
+
+    def _too_large_detail(self) -> dict:
+        return {
+            "error": "Request too large",
+            "message": f"Request body must be less than {self.max_size / (1024 * 1024):.1f} MB",
+            "max_size_bytes": self.max_size,
+        }
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({"detail": self._too_large_detail()}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Check Content-Length header
-        content_length = request.headers.get("content-length")
-        
-        if content_length:
-            content_length_int = int(content_length)
-            if content_length_int > MAX_REQUEST_SIZE:
-                logger.warning(
-                    f"Request too large: {content_length_int} bytes from {request.client.host if request.client else 'unknown'}"
-                )
-                raise HTTPException(
-                    status_code=413,
-                    detail={
-                        "error": "Request too large",
-                        "message": f"Request body must be less than {MAX_REQUEST_SIZE / (1024 * 1024):.1f} MB",
-                        "max_size_bytes": MAX_REQUEST_SIZE
-                    }
-                )
-        
-        return await call_next(request)
-
-
-class LogSanitizationMiddleware(BaseHTTPMiddleware):
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    content_length = 0
+                if content_length > self.max_size:
+                    logger.warning(f"Request too large: {content_length} bytes from {_client_host(scope)}")
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    logger.warning(f"Request body exceeded {self.max_size} bytes from {_client_host(scope)}")
+                    # FastAPI re-raises HTTPExceptions from body reading, so this becomes a 413 response
+                    raise HTTPException(status_code=413, detail=self._too_large_detail())
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await self._reject(send)
+
+
+class LogSanitizationMiddleware:
     """
     Middleware to sanitize sensitive data from logs.
     Prevents logging of financial data and PII.
+
+    Only the method, path and client address are logged; bodies and query
+    strings (which may carry financial data) never are.
     """
-    
+
     SENSITIVE_FIELDS = [
         "monthly_income",
         "expenses",
@@ -132,27 +186,18 @@ class LogSanitizationMiddleware(BaseHTTPMiddleware):
         "token",
         "password"
     ]
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """
-        Process request and sanitize logs.
-        
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/endpoint handler
-            
-        Returns:
-            HTTP response
-        """
-        # Log request without sensitive data
-        log_data = {
-            "method": request.method,
-            "path": request.url.path,
-            "client": request.client.host if request.client else "unknown"
-        }
-        
-        logger.info(f"Request: {log_data}")
-        
-        response = await call_next(request)
-        
-        return response
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            # Log request without sensitive data
+            log_data = {
+                "method": scope.get("method", ""),
+                "path": scope.get("path", ""),
+                "client": _client_host(scope),
+            }
+            logger.info(f"Request: {log_data}")
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,56 @@
+"""
+Server-Timing / tracing middleware
+Starts a trace per request, adds a Server-Timing header with per-stage durations (pure ASGI)
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.tracing import SERVER_TIMING_ENABLED, finish_trace, server_timing_header, start_trace
+
+
+class ServerTimingMiddleware:
+    """
+    Trace each HTTP request and report its stage spans in a Server-Timing header.
+
+    Stages are recorded with services.tracing.span() anywhere in the request's
+    call stack (including threadpool work). The header reflects the spans that
+    finished before the response started, which for regular JSON responses is
+    the whole handler.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        trace = start_trace(
+            f"{scope.get('method', '')} {scope.get('path', '')}",
+            traceparent,
+            **{"http.method": scope.get("method", ""), "http.target": scope.get("path", "")},
+        )
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append("Server-Timing", server_timing_header(trace))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                trace.root.name = f"{scope.get('method', '')} {route}"
+                trace.root.attributes["http.route"] = route
+            finish_trace(trace, **{"http.status_code": status_code})
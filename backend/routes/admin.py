@@ -0,0 +1,125 @@
+"""
+Admin API Routes
+On-demand CPU sampling and memory (tracemalloc) diagnostics for live workers, protected by ADMIN_TOKEN
+"""
+import asyncio
+import logging
+import os
+import secrets
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+import routes.travel_ai_enhancement as travel_ai
+import services.cache as plan_cache
+from middleware import rate_limiter
+from services.cache_service import budget_cache
+from services.idempotency import idempotency_store
+from services.profiler import (
+    MAX_PROFILE_SECONDS,
+    memory_diff,
+    register_size_probe,
+    sample_stacks,
+    start_memory_tracing,
+    stop_memory_tracing,
+)
+
+logger = logging.getLogger(__name__)
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+# Long-lived in-memory structures worth watching for unbounded growth
+register_size_probe("travel_session_ai_calls", lambda: len(travel_ai.SESSION_AI_CALLS))
+register_size_probe("travel_unit_price_cache", lambda: len(travel_ai.AI_CACHE))
+register_size_probe("ai_plan_cache", lambda: len(plan_cache._cache))
+register_size_probe("budget_result_cache", lambda: len(budget_cache.cache))
+register_size_probe("idempotency_keys", lambda: len(idempotency_store))
+register_size_probe("rate_limiter_ips", lambda: len(rate_limiter._rate_limit_store))
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None, alias=ADMIN_TOKEN_HEADER)) -> None:
+    """
+    Allow the request only with the configured admin token.
+    Admin endpoints are disabled (404) when ADMIN_TOKEN is not set.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(
+            status_code=401,
+            detail={"error": True, "message": "Invalid or missing admin token"}
+        )
+
+
+router = APIRouter(prefix="/api/v1/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+# ===========================================
+# CPU PROFILING
+# ===========================================
+
+@router.get("/profile/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+) -> PlainTextResponse:
+    """
+    Sample all thread stacks of this worker for `seconds`.
+
+    Returns:
+        Collapsed stacks ("thread;outer;...;inner count" per line), ready for
+        flamegraph.pl or speedscope
+    """
+    sampler = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000)
+    if sampler is None:
+        raise HTTPException(
+            status_code=409,
+            detail={"error": True, "message": "A profiling session is already running on this worker"}
+        )
+    logger.info(f"CPU profile: {sampler.sample_count} samples, {len(sampler.samples)} distinct stacks")
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{os.getpid()}.collapsed"',
+            "X-Profile-Samples": str(sampler.sample_count),
+        },
+    )
+
+
+# ===========================================
+# MEMORY PROFILING
+# ===========================================
+
+@router.post("/profile/memory/start")
+async def start_memory_profile(frames: int = Query(10, ge=1, le=50)) -> Dict[str, Any]:
+    """Start tracemalloc on this worker and take a baseline snapshot."""
+    await asyncio.to_thread(start_memory_tracing, frames)
+    return {"status": "tracing", "pid": os.getpid(), "frames": frames}
+
+
+@router.get("/profile/memory")
+async def memory_profile(
+    limit: int = Query(25, ge=1, le=200),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    reset_baseline: bool = False,
+) -> Dict[str, Any]:
+    """
+    Diff current allocations against the baseline snapshot.
+
+    Returns:
+        Top allocation growth sites plus sizes of known long-lived containers
+    """
+    try:
+        report = await asyncio.to_thread(memory_diff, limit, group_by, reset_baseline)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail={"error": True, "message": str(e)})
+    return {"pid": os.getpid(), **report}
+
+
+@router.post("/profile/memory/stop")
+async def stop_memory_profile() -> Dict[str, Any]:
+    """Stop tracemalloc (it slows allocations while running)."""
+    await asyncio.to_thread(stop_memory_tracing)
+    return {"status": "stopped", "pid": os.getpid()}
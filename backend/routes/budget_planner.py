@@ -3,18 +3,35 @@ Budget Planner V1.2 - API Routes
 FastAPI endpoints for budget planning operations
 """
 
-from fastapi import APIRouter, HTTPException, status
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Request, Response, WebSocket, status
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional
 import logging
 
 # Import budget planner schemas
 from budget_schemas.budget_planner import (
+    BudgetBatchRequest,
+    BudgetBatchResponse,
     BudgetGenerateRequest,
     BudgetGenerateResponse,
+    BudgetPlan,
+    BudgetRebalanceDeltaRequest,
+    BudgetRebalanceDeltaResponse,
     BudgetRebalanceRequest,
     BudgetRebalanceResponse,
+    CurrencyConversions,
+    GoalSimulationRequest,
+    GoalSimulationResponse,
+    NeedsCategory,
+    SavingsCategory,
+    WantsCategory,
 )
 from services.budget_planner_service import BudgetPlannerService
+from services.compression import PrecompressedJSON
+from services.currency import MoneyFields, RateMatrix, rate_matrix
+from services.json_response import FastJSONResponse
+from services.rebalance_channel import RebalanceChannel
+from services.rebalance_engine import apply_changes
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -31,6 +48,16 @@ router = APIRouter(
 )
 
 
+# Every monetary field of a BudgetPlan, for display-currency conversions
+PLAN_MONEY_FIELDS = MoneyFields(
+    "income",
+    "budget_amounts.needs", "budget_amounts.wants", "budget_amounts.savings",
+    *(f"categories.needs.{name}" for name in NeedsCategory.model_fields),
+    *(f"categories.wants.{name}" for name in WantsCategory.model_fields),
+    *(f"categories.savings.{name}" for name in SavingsCategory.model_fields),
+)
+
+
 # ============================================
 # DEPENDENCY FUNCTIONS
 # ============================================
@@ -137,7 +164,7 @@ def validate_budget_request(request: BudgetGenerateRequest) -> BudgetGenerateReq
 @router.post("/generate", response_model=BudgetGenerateResponse)
 async def generate_budget(
     request: BudgetGenerateRequest
-) -> BudgetGenerateResponse:
+) -> FastJSONResponse:
     """
     Generate a personalized budget plan.
     
@@ -184,6 +211,15 @@ async def generate_budget(
         }
         ```
     """
+    matrix = rate_matrix()
+    if request.display_currencies:
+        unsupported = [code for code in [request.currency, *request.display_currencies] if not matrix.supports(code)]
+        if unsupported:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported currencies: {', '.join(unsupported)}. Supported: {', '.join(matrix.codes)}"
+            )
+
     try:
         logger.info(f"Generating budget for income: ₹{request.monthly_income}")
         
@@ -192,10 +228,11 @@ async def generate_budget(
         
         logger.info("Budget generated successfully")
         
-        return BudgetGenerateResponse(
+        return FastJSONResponse(BudgetGenerateResponse(
             success=True,
-            plan=budget_plan
-        )
+            plan=budget_plan,
+            conversions=convert_plan(budget_plan, request.currency, request.display_currencies, matrix)
+        ))
     
     except Exception as e:
         logger.error(f"Error generating budget: {str(e)}", exc_info=True)
@@ -205,6 +242,97 @@ async def generate_budget(
         )
 
 
+@router.post("/generate/batch", response_model=BudgetBatchResponse)
+async def generate_budget_batch(
+    request: BudgetBatchRequest
+) -> FastJSONResponse:
+    """
+    Generate budget allocations for up to 1000 profiles in one call.
+    
+    Runs the same allocation pipeline as /generate over arrays of profiles, for
+    cohort analytics and bulk partner requests. Each plan has the split, amounts,
+    categories and alert codes; explanations and currency conversions are left out.
+    
+    Args:
+        request: BudgetBatchRequest with a list of generate requests
+    
+    Returns:
+        BudgetBatchResponse with one plan per profile, in request order
+    
+    Raises:
+        HTTPException: 500 for internal errors
+    """
+    try:
+        logger.info(f"Generating {len(request.profiles)} budgets in batch")
+        plans = BudgetPlannerService.generate_budget_batch(request.profiles)
+        return FastJSONResponse({"success": True, "count": len(plans), "plans": plans})
+    
+    except Exception as e:
+        logger.error(f"Error generating budget batch: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while generating budgets"
+        )
+
+
+@router.post("/goals/simulate", response_model=GoalSimulationResponse)
+async def simulate_goals(
+    request: GoalSimulationRequest
+) -> FastJSONResponse:
+    """
+    Estimate the probability of reaching each savings goal.
+    
+    Generates the budget, then runs a seeded Monte Carlo simulation of returns,
+    inflation and income growth over the plan's SIP, FD/RD and goal allocations.
+    Identical requests are served from cache.
+    
+    Args:
+        request: GoalSimulationRequest with budget inputs (at least one goal) and settings
+    
+    Returns:
+        GoalSimulationResponse with per-goal probabilities and balance percentiles
+    
+    Raises:
+        HTTPException: 500 for internal errors
+    """
+    try:
+        logger.info(f"Simulating {len(request.inputs.goals)} goals over {request.paths} paths")
+        result = await run_in_threadpool(BudgetPlannerService.simulate_goals, request)
+        return FastJSONResponse({"success": True, **result})
+    
+    except Exception as e:
+        logger.error(f"Error simulating goals: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while simulating goals"
+        )
+
+
+def convert_plan(
+    plan: BudgetPlan, currency: str, display_currencies: List[str], matrix: RateMatrix,
+) -> Optional[CurrencyConversions]:
+    """
+    The plan's amounts in each display currency (None when none were requested).
+
+    Args:
+        plan: Generated plan, in `currency`
+        currency: The request's currency
+        display_currencies: Extra currencies to quote the plan in
+        matrix: Rates the currencies were validated against
+    """
+    if not display_currencies:
+        return None
+    targets = list(dict.fromkeys(code.upper() for code in display_currencies))
+    return CurrencyConversions(
+        base_currency=currency.upper(),
+        rates_as_of=matrix.as_of,
+        rates=dict(zip(targets, matrix.rates_from(currency, targets))),
+        amounts=PLAN_MONEY_FIELDS.quote(
+            plan.model_dump(include={"income", "budget_amounts", "categories"}), currency, targets, matrix=matrix,
+        ),
+    )
+
+
 @router.post("/rebalance", response_model=BudgetRebalanceResponse)
 async def rebalance_budget(
     request: BudgetRebalanceRequest
@@ -270,6 +398,86 @@ async def rebalance_budget(
         )
 
 
+@router.post("/rebalance/delta", response_model=BudgetRebalanceDeltaResponse)
+async def rebalance_budget_delta(
+    request: BudgetRebalanceDeltaRequest
+) -> BudgetRebalanceDeltaResponse:
+    """
+    Incremental rebalance for live slider edits.
+    
+    The first event sends the full context (edited_plan + original_inputs) and gets
+    back a session_id with every plan field. Later events send only the session_id and
+    the changed inputs; the server recomputes just the amounts, alert rules and
+    explanation lines that depend on them and returns the fields whose values changed.
+    
+    Args:
+        request: BudgetRebalanceDeltaRequest with:
+        - session_id: Session from a previous response (omit to start one)
+        - changes: Edited inputs (income, needs_percent, wants_percent, savings_percent)
+        - edited_plan / original_inputs: Full context, needed when starting a session
+    
+    Returns:
+        BudgetRebalanceDeltaResponse with the session, its revision and the changed fields
+    
+    Raises:
+        HTTPException: 400 for invalid changes, 404 for an unknown session sent without
+        full context (the client should resend it), 500 for internal errors
+    
+    Example:
+        ```json
+        {"session_id": "5f0c...", "changes": {"needs_percent": 55, "wants_percent": 25}}
+        ```
+    """
+    try:
+        session, started = BudgetPlannerService.open_rebalance_session(request)
+        if session is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Unknown or expired rebalance session; resend edited_plan and original_inputs",
+            )
+        if started:
+            _, recomputed = apply_changes(session, request.changes)
+            return BudgetRebalanceDeltaResponse(
+                session_id=session.id,
+                revision=session.revision,
+                full=True,
+                changed=session.outputs(),
+                recomputed=recomputed,
+            )
+        
+        changed, recomputed = apply_changes(session, request.changes)
+        return BudgetRebalanceDeltaResponse(
+            session_id=session.id,
+            revision=session.revision,
+            changed=changed,
+            recomputed=recomputed,
+        )
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in incremental rebalance: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while rebalancing budget"
+        )
+
+
+@router.websocket("/ws")
+async def rebalance_budget_channel(websocket: WebSocket) -> None:
+    """
+    Interactive budget editing over one WebSocket connection.
+    
+    The first frame starts a session (edited_plan + original_inputs) or resumes one
+    (session_id); every later frame carries only the changed inputs. Bursts of edits
+    are coalesced and each update frame holds only the plan fields that changed.
+    See services.rebalance_channel.RebalanceChannel for the message format.
+    """
+    await RebalanceChannel(websocket).serve()
+
+
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
     """
@@ -285,82 +493,304 @@ async def health_check() -> Dict[str, Any]:
     }
 
 
+# ============================================
+# STATIC REFERENCE DATA
+# ============================================
+
+BUDGET_MODES: Dict[str, Any] = {
+    "modes": [
+        {
+            "code": "basic",
+            "name": "Basic Balance",
+            "description": "Traditional 45/30/25 split - Steady and conservative",
+            "ideal_for": "Beginners, stable income",
+        },
+        {
+            "code": "aggressive_savings",
+            "name": "Aggressive Savings",
+            "description": "Higher savings (30-40%) - For debt repayment and goals",
+            "ideal_for": "Debt holders, long-term goals",
+        },
+        {
+            "code": "smart_balanced",
+            "name": "Smart Balanced",
+            "description": "AI-optimized based on your profile - Recommended",
+            "ideal_for": "All income levels",
+        },
+    ]
+}
+
+LIFESTYLE_OPTIONS: Dict[str, Any] = {
+    "lifestyles": [
+        {
+            "code": "minimal",
+            "name": "Minimal",
+            "description": "Budget-conscious, minimal discretionary spending",
+            "effect": "Reduces wants spending by ~7.5%",
+        },
+        {
+            "code": "moderate",
+            "name": "Moderate",
+            "description": "Balanced lifestyle, standard discretionary spending",
+            "effect": "No adjustment to wants",
+        },
+        {
+            "code": "comfort",
+            "name": "Comfort",
+            "description": "Comfortable lifestyle, regular outings and shopping",
+            "effect": "Increases wants spending by ~5%",
+        },
+        {
+            "code": "premium",
+            "name": "Premium",
+            "description": "Premium lifestyle, frequent entertainment and dining",
+            "effect": "Increases wants spending by ~12.5%",
+        },
+    ]
+}
+
+COUNTRIES: List[Dict[str, Any]] = [
+    {
+        "code": "IN",
+        "name": "India",
+        "region": "Asia",
+        "description": "India - Domestic",
+        "currency": "INR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "US",
+        "name": "United States",
+        "region": "North America",
+        "description": "USA - United States of America",
+        "currency": "USD",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "GB",
+        "name": "United Kingdom",
+        "region": "Europe",
+        "description": "UK - United Kingdom",
+        "currency": "GBP",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "CA",
+        "name": "Canada",
+        "region": "North America",
+        "description": "Canada",
+        "currency": "CAD",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "AU",
+        "name": "Australia",
+        "region": "Oceania",
+        "description": "Australia",
+        "currency": "AUD",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "SG",
+        "name": "Singapore",
+        "region": "Asia",
+        "description": "Singapore",
+        "currency": "SGD",
+        "hasMultipleTiers": False,
+    },
+    {
+        "code": "AE",
+        "name": "UAE",
+        "region": "Middle East",
+        "description": "United Arab Emirates",
+        "currency": "AED",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "DE",
+        "name": "Germany",
+        "region": "Europe",
+        "description": "Germany",
+        "currency": "EUR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "FR",
+        "name": "France",
+        "region": "Europe",
+        "description": "France",
+        "currency": "EUR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "PL",
+        "name": "Poland",
+        "region": "Europe",
+        "description": "Poland",
+        "currency": "PLN",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "RU",
+        "name": "Russia",
+        "region": "Europe/Asia",
+        "description": "Russia",
+        "currency": "RUB",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "JP",
+        "name": "Japan",
+        "region": "Asia",
+        "description": "Japan",
+        "currency": "JPY",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "CN",
+        "name": "China",
+        "region": "Asia",
+        "description": "China",
+        "currency": "CNY",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "KR",
+        "name": "South Korea",
+        "region": "Asia",
+        "description": "South Korea",
+        "currency": "KRW",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "TH",
+        "name": "Thailand",
+        "region": "Asia",
+        "description": "Thailand",
+        "currency": "THB",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "LK",
+        "name": "Sri Lanka",
+        "region": "Asia",
+        "description": "Sri Lanka",
+        "currency": "LKR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "MX",
+        "name": "Mexico",
+        "region": "North America",
+        "description": "Mexico",
+        "currency": "MXN",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "BR",
+        "name": "Brazil",
+        "region": "South America",
+        "description": "Brazil",
+        "currency": "BRL",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "ID",
+        "name": "Indonesia",
+        "region": "Asia",
+        "description": "Indonesia",
+        "currency": "IDR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "PH",
+        "name": "Philippines",
+        "region": "Asia",
+        "description": "Philippines",
+        "currency": "PHP",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "VN",
+        "name": "Vietnam",
+        "region": "Asia",
+        "description": "Vietnam",
+        "currency": "VND",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "MY",
+        "name": "Malaysia",
+        "region": "Asia",
+        "description": "Malaysia",
+        "currency": "MYR",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "NZ",
+        "name": "New Zealand",
+        "region": "Oceania",
+        "description": "New Zealand",
+        "currency": "NZD",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "SE",
+        "name": "Sweden",
+        "region": "Europe",
+        "description": "Sweden",
+        "currency": "SEK",
+        "hasMultipleTiers": True,
+    },
+    {
+        "code": "NL",
+        "name": "Netherlands",
+        "region": "Europe",
+        "description": "Netherlands",
+        "currency": "EUR",
+        "hasMultipleTiers": True,
+    },
+]
+
+
 # ============================================
 # HELPER ENDPOINTS (Optional)
 # ============================================
 
+# Static reference data, serialized and compressed once at import
+BUDGET_MODES_PAYLOAD = PrecompressedJSON(BUDGET_MODES)
+LIFESTYLE_OPTIONS_PAYLOAD = PrecompressedJSON(LIFESTYLE_OPTIONS)
+COUNTRIES_PAYLOAD = PrecompressedJSON({
+    "total_countries": len(COUNTRIES),
+    "countries": sorted(COUNTRIES, key=lambda x: x["name"]),
+    "message": "Global coverage with support for 25+ countries. More countries can be added based on traffic patterns.",
+})
+
+
 @router.get("/budget-modes")
-async def get_budget_modes() -> Dict[str, Any]:
+async def get_budget_modes(request: Request) -> Response:
     """
     Get available budget modes.
     
     Returns:
         Dict with budget mode descriptions
     """
-    return {
-        "modes": [
-            {
-                "code": "basic",
-                "name": "Basic Balance",
-                "description": "Traditional 45/30/25 split - Steady and conservative",
-                "ideal_for": "Beginners, stable income",
-            },
-            {
-                "code": "aggressive_savings",
-                "name": "Aggressive Savings",
-                "description": "Higher savings (30-40%) - For debt repayment and goals",
-                "ideal_for": "Debt holders, long-term goals",
-            },
-            {
-                "code": "smart_balanced",
-                "name": "Smart Balanced",
-                "description": "AI-optimized based on your profile - Recommended",
-                "ideal_for": "All income levels",
-            },
-        ]
-    }
+    return BUDGET_MODES_PAYLOAD.response(request)
 
 
 @router.get("/lifestyle-options")
-async def get_lifestyle_options() -> Dict[str, Any]:
+async def get_lifestyle_options(request: Request) -> Response:
     """
     Get available lifestyle options.
     
     Returns:
         Dict with lifestyle descriptions
     """
-    return {
-        "lifestyles": [
-            {
-                "code": "minimal",
-                "name": "Minimal",
-                "description": "Budget-conscious, minimal discretionary spending",
-                "effect": "Reduces wants spending by ~7.5%",
-            },
-            {
-                "code": "moderate",
-                "name": "Moderate",
-                "description": "Balanced lifestyle, standard discretionary spending",
-                "effect": "No adjustment to wants",
-            },
-            {
-                "code": "comfort",
-                "name": "Comfort",
-                "description": "Comfortable lifestyle, regular outings and shopping",
-                "effect": "Increases wants spending by ~5%",
-            },
-            {
-                "code": "premium",
-                "name": "Premium",
-                "description": "Premium lifestyle, frequent entertainment and dining",
-                "effect": "Increases wants spending by ~12.5%",
-            },
-        ]
-    }
+    return LIFESTYLE_OPTIONS_PAYLOAD.response(request)
 
 
 @router.get("/countries")
-async def get_countries() -> Dict[str, Any]:
+async def get_countries(request: Request) -> Response:
     """
     Get available countries for budget planning.
     
@@ -371,211 +801,4 @@ async def get_countries() -> Dict[str, Any]:
     Returns:
         Dict with list of countries and their details
     """
-    countries: List[Dict[str, Any]] = [
-        {
-            "code": "IN",
-            "name": "India",
-            "region": "Asia",
-            "description": "India - Domestic",
-            "currency": "INR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "US",
-            "name": "United States",
-            "region": "North America",
-            "description": "USA - United States of America",
-            "currency": "USD",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "GB",
-            "name": "United Kingdom",
-            "region": "Europe",
-            "description": "UK - United Kingdom",
-            "currency": "GBP",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "CA",
-            "name": "Canada",
-            "region": "North America",
-            "description": "Canada",
-            "currency": "CAD",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "AU",
-            "name": "Australia",
-            "region": "Oceania",
-            "description": "Australia",
-            "currency": "AUD",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "SG",
-            "name": "Singapore",
-            "region": "Asia",
-            "description": "Singapore",
-            "currency": "SGD",
-            "hasMultipleTiers": False,
-        },
-        {
-            "code": "AE",
-            "name": "UAE",
-            "region": "Middle East",
-            "description": "United Arab Emirates",
-            "currency": "AED",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "DE",
-            "name": "Germany",
-            "region": "Europe",
-            "description": "Germany",
-            "currency": "EUR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "FR",
-            "name": "France",
-            "region": "Europe",
-            "description": "France",
-            "currency": "EUR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "PL",
-            "name": "Poland",
-            "region": "Europe",
-            "description": "Poland",
-            "currency": "PLN",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "RU",
-            "name": "Russia",
-            "region": "Europe/Asia",
-            "description": "Russia",
-            "currency": "RUB",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "JP",
-            "name": "Japan",
-            "region": "Asia",
-            "description": "Japan",
-            "currency": "JPY",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "CN",
-            "name": "China",
-            "region": "Asia",
-            "description": "China",
-            "currency": "CNY",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "KR",
-            "name": "South Korea",
-            "region": "Asia",
-            "description": "South Korea",
-            "currency": "KRW",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "TH",
-            "name": "Thailand",
-            "region": "Asia",
-            "description": "Thailand",
-            "currency": "THB",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "LK",
-            "name": "Sri Lanka",
-            "region": "Asia",
-            "description": "Sri Lanka",
-            "currency": "LKR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "MX",
-            "name": "Mexico",
-            "region": "North America",
-            "description": "Mexico",
-            "currency": "MXN",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "BR",
-            "name": "Brazil",
-            "region": "South America",
-            "description": "Brazil",
-            "currency": "BRL",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "ID",
-            "name": "Indonesia",
-            "region": "Asia",
-            "description": "Indonesia",
-            "currency": "IDR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "PH",
-            "name": "Philippines",
-            "region": "Asia",
-            "description": "Philippines",
-            "currency": "PHP",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "VN",
-            "name": "Vietnam",
-            "region": "Asia",
-            "description": "Vietnam",
-            "currency": "VND",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "MY",
-            "name": "Malaysia",
-            "region": "Asia",
-            "description": "Malaysia",
-            "currency": "MYR",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "NZ",
-            "name": "New Zealand",
-            "region": "Oceania",
-            "description": "New Zealand",
-            "currency": "NZD",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "SE",
-            "name": "Sweden",
-            "region": "Europe",
-            "description": "Sweden",
-            "currency": "SEK",
-            "hasMultipleTiers": True,
-        },
-        {
-            "code": "NL",
-            "name": "Netherlands",
-            "region": "Europe",
-            "description": "Netherlands",
-            "currency": "EUR",
-            "hasMultipleTiers": True,
-        },
-    ]
-    
-    return {
-        "total_countries": len(countries),
-        "countries": sorted(countries, key=lambda x: x["name"]),
-        "message": "Global coverage with support for 25+ countries. More countries can be added based on traffic patterns.",
-    }
+    return COUNTRIES_PAYLOAD.response(request)
@@ -0,0 +1,274 @@
+"""
+Background Job API Routes
+Submit long-running AI generations and PDF exports, then poll or stream for the result
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from routes.travel_planner import ItineraryRequest, build_itinerary
+from schemas import AIPlanRequest, PDFExportRequest
+from services.ai_planner_v2 import generate_ai_plan_v2
+from services.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER, run_idempotent
+from services.job_store import JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, Job, get_job_store
+from services.pdf_export import generate_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["Background Jobs"])
+
+STREAM_POLL_INTERVAL = float(os.getenv("JOB_STREAM_POLL_INTERVAL", "0.5"))  # seconds
+STREAM_TIMEOUT = float(os.getenv("JOB_STREAM_TIMEOUT", "120"))  # seconds
+STREAM_KEEPALIVE = 15.0  # seconds between SSE keep-alive comments
+
+# Result produced by a job: (body, content type, optional download filename)
+JobResult = Tuple[bytes, str, Optional[str]]
+
+# Strong references to running tasks so they are not garbage collected mid-flight
+_running_tasks: Set["asyncio.Task[None]"] = set()
+
+
+# ===========================================
+# JOB EXECUTION
+# ===========================================
+
+async def _run_job(job_id: str, work: Callable[[], Awaitable[JobResult]]) -> None:
+    """Run a job's work function and record its outcome in the job store."""
+    store = get_job_store()
+    store.update(job_id, status=JOB_RUNNING)
+    started = time.time()
+    try:
+        body, content_type, filename = await work()
+        store.update(
+            job_id,
+            status=JOB_SUCCEEDED,
+            result=body,
+            content_type=content_type,
+            filename=filename,
+        )
+        logger.info(f"Job {job_id[:8]}... succeeded in {time.time() - started:.2f}s")
+    except HTTPException as e:
+        detail = e.detail if isinstance(e.detail, str) else json.dumps(e.detail, default=str)
+        store.update(job_id, status=JOB_FAILED, error=detail)
+        logger.warning(f"Job {job_id[:8]}... failed: {detail}")
+    except Exception as e:
+        store.update(job_id, status=JOB_FAILED, error=str(e))
+        logger.error(f"Job {job_id[:8]}... failed: {e}", exc_info=True)
+
+
+def submit_job(kind: str, work: Callable[[], Awaitable[JobResult]]) -> Job:
+    """
+    Create a job and schedule its work on the running event loop.
+
+    Args:
+        kind: Job type label (e.g. "ai_plan_v2", "itinerary", "pdf_export")
+        work: Coroutine function producing the job result
+
+    Returns:
+        The newly created (queued) job
+    """
+    store = get_job_store()
+    store.fail_stale()
+    store.purge_expired()
+    job = store.create(kind)
+    task = asyncio.create_task(_run_job(job.id, work))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+    logger.info(f"Job {job.id[:8]}... submitted ({kind})")
+    return job
+
+
+async def _submit(
+    kind: str,
+    idempotency_key: Optional[str],
+    payload: BaseModel,
+    work: Callable[[], Awaitable[JobResult]],
+) -> JSONResponse:
+    """Submit a job, returning the existing job when the Idempotency-Key was seen before."""
+    async def create() -> Job:
+        return submit_job(kind, work)
+
+    job, replayed = await run_idempotent(f"job_{kind}", idempotency_key, payload, create)
+    return _accepted(get_job_store().get(job.id) or job, replayed)
+
+
+def _accepted(job: Job, replayed: bool = False) -> JSONResponse:
+    """202 Accepted response pointing the client at the status and stream URLs."""
+    status_url = f"{router.prefix}/{job.id}"
+    headers = {"Location": status_url}
+    if replayed:
+        headers[REPLAYED_HEADER] = "true"
+    return JSONResponse(
+        status_code=202,
+        content={
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "status_url": status_url,
+            "stream_url": f"{status_url}/stream",
+            "result_url": f"{status_url}/result",
+        },
+        headers=headers,
+    )
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": True, "message": "Job not found or expired"}
+        )
+    return job
+
+
+# ===========================================
+# SUBMISSION ENDPOINTS
+# ===========================================
+
+@router.post("/generate-ai-plan", status_code=202)
+async def submit_ai_plan_job(
+    ai_request: AIPlanRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> JSONResponse:
+    """
+    Queue a V2 AI budget plan generation.
+
+    Returns:
+        202 with the job id and polling/stream URLs
+    """
+    async def work() -> JobResult:
+        plan = await run_in_threadpool(generate_ai_plan_v2, ai_request.input, ai_request.summary)
+        return plan.model_dump_json().encode(), "application/json", None
+
+    return await _submit("ai_plan_v2", idempotency_key, ai_request, work)
+
+
+@router.post("/generate-itinerary", status_code=202)
+async def submit_itinerary_job(
+    request: ItineraryRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> JSONResponse:
+    """
+    Queue a travel itinerary generation.
+
+    Returns:
+        202 with the job id and polling/stream URLs
+    """
+    async def work() -> JobResult:
+        itinerary = await build_itinerary(request)
+        return itinerary.model_dump_json().encode(), "application/json", None
+
+    return await _submit("itinerary", idempotency_key, request, work)
+
+
+@router.post("/export-pdf", status_code=202)
+async def submit_pdf_export_job(
+    pdf_request: PDFExportRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> JSONResponse:
+    """
+    Queue a financial plan PDF export.
+
+    Returns:
+        202 with the job id and polling/stream URLs; download from result_url
+    """
+    async def work() -> JobResult:
+        pdf_bytes = await run_in_threadpool(
+            generate_pdf_bytes,
+            pdf_request.input,
+            pdf_request.summary,
+            pdf_request.ai_plan,
+        )
+        filename = f"VegaKash_Financial_Plan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return pdf_bytes, "application/pdf", filename
+
+    return await _submit("pdf_export", idempotency_key, pdf_request, work)
+
+
+# ===========================================
+# STATUS / RESULT ENDPOINTS
+# ===========================================
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Poll a job's status. JSON results are inlined once the job has succeeded.
+    """
+    return _get_job_or_404(job_id).to_status()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str) -> Response:
+    """
+    Fetch a finished job's raw result (e.g. the PDF file).
+
+    Returns:
+        The result body, 202 with the status if still running, or 500 if the job failed
+    """
+    job = _get_job_or_404(job_id)
+    if not job.finished:
+        return JSONResponse(status_code=202, content=job.to_status())
+    if job.status == JOB_FAILED or job.result is None:
+        raise HTTPException(
+            status_code=500,
+            detail={"error": True, "message": "Job failed", "detail": job.error}
+        )
+
+    headers = {}
+    if job.filename:
+        headers["Content-Disposition"] = f'attachment; filename="{job.filename}"'
+    return Response(content=job.result, media_type=job.content_type, headers=headers)
+
+
+def _sse_event(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@router.get("/{job_id}/stream")
+async def stream_job_status(job_id: str) -> StreamingResponse:
+    """
+    Stream job status changes as Server-Sent Events.
+
+    Emits a `status` event on every state change and a final `done` event
+    carrying the full status payload, then closes the stream.
+    """
+    _get_job_or_404(job_id)
+
+    async def events() -> AsyncIterator[str]:
+        store = get_job_store()
+        deadline = time.monotonic() + STREAM_TIMEOUT
+        last_status = None
+        last_sent = time.monotonic()
+        while time.monotonic() < deadline:
+            job = store.get(job_id)
+            if job is None:
+                yield _sse_event("error", {"job_id": job_id, "message": "Job not found or expired"})
+                return
+            if job.finished:
+                yield _sse_event("done", job.to_status())
+                return
+            if job.status != last_status:
+                last_status = job.status
+                last_sent = time.monotonic()
+                yield _sse_event("status", {"job_id": job_id, "status": job.status})
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+        yield _sse_event("timeout", {"job_id": job_id, "status": last_status})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
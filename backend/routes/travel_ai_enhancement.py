@@ -8,44 +8,160 @@ import json
 import asyncio
 import time
 import hashlib
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
-from openai import AsyncOpenAI
+from typing import Dict, Any, List, Optional
+from datetime import date, datetime, timedelta
 import logging
-from dotenv import load_dotenv
-from pathlib import Path
+
+from services.cache_prewarmer import record_token_usage, register_prewarm_target
+from services.cache_snapshot import SnapshotEntry, register_snapshot_source
+from services.heavy_hitters import record_hit
+from services.metrics import RATE_LIMIT_REJECTIONS, record_ai_usage, record_cache_lookup, track_ai_call
+from services.openai_clients import get_async_openai_client
 
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
+# In-memory cache of AI unit prices (per person / per night), 24 hour TTL
+# Keyed by (route, travel month or season, style) so trips that differ only in
+# exact dates or party size share an entry; totals are computed by the caller.
+AI_CACHE: Dict[str, Dict[str, Any]] = {}
+AI_CACHE_TTL_HOURS = int(os.getenv("TRAVEL_AI_CACHE_TTL_HOURS", "24"))
+PRICE_CACHE_BUCKET = os.getenv("TRAVEL_PRICE_CACHE_BUCKET", "month")  # month | season
 
-# Initialize OpenAI client with lazy loading to ensure .env is loaded
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Heavy-hitter tracker / pre-warm target for popular routes
+ROUTE_TRACKER = "travel_route"
+PREWARM_TARGET = "travel_unit_prices"
+PREWARM_AI_TIMEOUT = 15  # seconds; no user is waiting on pre-warm calls
 
-# In-memory cache for AI responses (24 hour TTL)
-AI_CACHE: Dict[str, Dict[str, Any]] = {}
+# Meteorological seasons (northern hemisphere); December belongs to the next winter
+SEASON_BY_MONTH = {
+    12: "winter", 1: "winter", 2: "winter",
+    3: "spring", 4: "spring", 5: "spring",
+    6: "summer", 7: "summer", 8: "summer",
+    9: "autumn", 10: "autumn", 11: "autumn",
+}
 
 # Rate limiting (per session)
 SESSION_AI_CALLS: Dict[str, int] = {}
 MAX_AI_CALLS_PER_SESSION = 3
 
 
-def generate_cache_key(origin: str, destination: str, dates: str, travelers: int, style: str) -> str:
-    """Generate cache key for AI responses"""
-    cache_string = f"{origin}_{destination}_{dates}_{travelers}_{style}"
+def travel_period_bucket(start_date: str, bucket: str = PRICE_CACHE_BUCKET) -> str:
+    """
+    Bucket a trip start date into its travel month ("2025-12") or season ("2026-winter").
+    
+    Args:
+        start_date: ISO start date of the trip
+        bucket: "month" or "season"
+        
+    Returns:
+        Bucket label used in cache keys and in the AI prompt
+    """
+    travel_date = date.fromisoformat(str(start_date)[:10])
+    if bucket == "season":
+        season = SEASON_BY_MONTH[travel_date.month]
+        year = travel_date.year + 1 if travel_date.month == 12 else travel_date.year
+        return f"{year}-{season}"
+    return f"{travel_date.year}-{travel_date.month:02d}"
+
+
+def describe_travel_period(period: str) -> str:
+    """Human-readable period for the prompt ("December 2025", "winter 2026")."""
+    year, part = period.split("-", 1)
+    if part.isdigit():
+        return f"{date(int(year), int(part), 1):%B} {year}"
+    return f"{part} {year}"
+
+
+def generate_cache_key(origin: str, destination: str, period: str, style: str) -> str:
+    """Generate unit-price cache key from (route, month/season bucket, style)"""
+    cache_string = "_".join(part.strip().lower() for part in (origin, destination, period, style))
     return hashlib.md5(cache_string.encode()).hexdigest()
 
 
 def is_cache_valid(cache_entry: Dict[str, Any]) -> bool:
-    """Check if cached response is still valid (24 hours)"""
+    """Check if cached response is still valid (AI_CACHE_TTL_HOURS)"""
     if "timestamp" not in cache_entry:
         return False
     
     cached_time = datetime.fromisoformat(cache_entry["timestamp"])
     age = datetime.now() - cached_time
-    return age < timedelta(hours=24)
+    return age < timedelta(hours=AI_CACHE_TTL_HOURS)
+
+
+def unit_price_cache_key(
+    origin_city: str,
+    origin_country: str,
+    destination_city: str,
+    destination_country: str,
+    start_date: str,
+    travel_style: str
+) -> str:
+    """Cache key for a trip's AI unit prices"""
+    return generate_cache_key(
+        f"{origin_city.strip()},{origin_country.strip()}",
+        f"{destination_city.strip()},{destination_country.strip()}",
+        travel_period_bucket(start_date),
+        travel_style
+    )
+
+
+def get_cached_unit_prices(
+    origin_city: str,
+    origin_country: str,
+    destination_city: str,
+    destination_country: str,
+    start_date: str,
+    travel_style: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up cached AI unit prices for a trip without calling the AI.
+    
+    Returns:
+        Cached unit prices (marked "cached": True) or None
+    """
+    cache_key = unit_price_cache_key(
+        origin_city, origin_country, destination_city, destination_country, start_date, travel_style
+    )
+    entry = AI_CACHE.get(cache_key)
+    if entry and is_cache_valid(entry):
+        logger.info("AI unit prices found in cache")
+        record_cache_lookup(PREWARM_TARGET, hit=True)
+        return {**entry["data"], "latency_ms": 0.0, "cached": True}
+    record_cache_lookup(PREWARM_TARGET, hit=False)
+    return None
+
+
+def track_route_request(
+    origin_city: str,
+    origin_country: str,
+    destination_city: str,
+    destination_country: str,
+    start_date: str,
+    travel_style: str,
+    fallback_flight_range: Dict[str, int],
+    fallback_hotel: float,
+    fallback_food: float,
+) -> None:
+    """Count a unit-price lookup for a route so the pre-warmer can keep hot routes cached."""
+    period = travel_period_bucket(start_date)
+    record_hit(
+        ROUTE_TRACKER,
+        unit_price_cache_key(
+            origin_city, origin_country, destination_city, destination_country, start_date, travel_style
+        ),
+        payload={
+            "origin_city": origin_city,
+            "origin_country": origin_country,
+            "destination_city": destination_city,
+            "destination_country": destination_country,
+            "start_date": start_date,
+            "travel_style": travel_style,
+            "fallback_flight_range": fallback_flight_range,
+            "fallback_hotel": fallback_hotel,
+            "fallback_food": fallback_food,
+        },
+        label=f"{origin_city}, {origin_country} → {destination_city}, {destination_country} ({period}, {travel_style})",
+    )
 
 
 def check_rate_limit(session_id: str) -> bool:
@@ -53,7 +169,10 @@ def check_rate_limit(session_id: str) -> bool:
     if session_id not in SESSION_AI_CALLS:
         SESSION_AI_CALLS[session_id] = 0
     
-    return SESSION_AI_CALLS[session_id] < MAX_AI_CALLS_PER_SESSION
+    allowed = SESSION_AI_CALLS[session_id] < MAX_AI_CALLS_PER_SESSION
+    if not allowed:
+        RATE_LIMIT_REJECTIONS.inc(limiter="travel_ai_session")
+    return allowed
 
 
 def increment_session_calls(session_id: str):
@@ -69,41 +188,43 @@ async def enhance_with_ai(
     destination_city: str,
     destination_country: str,
     start_date: str,
-    end_date: str,
-    travelers: int,
     travel_style: str,
     fallback_flight_range: Dict[str, int],
     fallback_hotel: float,
     fallback_food: float,
-    timeout_seconds: int = 2
+    timeout_seconds: float = 2,
+    force_refresh: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
-    Enhance cost estimates with AI
+    Enhance unit cost estimates with AI
+    
+    Only unit prices (per person flight, per night hotel, per person per day food)
+    are requested, so the answer is reusable for any trip on the same route, in the
+    same month/season and style. Callers compute totals from these unit prices.
+    force_refresh skips the cache lookup (used by the cache pre-warmer).
     
     Returns:
-        Dict with AI-enhanced values or None if timeout/error
+        Dict with AI-enhanced unit prices or None if timeout/error
     """
     
-    # Generate cache key
-    cache_key = generate_cache_key(
-        f"{origin_city},{origin_country}",
-        f"{destination_city},{destination_country}",
-        f"{start_date}_{end_date}",
-        travelers,
-        travel_style
-    )
-    
     # Check cache first
-    if cache_key in AI_CACHE and is_cache_valid(AI_CACHE[cache_key]):
-        logger.info("AI response found in cache")
-        return AI_CACHE[cache_key]["data"]
+    if not force_refresh:
+        cached = get_cached_unit_prices(
+            origin_city, origin_country, destination_city, destination_country, start_date, travel_style
+        )
+        if cached:
+            return cached
+    
+    cache_key = unit_price_cache_key(
+        origin_city, origin_country, destination_city, destination_country, start_date, travel_style
+    )
+    travel_period = describe_travel_period(travel_period_bucket(start_date))
     
-    prompt = f"""You are a travel cost expert. Refine these travel cost estimates based on current 2025 market data.
+    prompt = f"""You are a travel cost expert. Refine these travel unit cost estimates based on current market data.
 
 Trip Details:
 - Route: {origin_city}, {origin_country} → {destination_city}, {destination_country}
-- Dates: {start_date} to {end_date} (December 2025 - Peak Season)
-- Travelers: {travelers} people
+- Travel period: {travel_period}
 - Style: {travel_style}
 
 Current Fallback Estimates (USD):
@@ -111,9 +232,9 @@ Current Fallback Estimates (USD):
 - Hotel: ${fallback_hotel} per night
 - Food: ${fallback_food} per person per day
 
-Task: Refine these estimates based on:
-1. Current December 2025 market rates
-2. Peak season pricing (December is high season)
+Task: Refine these per-person / per-night unit prices based on:
+1. Market rates for {travel_period}
+2. Seasonal demand at the destination during {travel_period}
 3. Route popularity and demand
 4. Destination-specific factors
 
@@ -131,20 +252,24 @@ Respond ONLY with valid JSON (no markdown):
         start_time = time.time()
         
         # Call OpenAI with timeout
-        response = await asyncio.wait_for(
-            openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a travel cost expert. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=300
-            ),
-            timeout=timeout_seconds
-        )
+        with track_ai_call("travel_unit_prices"):
+            response = await asyncio.wait_for(
+                get_async_openai_client().chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a travel cost expert. Respond only with valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=300
+                ),
+                timeout=timeout_seconds
+            )
         
         latency = time.time() - start_time
+        record_ai_usage("travel_unit_prices", response.usage)
+        if response.usage:
+            record_token_usage(PREWARM_TARGET, response.usage.total_tokens)
         
         # Parse response
         raw_content = response.choices[0].message.content
@@ -197,4 +322,47 @@ def clear_old_cache():
         del AI_CACHE[key]
     
     if expired_keys:
-        logger.info(f"Cleared {len(expired_keys)} expired cache entries")
\ No newline at end of file
+        logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+
+
+def _snapshot_entries() -> List[SnapshotEntry]:
+    """Unit-price cache entries for persistent snapshots."""
+    return [
+        (key, entry["data"], datetime.fromisoformat(entry["timestamp"]).timestamp())
+        for key, entry in list(AI_CACHE.items())
+        if "timestamp" in entry
+    ]
+
+
+def _restore_entries(entries: List[SnapshotEntry]) -> int:
+    """Restore snapshot entries without overwriting fresher ones."""
+    added = 0
+    for key, data, created_at in entries:
+        if key not in AI_CACHE:
+            AI_CACHE[key] = {"data": data, "timestamp": datetime.fromtimestamp(created_at).isoformat()}
+            added += 1
+    return added
+
+
+register_snapshot_source("travel_unit_prices", _snapshot_entries, _restore_entries, AI_CACHE_TTL_HOURS * 3600)
+
+
+
+# ===========================================
+# CACHE PRE-WARMING
+# ===========================================
+
+def _unit_price_expiry(cache_key: str) -> Optional[float]:
+    entry = AI_CACHE.get(cache_key)
+    if not entry or "timestamp" not in entry:
+        return None
+    return datetime.fromisoformat(entry["timestamp"]).timestamp() + AI_CACHE_TTL_HOURS * 3600
+
+
+async def _refresh_unit_prices(payload: Dict[str, Any]) -> None:
+    result = await enhance_with_ai(**payload, timeout_seconds=PREWARM_AI_TIMEOUT, force_refresh=True)
+    if result is None:
+        raise RuntimeError("AI unit-price refresh returned no data")
+
+
+register_prewarm_target(PREWARM_TARGET, ROUTE_TRACKER, _unit_price_expiry, _refresh_unit_prices, default_tokens=550)
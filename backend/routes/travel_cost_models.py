@@ -30,117 +30,8 @@ FLIGHT_COSTS = {
     }
 }
 
-# Hotel costs per night (in USD) by travel style
-HOTEL_COSTS = {
-    "budget": {
-        "low_cost_countries": 15,      # India, Vietnam, Thailand, Philippines
-        "mid_cost_countries": 30,      # Mexico, Turkey, Portugal, Poland
-        "high_cost_countries": 50,     # USA, Western Europe, Japan
-        "premium_destinations": 80     # Dubai, Singapore, Switzerland, Nordic
-    },
-    "standard": {
-        "low_cost_countries": 40,
-        "mid_cost_countries": 70,
-        "high_cost_countries": 100,
-        "premium_destinations": 150
-    },
-    "luxury": {
-        "low_cost_countries": 100,
-        "mid_cost_countries": 180,
-        "high_cost_countries": 300,
-        "premium_destinations": 450
-    },
-    "ultra-luxury": {
-        "low_cost_countries": 250,
-        "mid_cost_countries": 400,
-        "high_cost_countries": 600,
-        "premium_destinations": 1000
-    }
-}
-
-# Food costs per person per day (in USD)
-FOOD_COSTS = {
-    "budget": {
-        "low_cost_countries": 10,
-        "mid_cost_countries": 20,
-        "high_cost_countries": 30,
-        "premium_destinations": 40
-    },
-    "standard": {
-        "low_cost_countries": 25,
-        "mid_cost_countries": 40,
-        "high_cost_countries": 60,
-        "premium_destinations": 80
-    },
-    "luxury": {
-        "low_cost_countries": 60,
-        "mid_cost_countries": 100,
-        "high_cost_countries": 150,
-        "premium_destinations": 200
-    },
-    "ultra-luxury": {
-        "low_cost_countries": 120,
-        "mid_cost_countries": 180,
-        "high_cost_countries": 250,
-        "premium_destinations": 350
-    }
-}
-
-# Local transport costs per person per day (in USD)
-TRANSPORT_COSTS = {
-    "public": {
-        "low_cost_countries": 5,
-        "mid_cost_countries": 10,
-        "high_cost_countries": 15,
-        "premium_destinations": 20
-    },
-    "taxi": {
-        "low_cost_countries": 15,
-        "mid_cost_countries": 25,
-        "high_cost_countries": 40,
-        "premium_destinations": 60
-    },
-    "rental": {
-        "low_cost_countries": 30,
-        "mid_cost_countries": 50,
-        "high_cost_countries": 80,
-        "premium_destinations": 120
-    },
-    "mix": {
-        "low_cost_countries": 12,
-        "mid_cost_countries": 20,
-        "high_cost_countries": 30,
-        "premium_destinations": 45
-    }
-}
-
-# Activities cost per person per day (in USD)
-ACTIVITIES_COSTS = {
-    "budget": {
-        "low_cost_countries": 10,
-        "mid_cost_countries": 20,
-        "high_cost_countries": 30,
-        "premium_destinations": 40
-    },
-    "standard": {
-        "low_cost_countries": 25,
-        "mid_cost_countries": 40,
-        "high_cost_countries": 60,
-        "premium_destinations": 80
-    },
-    "luxury": {
-        "low_cost_countries": 60,
-        "mid_cost_countries": 100,
-        "high_cost_countries": 150,
-        "premium_destinations": 200
-    },
-    "ultra-luxury": {
-        "low_cost_countries": 150,
-        "mid_cost_countries": 250,
-        "high_cost_countries": 400,
-        "premium_destinations": 600
-    }
-}
+# Hotel, food, local transport and activity unit costs (USD, by style and destination tier)
+# live in data/pricing.json and are read through services.pricing_store
 
 # Country/City classification
 COUNTRY_CLASSIFICATION = {
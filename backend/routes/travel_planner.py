@@ -15,16 +15,11 @@ import time
 import uuid
 import httpx
 from urllib.parse import quote_plus
-from openai import AsyncOpenAI
 
 # Import fallback models and AI enhancement
 from .travel_cost_models import (
     get_destination_tier,
     get_flight_cost_range,
-    HOTEL_COSTS,
-    FOOD_COSTS,
-    TRANSPORT_COSTS,
-    ACTIVITIES_COSTS,
     ACTIVITY_BUFFER_PERCENT,
     MISCELLANEOUS_PERCENT,
     VISA_COST_USD,
@@ -32,39 +27,37 @@ from .travel_cost_models import (
 )
 from .travel_ai_enhancement import (
     enhance_with_ai,
+    get_cached_unit_prices,
     check_rate_limit,
     increment_session_calls,
     clear_old_cache,
+    track_route_request,
     MAX_AI_CALLS_PER_SESSION,
     SESSION_AI_CALLS
 )
+from services.heavy_hitters import record_hit
+from services.metrics import record_ai_usage, track_ai_call
+from services.openai_clients import get_async_openai_client
+from services.tracing import span
+from services.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER, run_idempotent
+from services.json_response import FastJSONResponse
+from services.pricing_store import current_pricing
+from services.currency import MoneyFields, rate_matrix, usd_rate
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-# Currency conversion rates (USD as base) - Updated as of 2025
-CURRENCY_RATES = {
-    "USD": 1.0,
-    "INR": 83.50,      # Indian Rupee
-    "EUR": 0.92,       # Euro
-    "GBP": 0.79,       # British Pound
-    "AUD": 1.52,       # Australian Dollar
-    "CAD": 1.35,       # Canadian Dollar
-    "AED": 3.67,       # UAE Dirham
-    "THB": 33.50,      # Thai Baht
-    "SGD": 1.34,       # Singapore Dollar
-    "MYR": 4.45,       # Malaysian Ringgit
-    "JPY": 145.0,      # Japanese Yen
-    "CNY": 7.20,       # Chinese Yuan
-}
-
 def convert_currency(amount_usd: float, target_currency: str) -> float:
     """Convert USD amount to target currency"""
-    rate = CURRENCY_RATES.get(target_currency.upper(), 1.0)
-    return amount_usd * rate
+    return amount_usd * usd_rate(target_currency)
+
+# Money fields of the hybrid budget, converted from USD to the home currency in one pass
+HYBRID_MONEY_FIELDS = MoneyFields(
+    "total_flight_cost", "total_hotel_cost", "total_food_cost", "total_transport_cost",
+    "total_activities_cost", "shopping_cost", "visa_cost", "insurance_cost", "miscellaneous_cost",
+    "flight_estimate.min", "flight_estimate.max", "flight_estimate.average",
+    "hotel_per_night.value", "food_per_day.value", "transport_per_day.value", "activities_per_day.value",
+)
 
 # Create router
 router = APIRouter(
@@ -173,6 +166,7 @@ class HybridBudgetResponse(BaseModel):
     
     trip_days: int
     currency: str
+    rates_as_of: Optional[str] = None  # Timestamp of the exchange rates used
     ai_status: str  # "ai-enhanced", "fallback", "partial-ai"
     fallback_used: bool
     ai_latency_ms: Optional[float] = None
@@ -509,15 +503,17 @@ Return ONLY the JSON object, no other text."""
         
         # Call OpenAI API
         try:
-            response = await openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a travel budget expert providing realistic 2025 travel cost estimates. Always return valid JSON only."},
-                    {"role": "user", "content": ai_prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent pricing
-                max_tokens=800
-            )
+            with track_ai_call("travel_budget"):
+                response = await get_async_openai_client().chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a travel budget expert providing realistic 2025 travel cost estimates. Always return valid JSON only."},
+                        {"role": "user", "content": ai_prompt}
+                    ],
+                    temperature=0.3,  # Lower temperature for more consistent pricing
+                    max_tokens=800
+                )
+            record_ai_usage("travel_budget", response.usage)
             
             ai_content = response.choices[0].message.content
             if ai_content is None:
@@ -626,7 +622,7 @@ Return ONLY the JSON object, no other text."""
         )
         
         logger.info(f"Budget calculated successfully: {grand_total:.2f} {request.homeCurrency}")
-        return response
+        return FastJSONResponse(response)
         
     except Exception as e:
         logger.error(f"Error calculating travel budget: {str(e)}")
@@ -738,7 +734,22 @@ async def optimize_travel_budget(request: TravelOptimizationRequest):
 
 
 @router.post("/generate-itinerary", response_model=ItineraryResponse)
-async def generate_itinerary(request: ItineraryRequest):
+async def generate_itinerary(
+    request: ItineraryRequest,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> FastJSONResponse:
+    """
+    Generate detailed day-by-day itinerary (see build_itinerary)
+    Retries carrying the same Idempotency-Key reuse the first (or in-flight) result
+    """
+    itinerary, replayed = await run_idempotent(
+        "itinerary", idempotency_key, request, lambda: build_itinerary(request)
+    )
+    # The itinerary is built as an ItineraryResponse already; skip response_model re-validation
+    return FastJSONResponse(itinerary, headers={REPLAYED_HEADER: "true"} if replayed else None)
+
+
+async def build_itinerary(request: ItineraryRequest) -> ItineraryResponse:
     """
     Generate detailed day-by-day itinerary with specific landmarks, cuisines, and activities
     
@@ -757,6 +768,14 @@ async def generate_itinerary(request: ItineraryRequest):
         
         trip_days = calculate_trip_days(request.travelData.startDate, request.travelData.endDate)
         
+        # Itineraries are not cached; popular destinations are tracked for visibility only
+        destination = f"{request.travelData.destinationCity}, {request.travelData.destinationCountry}"
+        record_hit(
+            "itinerary_destination",
+            f"{destination}|{request.travelData.travelStyle}|{detail_level}".lower(),
+            label=f"{destination} ({request.travelData.travelStyle}, {detail_level})",
+        )
+        
         # Always try to generate AI-powered itinerary for better quality
         # Falls back to template only if AI fails
         ai_itinerary_data = {}
@@ -1042,22 +1061,24 @@ Return ONLY JSON, no markdown or extra text."""
         
         logger.info(f"🤖 Calling AI to generate {detail_level} itinerary for {destination_city}...")
         
-        response = await openai_client.chat.completions.create(
-            model="gpt-4o-mini",  # Fast and cost-effective
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert travel guide. Always return ONLY valid JSON, no other text or markdown."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.8,
-            max_tokens=2000,
-            timeout=59
-        )
+        with track_ai_call("itinerary"):
+            response = await get_async_openai_client().chat.completions.create(
+                model="gpt-4o-mini",  # Fast and cost-effective
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are an expert travel guide. Always return ONLY valid JSON, no other text or markdown."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.8,
+                max_tokens=2000,
+                timeout=59
+            )
+        record_ai_usage("itinerary", response.usage)
         
         response_text = response.choices[0].message.content
         if response_text is None:
@@ -1220,18 +1241,20 @@ Respond ONLY with valid JSON, no markdown formatting."""
     try:
         start_time = time.time()
         
-        response = await asyncio.wait_for(
-            openai_client.chat.completions.create(
-                model="gpt-4o-mini",  # Fast and cost-effective
-                messages=[
-                    {"role": "system", "content": "You are a travel cost estimation expert. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Low temperature for consistent estimates
-                max_tokens=500
-            ),
-            timeout=timeout
-        )
+        with track_ai_call("travel_cost_estimates"):
+            response = await asyncio.wait_for(
+                get_async_openai_client().chat.completions.create(
+                    model="gpt-4o-mini",  # Fast and cost-effective
+                    messages=[
+                        {"role": "system", "content": "You are a travel cost estimation expert. Always respond with valid JSON only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,  # Low temperature for consistent estimates
+                    max_tokens=500
+                ),
+                timeout=timeout
+            )
+        record_ai_usage("travel_cost_estimates", response.usage)
         
         end_time = time.time()
         latency = end_time - start_time
@@ -1353,7 +1376,7 @@ async def test_ai_latency(request: TravelBudgetRequest) -> Dict[str, Any]:
         
         # Convert to user's currency
         currency = request.homeCurrency
-        conversion_rate = CURRENCY_RATES.get(currency, 1.0)
+        conversion_rate = usd_rate(currency)
         
         return {
             "test_results": {
@@ -1477,91 +1500,95 @@ async def calculate_budget_hybrid(
         # Clean old cache periodically
         clear_old_cache()
         
-        # Calculate trip parameters
-        trip_days = calculate_trip_days(request.startDate, request.endDate)
-        total_travelers = request.adults + request.children + request.infants
+        with span("fallback"):
+            # Calculate trip parameters
+            trip_days = calculate_trip_days(request.startDate, request.endDate)
+            total_travelers = request.adults + request.children + request.infants
         
-        # Get destination tier
-        destination_full = f"{request.destinationCity}, {request.destinationCountry}"
-        origin_full = f"{request.originCity}, {request.originCountry}"
-        dest_tier = get_destination_tier(destination_full)
+            # Get destination tier
+            destination_full = f"{request.destinationCity}, {request.destinationCountry}"
+            origin_full = f"{request.originCity}, {request.originCountry}"
+            dest_tier = get_destination_tier(destination_full)
         
-        # ============================================
-        # STEP 1: INSTANT FALLBACK CALCULATION
-        # ============================================
+            # ============================================
+            # STEP 1: INSTANT FALLBACK CALCULATION
+            # ============================================
         
-        # Flight costs (fallback)
-        flight_range = get_flight_cost_range(origin_full, destination_full)
-        avg_flight_per_person = (flight_range["min"] + flight_range["max"]) / 2
-        total_flight_fallback = avg_flight_per_person * total_travelers if request.includeFlights else 0
+            # Flight costs (fallback)
+            flight_range = get_flight_cost_range(origin_full, destination_full)
+            avg_flight_per_person = (flight_range["min"] + flight_range["max"]) / 2
+            total_flight_fallback = avg_flight_per_person * total_travelers if request.includeFlights else 0
         
-        # Hotel costs (fallback)
-        hotel_per_night_fallback = HOTEL_COSTS[request.travelStyle][dest_tier]
-        total_hotel_fallback = hotel_per_night_fallback * trip_days
+            # One pricing version for the whole estimate, even if the data file is reloaded meanwhile
+            pricing = current_pricing()
+
+            # Hotel costs (fallback)
+            hotel_per_night_fallback = pricing.travel_cost("hotel_per_night", request.travelStyle, dest_tier)
+            total_hotel_fallback = hotel_per_night_fallback * trip_days
         
-        # Food costs (fallback)
-        food_per_day_fallback = FOOD_COSTS[request.travelStyle][dest_tier]
-        total_food_fallback = food_per_day_fallback * total_travelers * trip_days
+            # Food costs (fallback)
+            food_per_day_fallback = pricing.travel_cost("food_per_person_day", request.travelStyle, dest_tier)
+            total_food_fallback = food_per_day_fallback * total_travelers * trip_days
         
-        # Transport costs (fallback)
-        transport_per_day_fallback = TRANSPORT_COSTS[request.localTransport][dest_tier]
-        total_transport_fallback = transport_per_day_fallback * total_travelers * trip_days
+            # Transport costs (fallback)
+            transport_per_day_fallback = pricing.travel_cost("transport_per_person_day", request.localTransport, dest_tier)
+            total_transport_fallback = transport_per_day_fallback * total_travelers * trip_days
         
-        # Activities costs (fallback)
-        activities_per_day_fallback = ACTIVITIES_COSTS[request.travelStyle][dest_tier]
-        total_activities_fallback = activities_per_day_fallback * total_travelers * trip_days * (ACTIVITY_BUFFER_PERCENT / 100)
+            # Activities costs (fallback)
+            activities_per_day_fallback = pricing.travel_cost("activities_per_person_day", request.travelStyle, dest_tier)
+            total_activities_fallback = activities_per_day_fallback * total_travelers * trip_days * (ACTIVITY_BUFFER_PERCENT / 100)
         
-        # Shopping (fixed estimate)
-        shopping_cost = 50 * total_travelers
+            # Shopping (fixed estimate)
+            shopping_cost = 50 * total_travelers
         
-        # Visa
-        visa_cost = VISA_COST_USD * total_travelers if request.includeVisa else 0
+            # Visa
+            visa_cost = VISA_COST_USD * total_travelers if request.includeVisa else 0
         
-        # Insurance
-        insurance_cost = INSURANCE_COST_PER_DAY_USD * trip_days * total_travelers if request.includeInsurance else 0
+            # Insurance
+            insurance_cost = INSURANCE_COST_PER_DAY_USD * trip_days * total_travelers if request.includeInsurance else 0
         
-        # Miscellaneous
-        subtotal_before_misc = (
-            total_flight_fallback + total_hotel_fallback + total_food_fallback +
-            total_transport_fallback + total_activities_fallback + shopping_cost +
-            visa_cost + insurance_cost
-        )
-        miscellaneous_cost = subtotal_before_misc * (MISCELLANEOUS_PERCENT / 100)
-        
-        # Fallback response structure
-        fallback_response: Dict[str, Any] = {
-            "flight_estimate": {
-                "min": flight_range["min"],
-                "max": flight_range["max"],
-                "average": avg_flight_per_person,
-                "source": "fallback"
-            },
-            "hotel_per_night": {
-                "value": hotel_per_night_fallback,
-                "source": "fallback"
-            },
-            "food_per_day": {
-                "value": food_per_day_fallback,
-                "source": "fallback"
-            },
-            "transport_per_day": {
-                "value": transport_per_day_fallback,
-                "source": "fallback"
-            },
-            "activities_per_day": {
-                "value": activities_per_day_fallback,
-                "source": "fallback"
-            },
-            "total_flight_cost": total_flight_fallback,
-            "total_hotel_cost": total_hotel_fallback,
-            "total_food_cost": total_food_fallback,
-            "total_transport_cost": total_transport_fallback,
-            "total_activities_cost": total_activities_fallback,
-            "shopping_cost": shopping_cost,
-            "visa_cost": visa_cost,
-            "insurance_cost": insurance_cost,
-            "miscellaneous_cost": miscellaneous_cost
-        }
+            # Miscellaneous
+            subtotal_before_misc = (
+                total_flight_fallback + total_hotel_fallback + total_food_fallback +
+                total_transport_fallback + total_activities_fallback + shopping_cost +
+                visa_cost + insurance_cost
+            )
+            miscellaneous_cost = subtotal_before_misc * (MISCELLANEOUS_PERCENT / 100)
+        
+            # Fallback response structure
+            fallback_response: Dict[str, Any] = {
+                "flight_estimate": {
+                    "min": flight_range["min"],
+                    "max": flight_range["max"],
+                    "average": avg_flight_per_person,
+                    "source": "fallback"
+                },
+                "hotel_per_night": {
+                    "value": hotel_per_night_fallback,
+                    "source": "fallback"
+                },
+                "food_per_day": {
+                    "value": food_per_day_fallback,
+                    "source": "fallback"
+                },
+                "transport_per_day": {
+                    "value": transport_per_day_fallback,
+                    "source": "fallback"
+                },
+                "activities_per_day": {
+                    "value": activities_per_day_fallback,
+                    "source": "fallback"
+                },
+                "total_flight_cost": total_flight_fallback,
+                "total_hotel_cost": total_hotel_fallback,
+                "total_food_cost": total_food_fallback,
+                "total_transport_cost": total_transport_fallback,
+                "total_activities_cost": total_activities_fallback,
+                "shopping_cost": shopping_cost,
+                "visa_cost": visa_cost,
+                "insurance_cost": insurance_cost,
+                "miscellaneous_cost": miscellaneous_cost
+            }
         
         # ============================================
         # STEP 2: AI ENHANCEMENT (OPTIONAL, 2s TIMEOUT)
@@ -1571,31 +1598,54 @@ async def calculate_budget_hybrid(
         ai_latency = None
         ai_calls_remaining = MAX_AI_CALLS_PER_SESSION - SESSION_AI_CALLS.get(session_id, 0)
         
-        # Only attempt AI if rate limit not exceeded
-        if check_rate_limit(session_id):
-            try:
-                ai_result = await enhance_with_ai(
-                    origin_city=request.originCity,
-                    origin_country=request.originCountry,
-                    destination_city=request.destinationCity,
-                    destination_country=request.destinationCountry,
-                    start_date=str(request.startDate),
-                    end_date=str(request.endDate),
-                    travelers=total_travelers,
-                    travel_style=request.travelStyle,
-                    fallback_flight_range=flight_range,
-                    fallback_hotel=hotel_per_night_fallback,
-                    fallback_food=food_per_day_fallback,
-                    timeout_seconds=2  # 2 second timeout
+        # Cached unit prices (same route, month/season and style) are free;
+        # only attempt a fresh AI call if the session rate limit allows it
+        try:
+            track_route_request(
+                request.originCity,
+                request.originCountry,
+                request.destinationCity,
+                request.destinationCountry,
+                str(request.startDate),
+                request.travelStyle,
+                flight_range,
+                hotel_per_night_fallback,
+                food_per_day_fallback,
+            )
+            with span("cache"):
+                ai_result = get_cached_unit_prices(
+                    request.originCity,
+                    request.originCountry,
+                    request.destinationCity,
+                    request.destinationCountry,
+                    str(request.startDate),
+                    request.travelStyle
                 )
-                
+            if ai_result is None and check_rate_limit(session_id):
+                with span("ai"):
+                    ai_result = await enhance_with_ai(
+                        origin_city=request.originCity,
+                        origin_country=request.originCountry,
+                        destination_city=request.destinationCity,
+                        destination_country=request.destinationCountry,
+                        start_date=str(request.startDate),
+                        travel_style=request.travelStyle,
+                        fallback_flight_range=flight_range,
+                        fallback_hotel=hotel_per_night_fallback,
+                        fallback_food=food_per_day_fallback,
+                        timeout_seconds=2,  # 2 second timeout
+                        force_refresh=True  # Cache was checked above
+                    )
+                    if ai_result:
+                        increment_session_calls(session_id)
+                        ai_calls_remaining -= 1
+            
+            with span("merge"):
                 if ai_result:
                     # AI enhancement successful
                     ai_enhanced = True
                     ai_latency = ai_result.get("latency_ms")
-                    increment_session_calls(session_id)
-                    ai_calls_remaining -= 1
-                    
+                
                     # Update response with AI values
                     fallback_response["flight_estimate"] = {
                         "min": ai_result["flight_min"],
@@ -1613,13 +1663,13 @@ async def calculate_budget_hybrid(
                         "value": ai_result["food_per_day"],
                         "source": "ai"
                     }
-                    
+                
                     # Recalculate totals with AI values
                     avg_flight_ai = (ai_result["flight_min"] + ai_result["flight_max"]) / 2
                     fallback_response["total_flight_cost"] = avg_flight_ai * total_travelers if request.includeFlights else 0
                     fallback_response["total_hotel_cost"] = ai_result["hotel_per_night"] * trip_days
                     fallback_response["total_food_cost"] = ai_result["food_per_day"] * total_travelers * trip_days
-                    
+                
                     # Recalculate misc
                     subtotal_before_misc = (
                         fallback_response["total_flight_cost"] + fallback_response["total_hotel_cost"] +
@@ -1627,78 +1677,68 @@ async def calculate_budget_hybrid(
                         fallback_response["total_activities_cost"] + shopping_cost + visa_cost + insurance_cost
                     )
                     fallback_response["miscellaneous_cost"] = subtotal_before_misc * (MISCELLANEOUS_PERCENT / 100)
-                    
+                
                     logger.info(f"AI enhancement applied in {ai_latency}ms")
                 
-            except Exception as e:
-                logger.warning(f"AI enhancement failed: {e}, using fallback")
+        except Exception as e:
+            logger.warning(f"AI enhancement failed: {e}, using fallback")
         
         # ============================================
         # STEP 3: FINAL CALCULATIONS
         # ============================================
         
-        subtotal = (
-            fallback_response["total_flight_cost"] +
-            fallback_response["total_hotel_cost"] +
-            fallback_response["total_food_cost"] +
-            fallback_response["total_transport_cost"] +
-            fallback_response["total_activities_cost"] +
-            fallback_response["shopping_cost"] +
-            fallback_response["visa_cost"] +
-            fallback_response["insurance_cost"] +
-            fallback_response["miscellaneous_cost"]
-        )
+        with span("totals"):
+            subtotal = (
+                fallback_response["total_flight_cost"] +
+                fallback_response["total_hotel_cost"] +
+                fallback_response["total_food_cost"] +
+                fallback_response["total_transport_cost"] +
+                fallback_response["total_activities_cost"] +
+                fallback_response["shopping_cost"] +
+                fallback_response["visa_cost"] +
+                fallback_response["insurance_cost"] +
+                fallback_response["miscellaneous_cost"]
+            )
         
-        buffer_amount = subtotal * (request.bufferPercentage / 100)
-        grand_total = subtotal + buffer_amount
-        per_person = grand_total / total_travelers
-        per_day = grand_total / trip_days
-        
-        # Currency conversion
-        conversion_rate = CURRENCY_RATES.get(request.homeCurrency, 1.0)
-        
-        # Apply currency conversion to all amounts
-        for key in ["total_flight_cost", "total_hotel_cost", "total_food_cost", 
-                    "total_transport_cost", "total_activities_cost", "shopping_cost",
-                    "visa_cost", "insurance_cost", "miscellaneous_cost"]:
-            fallback_response[key] = fallback_response[key] * conversion_rate
-        
-        # Convert nested values
-        fallback_response["flight_estimate"]["min"] = fallback_response["flight_estimate"]["min"] * conversion_rate
-        fallback_response["flight_estimate"]["max"] = fallback_response["flight_estimate"]["max"] * conversion_rate
-        fallback_response["flight_estimate"]["average"] = fallback_response["flight_estimate"]["average"] * conversion_rate
-        fallback_response["hotel_per_night"]["value"] = fallback_response["hotel_per_night"]["value"] * conversion_rate
-        fallback_response["food_per_day"]["value"] = fallback_response["food_per_day"]["value"] * conversion_rate
-        fallback_response["transport_per_day"]["value"] = fallback_response["transport_per_day"]["value"] * conversion_rate
-        fallback_response["activities_per_day"]["value"] = fallback_response["activities_per_day"]["value"] * conversion_rate
-        
-        subtotal *= conversion_rate
-        buffer_amount *= conversion_rate
-        grand_total *= conversion_rate
-        per_person *= conversion_rate
-        per_day *= conversion_rate
-        
-        calc_time = (time.time() - calc_start) * 1000  # Convert to ms
-        
-        # Build response
-        response = HybridBudgetResponse(
-            **fallback_response,
-            subtotal=round(subtotal, 2),
-            buffer=round(buffer_amount, 2),
-            total_estimated_cost=round(grand_total, 2),
-            per_person_cost=round(per_person, 2),
-            per_day_cost=round(per_day, 2),
-            trip_days=trip_days,
-            currency=request.homeCurrency,
-            ai_status="ai-enhanced" if ai_enhanced else "fallback",
-            fallback_used=not ai_enhanced,
-            ai_latency_ms=ai_latency,
-            ai_calls_remaining=ai_calls_remaining,
-            calculation_time_ms=round(calc_time, 2)
-        )
+            buffer_amount = subtotal * (request.bufferPercentage / 100)
+            grand_total = subtotal + buffer_amount
+            per_person = grand_total / total_travelers
+            per_day = grand_total / trip_days
+        
+            # Currency conversion
+            # Rates from the same pricing snapshot as the unit costs
+            rates = rate_matrix(pricing)
+            conversion_rate = usd_rate(request.homeCurrency, rates)
+            HYBRID_MONEY_FIELDS.convert(fallback_response, conversion_rate)
+        
+            subtotal *= conversion_rate
+            buffer_amount *= conversion_rate
+            grand_total *= conversion_rate
+            per_person *= conversion_rate
+            per_day *= conversion_rate
+        
+            calc_time = (time.time() - calc_start) * 1000  # Convert to ms
+        
+            # Build response
+            response = HybridBudgetResponse(
+                **fallback_response,
+                subtotal=round(subtotal, 2),
+                buffer=round(buffer_amount, 2),
+                total_estimated_cost=round(grand_total, 2),
+                per_person_cost=round(per_person, 2),
+                per_day_cost=round(per_day, 2),
+                trip_days=trip_days,
+                currency=request.homeCurrency,
+                rates_as_of=rates.as_of,
+                ai_status="ai-enhanced" if ai_enhanced else "fallback",
+                fallback_used=not ai_enhanced,
+                ai_latency_ms=ai_latency,
+                ai_calls_remaining=ai_calls_remaining,
+                calculation_time_ms=round(calc_time, 2)
+            )
         
         logger.info(f"Hybrid budget calculated in {calc_time:.2f}ms (AI: {ai_enhanced})")
-        return response
+        return FastJSONResponse(response)
         
     except Exception as e:
         logger.error(f"Hybrid budget calculation failed: {str(e)}")
@@ -8,12 +8,13 @@ import os
 import re
 import time
 from typing import Optional, Dict, Any, List
-from openai import OpenAI, OpenAIError, RateLimitError, APITimeoutError, APIConnectionError
 from schemas import (
     FinancialInput, SummaryOutput, AIPlanOutput,
     AIPlanOutputV2, AlertV2, MetadataV2, TotalsV2, SplitV2, ExplainersV2, ExpenseBreakdownV2
 )
 # from services.cache import get_cached_plan, set_cached_plan  # Temporarily disabled
+from services.metrics import record_ai_usage, track_ai_call
+from services.openai_clients import get_openai_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -395,7 +396,9 @@ def generate_ai_plan(financial_input: FinancialInput, summary: SummaryOutput) ->
         return create_fallback_response()
     
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key, timeout=AI_TIMEOUT)
+    client = get_openai_client(api_key, timeout=AI_TIMEOUT)
+    # Imported here so the SDK loads on first use, not at application import
+    from openai import APIConnectionError, APITimeoutError, OpenAIError, RateLimitError
     
     # Build the prompt
     user_prompt = build_ai_prompt(financial_input, summary)
@@ -407,34 +410,36 @@ def generate_ai_plan(financial_input: FinancialInput, summary: SummaryOutput) ->
             logger.info(f"Calling OpenAI API (attempt {attempt}/{AI_MAX_RETRIES})...")
             
             # Call OpenAI API with optimized settings
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an experienced financial planning assistant for users in India. "
-                            "You provide practical, conservative, and actionable guidance on budgeting, saving, and debt strategy. "
-                            "You are NOT a certified financial advisor; this is educational guidance only. "
-                            "Always favor feasibility over optimism and consider the Indian financial context. "
-                            "Return responses in valid JSON format only with these exact keys: "
-                            "summary_text, budget_breakdown, expense_optimizations, "
-                            "savings_and_investment_plan, debt_strategy, goal_plan, "
-                            "action_items_30_days, disclaimer. "
-                            "Never include speculative or unrealistic recommendations. Be concise and action-oriented."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                temperature=AI_TEMPERATURE,
-                max_tokens=AI_MAX_TOKENS,
-                response_format={"type": "json_object"}
-            )
+            with track_ai_call("ai_plan_v1"):
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": (
+                                "You are an experienced financial planning assistant for users in India. "
+                                "You provide practical, conservative, and actionable guidance on budgeting, saving, and debt strategy. "
+                                "You are NOT a certified financial advisor; this is educational guidance only. "
+                                "Always favor feasibility over optimism and consider the Indian financial context. "
+                                "Return responses in valid JSON format only with these exact keys: "
+                                "summary_text, budget_breakdown, expense_optimizations, "
+                                "savings_and_investment_plan, debt_strategy, goal_plan, "
+                                "action_items_30_days, disclaimer. "
+                                "Never include speculative or unrealistic recommendations. Be concise and action-oriented."
+                            )
+                        },
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ],
+                    temperature=AI_TEMPERATURE,
+                    max_tokens=AI_MAX_TOKENS,
+                    response_format={"type": "json_object"}
+                )
             
             # Log token usage for cost monitoring
+            record_ai_usage("ai_plan_v1", response.usage)
             if response.usage:
                 logger.info(
                     f"Token usage - Prompt: {response.usage.prompt_tokens}, "
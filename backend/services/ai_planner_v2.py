@@ -2,17 +2,24 @@
 V2: AI Financial Budget Planner - Context-Aware Planning
 Enhanced version with city tier, lifestyle, and cost-of-living considerations
 """
+import asyncio
 import json
 import logging
 import os
 import re
 import time
 from typing import Optional, Dict, Any, List
-from openai import OpenAI, OpenAIError, RateLimitError, APITimeoutError, APIConnectionError
 from schemas import (
     FinancialInput, SummaryOutput, ExpensesInput,
     AIPlanOutputV2, AlertV2, MetadataV2, TotalsV2, SplitV2, ExplainersV2, ExpenseBreakdownV2
 )
+from services.cache import get_cache_expiry, get_cached_plan, plan_cache_key, set_cached_plan
+from services.cache_prewarmer import record_token_usage, register_prewarm_target
+from services.calculations import calculate_summary
+from services.heavy_hitters import record_hit
+from services.metrics import record_ai_usage, track_ai_call
+from services.openai_clients import get_openai_client
+from services.tracing import span
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,6 +30,8 @@ AI_RETRY_DELAY = 2
 AI_TIMEOUT = 30
 AI_MAX_TOKENS_V2 = 2000
 AI_TEMPERATURE = 0.3
+PLAN_CACHE_NAMESPACE = "ai_plan_v2"
+PROFILE_TRACKER = "ai_plan_profile"  # Heavy-hitter tracker of (banded) financial profiles
 
 # City Tier Budget Split Rules (Modified 40-30-20)
 TIER_SPLITS = {
@@ -363,8 +372,78 @@ def create_fallback_response_v2(income: float) -> AIPlanOutputV2:
     )
 
 
-def generate_ai_plan_v2(financial_input: FinancialInput, summary: SummaryOutput) -> AIPlanOutputV2:
-    """Generate context-aware AI budget plan using OpenAI"""
+def rehydrate_cached_plan_v2(
+    plan_data: Dict[str, Any],
+    financial_input: FinancialInput,
+    summary: SummaryOutput
+) -> AIPlanOutputV2:
+    """
+    Adapt a plan cached for a similar profile to this request's exact numbers.
+
+    Cache keys are banded, so the cached plan may have been generated for a
+    slightly different income. Breakdown amounts are rescaled to the exact income
+    from calculate_summary and the totals are recomputed from the breakdown.
+    """
+    plan = AIPlanOutputV2(**plan_data)
+    income = int(summary.total_income)
+    cached_income = plan.totals.income
+    scale = income / cached_income if cached_income > 0 else 1.0
+    breakdown = plan.breakdown
+    cached_sum = sum(
+        sum(bucket.values()) for bucket in (breakdown.needs, breakdown.wants, breakdown.savings)
+    )
+
+    for bucket in (breakdown.needs, breakdown.wants, breakdown.savings):
+        for category, amount in bucket.items():
+            bucket[category] = int(round(amount * scale))
+
+    # Keep needs + wants + savings == income when the cached plan balanced exactly
+    if int(cached_sum) == int(cached_income) and breakdown.savings:
+        drift = income - sum(
+            sum(bucket.values()) for bucket in (breakdown.needs, breakdown.wants, breakdown.savings)
+        )
+        largest = max(breakdown.savings, key=lambda category: breakdown.savings[category])
+        breakdown.savings[largest] = max(0, breakdown.savings[largest] + drift)
+
+    total_expenses = sum(breakdown.needs.values()) + sum(breakdown.wants.values())
+    net_savings = sum(breakdown.savings.values())
+    plan.totals = TotalsV2(
+        income=income,
+        total_expenses=total_expenses,
+        net_savings=net_savings,
+        savings_rate_percent=(net_savings / income * 100) if income > 0 else 0
+    )
+    plan.metadata.col_multiplier = float(financial_input.cost_of_living_index or 1.0)
+    if financial_input.city:
+        plan.metadata.city = financial_input.city
+    return plan
+
+
+def generate_ai_plan_v2(
+    financial_input: FinancialInput,
+    summary: SummaryOutput,
+    force_refresh: bool = False,
+) -> AIPlanOutputV2:
+    """
+    Generate context-aware AI budget plan using OpenAI
+    
+    force_refresh skips the cache lookup and heavy-hitter tracking (used by the cache pre-warmer).
+    """
+    
+    # Similar profiles share a cached plan (see services.cache key strategies)
+    cache_input = financial_input.model_dump()
+    if not force_refresh:
+        record_hit(
+            PROFILE_TRACKER,
+            plan_cache_key(cache_input, namespace=PLAN_CACHE_NAMESPACE),
+            payload=cache_input,
+            label=f"{normalize_city_tier(financial_input.city_tier)} / {financial_input.currency}",
+        )
+        with span("cache"):
+            cached_plan = get_cached_plan(cache_input, namespace=PLAN_CACHE_NAMESPACE)
+        if cached_plan:
+            logger.info("Returning cached V2 AI plan")
+            return rehydrate_cached_plan_v2(cached_plan, financial_input, summary)
     
     # Get API key
     api_key = os.getenv("OPENAI_API_KEY")
@@ -373,13 +452,16 @@ def generate_ai_plan_v2(financial_input: FinancialInput, summary: SummaryOutput)
         return create_fallback_response_v2(summary.total_income)
     
     # Initialize client
-    client = OpenAI(api_key=api_key, timeout=AI_TIMEOUT)
+    client = get_openai_client(api_key, timeout=AI_TIMEOUT)
+    # Imported here so the SDK loads on first use, not at application import
+    from openai import APIConnectionError, APITimeoutError, OpenAIError, RateLimitError
     
     # Normalized city tier for consistent downstream usage
     default_city_tier = normalize_city_tier(financial_input.city_tier)
 
     # Build V2 prompt
-    user_prompt = build_ai_prompt_v2(financial_input, summary)
+    with span("prompt"):
+        user_prompt = build_ai_prompt_v2(financial_input, summary)
     model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     
     # Retry loop
@@ -388,131 +470,137 @@ def generate_ai_plan_v2(financial_input: FinancialInput, summary: SummaryOutput)
             logger.info(f"Calling OpenAI API V2 (attempt {attempt}/{AI_MAX_RETRIES})...")
             
             # Call API
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a senior Indian financial planner who is conservative, practical, and detail-oriented. "
-                            "Generate structured monthly budgets considering city tier, lifestyle, and family size. "
-                            "Return ONLY valid JSON matching the exact schema provided. No prose before or after. "
-                            "All monetary values must be integers. Income must equal needs + wants + savings exactly. "
-                            "Never produce negative values. When constraints are tight, trim wants first, then savings, and raise alerts. "
-                            "Always surface alerts when rules trigger. Keep recommendations short and action-focused for India."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                temperature=AI_TEMPERATURE,
-                max_tokens=AI_MAX_TOKENS_V2,
-                response_format={"type": "json_object"}
-            )
+            with track_ai_call("ai_plan_v2"), span("ai-upstream"):
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": (
+                                "You are a senior Indian financial planner who is conservative, practical, and detail-oriented. "
+                                "Generate structured monthly budgets considering city tier, lifestyle, and family size. "
+                                "Return ONLY valid JSON matching the exact schema provided. No prose before or after. "
+                                "All monetary values must be integers. Income must equal needs + wants + savings exactly. "
+                                "Never produce negative values. When constraints are tight, trim wants first, then savings, and raise alerts. "
+                                "Always surface alerts when rules trigger. Keep recommendations short and action-focused for India."
+                            )
+                        },
+                        {
+                            "role": "user",
+                            "content": user_prompt
+                        }
+                    ],
+                    temperature=AI_TEMPERATURE,
+                    max_tokens=AI_MAX_TOKENS_V2,
+                    response_format={"type": "json_object"}
+                )
             
             # Log token usage
+            record_ai_usage("ai_plan_v2", response.usage)
             if response.usage:
                 logger.info(
                     f"V2 Token usage - Prompt: {response.usage.prompt_tokens}, "
                     f"Completion: {response.usage.completion_tokens}, "
                     f"Total: {response.usage.total_tokens}"
                 )
+                record_token_usage(PLAN_CACHE_NAMESPACE, response.usage.total_tokens)
             
             # Extract response
-            ai_response_text = response.choices[0].message.content
-            if not ai_response_text:
-                raise ValueError("Empty response from AI")
+            with span("extract"):
+                ai_response_text = response.choices[0].message.content
+                if not ai_response_text:
+                    raise ValueError("Empty response from AI")
             
-            logger.info("Received V2 response, parsing JSON...")
+                logger.info("Received V2 response, parsing JSON...")
             
-            # Parse JSON
-            ai_data = extract_json_from_text(ai_response_text)
-            if not ai_data:
-                raise ValueError("Failed to extract JSON from V2 response")
+                # Parse JSON
+                ai_data = extract_json_from_text(ai_response_text)
+                if not ai_data:
+                    raise ValueError("Failed to extract JSON from V2 response")
             
-            # Build alerts
-            alerts: List[AlertV2] = []
-            if "alerts" in ai_data and isinstance(ai_data["alerts"], list):
-                for alert_item in ai_data["alerts"]:
-                    alert_item: Any = alert_item  # Explicit type annotation
-                    if isinstance(alert_item, dict):
-                        alert_dict: Dict[str, Any] = alert_item
-                        alerts.append(AlertV2(
-                            code=str(alert_dict.get("code", "UNKNOWN")),
-                            message=str(alert_dict.get("message", "")),
-                            severity=str(alert_dict.get("severity", "info")),
-                            suggestion=str(alert_dict.get("suggestion", ""))
-                        ))
+            with span("validate"):
+                # Build alerts
+                alerts: List[AlertV2] = []
+                if "alerts" in ai_data and isinstance(ai_data["alerts"], list):
+                    for alert_item in ai_data["alerts"]:
+                        alert_item: Any = alert_item  # Explicit type annotation
+                        if isinstance(alert_item, dict):
+                            alert_dict: Dict[str, Any] = alert_item
+                            alerts.append(AlertV2(
+                                code=str(alert_dict.get("code", "UNKNOWN")),
+                                message=str(alert_dict.get("message", "")),
+                                severity=str(alert_dict.get("severity", "info")),
+                                suggestion=str(alert_dict.get("suggestion", ""))
+                            ))
             
-            # Build metadata
-            metadata_data = ai_data.get("metadata", {})
-            metadata = MetadataV2(
-                city=metadata_data.get("city"),
-                city_tier=metadata_data.get("city_tier", default_city_tier),
-                col_multiplier=float(metadata_data.get("col_multiplier", financial_input.cost_of_living_index or 1.0)),
-                reasoning_summary=metadata_data.get("reasoning_summary", "Budget plan generated")
-            )
+                # Build metadata
+                metadata_data = ai_data.get("metadata", {})
+                metadata = MetadataV2(
+                    city=metadata_data.get("city"),
+                    city_tier=metadata_data.get("city_tier", default_city_tier),
+                    col_multiplier=float(metadata_data.get("col_multiplier", financial_input.cost_of_living_index or 1.0)),
+                    reasoning_summary=metadata_data.get("reasoning_summary", "Budget plan generated")
+                )
             
-            # Build totals
-            totals_data = ai_data.get("totals", {})
-            income = int(totals_data.get("income", summary.total_income))
+                # Build totals
+                totals_data = ai_data.get("totals", {})
+                income = int(totals_data.get("income", summary.total_income))
             
-            # Calculate totals from breakdown if available
-            breakdown_data = ai_data.get("breakdown", {})
-            needs_total = sum(breakdown_data.get("needs", {}).values())
-            wants_total = sum(breakdown_data.get("wants", {}).values())
-            savings_total = sum(breakdown_data.get("savings", {}).values())
+                # Calculate totals from breakdown if available
+                breakdown_data = ai_data.get("breakdown", {})
+                needs_total = sum(breakdown_data.get("needs", {}).values())
+                wants_total = sum(breakdown_data.get("wants", {}).values())
+                savings_total = sum(breakdown_data.get("savings", {}).values())
             
-            total_expenses = needs_total + wants_total
-            net_savings = savings_total
-            savings_rate_percent = (net_savings / income * 100) if income > 0 else 0
+                total_expenses = needs_total + wants_total
+                net_savings = savings_total
+                savings_rate_percent = (net_savings / income * 100) if income > 0 else 0
             
-            totals = TotalsV2(
-                income=income,
-                total_expenses=total_expenses,
-                net_savings=net_savings,
-                savings_rate_percent=savings_rate_percent
-            )
+                totals = TotalsV2(
+                    income=income,
+                    total_expenses=total_expenses,
+                    net_savings=net_savings,
+                    savings_rate_percent=savings_rate_percent
+                )
             
-            # Build split
-            split_data = ai_data.get("split", {})
-            split = SplitV2(
-                needs_percent=float(split_data.get("needs_percent", 40)),
-                wants_percent=float(split_data.get("wants_percent", 30)),
-                savings_percent=float(split_data.get("savings_percent", 30))
-            )
+                # Build split
+                split_data = ai_data.get("split", {})
+                split = SplitV2(
+                    needs_percent=float(split_data.get("needs_percent", 40)),
+                    wants_percent=float(split_data.get("wants_percent", 30)),
+                    savings_percent=float(split_data.get("savings_percent", 30))
+                )
             
-            # Build breakdown
-            breakdown_data = ai_data.get("breakdown", {})
-            breakdown = ExpenseBreakdownV2(
-                needs={k: int(v) for k, v in breakdown_data.get("needs", {}).items()},
-                wants={k: int(v) for k, v in breakdown_data.get("wants", {}).items()},
-                savings={k: int(v) for k, v in breakdown_data.get("savings", {}).items()}
-            )
+                # Build breakdown
+                breakdown_data = ai_data.get("breakdown", {})
+                breakdown = ExpenseBreakdownV2(
+                    needs={k: int(v) for k, v in breakdown_data.get("needs", {}).items()},
+                    wants={k: int(v) for k, v in breakdown_data.get("wants", {}).items()},
+                    savings={k: int(v) for k, v in breakdown_data.get("savings", {}).items()}
+                )
             
-            # Build explainers
-            explainers_data = ai_data.get("explainers", {})
-            explainers = ExplainersV2(
-                why_split=explainers_data.get("why_split", ""),
-                how_to_save=explainers_data.get("how_to_save", ""),
-                city_impact=explainers_data.get("city_impact", "")
-            )
+                # Build explainers
+                explainers_data = ai_data.get("explainers", {})
+                explainers = ExplainersV2(
+                    why_split=explainers_data.get("why_split", ""),
+                    how_to_save=explainers_data.get("how_to_save", ""),
+                    city_impact=explainers_data.get("city_impact", "")
+                )
             
-            # Create final plan
-            ai_plan = AIPlanOutputV2(
-                plan_mode=ai_data.get("plan_mode", "basic"),
-                metadata=metadata,
-                totals=totals,
-                split=split,
-                breakdown=breakdown,
-                alerts=alerts,
-                recommendations=ai_data.get("recommendations", []),
-                explainers=explainers
-            )
+                # Create final plan
+                ai_plan = AIPlanOutputV2(
+                    plan_mode=ai_data.get("plan_mode", "basic"),
+                    metadata=metadata,
+                    totals=totals,
+                    split=split,
+                    breakdown=breakdown,
+                    alerts=alerts,
+                    recommendations=ai_data.get("recommendations", []),
+                    explainers=explainers
+                )
             
             logger.info("Successfully generated V2 AI budget plan")
+            set_cached_plan(cache_input, ai_plan.model_dump(), namespace=PLAN_CACHE_NAMESPACE)
             return ai_plan
             
         except RateLimitError as e:
@@ -551,3 +639,23 @@ def generate_ai_plan_v2(financial_input: FinancialInput, summary: SummaryOutput)
     
     logger.error("All V2 retries exhausted")
     return create_fallback_response_v2(summary.total_income)
+
+
+# ===========================================
+# CACHE PRE-WARMING
+# ===========================================
+
+async def _refresh_cached_plan(cache_input: Dict[str, Any]) -> None:
+    financial_input = FinancialInput(**cache_input)
+    summary = calculate_summary(financial_input)
+    cache_key = plan_cache_key(cache_input, namespace=PLAN_CACHE_NAMESPACE)
+    expiry_before = get_cache_expiry(cache_key)
+    await asyncio.to_thread(generate_ai_plan_v2, financial_input, summary, True)
+    # A failed AI call returns the fallback plan without caching it
+    if get_cache_expiry(cache_key) == expiry_before:
+        raise RuntimeError("AI plan refresh did not update the cache")
+
+
+register_prewarm_target(
+    PLAN_CACHE_NAMESPACE, PROFILE_TRACKER, get_cache_expiry, _refresh_cached_plan, default_tokens=AI_MAX_TOKENS_V2
+)
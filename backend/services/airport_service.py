@@ -4,7 +4,7 @@ Provides airport lookup by city and IATA code resolution.
 Includes ~500 major airports globally; can be extended.
 """
 import logging
-from typing import Dict, Optional, List, TypedDict
+from typing import Dict, Optional, List, Tuple, TypedDict
 
 logger = logging.getLogger(__name__)
 
@@ -187,6 +187,13 @@ IATA_AIRPORTS: Dict[str, List[AirportData]] = {
     "santiago": [{"code": "SCL", "city": "Santiago", "country": "Chile", "distance_km": 0}],
 }
 
+# Lookup form built once at import: closest airport first, as tuples, so lookups
+# neither sort nor mutate and the table stays shared between forked workers
+_AIRPORTS_BY_CITY: Dict[str, Tuple[AirportData, ...]] = {
+    city: tuple(sorted(airports, key=lambda a: a.get("distance_km", float("inf"))))
+    for city, airports in IATA_AIRPORTS.items()
+}
+
 
 def get_airports_by_city(city: str) -> List[AirportData]:
     """
@@ -203,10 +210,7 @@ def get_airports_by_city(city: str) -> List[AirportData]:
         return []
     
     c = city.lower().strip()
-    airports = IATA_AIRPORTS.get(c, [])
-    
-    # Sort by distance (closest first)
-    return sorted(airports, key=lambda a: a.get("distance_km", float("inf")))
+    return list(_AIRPORTS_BY_CITY.get(c, ()))
 
 
 def get_primary_airport(city: str) -> Optional[AirportData]:
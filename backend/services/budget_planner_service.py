@@ -3,6 +3,11 @@ Budget Planner V1.2 - Budget Planner Service
 Core business logic for budget generation and rebalancing
 """
 
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from budget_schemas.budget_planner import (
     BudgetGenerateRequest,
     BudgetPlan,
@@ -14,19 +19,42 @@ from budget_schemas.budget_planner import (
     Categories,
     Alert,
     Metadata,
+    BudgetRebalanceDeltaRequest,
     BudgetRebalanceRequest,
+    GoalSimulationRequest,
 )
 from utils.budget_calculator import (
-    calculate_col_adjusted_budget,
-    apply_lifestyle_modifier,
-    apply_income_based_tuning,
     allocate_budget,
     calculate_total_emi,
-    get_mode_adjustment,
 )
 from utils.alert_detector import (
+    decode_alert_mask,
+    evaluate_alerts_batch,
     generate_alerts,
 )
+from utils.budget_batch import (
+    FIXED_EXPENSE_FIELDS,
+    VARIABLE_EXPENSE_FIELDS,
+    generate_budget_batch,
+    total_expenses_batch,
+)
+from utils import goal_simulator
+from utils.split_table import SPLIT_TABLE
+from services.cache_service import goal_simulation_cache
+from services.rebalance_engine import (
+    REBALANCE_GRAPH,
+    RebalanceSession,
+    rebalance_inputs,
+    rebalance_sessions,
+    start_session,
+)
+
+# Paths x horizon months simulated per request (the default 5000 paths at the 360-month maximum);
+# longer horizons get fewer paths, so the work per request is bounded and independent of load
+GOAL_SIMULATION_MAX_PATH_MONTHS = int(os.getenv("GOAL_SIMULATION_MAX_PATH_MONTHS", "1800000"))
+# Per-request safety net for an overloaded worker (a full-size run takes ~250ms); longer runs return
+# the paths simulated so far
+GOAL_SIMULATION_TIME_BUDGET_MS = float(os.getenv("GOAL_SIMULATION_TIME_BUDGET_MS", "2000"))
 
 
 class BudgetPlannerService:
@@ -83,54 +111,16 @@ class BudgetPlannerService:
         
         total_expenses = total_fixed + total_variable + total_emi
         
-        # Step 1: Calculate COL-adjusted budget split
-        col_adjusted = calculate_col_adjusted_budget(
-            base_needs=50,
+        # Steps 1-3 and the budget mode: COL split, lifestyle modifier, income tuning (precomputed)
+        needs_percent, wants_percent, savings_percent = SPLIT_TABLE.lookup(
             col_multiplier=col_multiplier,
-            min_savings=5.0
-        )
-        
-        needs_percent = col_adjusted['needs']
-        wants_percent = col_adjusted['wants']
-        savings_percent = col_adjusted['savings']
-        
-        # Step 2: Apply lifestyle modifier to wants
-        wants_percent = apply_lifestyle_modifier(wants_percent, lifestyle)
-        
-        # Recalculate needs and savings to maintain 100%
-        needs_percent = max(needs_percent, 0)
-        savings_percent = max(100 - needs_percent - wants_percent, 0)
-        wants_percent = 100 - needs_percent - savings_percent
-        
-        # Step 3: Apply income-based tuning
-        tuned_split = apply_income_based_tuning(
+            lifestyle=lifestyle,
+            mode=budget_mode,
             income=monthly_income,
-            needs_percent=needs_percent,
-            wants_percent=wants_percent,
-            savings_percent=savings_percent,
             rent=request.fixed_expenses.rent,
             total_emi=total_emi,
         )
         
-        needs_percent = tuned_split['needs']
-        wants_percent = tuned_split['wants']
-        savings_percent = tuned_split['savings']
-        
-        # Apply budget mode adjustments
-        mode_adj = get_mode_adjustment(budget_mode)
-        if budget_mode != 'smart_balanced':
-            # Basic mode uses 45/30/25
-            if budget_mode == 'basic':
-                needs_percent = 45
-                wants_percent = 30
-                savings_percent = 25
-            # Aggressive savings mode reduces wants and increases savings
-            elif budget_mode == 'aggressive_savings':
-                wants_reduction = wants_percent * (mode_adj['wants_reduction'] / 100)
-                wants_percent = max(wants_percent - wants_reduction, 5)
-                savings_percent = min(savings_percent + mode_adj['savings_boost'], 40)
-                needs_percent = 100 - wants_percent - savings_percent
-        
         # Calculate absolute amounts
         needs_amount = (monthly_income * needs_percent) / 100
         wants_amount = (monthly_income * wants_percent) / 100
@@ -250,6 +240,115 @@ class BudgetPlannerService:
         
         return budget_plan
     
+    @staticmethod
+    def generate_budget_batch(requests: List[BudgetGenerateRequest]) -> List[Dict[str, Any]]:
+        """
+        Allocate budgets for many profiles in one vectorized pass.
+        
+        Splits, amounts and categories are identical to generate_budget for each
+        profile; alerts are reported as codes only and no explanation is written.
+        
+        Args:
+            requests: Budget generation requests
+        
+        Returns:
+            One BudgetBatchPlan-shaped dict per request, in order
+        """
+        income = np.array([request.monthly_income for request in requests], dtype=float)
+        total_emi = np.array(
+            [calculate_total_emi([loan.model_dump() for loan in request.loans]) for request in requests], dtype=float
+        )
+        fixed = {
+            name: np.array([getattr(request.fixed_expenses, name) for request in requests], dtype=float)
+            for name in FIXED_EXPENSE_FIELDS
+        }
+        variable = {
+            name: np.array([getattr(request.variable_expenses, name) for request in requests], dtype=float)
+            for name in VARIABLE_EXPENSE_FIELDS
+        }
+        modes = np.array([request.mode for request in requests])
+        
+        result = generate_budget_batch(
+            income=income,
+            col_multiplier=np.array([request.col_multiplier for request in requests], dtype=float),
+            lifestyle=np.array([request.lifestyle for request in requests]),
+            mode=modes,
+            fixed_expenses=fixed,
+            variable_expenses=variable,
+            total_emi=total_emi,
+        )
+        split, amounts = result['budget_split'], result['budget_amounts']
+        fired, _ = evaluate_alerts_batch({
+            'income': income,
+            'rent': fixed['rent'],
+            'total_emi': total_emi,
+            'total_expenses': total_expenses_batch(fixed, variable, total_emi),
+            'wants_percent': split['wants_percent'],
+            'wants_amount': amounts['wants'],
+            'savings_amount': amounts['savings'],
+            'savings_percent': split['savings_percent'],
+            'emergency_fund': 0.0,  # Assume 0 for new budget
+            'city_tier': np.array([request.city_tier for request in requests]),
+            'budget_mode': modes,
+            'has_multiple_loans': np.array([len(request.loans) > 1 for request in requests]),
+        })
+        
+        # Columns -> rows, through plain lists (one tolist() per column)
+        def rows(columns: Dict[str, np.ndarray]) -> List[Dict[str, float]]:
+            names = list(columns)
+            return [dict(zip(names, values)) for values in zip(*(columns[name].tolist() for name in names))]
+        
+        categories = {group: rows(columns) for group, columns in result['categories'].items()}
+        return [
+            {
+                'income': income_value,
+                'budget_split': split_row,
+                'budget_amounts': amounts_row,
+                'categories': {group: categories[group][i] for group in categories},
+                'alert_codes': [code.value for code in decode_alert_mask(mask)],
+            }
+            for i, (income_value, split_row, amounts_row, mask) in enumerate(zip(
+                income.tolist(), rows(split), rows(amounts), fired.tolist(),
+            ))
+        ]
+    
+    @staticmethod
+    def simulate_goals(request: GoalSimulationRequest) -> Dict[str, Any]:
+        """
+        Monte Carlo probability of reaching each savings goal with the plan's savings.
+        
+        The plan's SIP, FD/RD and goals allocations are the monthly contributions.
+        Paths are capped so paths x horizon months stays within GOAL_SIMULATION_MAX_PATH_MONTHS.
+        Results are deterministic per seed and cached; the simulation stops early
+        (truncated) when GOAL_SIMULATION_TIME_BUDGET_MS runs out. Truncated results
+        depend on load, so they are returned but never cached.
+        
+        Args:
+            request: GoalSimulationRequest with budget inputs and simulation settings
+        
+        Returns:
+            GoalSimulationResponse-shaped dict
+        """
+        cache_key = request.model_dump(mode="json")
+        cached = goal_simulation_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, 'cached': True}
+        
+        savings = BudgetPlannerService.generate_budget(request.inputs).categories.savings
+        horizon = max(goal.target_months for goal in request.inputs.goals)
+        result = goal_simulator.simulate_goals(
+            goals=[goal.model_dump() for goal in request.inputs.goals],
+            sip=savings.sip,
+            fd_rd=savings.fd_rd,
+            goal_saving=savings.goals,
+            paths=min(request.paths, max(GOAL_SIMULATION_MAX_PATH_MONTHS // horizon, 100)),
+            seed=request.seed,
+            time_budget_ms=GOAL_SIMULATION_TIME_BUDGET_MS,
+        )
+        if not result['truncated']:
+            goal_simulation_cache.set(cache_key, result)
+        return {**result, 'cached': False}
+    
     @staticmethod
     def rebalance_budget(
         request: BudgetRebalanceRequest,
@@ -269,115 +368,79 @@ class BudgetPlannerService:
             Updated BudgetPlan with rebalance reasoning
         """
         
-        # Extract edited values
-        edited_plan_dict = request.edited_plan
+        # Same dependency graph the incremental /rebalance/delta endpoint updates, evaluated in full
+        values = REBALANCE_GRAPH.evaluate(BudgetPlannerService.rebalance_inputs(request))
+        return BudgetPlannerService.plan_from_rebalance(values, request)
+    
+    @staticmethod
+    def rebalance_inputs(request: BudgetRebalanceRequest) -> Dict[str, Any]:
+        """Rebalance graph inputs: the edited split plus context from the original inputs."""
         original_inputs = request.original_inputs
-        
-        # Ensure percentages sum to 100
-        total_percent = (
-            edited_plan_dict.get('budget_split', {}).get('needs_percent', 0) +
-            edited_plan_dict.get('budget_split', {}).get('wants_percent', 0) +
-            edited_plan_dict.get('budget_split', {}).get('savings_percent', 0)
-        )
-        
-        if total_percent != 100:
-            # Adjust savings to maintain 100%
-            if 'budget_split' not in edited_plan_dict:
-                edited_plan_dict['budget_split'] = {}
-            edited_plan_dict['budget_split']['savings_percent'] = (
-                100 - 
-                edited_plan_dict.get('budget_split', {}).get('needs_percent', 0) - 
-                edited_plan_dict.get('budget_split', {}).get('wants_percent', 0)
-            )
-        
-        # Recalculate amounts based on percentages
-        income = edited_plan_dict.get('income', original_inputs.monthly_income)
-        if 'budget_amounts' not in edited_plan_dict:
-            edited_plan_dict['budget_amounts'] = {}
-        
-        needs_percent = edited_plan_dict.get('budget_split', {}).get('needs_percent', 0)
-        wants_percent = edited_plan_dict.get('budget_split', {}).get('wants_percent', 0)
-        savings_percent = edited_plan_dict.get('budget_split', {}).get('savings_percent', 0)
-        
-        edited_plan_dict['budget_amounts']['needs'] = (income * needs_percent) / 100
-        edited_plan_dict['budget_amounts']['wants'] = (income * wants_percent) / 100
-        edited_plan_dict['budget_amounts']['savings'] = (income * savings_percent) / 100
-        
-        # Recalculate alerts
-        total_expenses = (
-            edited_plan_dict.get('budget_amounts', {}).get('needs', 0) +
-            edited_plan_dict.get('budget_amounts', {}).get('wants', 0)
-        )
-        
-        alerts_list = generate_alerts(
-            income=income,
-            rent=original_inputs.fixed_expenses.rent if hasattr(original_inputs, 'fixed_expenses') else 0,
-            total_emi=0,
-            total_expenses=total_expenses,
-            loans=[loan.model_dump() for loan in original_inputs.loans] if hasattr(original_inputs, 'loans') else [],
-            savings_amount=edited_plan_dict.get('budget_amounts', {}).get('savings', 0),
-            savings_percent=savings_percent,
-            wants_percent=wants_percent,
-            wants_amount=edited_plan_dict.get('budget_amounts', {}).get('wants', 0),
-            emergency_fund=0,
+        return rebalance_inputs(
+            request.edited_plan,
+            monthly_income=original_inputs.monthly_income,
+            rent=original_inputs.fixed_expenses.rent,
+            loan_count=len(original_inputs.loans),
             city_tier=request.city_tier,
-            budget_mode=original_inputs.mode if hasattr(original_inputs, 'mode') else 'smart_balanced',
+            budget_mode=original_inputs.mode,
         )
+    
+    @staticmethod
+    def open_rebalance_session(
+        request: BudgetRebalanceDeltaRequest,
+    ) -> Tuple[Optional[RebalanceSession], bool]:
+        """
+        Resume the request's editing session, or start one from its full context.
         
-        # Create Alert objects
-        alerts = [
-            Alert(
-                code=str(a.get('code', '')),
-                message=str(a.get('message', '')),
-                severity=str(a.get('severity', '')),
-                suggestion=str(a.get('suggestion', '')),
-            )
-            for a in alerts_list
-        ]
-        
-        # Generate rebalancing explanation
-        new_needs = edited_plan_dict.get('budget_split', {}).get('needs_percent', 50)
-        new_wants = edited_plan_dict.get('budget_split', {}).get('wants_percent', 30)
-        new_savings = edited_plan_dict.get('budget_split', {}).get('savings_percent', 20)
-        
-        explanation = BudgetPlannerService._generate_rebalance_explanation(
-            original_needs=50,
-            original_wants=30,
-            original_savings=20,
-            new_needs=new_needs,
-            new_wants=new_wants,
-            new_savings=new_savings,
-            alert_count=len(alerts),
+        Returns:
+            (session or None if unknown and no context was sent, whether it was just started)
+        """
+        session = rebalance_sessions.get(request.session_id) if request.session_id else None
+        if session is not None:
+            return session, False
+        if request.edited_plan is None or request.original_inputs is None:
+            return None, False
+        full_request = BudgetRebalanceRequest(
+            edited_plan=request.edited_plan,
+            original_inputs=request.original_inputs,
+            city_tier=request.city_tier,
+            col_multiplier=request.col_multiplier,
         )
+        return start_session(BudgetPlannerService.rebalance_inputs(full_request)), True
+    
+    @staticmethod
+    def plan_from_rebalance(values: Dict[str, Any], request: BudgetRebalanceRequest) -> BudgetPlan:
+        """Build the rebalanced plan from evaluated rebalance graph values."""
+        edited_plan_dict = request.edited_plan
         
         # Create metadata
         metadata = Metadata(
-            city=original_inputs.city,
+            city=request.original_inputs.city,
             city_tier=request.city_tier,
             col_multiplier=request.col_multiplier,
-            notes=f"Budget rebalanced. Original: 50/30/20, New: {new_needs}/{new_wants}/{new_savings}",
+            notes=values["metadata.notes"],
         )
         
         # Create updated budget plan
         rebalanced_plan = BudgetPlan(
-            income=income,
+            income=values["income"],
             budget_split=BudgetSplit(
-                needs_percent=new_needs,
-                wants_percent=new_wants,
-                savings_percent=new_savings,
+                needs_percent=values["budget_split.needs_percent"],
+                wants_percent=values["budget_split.wants_percent"],
+                savings_percent=values["budget_split.savings_percent"],
             ),
             budget_amounts=BudgetAmounts(
-                needs=edited_plan_dict.get('budget_amounts', {}).get('needs', 0),
-                wants=edited_plan_dict.get('budget_amounts', {}).get('wants', 0),
-                savings=edited_plan_dict.get('budget_amounts', {}).get('savings', 0),
+                needs=values["budget_amounts.needs"],
+                wants=values["budget_amounts.wants"],
+                savings=values["budget_amounts.savings"],
             ),
             categories=Categories(
                 needs=NeedsCategory(**edited_plan_dict.get('categories', {}).get('needs', {})),
                 wants=WantsCategory(**edited_plan_dict.get('categories', {}).get('wants', {})),
                 savings=SavingsCategory(**edited_plan_dict.get('categories', {}).get('savings', {})),
             ),
-            alerts=alerts,
-            explanation=explanation,
+            alerts=[Alert(**alert) for alert in values["alerts"]],
+            explanation=values["explanation"],
             metadata=metadata,
         )
         
@@ -463,42 +526,3 @@ class BudgetPlannerService:
         explanation += "\nℹ️ This budget is AI-generated based on your inputs. Adjust categories as needed."
         
         return explanation
-    
-    @staticmethod
-    def _generate_rebalance_explanation(
-        original_needs: float,
-        original_wants: float,
-        original_savings: float,
-        new_needs: float,
-        new_wants: float,
-        new_savings: float,
-        alert_count: int,
-    ) -> str:
-        """Generate explanation for rebalanced budget"""
-        
-        needs_change = new_needs - original_needs
-        wants_change = new_wants - original_wants
-        savings_change = new_savings - original_savings
-        
-        explanation = "Your budget has been rebalanced:\n\n"
-        
-        explanation += "📈 Changes:\n"
-        if needs_change > 0:
-            explanation += f"- Needs: +{needs_change:.1f}% (now {new_needs:.1f}%)\n"
-        elif needs_change < 0:
-            explanation += f"- Needs: {needs_change:.1f}% (now {new_needs:.1f}%)\n"
-        
-        if wants_change > 0:
-            explanation += f"- Wants: +{wants_change:.1f}% (now {new_wants:.1f}%)\n"
-        elif wants_change < 0:
-            explanation += f"- Wants: {wants_change:.1f}% (now {new_wants:.1f}%)\n"
-        
-        if savings_change > 0:
-            explanation += f"- Savings: +{savings_change:.1f}% (now {new_savings:.1f}%)\n"
-        elif savings_change < 0:
-            explanation += f"- Savings: {savings_change:.1f}% (now {new_savings:.1f}%)\n"
-        
-        if alert_count > 0:
-            explanation += f"\n⚠️ {alert_count} alert(s) for your attention."
-        
-        return explanation
@@ -1,47 +1,243 @@
 """
 Simple in-memory cache for AI responses
-Reduces API costs by caching identical requests
+Reduces API costs by caching identical (or, with normalized keys, similar) requests
 """
 import hashlib
 import json
+import math
+import os
+import random
 import time
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 
+from services.cache_snapshot import SnapshotEntry, register_snapshot_source
+from services.metrics import record_cache_lookup
+
 logger = logging.getLogger(__name__)
 
 # In-memory cache with TTL
 _cache: Dict[str, Dict[str, Any]] = {}
+_stats: Dict[str, int] = {"hits": 0, "misses": 0}
 CACHE_TTL = 3600  # 1 hour in seconds
 MAX_CACHE_SIZE = 100  # Maximum number of cached items
 
+# Cache key normalization
+# exact:   hash the raw input (only identical requests share an entry)
+# banded:  bucket income/expenses into relative bands and canonicalize loans
+# simhash: cluster profiles by a SimHash signature over expense/debt ratios
+CACHE_KEY_STRATEGIES = ("exact", "banded", "simhash")
+CACHE_KEY_STRATEGY = os.getenv("AI_PLAN_CACHE_KEY_STRATEGY", "banded")
+INCOME_BAND_WIDTH = float(os.getenv("AI_PLAN_CACHE_INCOME_BAND", "0.10"))  # 10% relative bands
+EXPENSE_SHARE_STEP = float(os.getenv("AI_PLAN_CACHE_SHARE_STEP", "0.02"))  # 2% of income per step
+SIMHASH_BITS = int(os.getenv("AI_PLAN_CACHE_SIMHASH_BITS", "16"))
+SIMHASH_INCOME_BAND_WIDTH = 0.25  # Coarse income band kept alongside the SimHash signature
+
+# Expense sections across the legacy and V1.2 input formats
+_EXPENSE_SECTIONS = ("expenses", "fixed_expenses", "variable_expenses")
+
+
+# ===========================================
+# KEY NORMALIZATION
+# ===========================================
+
+def _relative_band(value: float, width: float) -> int:
+    """Logarithmic band index: values within ~`width` of each other share a band (0 for zero)."""
+    if not value or value <= 0:
+        return 0
+    return int(math.floor(math.log(value) / math.log1p(width))) + 1
+
+
+def _share_band(amount: float, income: float, step: float = EXPENSE_SHARE_STEP) -> int:
+    """Bucket an amount as a share of income in `step`-sized steps."""
+    if not amount or income <= 0:
+        return 0
+    return int(round(amount / income / step))
+
+
+def _total_income(financial_input: Dict[str, Any]) -> float:
+    return float(financial_input.get("monthly_income_primary") or 0) + \
+        float(financial_input.get("monthly_income_additional") or 0)
+
+
+def _loan_emi(loan: Dict[str, Any]) -> float:
+    """Monthly EMI of a loan dict (0 when the loan is not computable)."""
+    from schemas import LoanInput
+    from services.calculations import calculate_loan_emi
+
+    try:
+        return calculate_loan_emi(LoanInput(**loan))
+    except Exception:
+        return float(loan.get("monthly_emi") or 0)
+
+
+def _expense_shares(financial_input: Dict[str, Any], income: float) -> Dict[str, float]:
+    """Every expense category as a share of income, keyed `section.category`."""
+    shares: Dict[str, float] = {}
+    for section in _EXPENSE_SECTIONS:
+        for category, amount in (financial_input.get(section) or {}).items():
+            if isinstance(amount, (int, float)) and amount > 0 and income > 0:
+                shares[f"{section}.{category}"] = amount / income
+    return shares
+
 
-def _generate_cache_key(financial_input: Dict[Any, Any]) -> str:
+def _categorical_profile(financial_input: Dict[str, Any]) -> Dict[str, Any]:
+    """Non-numeric context that always has to match exactly."""
+    goals = financial_input.get("goals") or {}
+    return {
+        "currency": financial_input.get("currency"),
+        "country": (financial_input.get("country") or "").strip().lower(),
+        "city": (financial_input.get("city") or "").strip().lower(),
+        "city_tier": financial_input.get("city_tier"),
+        "lifestyle": financial_input.get("lifestyle"),
+        "family_size": financial_input.get("family_size"),
+        "col": round(float(financial_input.get("cost_of_living_index") or 1.0) * 20) / 20,  # 0.05 steps
+        "goal_type": goals.get("primary_goal_type"),
+    }
+
+
+def _canonical_loans(financial_input: Dict[str, Any], income: float) -> List[Tuple[int, float, int]]:
+    """Loans reduced to (EMI share band, rate to 0.5%, remaining years), order-independent."""
+    loans = [
+        (
+            _share_band(_loan_emi(loan), income),
+            round(float(loan.get("interest_rate_annual") or 0) * 2) / 2,
+            int(math.ceil(int(loan.get("remaining_months") or 0) / 12)),
+        )
+        for loan in financial_input.get("loans") or []
+    ]
+    return sorted(loans)
+
+
+def normalize_financial_input(financial_input: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Generate a unique cache key from financial input data.
+    Banded representation of a financial input for cache keys.
+
+    Incomes fall into relative (logarithmic) bands, expense categories and goals
+    into share-of-income steps, and loans are canonicalized (names and order dropped),
+    so near-identical profiles map to the same key.
+
+    Args:
+        financial_input: Dictionary representation of financial data
+
+    Returns:
+        Normalized dictionary suitable for hashing
+    """
+    income = _total_income(financial_input)
+    goals = financial_input.get("goals") or {}
+    return {
+        **_categorical_profile(financial_input),
+        "income_band": _relative_band(income, INCOME_BAND_WIDTH),
+        "expenses": {
+            category: _share_band(share * income, income)
+            for category, share in sorted(_expense_shares(financial_input, income).items())
+        },
+        "loans": _canonical_loans(financial_input, income),
+        "savings_target": _share_band(float(goals.get("monthly_savings_target") or 0), income),
+        "goal_amount_band": _relative_band(float(goals.get("primary_goal_amount") or 0), 0.25),
+        "savings_goals": sorted(
+            (_relative_band(float(goal.get("target") or 0), 0.25), int(goal.get("timeline") or 0) // 6,
+             int(goal.get("priority") or 0))
+            for goal in financial_input.get("savings_goals") or []
+        ),
+    }
+
+
+@lru_cache(maxsize=4096)
+def _simhash_weight(feature: str, bit: int) -> float:
+    """Deterministic Gaussian hyperplane weight for (feature, bit)."""
+    return random.Random(f"{feature}:{bit}").gauss(0.0, 1.0)
+
+
+def simhash_signature(features: Dict[str, float], bits: int = SIMHASH_BITS) -> int:
+    """
+    SimHash (random-hyperplane LSH) signature of a sparse feature vector.
+    Vectors pointing in similar directions share most signature bits.
+    """
+    signature = 0
+    for bit in range(bits):
+        projection = sum(value * _simhash_weight(name, bit) for name, value in features.items())
+        if projection >= 0:
+            signature |= 1 << bit
+    return signature
+
+
+def simhash_profile(financial_input: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Clustered representation of a financial input for cache keys.
+
+    The expense, EMI and savings-target ratios are reduced to a SimHash signature;
+    categorical context and a coarse income band still have to match exactly.
+    """
+    income = _total_income(financial_input)
+    goals = financial_input.get("goals") or {}
+    features = _expense_shares(financial_input, income)
+    if income > 0:
+        emi_total = sum(_loan_emi(loan) for loan in financial_input.get("loans") or [])
+        features["debt.emi"] = emi_total / income
+        features["goals.savings_target"] = float(goals.get("monthly_savings_target") or 0) / income
+    return {
+        **_categorical_profile(financial_input),
+        "income_band": _relative_band(income, SIMHASH_INCOME_BAND_WIDTH),
+        "has_loans": bool(financial_input.get("loans")),
+        "simhash": simhash_signature(features),
+    }
+
+
+def _generate_cache_key(
+    financial_input: Dict[Any, Any],
+    strategy: Optional[str] = None,
+    namespace: str = "",
+) -> str:
+    """
+    Generate a cache key from financial input data.
     
     Args:
         financial_input: Dictionary representation of financial data
+        strategy: Key strategy (exact, banded, simhash); defaults to CACHE_KEY_STRATEGY
+        namespace: Prefix separating different kinds of cached plans
         
     Returns:
-        MD5 hash of the input data
+        MD5 hash of the (normalized) input data
     """
+    strategy = strategy or CACHE_KEY_STRATEGY
+    if strategy not in CACHE_KEY_STRATEGIES:
+        logger.warning(f"Unknown cache key strategy '{strategy}', using exact keys")
+        strategy = "exact"
+    if strategy == "banded":
+        key_data: Dict[Any, Any] = normalize_financial_input(financial_input)
+    elif strategy == "simhash":
+        key_data = simhash_profile(financial_input)
+    else:
+        key_data = financial_input
+    
     # Sort keys for consistent hashing
-    sorted_input = json.dumps(financial_input, sort_keys=True)
-    return hashlib.md5(sorted_input.encode()).hexdigest()
+    sorted_input = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.md5(f"{namespace}:{strategy}:{sorted_input}".encode()).hexdigest()
 
 
-def get_cached_plan(financial_input: Dict[Any, Any]) -> Optional[Dict[Any, Any]]:
+# ===========================================
+# CACHE OPERATIONS
+# ===========================================
+
+def get_cached_plan(
+    financial_input: Dict[Any, Any],
+    namespace: str = "",
+    strategy: Optional[str] = None,
+) -> Optional[Dict[Any, Any]]:
     """
     Retrieve cached AI plan if available and not expired.
     
     Args:
         financial_input: Dictionary representation of financial data
+        namespace: Prefix separating different kinds of cached plans
+        strategy: Key strategy override (see CACHE_KEY_STRATEGIES)
         
     Returns:
         Cached plan data or None if not found/expired
     """
-    cache_key = _generate_cache_key(financial_input)
+    cache_key = _generate_cache_key(financial_input, strategy, namespace)
     
     if cache_key in _cache:
         cached_item = _cache[cache_key]
@@ -49,6 +245,8 @@ def get_cached_plan(financial_input: Dict[Any, Any]) -> Optional[Dict[Any, Any]]
         # Check if cache is still valid
         if time.time() - cached_item["timestamp"] < CACHE_TTL:
             logger.info(f"Cache HIT for key: {cache_key[:8]}...")
+            _stats["hits"] += 1
+            record_cache_lookup(namespace or "ai_plan", hit=True)
             return cached_item["data"]
         else:
             # Remove expired cache
@@ -56,18 +254,27 @@ def get_cached_plan(financial_input: Dict[Any, Any]) -> Optional[Dict[Any, Any]]
             del _cache[cache_key]
     
     logger.info(f"Cache MISS for key: {cache_key[:8]}...")
+    _stats["misses"] += 1
+    record_cache_lookup(namespace or "ai_plan", hit=False)
     return None
 
 
-def set_cached_plan(financial_input: Dict[Any, Any], plan_data: Dict[Any, Any]) -> None:
+def set_cached_plan(
+    financial_input: Dict[Any, Any],
+    plan_data: Dict[Any, Any],
+    namespace: str = "",
+    strategy: Optional[str] = None,
+) -> None:
     """
     Store AI plan in cache with timestamp.
     
     Args:
         financial_input: Dictionary representation of financial data
         plan_data: AI plan to cache
+        namespace: Prefix separating different kinds of cached plans
+        strategy: Key strategy override (see CACHE_KEY_STRATEGIES)
     """
-    cache_key = _generate_cache_key(financial_input)
+    cache_key = _generate_cache_key(financial_input, strategy, namespace)
     
     # Implement simple LRU: remove oldest item if cache is full
     if len(_cache) >= MAX_CACHE_SIZE:
@@ -83,10 +290,27 @@ def set_cached_plan(financial_input: Dict[Any, Any], plan_data: Dict[Any, Any])
     logger.info(f"Cache SET for key: {cache_key[:8]}... (Total cached: {len(_cache)})")
 
 
+def plan_cache_key(
+    financial_input: Dict[Any, Any],
+    namespace: str = "",
+    strategy: Optional[str] = None,
+) -> str:
+    """Cache key a plan for this input is stored under (used for heavy-hitter tracking)."""
+    return _generate_cache_key(financial_input, strategy, namespace)
+
+
+def get_cache_expiry(cache_key: str) -> Optional[float]:
+    """Expiry time (epoch seconds) of a cached entry, or None if it is not cached."""
+    cached_item = _cache.get(cache_key)
+    if cached_item is None:
+        return None
+    return cached_item["timestamp"] + CACHE_TTL
+
+
 def clear_cache() -> None:
     """Clear all cached items."""
-    global _cache
-    _cache = {}
+    _cache.clear()
+    _stats.update(hits=0, misses=0)
     logger.info("Cache cleared")
 
 
@@ -97,11 +321,19 @@ def get_cache_stats() -> Dict[str, Any]:
     Returns:
         Dictionary with cache stats (size, oldest entry age, etc.)
     """
+    lookups = _stats["hits"] + _stats["misses"]
+    hit_stats = {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "key_strategy": CACHE_KEY_STRATEGY,
+    }
     if not _cache:
         return {
             "size": 0,
             "oldest_entry_age_seconds": 0,
-            "total_entries": 0
+            "total_entries": 0,
+            **hit_stats
         }
     
     current_time = time.time()
@@ -111,5 +343,26 @@ def get_cache_stats() -> Dict[str, Any]:
         "size": len(_cache),
         "oldest_entry_age_seconds": int(current_time - oldest_timestamp),
         "total_entries": len(_cache),
-        "ttl_seconds": CACHE_TTL
+        "ttl_seconds": CACHE_TTL,
+        **hit_stats
     }
+
+
+def _snapshot_entries() -> List[SnapshotEntry]:
+    """Cache entries for persistent snapshots."""
+    return [(key, item["data"], item["timestamp"]) for key, item in list(_cache.items())]
+
+
+def _restore_entries(entries: List[SnapshotEntry]) -> int:
+    """Restore snapshot entries (newest first) without overwriting fresher ones."""
+    added = 0
+    for key, data, created_at in entries:
+        if len(_cache) >= MAX_CACHE_SIZE:
+            break
+        if key not in _cache:
+            _cache[key] = {"data": data, "timestamp": created_at}
+            added += 1
+    return added
+
+
+register_snapshot_source("ai_plan", _snapshot_entries, _restore_entries, CACHE_TTL)
@@ -0,0 +1,196 @@
+"""
+Scheduled cache pre-warmer
+Refreshes cache entries for the hottest keys before they expire, within a token budget per cycle.
+Opt-in, and per process: under gunicorn every worker runs its own pre-warmer on the traffic it
+sees, so OpenAI spend per cycle is up to workers x CACHE_PREWARM_TOKEN_BUDGET
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.heavy_hitters import HeavyHitter, get_tracker
+
+logger = logging.getLogger(__name__)
+
+PREWARM_INTERVAL = int(os.getenv("CACHE_PREWARM_INTERVAL_SECONDS", "300"))  # 0 disables the pre-warmer
+PREWARM_TOKEN_BUDGET = int(os.getenv("CACHE_PREWARM_TOKEN_BUDGET", "0"))  # OpenAI tokens per cycle per worker; 0 = off
+PREWARM_TOP_K = int(os.getenv("CACHE_PREWARM_TOP_K", "10"))  # Keys considered per cache
+PREWARM_MIN_HITS = float(os.getenv("CACHE_PREWARM_MIN_HITS", "3"))  # Minimum (decayed) hits to be "hot"
+PREWARM_DECAY = float(os.getenv("CACHE_PREWARM_DECAY", "0.5"))  # Count decay applied after each cycle
+
+# Weight of the newest observation in the per-cache token usage average
+TOKEN_USAGE_SMOOTHING = 0.2
+
+
+@dataclass
+class PrewarmTarget:
+    """A cache the pre-warmer keeps hot."""
+    name: str
+    tracker: str
+    expires_at: Callable[[str], Optional[float]]
+    refresh: Callable[[Any], Awaitable[Any]]
+    default_tokens: int
+
+
+_targets: Dict[str, PrewarmTarget] = {}
+_token_estimates: Dict[str, float] = {}
+_last_cycle: Dict[str, Any] = {}
+
+
+def register_prewarm_target(
+    name: str,
+    tracker: str,
+    expires_at: Callable[[str], Optional[float]],
+    refresh: Callable[[Any], Awaitable[Any]],
+    default_tokens: int,
+) -> None:
+    """
+    Register a cache for pre-warming.
+
+    Args:
+        name: Target name, also used for token usage accounting
+        tracker: Heavy-hitter tracker whose keys are this cache's keys
+        expires_at: Returns a key's expiry (epoch seconds) or None if not cached
+        refresh: Recomputes and caches the entry from a tracked payload, bypassing the cache
+        default_tokens: Token cost assumed per refresh until real usage is recorded
+    """
+    _targets[name] = PrewarmTarget(name, tracker, expires_at, refresh, default_tokens)
+
+
+def record_token_usage(name: str, total_tokens: int) -> None:
+    """Fold an AI call's token usage into the running estimate for that cache."""
+    previous = _token_estimates.get(name)
+    if previous is None:
+        _token_estimates[name] = float(total_tokens)
+    else:
+        _token_estimates[name] = previous + TOKEN_USAGE_SMOOTHING * (total_tokens - previous)
+
+
+def estimated_tokens(name: str) -> int:
+    """Expected token cost of one refresh of the named target."""
+    target = _targets.get(name)
+    default = target.default_tokens if target else 0
+    return int(round(_token_estimates.get(name, default)))
+
+
+def _candidates(now: float, horizon: float) -> List[Tuple[PrewarmTarget, HeavyHitter]]:
+    """Hot keys that are missing or expire within the horizon, hottest first across all caches."""
+    candidates: List[Tuple[PrewarmTarget, HeavyHitter]] = []
+    for target in list(_targets.values()):
+        for hitter in get_tracker(target.tracker).top(PREWARM_TOP_K):
+            if hitter.count < PREWARM_MIN_HITS:
+                break
+            if hitter.payload is None:
+                continue
+            expires_at = target.expires_at(hitter.key)
+            if expires_at is None or expires_at - now <= horizon:
+                candidates.append((target, hitter))
+    candidates.sort(key=lambda candidate: candidate[1].count, reverse=True)
+    return candidates
+
+
+async def run_prewarm_cycle(
+    token_budget: int = PREWARM_TOKEN_BUDGET,
+    horizon: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Refresh hot cache entries that would expire before the next cycle.
+
+    Args:
+        token_budget: Maximum estimated OpenAI tokens spent in this cycle
+        horizon: Refresh entries expiring within this many seconds (default: one interval)
+
+    Returns:
+        Cycle summary (refreshed, skipped over budget, failed, tokens spent)
+    """
+    started = time.time()
+    horizon = horizon if horizon is not None else max(PREWARM_INTERVAL, 1) * 1.5
+    refreshed = skipped = failed = 0
+    spent = 0
+
+    for target, hitter in _candidates(started, horizon):
+        cost = estimated_tokens(target.name)
+        if spent + cost > token_budget:
+            skipped += 1
+            continue
+        try:
+            await target.refresh(hitter.payload)
+            refreshed += 1
+        except Exception as e:
+            failed += 1
+            logger.warning(f"Pre-warm of {target.name} key {hitter.key[:8]}... failed: {e}")
+        spent += cost
+
+    for target in list(_targets.values()):
+        get_tracker(target.tracker).decay(PREWARM_DECAY)
+
+    summary = {
+        "refreshed": refreshed,
+        "skipped_over_budget": skipped,
+        "failed": failed,
+        "tokens_spent_estimate": spent,
+        "token_budget": token_budget,
+        "finished_at": time.time(),
+        "duration_ms": round((time.time() - started) * 1000, 2),
+    }
+    _last_cycle.clear()
+    _last_cycle.update(summary)
+    if refreshed or skipped or failed:
+        logger.info(f"Cache pre-warm: {summary}")
+    return summary
+
+
+def prewarm_stats() -> Dict[str, Any]:
+    """Pre-warmer configuration, token estimates and last cycle summary for monitoring."""
+    return {
+        "enabled": PREWARM_INTERVAL > 0 and PREWARM_TOKEN_BUDGET > 0,
+        "interval_seconds": PREWARM_INTERVAL,
+        "token_budget": PREWARM_TOKEN_BUDGET,  # This worker's; each worker has its own
+        "pid": os.getpid(),
+        "targets": {name: {"estimated_tokens": estimated_tokens(name)} for name in _targets},
+        "last_cycle": dict(_last_cycle),
+    }
+
+
+# ===========================================
+# APPLICATION LIFECYCLE
+# ===========================================
+
+_prewarm_task: Optional["asyncio.Task[None]"] = None
+
+
+async def _prewarm_loop() -> None:
+    while True:
+        await asyncio.sleep(PREWARM_INTERVAL)
+        try:
+            await run_prewarm_cycle()
+        except Exception as e:
+            logger.error(f"Cache pre-warm cycle failed: {e}", exc_info=True)
+
+
+async def start_cache_prewarmer() -> None:
+    """Start the periodic pre-warmer (no-op when the interval or token budget is 0)."""
+    global _prewarm_task
+    if PREWARM_INTERVAL <= 0 or PREWARM_TOKEN_BUDGET <= 0 or _prewarm_task is not None:
+        return
+    _prewarm_task = asyncio.create_task(_prewarm_loop())
+    logger.info(
+        f"Cache pre-warmer enabled in pid {os.getpid()} "
+        f"(every {PREWARM_INTERVAL}s, {PREWARM_TOKEN_BUDGET} tokens/cycle for this worker)"
+    )
+
+
+async def stop_cache_prewarmer() -> None:
+    """Stop the periodic pre-warmer."""
+    global _prewarm_task
+    if _prewarm_task is None:
+        return
+    _prewarm_task.cancel()
+    try:
+        await _prewarm_task
+    except asyncio.CancelledError:
+        pass
+    _prewarm_task = None
@@ -5,14 +5,25 @@ Reduces cost by storing identical request results for 6 hours.
 import json
 import hashlib
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
+
+from services.cache_snapshot import SnapshotEntry, register_snapshot_source
+from services.metrics import record_cache_lookup
 
 class ResultCache:
     """Simple in-memory cache with 6-hour TTL."""
     
-    def __init__(self, ttl_hours: int = 6):
+    def __init__(self, ttl_hours: int = 6, name: str = "result", max_size: Optional[int] = None):
+        self.name = name  # Metrics namespace
         self.cache: Dict[str, Tuple[Dict[str, Any], datetime]] = {}  # {hash: (result, timestamp)}
         self.ttl = timedelta(hours=ttl_hours)
+        self.max_size = max_size  # None = unbounded
+    
+    def _evict_oldest(self) -> None:
+        """Drop the oldest entry when the cache is full."""
+        if self.max_size is not None and len(self.cache) >= self.max_size:
+            oldest_key = min(self.cache, key=lambda k: self.cache[k][1])
+            del self.cache[oldest_key]
     
     def _make_key(self, request_data: Dict[str, Any]) -> Optional[str]:
         """Generate cache key from request (order-independent)."""
@@ -26,32 +37,58 @@ class ResultCache:
         """Retrieve cached result if fresh."""
         key = self._make_key(request_data)
         if not key or key not in self.cache:
+            record_cache_lookup(self.name, hit=False)
             return None
         
         result, timestamp = self.cache[key]
         if datetime.now() - timestamp > self.ttl:
             del self.cache[key]  # Expired
+            record_cache_lookup(self.name, hit=False)
             return None
         
+        record_cache_lookup(self.name, hit=True)
         return result
     
     def set(self, request_data: Dict[str, Any], result: Dict[str, Any]) -> None:
         """Store result in cache."""
         key = self._make_key(request_data)
         if key:
+            if key not in self.cache:
+                self._evict_oldest()
             self.cache[key] = (result, datetime.now())
     
     def clear(self) -> None:
         """Clear entire cache."""
         self.cache.clear()
     
+    def export_entries(self) -> List[SnapshotEntry]:
+        """Entries as (key, result, created_at epoch) for persistent snapshots."""
+        return [(key, result, timestamp.timestamp()) for key, (result, timestamp) in list(self.cache.items())]
+    
+    def import_entries(self, entries: List[SnapshotEntry]) -> int:
+        """Restore snapshot entries without overwriting fresher ones."""
+        added = 0
+        for key, result, created_at in entries:
+            if self.max_size is not None and len(self.cache) >= self.max_size:
+                break
+            if key not in self.cache:
+                self.cache[key] = (result, datetime.fromtimestamp(created_at))
+                added += 1
+        return added
+    
     def stats(self) -> Dict[str, Any]:
         """Return cache statistics."""
         return {
             "size": len(self.cache),
+            "max_size": self.max_size,
             "ttl_hours": self.ttl.total_seconds() / 3600,
         }
 
 
 # Global cache instance
-budget_cache = ResultCache(ttl_hours=6)
+budget_cache = ResultCache(ttl_hours=6, name="budget")
+register_snapshot_source(
+    "budget", budget_cache.export_entries, budget_cache.import_entries, budget_cache.ttl.total_seconds()
+)
+# Deterministic per seed; bounded because callers choose the seed, paths and goals in the key
+goal_simulation_cache = ResultCache(ttl_hours=6, name="goal_simulation", max_size=256)
@@ -0,0 +1,247 @@
+"""
+Persistent snapshots of the in-memory caches (AI plans, travel unit prices, budget results)
+Snapshots to SQLite on a timer and at shutdown, and reloads them on startup for warm restarts
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "")  # Empty disables snapshots
+CACHE_SNAPSHOT_INTERVAL = int(os.getenv("CACHE_SNAPSHOT_INTERVAL_SECONDS", "300"))  # 5 minutes
+
+# (key, value, created_at epoch seconds)
+SnapshotEntry = Tuple[str, Any, float]
+
+
+@dataclass
+class SnapshotSource:
+    """A cache that can be snapshotted: how to dump it, restore it, and how long entries live."""
+    name: str
+    dump: Callable[[], Iterable[SnapshotEntry]]
+    restore: Callable[[List[SnapshotEntry]], int]
+    ttl_seconds: float
+
+
+_sources: Dict[str, SnapshotSource] = {}
+
+
+def register_snapshot_source(
+    name: str,
+    dump: Callable[[], Iterable[SnapshotEntry]],
+    restore: Callable[[List[SnapshotEntry]], int],
+    ttl_seconds: float,
+) -> None:
+    """
+    Register a cache for snapshotting.
+
+    Args:
+        name: Namespace of the cache in the snapshot file
+        dump: Returns the cache's current (key, value, created_at) entries
+        restore: Loads entries back into the cache, returns how many were added
+        ttl_seconds: Entry lifetime; older entries are neither restored nor kept on disk
+    """
+    _sources[name] = SnapshotSource(name, dump, restore, ttl_seconds)
+
+
+class CacheSnapshotStore:
+    """
+    SQLite snapshot file with one zlib-compressed JSON blob per cache entry.
+    Workers sharing the file merge their entries (last writer wins per key).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Entries already on disk, so timer snapshots only write what changed
+        self._written: Dict[str, Dict[str, float]] = {}
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    payload BLOB NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def save(self, namespace: str, entries: Iterable[SnapshotEntry], ttl_seconds: float) -> int:
+        """Write new/changed entries for a namespace and prune expired ones."""
+        written = self._written.setdefault(namespace, {})
+        rows = [
+            (namespace, key, created_at, zlib.compress(json.dumps(value, default=str).encode()))
+            for key, value, created_at in entries
+            if written.get(key) != created_at
+        ]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, created_at, payload) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                    (namespace, time.time() - ttl_seconds),
+                )
+        finally:
+            conn.close()
+        for _, key, created_at, _ in rows:
+            written[key] = created_at
+        return len(rows)
+
+    def load(self, namespace: str, ttl_seconds: float) -> List[SnapshotEntry]:
+        """Read a namespace's unexpired entries, newest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, created_at, payload FROM cache_entries "
+                "WHERE namespace = ? AND created_at >= ? ORDER BY created_at DESC",
+                (namespace, time.time() - ttl_seconds),
+            ).fetchall()
+        finally:
+            conn.close()
+        entries: List[SnapshotEntry] = []
+        for key, created_at, payload in rows:
+            try:
+                entries.append((key, json.loads(zlib.decompress(payload)), created_at))
+            except (zlib.error, ValueError) as e:
+                logger.warning(f"Skipping corrupt snapshot entry {namespace}/{key[:8]}...: {e}")
+        self._written[namespace] = {key: created_at for key, _, created_at in entries}
+        return entries
+
+
+def collect_snapshot() -> Dict[str, List[SnapshotEntry]]:
+    """Copy every registered cache's entries (run on the event loop thread)."""
+    collected: Dict[str, List[SnapshotEntry]] = {}
+    for source in list(_sources.values()):
+        try:
+            collected[source.name] = list(source.dump())
+        except Exception as e:
+            logger.error(f"Collecting cache '{source.name}' for snapshot failed: {e}")
+    return collected
+
+
+def write_snapshot(store: CacheSnapshotStore, collected: Dict[str, List[SnapshotEntry]]) -> int:
+    """
+    Write collected entries to disk (safe to run in a thread).
+
+    Returns:
+        Number of entries written
+    """
+    total = 0
+    for name, entries in collected.items():
+        source = _sources.get(name)
+        if source is None:
+            continue
+        try:
+            total += store.save(name, entries, source.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Cache snapshot of '{name}' failed: {e}")
+    return total
+
+
+def save_snapshot(store: CacheSnapshotStore) -> int:
+    """Snapshot every registered cache synchronously."""
+    return write_snapshot(store, collect_snapshot())
+
+
+def read_snapshot(store: CacheSnapshotStore) -> Dict[str, List[SnapshotEntry]]:
+    """Read every registered cache's entries from disk (safe to run in a thread)."""
+    snapshot: Dict[str, List[SnapshotEntry]] = {}
+    for source in list(_sources.values()):
+        try:
+            snapshot[source.name] = store.load(source.name, source.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Reading cache snapshot of '{source.name}' failed: {e}")
+    return snapshot
+
+
+def restore_snapshot(snapshot: Dict[str, List[SnapshotEntry]]) -> int:
+    """Load previously read entries into the registered caches."""
+    total = 0
+    for name, entries in snapshot.items():
+        source = _sources.get(name)
+        if source is not None and entries:
+            total += source.restore(entries)
+    return total
+
+
+# ===========================================
+# APPLICATION LIFECYCLE
+# ===========================================
+
+_store: Optional[CacheSnapshotStore] = None
+_snapshot_task: Optional["asyncio.Task[None]"] = None
+
+
+async def _snapshot_loop(store: CacheSnapshotStore) -> None:
+    while True:
+        await asyncio.sleep(CACHE_SNAPSHOT_INTERVAL)
+        written = await asyncio.to_thread(write_snapshot, store, collect_snapshot())
+        if written:
+            logger.info(f"Cache snapshot: wrote {written} entries")
+
+
+async def _warm_start(store: CacheSnapshotStore) -> None:
+    started = time.time()
+    snapshot = await asyncio.to_thread(read_snapshot, store)
+    restored = restore_snapshot(snapshot)
+    logger.info(f"Cache snapshot: restored {restored} entries in {time.time() - started:.2f}s")
+
+
+async def start_cache_snapshots(path: Optional[str] = None) -> None:
+    """
+    Start background restore and periodic snapshots (no-op when CACHE_SNAPSHOT_PATH is unset).
+    The snapshot is read in a thread, so startup is not blocked by it.
+    """
+    global _store, _snapshot_task
+    path = path if path is not None else os.getenv("CACHE_SNAPSHOT_PATH", CACHE_SNAPSHOT_PATH)
+    if not path:
+        return
+    try:
+        _store = CacheSnapshotStore(path)
+    except sqlite3.Error as e:
+        logger.error(f"Cache snapshots disabled, cannot open {path}: {e}")
+        return
+
+    async def run() -> None:
+        await _warm_start(_store)
+        await _snapshot_loop(_store)
+
+    _snapshot_task = asyncio.create_task(run())
+    logger.info(f"Cache snapshots enabled ({path}, every {CACHE_SNAPSHOT_INTERVAL}s)")
+
+
+async def stop_cache_snapshots() -> None:
+    """Stop the snapshot timer and write a final snapshot."""
+    global _store, _snapshot_task
+    if _snapshot_task is not None:
+        _snapshot_task.cancel()
+        try:
+            await _snapshot_task
+        except asyncio.CancelledError:
+            pass
+        _snapshot_task = None
+    if _store is not None:
+        written = await asyncio.to_thread(write_snapshot, _store, collect_snapshot())
+        logger.info(f"Cache snapshot on shutdown: wrote {written} entries")
+        _store = None
@@ -0,0 +1,94 @@
+"""
+Response compression helpers
+Content-encoding negotiation, gzip/brotli encoders and precompressed static JSON payloads with per-encoding ETags
+"""
+import gzip
+import hashlib
+from typing import Any, Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from services.json_response import dump_json
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only without it
+    brotli = None
+
+GZIP_LEVEL = 6  # Per-response compression; static payloads use the maximum
+BROTLI_QUALITY = 4
+STATIC_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported encoding from an Accept-Encoding header (br over gzip).
+
+    Returns:
+        "br", "gzip" or None when the client accepts neither
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL if level is None else level, mtime=0)
+
+
+class PrecompressedJSON:
+    """
+    A JSON payload serialized and compressed once (at import/startup).
+
+    Serves the best encoding the client accepts with Cache-Control and a
+    strong ETag per encoding (the gzip and br bodies are different bytes),
+    and answers a matching If-None-Match with 304. The compression
+    middleware passes these responses through untouched.
+    """
+
+    def __init__(self, content: Any, cache_control: str = STATIC_CACHE_CONTROL):
+        self.body = dump_json(content)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.cache_control = cache_control
+        self.encoded: Dict[str, bytes] = {
+            "gzip": compress(self.body, "gzip", level=9),
+        }
+        if brotli is not None:
+            self.encoded["br"] = compress(self.body, "br", level=11)
+        self.etags: Dict[Optional[str], str] = {None: f'"{digest}"'}
+        self.etags.update({encoding: f'"{digest}-{encoding}"' for encoding in self.encoded})
+
+    def response(self, request: Request) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding not in self.encoded:
+            encoding = None
+        etag = self.etags[encoding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if if_none_match.strip() == "*" or etag in tags:
+            return Response(status_code=304, headers=headers)
+
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded[encoding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
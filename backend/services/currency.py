@@ -0,0 +1,151 @@
+"""
+Currency conversion
+Cross-rate matrix for any currency pair (built once per pricing snapshot) and one-pass conversion of a response's money fields
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.pricing_store import PricingSnapshot, current_pricing
+
+
+class UnsupportedCurrencyError(ValueError):
+    """A currency code has no rate in the pricing data."""
+
+
+class RateMatrix:
+    """
+    Every cross rate between the currencies in a pricing snapshot.
+
+    `matrix[i][j]` is the number of units of currency j per unit of currency i,
+    computed once from the per-USD rates, so converting between any pair is
+    two index lookups instead of a division per field.
+    """
+
+    def __init__(self, per_usd: Mapping[str, float], as_of: Optional[str] = None, version: str = ""):
+        self.codes: Tuple[str, ...] = tuple(sorted(per_usd))
+        self.as_of = as_of
+        self.version = version
+        # Upper- and lower-case aliases, so hot paths skip str.upper()
+        self._index: Dict[str, int] = {}
+        for i, code in enumerate(self.codes):
+            self._index[code] = self._index[code.lower()] = i
+        rates = [float(per_usd[code]) for code in self.codes]
+        self.matrix: Tuple[Tuple[float, ...], ...] = tuple(
+            tuple(target / source for target in rates) for source in rates
+        )
+
+    def position(self, currency: str) -> int:
+        index = self._index.get(currency)
+        if index is None:
+            index = self._index.get(currency.upper())
+            if index is None:
+                raise UnsupportedCurrencyError(f"Unsupported currency: {currency}")
+        return index
+
+    def supports(self, currency: str) -> bool:
+        return currency in self._index or currency.upper() in self._index
+
+    def rate(self, source: str, target: str) -> float:
+        """Units of `target` per unit of `source`."""
+        return self.matrix[self.position(source)][self.position(target)]
+
+    def rates_from(self, source: str, targets: Sequence[str]) -> List[float]:
+        """Rates from `source` to each of `targets`."""
+        row = self.matrix[self.position(source)]
+        return [row[self.position(target)] for target in targets]
+
+    def convert(self, amount: float, source: str, target: str) -> float:
+        return amount * self.rate(source, target)
+
+
+# The matrix for the snapshot it was built from; rebuilt on the first call after a pricing reload
+_cached: Tuple[Optional[PricingSnapshot], Optional[RateMatrix]] = (None, None)
+
+
+def rate_matrix(snapshot: Optional[PricingSnapshot] = None) -> RateMatrix:
+    """Rate matrix for `snapshot` (default: the live pricing snapshot)."""
+    global _cached
+    snapshot = snapshot or current_pricing()
+    source, matrix = _cached
+    if source is not snapshot or matrix is None:
+        matrix = RateMatrix(snapshot.currency_rates, snapshot.currency_rates_as_of, snapshot.version)
+        _cached = (snapshot, matrix)
+    return matrix
+
+
+def usd_rate(currency: str, matrix: Optional[RateMatrix] = None) -> float:
+    """Units of `currency` per USD; unknown currencies count as USD (1.0), as the travel planner always has."""
+    matrix = matrix or rate_matrix()
+    if not matrix.supports(currency):
+        return 1.0
+    return matrix.matrix[matrix.position("USD")][matrix.position(currency)]
+
+
+class MoneyFields:
+    """
+    Dotted paths of the monetary fields in a response payload, split once per response type.
+
+    Example:
+        TOTALS = MoneyFields("total", "flight.min", "flight.max")
+        TOTALS.convert(payload, rate)                     # in place, one pass
+        TOTALS.quote(payload, "INR", ["USD", "EUR"])      # every field in several currencies at once
+    """
+
+    def __init__(self, *paths: str):
+        self.paths: Tuple[Tuple[str, ...], ...] = tuple(tuple(path.split(".")) for path in paths)
+        # Layout for rebuilding nested output: every intermediate object (parents first),
+        # then each object's leaf keys with the positions of their values
+        self._objects = sorted({path[:depth] for path in self.paths for depth in range(1, len(path))}, key=len)
+        leaves: Dict[Tuple[str, ...], List[Tuple[str, int]]] = {}
+        for index, path in enumerate(self.paths):
+            leaves.setdefault(path[:-1], []).append((path[-1], index))
+        self._leaves = [(parent, tuple(items)) for parent, items in leaves.items()]
+
+    def _parent(self, payload: Dict[str, Any], path: Tuple[str, ...]) -> Dict[str, Any]:
+        for key in path[:-1]:
+            payload = payload[key]
+        return payload
+
+    def values(self, payload: Dict[str, Any]) -> List[float]:
+        return [self._parent(payload, path)[path[-1]] for path in self.paths]
+
+    def convert(self, payload: Dict[str, Any], rate: float) -> Dict[str, Any]:
+        """Multiply every money field by `rate` in place; returns the payload."""
+        for path in self.paths:
+            parent = self._parent(payload, path)
+            parent[path[-1]] = parent[path[-1]] * rate
+        return payload
+
+    def quote(
+        self,
+        payload: Dict[str, Any],
+        source: str,
+        targets: Iterable[str],
+        decimals: int = 2,
+        matrix: Optional[RateMatrix] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        The money fields converted into each target currency, nested like the payload.
+
+        The fields are read once and converted and rounded for every currency in one
+        vectorized step (currencies x fields), so extra display currencies cost almost nothing.
+        Rates come from `matrix` (default: the live one).
+
+        Raises:
+            UnsupportedCurrencyError: If the source or a target has no rate
+        """
+        targets = list(dict.fromkeys(target.upper() for target in targets))
+        rates = (matrix or rate_matrix()).rates_from(source, targets)
+        converted = np.round(np.outer(rates, self.values(payload)), decimals).tolist()
+        return {target: self._nest(row) for target, row in zip(targets, converted)}
+
+    def _nest(self, values: List[float]) -> Dict[str, Any]:
+        objects: Dict[Tuple[str, ...], Dict[str, Any]] = {(): {}}
+        for path in self._objects:
+            objects[path] = objects[path[:-1]][path[-1]] = {}
+        for parent, items in self._leaves:
+            node = objects[parent]
+            for key, index in items:
+                node[key] = values[index]
+        return objects[()]
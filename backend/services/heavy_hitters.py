@@ -0,0 +1,153 @@
+"""
+Heavy-hitter tracking for popular routes, itineraries and financial profiles
+Space-Saving sketch: bounded memory, approximate top-K with per-key error bounds
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HEAVY_HITTER_CAPACITY = int(os.getenv("HEAVY_HITTER_CAPACITY", "256"))  # Counters kept per tracker
+
+
+@dataclass
+class HeavyHitter:
+    """A tracked key with its estimated count (overestimated by at most `error`)."""
+    key: str
+    count: float
+    error: float
+    label: str
+    payload: Any
+    last_seen: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key[:12],
+            "label": self.label,
+            "count": round(self.count, 2),
+            "error": round(self.error, 2),
+            "last_seen": self.last_seen,
+        }
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter sketch (Metwally et al.).
+
+    Keeps at most `capacity` counters. An unseen key replaces the smallest
+    counter and inherits its count as error, so any key with true frequency
+    above total/capacity is guaranteed to be tracked. Each counter also keeps
+    the latest payload offered for its key, which the cache pre-warmer uses to
+    recompute the entry.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._counters: Dict[str, HeavyHitter] = {}
+        self._total = 0.0
+        self._lock = threading.Lock()  # Offered from threadpool workers too
+
+    def offer(self, key: str, payload: Any = None, label: str = "", weight: float = 1.0) -> None:
+        """Record `weight` occurrences of a key."""
+        now = time.time()
+        with self._lock:
+            self._total += weight
+            counter = self._counters.get(key)
+            if counter is None:
+                if len(self._counters) < self.capacity:
+                    counter = HeavyHitter(key, 0.0, 0.0, label, payload, now)
+                else:
+                    evicted = min(self._counters.values(), key=lambda c: c.count)
+                    del self._counters[evicted.key]
+                    counter = HeavyHitter(key, evicted.count, evicted.count, label, payload, now)
+                self._counters[key] = counter
+            counter.count += weight
+            counter.last_seen = now
+            if payload is not None:
+                counter.payload = payload
+            if label:
+                counter.label = label
+
+    def top(self, k: int) -> List[HeavyHitter]:
+        """The k keys with the highest estimated counts, hottest first."""
+        with self._lock:
+            ranked = sorted(self._counters.values(), key=lambda c: c.count, reverse=True)
+        return ranked[:k]
+
+    def decay(self, factor: float) -> None:
+        """Scale all counts so hotness tracks recent traffic rather than all-time totals."""
+        with self._lock:
+            self._total *= factor
+            for counter in self._counters.values():
+                counter.count *= factor
+                counter.error *= factor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._total = 0.0
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+# ===========================================
+# GLOBAL TRACKERS
+# ===========================================
+
+_trackers: Dict[str, SpaceSaving] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(name: str) -> SpaceSaving:
+    """Get (or create) the named tracker, e.g. "travel_route" or "ai_plan_profile"."""
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is None:
+            tracker = _trackers[name] = SpaceSaving()
+        return tracker
+
+
+def record_hit(name: str, key: str, payload: Any = None, label: str = "") -> None:
+    """
+    Record a request for a key in the named tracker.
+
+    Args:
+        name: Tracker name
+        key: Cache key the request maps to
+        payload: Data needed to recompute the key's cache entry (latest wins)
+        label: Human-readable description shown in stats
+    """
+    try:
+        get_tracker(name).offer(key, payload, label)
+    except Exception as e:  # Tracking must never break a request
+        logger.warning(f"Heavy-hitter tracking failed for {name}: {e}")
+
+
+def heavy_hitter_stats(k: int = 10, name: Optional[str] = None) -> Dict[str, Any]:
+    """Top-k keys per tracker for monitoring."""
+    with _trackers_lock:
+        trackers = {n: t for n, t in _trackers.items() if name is None or n == name}
+    return {
+        tracker_name: {
+            "tracked_keys": len(tracker),
+            "total": round(tracker.total, 2),
+            "top": [hitter.to_dict() for hitter in tracker.top(k)],
+        }
+        for tracker_name, tracker in trackers.items()
+    }
+
+
+def clear_trackers() -> None:
+    """Reset all trackers (used by tests)."""
+    with _trackers_lock:
+        for tracker in _trackers.values():
+            tracker.clear()
@@ -0,0 +1,148 @@
+"""
+Idempotency-Key support for expensive endpoints (AI plans, itineraries, PDF exports)
+Repeated keys replay the stored result or wait on the computation already in flight
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))  # 10 minutes
+MAX_IDEMPOTENCY_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "1000"))
+MAX_KEY_LENGTH = 255
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    future: "asyncio.Future[Any]"
+    created_at: float = field(default_factory=time.time)
+
+
+class IdempotencyStore:
+    """
+    Short-TTL, process-local store of results keyed by (operation, Idempotency-Key).
+
+    The first request with a key runs the computation; concurrent requests with the
+    same key await the same future, and later ones replay the stored result until it
+    expires. Failed computations are forgotten so the client can retry with the key.
+    """
+
+    def __init__(self, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS, max_keys: int = MAX_IDEMPOTENCY_KEYS):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+    def _purge(self) -> None:
+        """Drop expired entries (oldest first) and enforce the size bound."""
+        cutoff = time.time() - self.ttl_seconds
+        while self._entries:
+            entry_key, entry = next(iter(self._entries.items()))
+            expired = entry.created_at < cutoff and entry.future.done()
+            if not expired and len(self._entries) < self.max_keys:
+                break
+            del self._entries[entry_key]
+
+    async def run(
+        self,
+        operation: str,
+        key: str,
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """
+        Run `compute` once per (operation, key).
+
+        Args:
+            operation: Name of the endpoint/operation the key is scoped to
+            key: Client-supplied Idempotency-Key
+            fingerprint: Hash of the request payload
+            compute: Coroutine function producing the result
+
+        Returns:
+            (result, replayed) where replayed is True if the result was shared
+
+        Raises:
+            HTTPException: 422 if the key was already used with a different payload
+        """
+        self._purge()
+        entry_key = (operation, key)
+        entry = self._entries.get(entry_key)
+
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail={
+                        "error": True,
+                        "message": f"{IDEMPOTENCY_HEADER} was already used with a different request payload",
+                    }
+                )
+            logger.info(f"Idempotency HIT for {operation} ({'in flight' if not entry.future.done() else 'stored'})")
+            return await asyncio.shield(entry.future), True
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._entries[entry_key] = _Entry(fingerprint=fingerprint, future=future)
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._entries.pop(entry_key, None)
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when no one else is waiting
+            raise
+        future.set_result(result)
+        return result, False
+
+    def clear(self) -> None:
+        """Forget all stored keys."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+idempotency_store = IdempotencyStore()
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """Stable hash of a validated request model."""
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+async def run_idempotent(
+    operation: str,
+    key: Optional[str],
+    payload: BaseModel,
+    compute: Callable[[], Awaitable[Any]],
+) -> Tuple[Any, bool]:
+    """
+    Run `compute`, deduplicated by Idempotency-Key when the client sent one.
+
+    Args:
+        operation: Name of the endpoint/operation the key is scoped to
+        key: Idempotency-Key header value (None disables deduplication)
+        payload: Validated request body, used to detect key reuse with other data
+        compute: Coroutine function producing the result
+
+    Returns:
+        (result, replayed)
+    """
+    if not key:
+        return await compute(), False
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": True, "message": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters"}
+        )
+    return await idempotency_store.run(operation, key, request_fingerprint(payload), compute)
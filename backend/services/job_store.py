@@ -0,0 +1,286 @@
+"""
+Job store for long-running background work (AI plans, itineraries, PDF exports)
+Keeps job status and results so clients can poll or stream instead of holding a connection open
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+UNFINISHED_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "auto").lower()  # auto | memory | sqlite
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.sqlite3")
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))  # Finished jobs kept for 1 hour
+MAX_JOBS = int(os.getenv("JOB_STORE_MAX_JOBS", "1000"))  # In-memory store bound
+# Queued/running jobs not updated for this long are failed (their worker died or was restarted)
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+WORKER_COUNT = int(os.getenv("WEB_CONCURRENCY", "1"))  # Exported by gunicorn_config.py
+
+STALE_JOB_ERROR = "Job timed out: the worker running it stopped before it finished"
+
+
+@dataclass
+class Job:
+    """A unit of background work and its outcome."""
+    id: str
+    kind: str
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    result: Optional[bytes] = None
+    content_type: Optional[str] = None
+    filename: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def result_json(self) -> Optional[Any]:
+        """Decode a JSON result, or None for binary/missing results."""
+        if self.result is None or self.content_type != "application/json":
+            return None
+        return json.loads(self.result)
+
+    def to_status(self) -> Dict[str, Any]:
+        """Public status payload (binary results are referenced, not inlined)."""
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result_json(),
+            "has_result": self.result is not None,
+            "content_type": self.content_type,
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """Interface shared by the job store backends."""
+
+    def create(self, kind: str) -> Job:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Job]:
+        raise NotImplementedError
+
+    def update(self, job_id: str, **changes: Any) -> Optional[Job]:
+        raise NotImplementedError
+
+    def purge_expired(self) -> int:
+        raise NotImplementedError
+
+    def fail_stale(self) -> int:
+        raise NotImplementedError
+
+    @staticmethod
+    def _new_job(kind: str) -> Job:
+        return Job(id=uuid.uuid4().hex, kind=kind)
+
+    def _fail_if_stale(self, job: Optional[Job]) -> Optional[Job]:
+        """Mark one unfinished job failed when it has not been updated for JOB_STALE_SECONDS."""
+        if job is not None and not job.finished and job.updated_at < time.time() - self.stale_seconds:
+            logger.warning(f"Job {job.id[:8]}... stale in state {job.status}, marking failed")
+            return self.update(job.id, status=JOB_FAILED, error=STALE_JOB_ERROR)
+        return job
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store.
+    Fast, but jobs are only visible to the worker that created them.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = JOB_TTL_SECONDS,
+        max_jobs: int = MAX_JOBS,
+        stale_seconds: int = JOB_STALE_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self.stale_seconds = stale_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(self, kind: str) -> Job:
+        job = self._new_job(kind)
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs:
+                self._evict_locked()
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return self._fail_if_stale(job)
+
+    def update(self, job_id: str, **changes: Any) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.updated_at = time.time()
+            return job
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and job.updated_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def fail_stale(self) -> int:
+        cutoff = time.time() - self.stale_seconds
+        with self._lock:
+            stale = [job for job in self._jobs.values() if not job.finished and job.updated_at < cutoff]
+            for job in stale:
+                job.status, job.error, job.updated_at = JOB_FAILED, STALE_JOB_ERROR, time.time()
+        return len(stale)
+
+    def _evict_locked(self) -> None:
+        """Drop the oldest finished job (or the oldest job if none finished)."""
+        finished = [job for job in self._jobs.values() if job.finished]
+        candidates = finished or list(self._jobs.values())
+        oldest = min(candidates, key=lambda job: job.updated_at)
+        del self._jobs[oldest.id]
+        logger.info(f"Job store full, evicted job {oldest.id[:8]}...")
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite-backed job store.
+    Shared by all workers on the host, so a job can be polled from any worker.
+    """
+
+    _COLUMNS = ("id", "kind", "status", "created_at", "updated_at",
+                "result", "content_type", "filename", "error")
+
+    def __init__(self, path: str = JOB_STORE_PATH, ttl_seconds: int = JOB_TTL_SECONDS, stale_seconds: int = JOB_STALE_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    result BLOB,
+                    content_type TEXT,
+                    filename TEXT,
+                    error TEXT
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, kind: str) -> Job:
+        job = self._new_job(kind)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                tuple(getattr(job, column) for column in self._COLUMNS),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._fail_if_stale(Job(**dict(zip(self._COLUMNS, row))))
+
+    def update(self, job_id: str, **changes: Any) -> Optional[Job]:
+        changes["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*changes.values(), job_id),
+            )
+        return self.get(job_id)
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (*FINISHED_STATES, cutoff),
+            )
+        return cursor.rowcount
+
+    def fail_stale(self) -> int:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_FAILED, STALE_JOB_ERROR, now, *UNFINISHED_STATES, now - self.stale_seconds),
+            )
+        return cursor.rowcount
+
+
+_job_store: Optional[JobStore] = None
+
+
+def job_store_backend() -> str:
+    """
+    Backend to use: JOB_STORE_BACKEND when set to memory or sqlite, otherwise
+    sqlite when several workers serve requests (so any worker can answer a poll)
+    and memory for a single process.
+    """
+    if JOB_STORE_BACKEND in ("memory", "sqlite"):
+        return JOB_STORE_BACKEND
+    return "sqlite" if WORKER_COUNT > 1 else "memory"
+
+
+def get_job_store() -> JobStore:
+    """
+    Get the configured job store (created on first use).
+
+    See job_store_backend(); JOB_STORE_PATH sets the SQLite file, which all
+    workers on the host share.
+    """
+    global _job_store
+    if _job_store is None:
+        if job_store_backend() == "sqlite":
+            _job_store = SQLiteJobStore(JOB_STORE_PATH)
+        else:
+            _job_store = InMemoryJobStore()
+        logger.info(f"Job store initialized: {type(_job_store).__name__}")
+    return _job_store
@@ -0,0 +1,48 @@
+"""
+Fast JSON responses
+orjson for plain containers and pydantic's Rust serializer for models, written straight to bytes
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up (requirements-prod.txt)
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+def _orjson_default(value: Any) -> Any:
+    """Fallback for types orjson does not know (pydantic models nested in dicts, Decimal, sets, ...)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return to_jsonable_python(value)
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize a response body the way FastJSONResponse does."""
+    if isinstance(content, BaseModel):
+        # Same output as FastAPI's response_model serialization (by_alias), without the re-validation
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    if orjson is not None:
+        return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+    return to_json(content, by_alias=True)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    App-wide default response class.
+
+    Endpoints that return plain data still go through `response_model`
+    validation and only gain the faster encoder. Endpoints that build their
+    response model internally can return `FastJSONResponse(model)` to skip
+    re-validation entirely: FastAPI does not post-process Response objects,
+    while `response_model` on the route keeps the OpenAPI schema intact.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
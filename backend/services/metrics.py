@@ -0,0 +1,383 @@
+"""
+Prometheus-style application metrics (counters and histograms) with text exposition
+Multi-worker aware: each process flushes to METRICS_MULTIPROC_DIR and scrapes aggregate all files
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shared directory for multi-worker aggregation (ideally tmpfs, e.g. /dev/shm/vegakash-metrics)
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "5"))
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+AI_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def dump(self) -> List[Any]:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (e.g. latencies in seconds)."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts (non-cumulative), sum, count]
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._label_values(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the duration of a block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        series = self._values.get(self._label_values(labels))
+        return series[2] if series else 0
+
+    def dump(self) -> List[Any]:
+        with self._lock:
+            return [[list(key), [list(series[0]), series[1], series[2]]] for key, series in self._values.items()]
+
+
+class MetricsRegistry:
+    """All metrics of this process, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def dump(self) -> Dict[str, Any]:
+        """This process's metric values as JSON-serializable data."""
+        return {
+            metric.name: {
+                "type": metric.kind,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": [b for b in getattr(metric, "buckets", ()) if not math.isinf(b)],
+                "samples": metric.dump(),  # type: ignore[attr-defined]
+            }
+            for metric in self._metrics.values()
+        }
+
+    def clear(self) -> None:
+        """Reset all values (used by tests)."""
+        for metric in self._metrics.values():
+            with metric._lock:
+                metric._values.clear()  # type: ignore[attr-defined]
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ===========================================
+# MULTI-WORKER AGGREGATION
+# ===========================================
+
+def _process_file(directory: str, pid: Optional[int] = None) -> str:
+    return os.path.join(directory, f"metrics_{pid or os.getpid()}.json")
+
+
+def flush_metrics(directory: str = METRICS_MULTIPROC_DIR) -> None:
+    """Atomically write this process's metrics to the shared directory."""
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    path = _process_file(directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(REGISTRY.dump(), f)
+    os.replace(tmp_path, path)
+
+
+def _merge(into: Dict[str, Any], dump: Dict[str, Any]) -> None:
+    for name, metric in dump.items():
+        merged = into.setdefault(name, {**metric, "samples": {}})
+        for labels, value in metric["samples"]:
+            key = tuple(labels)
+            if metric["type"] == "counter":
+                merged["samples"][key] = merged["samples"].get(key, 0.0) + value
+            else:
+                existing = merged["samples"].get(key)
+                if existing is None:
+                    merged["samples"][key] = [list(value[0]), value[1], value[2]]
+                else:
+                    existing[0] = [a + b for a, b in zip(existing[0], value[0])]
+                    existing[1] += value[1]
+                    existing[2] += value[2]
+
+
+def collect_metrics(directory: str = METRICS_MULTIPROC_DIR) -> Dict[str, Any]:
+    """
+    Merge metrics across workers.
+
+    Without a multiprocess directory only this process is reported. With one,
+    every worker's last flush is summed (this process is flushed first), so
+    counters of workers that have exited are kept, as Prometheus expects.
+    """
+    merged: Dict[str, Any] = {}
+    if not directory:
+        _merge(merged, REGISTRY.dump())
+        return merged
+
+    flush_metrics(directory)
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith("metrics_") and filename.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, filename)) as f:
+                _merge(merged, json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics file {filename}: {e}")
+    return merged
+
+
+def render_metrics(directory: str = METRICS_MULTIPROC_DIR) -> str:
+    """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    for name, metric in sorted(collect_metrics(directory).items()):
+        labelnames = metric["labelnames"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for labels, value in sorted(metric["samples"].items()):
+            if metric["type"] == "counter":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            bucket_counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(list(metric["buckets"]) + [math.inf], bucket_counts):
+                cumulative += bucket_count
+                le = ("le", _format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def clear_multiprocess_dir(directory: str = METRICS_MULTIPROC_DIR) -> None:
+    """Remove stale worker files; call once in the master process before workers start."""
+    if not directory or not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        if filename.startswith("metrics_"):
+            os.remove(os.path.join(directory, filename))
+
+
+_flush_task: Optional["asyncio.Task[None]"] = None
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(flush_metrics)
+        except OSError as e:
+            logger.warning(f"Metrics flush failed: {e}")
+
+
+async def start_metrics_flusher() -> None:
+    """Periodically flush this worker's metrics (no-op without METRICS_MULTIPROC_DIR)."""
+    global _flush_task
+    if not METRICS_MULTIPROC_DIR or _flush_task is not None:
+        return
+    _flush_task = asyncio.create_task(_flush_loop())
+
+
+async def stop_metrics_flusher() -> None:
+    """Stop the flusher and write a final flush."""
+    global _flush_task
+    if _flush_task is None:
+        return
+    _flush_task.cancel()
+    try:
+        await _flush_task
+    except asyncio.CancelledError:
+        pass
+    _flush_task = None
+    flush_metrics()
+
+
+# ===========================================
+# APPLICATION METRICS
+# ===========================================
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "vegakash_http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "vegakash_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+AI_CALLS = REGISTRY.counter(
+    "vegakash_ai_calls_total", "OpenAI calls by call site and outcome (success, timeout, error)", ("site", "outcome")
+)
+AI_LATENCY = REGISTRY.histogram(
+    "vegakash_ai_call_duration_seconds", "OpenAI call latency by call site", ("site",), AI_LATENCY_BUCKETS
+)
+AI_TOKENS = REGISTRY.counter(
+    "vegakash_ai_tokens_total", "OpenAI tokens used by call site (prompt, completion)", ("site", "kind")
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "vegakash_cache_requests_total", "Cache lookups by namespace and result (hit, miss)", ("namespace", "result")
+)
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    "vegakash_rate_limit_rejections_total", "Requests rejected by a rate limiter", ("limiter",)
+)
+PDF_RENDER_LATENCY = REGISTRY.histogram(
+    "vegakash_pdf_render_duration_seconds", "PDF render time", (), (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+)
+
+_TIMEOUT_ERRORS = ("Timeout", "TimeoutError")
+
+
+def _is_timeout(error: BaseException) -> bool:
+    return isinstance(error, asyncio.TimeoutError) or any(
+        name in type(error).__name__ for name in _TIMEOUT_ERRORS
+    )
+
+
+@contextmanager
+def track_ai_call(site: str) -> Iterator[None]:
+    """
+    Time an OpenAI call and count its outcome.
+
+    Usage:
+        with track_ai_call("ai_plan_v2"):
+            response = client.chat.completions.create(...)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        AI_CALLS.inc(site=site, outcome="timeout" if _is_timeout(e) else "error")
+        raise
+    else:
+        AI_CALLS.inc(site=site, outcome="success")
+    finally:
+        AI_LATENCY.observe(time.perf_counter() - started, site=site)
+
+
+def record_ai_usage(site: str, usage: Any) -> None:
+    """Count prompt/completion tokens from an OpenAI `response.usage` object."""
+    if usage is None:
+        return
+    AI_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, site=site, kind="prompt")
+    AI_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, site=site, kind="completion")
+
+
+def record_cache_lookup(namespace: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(namespace=namespace, result="hit" if hit else "miss")
+
+
+def cache_hit_ratios() -> Dict[str, Dict[str, float]]:
+    """Hit ratio per cache namespace (this process) for /api/v1/stats."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for (namespace, result), value in list(CACHE_REQUESTS._values.items()):
+        totals.setdefault(namespace, {"hit": 0.0, "miss": 0.0})[result] = value
+    return {
+        namespace: {
+            "hits": counts["hit"],
+            "misses": counts["miss"],
+            "hit_ratio": round(counts["hit"] / (counts["hit"] + counts["miss"]), 4),
+        }
+        for namespace, counts in totals.items()
+        if counts["hit"] + counts["miss"] > 0
+    }
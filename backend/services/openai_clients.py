@@ -0,0 +1,70 @@
+"""
+Shared OpenAI clients
+One client (and connection pool) per process and configuration, honoring OPENAI_BASE_URL
+The SDK (~0.5s to import) is loaded on first use or by warm_up(), not at application import
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from services.warmup import register_warmer
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+
+def openai_base_url() -> Optional[str]:
+    """
+    Base URL for OpenAI-compatible APIs, e.g. the local stub
+    (benchmarks/openai_stub.py) at http://127.0.0.1:8100/v1. None means api.openai.com.
+    """
+    return os.getenv("OPENAI_BASE_URL") or None
+
+
+@lru_cache(maxsize=8)
+def _sync_client(api_key: Optional[str], base_url: Optional[str], timeout: Optional[float]) -> "OpenAI":
+    from openai import OpenAI
+
+    logger.info(f"Creating OpenAI client (base URL: {base_url or 'default'})")
+    return OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+
+
+@lru_cache(maxsize=8)
+def _async_client(api_key: Optional[str], base_url: Optional[str], timeout: Optional[float]) -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
+
+    logger.info(f"Creating async OpenAI client (base URL: {base_url or 'default'})")
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+
+
+def get_openai_client(api_key: Optional[str] = None, timeout: Optional[float] = None) -> "OpenAI":
+    """
+    Get the shared synchronous client (thread-safe; reused across requests).
+
+    Args:
+        api_key: API key, defaults to OPENAI_API_KEY
+        timeout: Request timeout in seconds, defaults to the SDK default
+    """
+    return _sync_client(api_key or os.getenv("OPENAI_API_KEY"), openai_base_url(), timeout)
+
+
+def get_async_openai_client(api_key: Optional[str] = None, timeout: Optional[float] = None) -> "AsyncOpenAI":
+    """Get the shared async client (see get_openai_client)."""
+    return _async_client(api_key or os.getenv("OPENAI_API_KEY"), openai_base_url(), timeout)
+
+
+def _import_sdk() -> None:
+    import openai  # noqa: F401
+
+
+def _warm_up_clients() -> None:
+    # Clients own connection pools, so they are built per worker, never before fork
+    if os.getenv("OPENAI_API_KEY"):
+        get_async_openai_client()
+
+
+register_warmer("openai_sdk", _import_sdk, fork_safe=True)
+register_warmer("openai_client", _warm_up_clients)
@@ -0,0 +1,27 @@
+"""
+PDF export entry point
+Loads the ReportLab generator (and reportlab itself) on first use or warm-up instead of at application import
+"""
+from typing import Optional
+
+from schemas import AIPlanOutput, FinancialInput, SummaryOutput
+from services.warmup import register_warmer
+
+
+def load_pdf_engine() -> None:
+    """Import the PDF generator now (called by the background warm-up)."""
+    import services.pdf_generator_reportlab  # noqa: F401
+
+
+def generate_pdf_bytes(
+    financial_input: FinancialInput,
+    summary: SummaryOutput,
+    ai_plan: Optional[AIPlanOutput] = None
+) -> bytes:
+    """Render the financial plan PDF (see services.pdf_generator_reportlab.generate_pdf_bytes)."""
+    from services.pdf_generator_reportlab import generate_pdf_bytes as render_pdf
+
+    return render_pdf(financial_input, summary, ai_plan)
+
+
+register_warmer("pdf_engine", load_pdf_engine, fork_safe=True)
@@ -14,8 +14,10 @@ from reportlab.platypus import Flowable
 from reportlab.lib.enums import TA_CENTER
 
 from schemas import FinancialInput, SummaryOutput, AIPlanOutput
+from services.metrics import PDF_RENDER_LATENCY
 
 
+@PDF_RENDER_LATENCY.time()
 def generate_pdf_bytes(
     financial_input: FinancialInput,
     summary: SummaryOutput,
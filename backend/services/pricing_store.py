@@ -0,0 +1,232 @@
+"""
+Versioned pricing and reference data store
+Loads data/pricing.json into an immutable snapshot and swaps in a new one when the file changes, without a restart
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRICING_DATA_PATH = os.getenv("PRICING_DATA_PATH", str(Path(__file__).resolve().parent.parent / "data" / "pricing.json"))
+PRICING_RELOAD_INTERVAL = float(os.getenv("PRICING_RELOAD_INTERVAL_SECONDS", "30"))
+
+TRAVEL_COST_CATEGORIES = ("hotel_per_night", "food_per_person_day", "transport_per_person_day", "activities_per_person_day")
+DESTINATION_TIERS = ("low_cost_countries", "mid_cost_countries", "high_cost_countries", "premium_destinations")
+
+# (mtime_ns, size) of the data file a snapshot was built from
+FileSignature = Tuple[int, int]
+
+
+class PricingDataError(ValueError):
+    """The pricing data file is missing, malformed or incomplete."""
+
+
+@dataclass(frozen=True)
+class PricingSnapshot:
+    """
+    One consistent version of the pricing data.
+
+    Snapshots are never modified: a reload builds a new one and replaces the
+    current reference, so a request that took a snapshot keeps seeing a single
+    version even if a reload happens mid-request.
+    """
+    version: str
+    loaded_at: float
+    signature: FileSignature
+    currency_rates: Mapping[str, float]  # Units per USD (see services.currency for cross rates)
+    # When the rates were captured (ISO 8601), so responses can say how fresh conversions are
+    currency_rates_as_of: Optional[str]
+    # category -> style (or transport mode) -> destination tier -> USD
+    travel_costs: Mapping[str, Mapping[str, Mapping[str, float]]]
+    # vehicle type -> lender type -> base rate (% p.a.)
+    auto_loan_base_rates: Mapping[str, Mapping[str, float]]
+    # (minimum credit score, rate adjustment), highest score first
+    credit_score_adjustments: Tuple[Tuple[int, float], ...]
+
+    def travel_cost(self, category: str, style: str, tier: str) -> float:
+        """Fallback unit cost in USD, e.g. travel_cost("hotel_per_night", "standard", "mid_cost_countries")."""
+        return self.travel_costs[category][style][tier]
+
+    def auto_loan_base_rate(self, vehicle_type: str, bank_type: str) -> float:
+        rates = self.auto_loan_base_rates.get(vehicle_type, self.auto_loan_base_rates["new_car"])
+        return rates.get(bank_type, 9.5)
+
+    def credit_score_adjustment(self, credit_score: int) -> float:
+        for min_score, adjustment in self.credit_score_adjustments:
+            if credit_score >= min_score:
+                return adjustment
+        return self.credit_score_adjustments[-1][1]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _number_table(section: str, table: Any, depth: int) -> Dict[str, Any]:
+    """Validate a nested {str: ... {str: number}} table `depth` levels deep."""
+    if not isinstance(table, dict) or not table:
+        raise PricingDataError(f"'{section}' must be a non-empty object")
+    for key, value in table.items():
+        if depth > 1:
+            _number_table(f"{section}.{key}", value, depth - 1)
+        elif isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise PricingDataError(f"'{section}.{key}' must be a non-negative number, got {value!r}")
+    return table
+
+
+def parse_snapshot(raw: Dict[str, Any], signature: FileSignature = (0, 0)) -> PricingSnapshot:
+    """
+    Validate raw pricing data and build a snapshot; nothing is swapped in unless this succeeds.
+
+    Raises:
+        PricingDataError: If a section is missing or holds invalid values
+    """
+    try:
+        version = str(raw["version"])
+        currency_rates = _number_table("currency_rates", raw["currency_rates"], 1)
+        travel_costs = _number_table("travel_costs", raw["travel_costs"], 3)
+        auto_loan = raw["auto_loan"]
+        base_rates = _number_table("auto_loan.base_rates", auto_loan["base_rates"], 2)
+        adjustments = tuple(sorted(
+            ((int(score), float(adjustment)) for score, adjustment in auto_loan["credit_score_adjustments"]),
+            reverse=True,
+        ))
+    except PricingDataError:
+        raise
+    except (KeyError, TypeError, ValueError) as e:
+        raise PricingDataError(f"Invalid pricing data: {e!r}") from e
+
+    if any(rate <= 0 for rate in currency_rates.values()):
+        raise PricingDataError("currency_rates must be positive")
+    if currency_rates.get("USD") != 1.0:
+        raise PricingDataError("currency_rates must be quoted per USD (USD = 1.0)")
+    for category in TRAVEL_COST_CATEGORIES:
+        if category not in travel_costs:
+            raise PricingDataError(f"travel_costs.{category} is missing")
+        for style, tiers in travel_costs[category].items():
+            missing = set(DESTINATION_TIERS) - set(tiers)
+            if missing:
+                raise PricingDataError(f"travel_costs.{category}.{style} is missing tiers {sorted(missing)}")
+    if "new_car" not in base_rates:
+        raise PricingDataError("auto_loan.base_rates must include 'new_car' (the default vehicle type)")
+    if not adjustments:
+        raise PricingDataError("auto_loan.credit_score_adjustments must not be empty")
+
+    return PricingSnapshot(
+        version=version,
+        loaded_at=time.time(),
+        signature=signature,
+        currency_rates=_freeze({code.upper(): float(rate) for code, rate in currency_rates.items()}),
+        currency_rates_as_of=raw.get("currency_rates_as_of"),
+        travel_costs=_freeze(travel_costs),
+        auto_loan_base_rates=_freeze(base_rates),
+        credit_score_adjustments=adjustments,
+    )
+
+
+def _file_signature(path: str) -> FileSignature:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_snapshot(path: str) -> PricingSnapshot:
+    """Read and validate a pricing data file."""
+    try:
+        signature = _file_signature(path)
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise PricingDataError(f"Cannot read pricing data {path}: {e}") from e
+    return parse_snapshot(raw, signature)
+
+
+# ===========================================
+# CURRENT SNAPSHOT
+# ===========================================
+
+# Replaced wholesale on reload (a single reference assignment, so readers see the old or the new snapshot)
+_snapshot: PricingSnapshot = load_snapshot(PRICING_DATA_PATH)
+_reload_failures = 0
+
+
+def current_pricing() -> PricingSnapshot:
+    """The live pricing snapshot; take it once per request and read everything from it."""
+    return _snapshot
+
+
+def reload_pricing(path: Optional[str] = None, force: bool = False) -> bool:
+    """
+    Swap in the data file's contents if it changed since the current snapshot was built.
+
+    An invalid file is logged and ignored, so the previous version stays live.
+
+    Returns:
+        True if a new snapshot was swapped in
+    """
+    global _snapshot, _reload_failures
+    path = path or PRICING_DATA_PATH
+    try:
+        if not force and _file_signature(path) == _snapshot.signature:
+            return False
+        snapshot = load_snapshot(path)
+    except (OSError, PricingDataError) as e:
+        _reload_failures += 1
+        logger.error(f"Pricing reload failed, keeping version {_snapshot.version}: {e}")
+        return False
+    previous, _snapshot = _snapshot.version, snapshot
+    logger.info(f"Pricing data reloaded: version {previous} -> {snapshot.version}")
+    return True
+
+
+def pricing_stats() -> Dict[str, Any]:
+    return {
+        "version": _snapshot.version,
+        "loaded_at": _snapshot.loaded_at,
+        "currencies": len(_snapshot.currency_rates),
+        "currency_rates_as_of": _snapshot.currency_rates_as_of,
+        "reload_failures": _reload_failures,
+    }
+
+
+# ===========================================
+# APPLICATION LIFECYCLE
+# ===========================================
+
+_watch_task: Optional["asyncio.Task[None]"] = None
+
+
+async def _watch_loop() -> None:
+    while True:
+        await asyncio.sleep(PRICING_RELOAD_INTERVAL)
+        await asyncio.to_thread(reload_pricing)
+
+
+async def start_pricing_watcher() -> None:
+    """Poll the pricing data file and hot-swap changes (PRICING_RELOAD_INTERVAL_SECONDS=0 disables)."""
+    global _watch_task
+    if PRICING_RELOAD_INTERVAL <= 0 or _watch_task is not None:
+        return
+    # Pick up edits made since import (e.g. in the gunicorn master before this worker forked)
+    await asyncio.to_thread(reload_pricing)
+    _watch_task = asyncio.create_task(_watch_loop())
+
+
+async def stop_pricing_watcher() -> None:
+    global _watch_task
+    if _watch_task is None:
+        return
+    _watch_task.cancel()
+    try:
+        await _watch_task
+    except asyncio.CancelledError:
+        pass
+    _watch_task = None
@@ -0,0 +1,162 @@
+"""
+In-process profiling for live workers
+Pure-Python stack sampler (collapsed-stack output for flamegraphs) and tracemalloc snapshot diffs
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+MIN_SAMPLE_INTERVAL = 0.001  # seconds
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Sample every thread's Python stack at a fixed interval.
+
+    Runs in its own thread, so it also sees the event loop thread while it is
+    busy. Output is the "collapsed stack" format (root;...;leaf count) accepted
+    by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = max(interval, MIN_SAMPLE_INTERVAL)
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+    def sample_once(self, skip_thread_ids: Optional[set] = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if skip_thread_ids and thread_id in skip_thread_ids:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.samples[";".join(reversed(stack))] += 1
+        self.sample_count += 1
+
+    def run(self, seconds: float) -> "StackSampler":
+        """Sample for `seconds` (blocking; call from a worker thread)."""
+        own_thread = {threading.get_ident()}
+        deadline = time.monotonic() + min(seconds, MAX_PROFILE_SECONDS)
+        while time.monotonic() < deadline:
+            self.sample_once(own_thread)
+            time.sleep(self.interval)
+        return self
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+_profile_lock = threading.Lock()
+
+
+def sample_stacks(seconds: float, interval: float = 0.01) -> Optional[StackSampler]:
+    """
+    Run one sampling session; returns None if another session is already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        logger.info(f"Stack sampling for {seconds}s every {interval * 1000:.0f}ms")
+        return StackSampler(interval).run(seconds)
+    finally:
+        _profile_lock.release()
+
+
+# ===========================================
+# MEMORY (tracemalloc)
+# ===========================================
+
+_baseline: Optional[tracemalloc.Snapshot] = None
+_memory_lock = threading.Lock()
+
+# Named size probes for known growth suspects (registered by their owners)
+_size_probes: Dict[str, Callable[[], int]] = {}
+
+
+def register_size_probe(name: str, probe: Callable[[], int]) -> None:
+    """Report the size of a long-lived structure (e.g. an unbounded dict) in memory reports."""
+    _size_probes[name] = probe
+
+
+def container_sizes() -> Dict[str, int]:
+    sizes: Dict[str, int] = {}
+    for name, probe in list(_size_probes.items()):
+        try:
+            sizes[name] = int(probe())
+        except Exception as e:
+            logger.warning(f"Size probe {name} failed: {e}")
+    return sizes
+
+
+def start_memory_tracing(frames: int = 10) -> None:
+    """Start tracemalloc (if needed) and take the baseline snapshot."""
+    global _baseline
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _baseline = tracemalloc.take_snapshot()
+
+
+def stop_memory_tracing() -> None:
+    global _baseline
+    with _memory_lock:
+        _baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def memory_diff(limit: int = 25, key_type: str = "lineno", reset_baseline: bool = False) -> Dict[str, Any]:
+    """
+    Compare the current allocations with the baseline snapshot.
+
+    Args:
+        limit: Number of top allocation sites to report
+        key_type: Grouping ("lineno", "filename" or "traceback")
+        reset_baseline: Make this snapshot the new baseline (diff since last call)
+
+    Returns:
+        Top allocation growth sites, traced totals and registered container sizes
+    """
+    global _baseline
+    with _memory_lock:
+        if not tracemalloc.is_tracing() or _baseline is None:
+            raise RuntimeError("Memory tracing is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+        stats = snapshot.compare_to(_baseline, key_type)
+        if reset_baseline:
+            _baseline = snapshot
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "containers": container_sizes(),
+        "top_growth": [
+            {
+                "location": str(stat.traceback[0]) if key_type != "traceback" else stat.traceback.format(),
+                "size_diff_bytes": stat.size_diff,
+                "size_bytes": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ],
+    }
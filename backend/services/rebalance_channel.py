@@ -0,0 +1,188 @@
+"""
+WebSocket channel for interactive budget editing
+Keeps a rebalance session per connection, coalesces bursts of slider edits and pushes back only the changed plan fields
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, Optional, Tuple, Union
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from budget_schemas.budget_planner import BudgetRebalanceDeltaRequest, BudgetRebalanceDeltaResponse
+from services.budget_planner_service import BudgetPlannerService
+from services.rebalance_engine import EDITABLE_INPUTS, RebalanceSession, apply_changes
+
+logger = logging.getLogger(__name__)
+
+# Edits arriving within this window of the first one are merged into a single update
+REBALANCE_WS_DEBOUNCE = float(os.getenv("REBALANCE_WS_DEBOUNCE_MS", "40")) / 1000
+REBALANCE_WS_IDLE_TIMEOUT = float(os.getenv("REBALANCE_WS_IDLE_SECONDS", "300"))
+REBALANCE_WS_MAX_MESSAGE_BYTES = int(os.getenv("REBALANCE_WS_MAX_MESSAGE_BYTES", "65536"))
+# Unread frames buffered per connection; a client sending faster than this is throttled by TCP backpressure
+REBALANCE_WS_QUEUE_SIZE = 32
+
+# Close codes (4000-4999 are application defined)
+CLOSE_NORMAL = 1000
+CLOSE_POLICY = 1008
+CLOSE_TOO_BIG = 1009
+CLOSE_UNKNOWN_SESSION = 4404
+
+_CLOSED = object()  # Queued by the reader when the client disconnects
+Frame = Union[str, object, None]
+
+
+class RebalanceChannel:
+    """
+    One client connection.
+
+    Protocol (JSON text frames):
+        client -> {"edited_plan": {...}, "original_inputs": {...}}   first frame: start a session
+                  {"session_id": "..."}                                 or resume one after a reconnect
+                  {"seq": 7, "changes": {"needs_percent": 55}}          then edits
+        server -> BudgetRebalanceDeltaResponse: every field once (full=true), then only changed fields,
+                  with `seq` of the last edit applied and how many edits were coalesced
+                  {"success": false, "error": "..."} for a rejected frame (the connection stays open)
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[Frame]" = asyncio.Queue(maxsize=REBALANCE_WS_QUEUE_SIZE)
+        self.session: Optional[RebalanceSession] = None
+
+    async def serve(self) -> None:
+        await self.websocket.accept()
+        reader = asyncio.create_task(self._read())
+        try:
+            if await self._open():
+                await self._edit_loop()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            reader.cancel()
+
+    async def _read(self) -> None:
+        """Move frames from the socket to the queue, so the edit loop can wait on both edits and time."""
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                if len(text) > REBALANCE_WS_MAX_MESSAGE_BYTES:
+                    await self.websocket.close(code=CLOSE_TOO_BIG)
+                    break
+                await self.queue.put(text)
+        except (WebSocketDisconnect, RuntimeError, KeyError):
+            # KeyError: binary frame (receive_text() expects text)
+            pass
+        await self.queue.put(_CLOSED)
+
+    async def _next(self, timeout: float) -> Frame:
+        """Next frame; _CLOSED on disconnect, None on timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    @staticmethod
+    def _parse(frame: str) -> Tuple[Optional[BudgetRebalanceDeltaRequest], Optional[str]]:
+        """(message, None) or (None, error detail)."""
+        try:
+            message = BudgetRebalanceDeltaRequest.model_validate_json(frame)
+        except ValidationError as e:
+            return None, f"Invalid message: {e.errors()[0]['msg']}"
+        unknown = set(message.changes) - set(EDITABLE_INPUTS)
+        if unknown:
+            return None, f"Cannot edit {sorted(unknown)}; editable fields: {list(EDITABLE_INPUTS)}"
+        return message, None
+
+    async def _send_error(self, detail: str) -> None:
+        await self.websocket.send_text(json.dumps({"success": False, "error": detail}))
+
+    async def _send(self, response: BudgetRebalanceDeltaResponse) -> None:
+        await self.websocket.send_text(response.model_dump_json())
+
+    async def _open(self) -> bool:
+        """Start or resume the session from the first frame."""
+        frame = await self._next(REBALANCE_WS_IDLE_TIMEOUT)
+        if frame is None or frame is _CLOSED:
+            await self._close(CLOSE_NORMAL)
+            return False
+        message, error = self._parse(frame)
+        if message is None:
+            await self._send_error(error)
+            await self._close(CLOSE_POLICY)
+            return False
+
+        session, started = BudgetPlannerService.open_rebalance_session(message)
+        if session is None:
+            await self._close(CLOSE_UNKNOWN_SESSION, "Unknown or expired rebalance session")
+            return False
+        self.session = session
+        _, recomputed = apply_changes(session, message.changes)
+        # A resumed session also gets every field: the client may have missed updates while disconnected
+        await self._send(BudgetRebalanceDeltaResponse(
+            session_id=session.id,
+            revision=session.revision,
+            full=True,
+            changed=session.outputs(),
+            recomputed=recomputed,
+            seq=message.seq,
+        ))
+        logger.debug(f"Rebalance channel {'started' if started else 'resumed'} session {session.id}")
+        return True
+
+    async def _edit_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            frame = await self._next(REBALANCE_WS_IDLE_TIMEOUT)
+            if frame is None:
+                await self._close(CLOSE_NORMAL, "Idle timeout")
+                return
+            if frame is _CLOSED:
+                return
+
+            # Coalesce: later values for the same field win
+            changes: Dict[str, float] = {}
+            seq: Optional[int] = None
+            coalesced = 0
+            closed = False
+            deadline = loop.time() + REBALANCE_WS_DEBOUNCE
+            while True:
+                message, error = self._parse(frame)
+                if message is None:
+                    await self._send_error(error)
+                else:
+                    changes.update(message.changes)
+                    seq = message.seq if message.seq is not None else seq
+                    coalesced += 1
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                frame = await self._next(remaining)
+                if frame is None:
+                    break
+                if frame is _CLOSED:
+                    closed = True
+                    break
+
+            if coalesced:
+                # Applied even if the client left, so a resume picks the edits up
+                changed, recomputed = apply_changes(self.session, changes)
+            if coalesced and not closed:
+                await self._send(BudgetRebalanceDeltaResponse(
+                    session_id=self.session.id,
+                    revision=self.session.revision,
+                    changed=changed,
+                    recomputed=recomputed,
+                    seq=seq,
+                    coalesced=coalesced,
+                ))
+            if closed:
+                return
+
+    async def _close(self, code: int, reason: str = "") -> None:
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except RuntimeError:
+            pass  # Already closed
@@ -0,0 +1,293 @@
+"""
+Incremental recompute engine for budget rebalancing
+Tracks which amounts, alerts and explanation lines depend on which inputs, recomputes only what an edit affects and returns the delta
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from utils.alert_detector import (
+    detect_high_emi_alert,
+    detect_high_rent_alert,
+    detect_high_wants_alert,
+    detect_insufficient_emergency_alert,
+    detect_low_savings_alert,
+    detect_negative_cashflow_alert,
+    sort_alerts,
+)
+
+logger = logging.getLogger(__name__)
+
+REBALANCE_SESSION_TTL = int(os.getenv("REBALANCE_SESSION_TTL_SECONDS", "1800"))  # 30 minutes idle
+REBALANCE_MAX_SESSIONS = int(os.getenv("REBALANCE_MAX_SESSIONS", "5000"))
+
+# The rebalance explanation compares against the standard 50/30/20 split
+ORIGINAL_SPLIT = {"needs": 50.0, "wants": 30.0, "savings": 20.0}
+
+
+class DependencyGraph:
+    """
+    Named computations over named inputs, evaluated in dependency order.
+
+    Nodes must be added after the nodes they depend on. `update` marks the
+    dependents of changed inputs dirty and recomputes only those; a node whose
+    value comes out unchanged does not dirty its own dependents.
+    """
+
+    def __init__(self, inputs: Tuple[str, ...]):
+        self.inputs = inputs
+        self._nodes: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {}
+        self._dependents: Dict[str, List[str]] = {name: [] for name in inputs}
+        self.outputs: List[str] = []
+        self._output_set: Set[str] = set()
+
+    def node(self, name: str, deps: Tuple[str, ...], compute: Callable[..., Any], output: bool = True) -> None:
+        """
+        Add a computed value.
+
+        Args:
+            name: Node name (outputs use the dotted path of the field they fill, e.g. "budget_amounts.needs")
+            deps: Inputs or earlier nodes passed positionally to `compute`
+            compute: Pure function of the dependency values
+            output: Whether the value is part of the result payload (False for intermediates)
+        """
+        for dep in deps:
+            if dep not in self._dependents:
+                raise ValueError(f"{name} depends on unknown node {dep}")
+        self._nodes[name] = (deps, compute)
+        self._dependents[name] = []
+        for dep in deps:
+            self._dependents[dep].append(name)
+        if output:
+            self.outputs.append(name)
+            self._output_set.add(name)
+
+    def evaluate(self, inputs: Mapping[str, Any]) -> Dict[str, Any]:
+        """Compute every node from scratch."""
+        values = {name: inputs[name] for name in self.inputs}
+        for name, (deps, compute) in self._nodes.items():
+            values[name] = compute(*(values[dep] for dep in deps))
+        return values
+
+    def update(self, values: Dict[str, Any], changes: Mapping[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Apply input changes to previously evaluated `values` in place.
+
+        Returns:
+            (changed output values, number of nodes recomputed)
+        """
+        dirty: Set[str] = set()
+        for name, value in changes.items():
+            if values[name] != value:
+                values[name] = value
+                dirty.update(self._dependents[name])
+        changed: Dict[str, Any] = {}
+        recomputed = 0
+        for name, (deps, compute) in self._nodes.items():  # Insertion order is a topological order
+            if name not in dirty:
+                continue
+            recomputed += 1
+            value = compute(*(values[dep] for dep in deps))
+            if value != values[name]:
+                values[name] = value
+                dirty.update(self._dependents[name])
+                changed[name] = value
+        return {name: value for name, value in changed.items() if name in self._output_set}, recomputed
+
+
+# ===========================================
+# REBALANCE GRAPH
+# ===========================================
+
+def change_line(label: str, original: float, new: float) -> str:
+    """One line of the rebalance explanation ("" when the share did not move)."""
+    change = new - original
+    if change > 0:
+        return f"- {label}: +{change:.1f}% (now {new:.1f}%)\n"
+    if change < 0:
+        return f"- {label}: {change:.1f}% (now {new:.1f}%)\n"
+    return ""
+
+
+def alerts_line(alert_count: int) -> str:
+    return f"\n⚠️ {alert_count} alert(s) for your attention." if alert_count > 0 else ""
+
+
+def _alert_payload(alert: Optional[Dict[str, object]]) -> Optional[Dict[str, str]]:
+    if alert is None:
+        return None
+    return {key: str(alert.get(key, '')) for key in ("code", "message", "severity", "suggestion")}
+
+
+def _effective_savings(needs: float, wants: float, savings: float) -> float:
+    # Savings absorbs the difference when the edited split does not add up to 100%
+    return savings if needs + wants + savings == 100 else 100 - needs - wants
+
+
+def _collect_alerts(*alerts: Optional[Dict[str, object]]) -> List[Dict[str, object]]:
+    return sort_alerts([alert for alert in alerts if alert is not None])
+
+
+def _explanation(needs_line: str, wants_line: str, savings_line: str, alert_line: str) -> str:
+    return "Your budget has been rebalanced:\n\n📈 Changes:\n" + needs_line + wants_line + savings_line + alert_line
+
+
+def _build_rebalance_graph() -> DependencyGraph:
+    graph = DependencyGraph(inputs=(
+        "income", "needs_percent", "wants_percent", "savings_percent",
+        "rent", "total_emi", "has_multiple_loans", "emergency_fund", "city_tier", "budget_mode",
+    ))
+    node = graph.node
+
+    node("budget_split.needs_percent", ("needs_percent",), lambda p: p)
+    node("budget_split.wants_percent", ("wants_percent",), lambda p: p)
+    node("budget_split.savings_percent", ("needs_percent", "wants_percent", "savings_percent"), _effective_savings)
+
+    for bucket in ("needs", "wants", "savings"):
+        node(f"budget_amounts.{bucket}", ("income", f"budget_split.{bucket}_percent"),
+             lambda income, percent: (income * percent) / 100)
+    node("total_expenses", ("budget_amounts.needs", "budget_amounts.wants"), lambda needs, wants: needs + wants,
+         output=False)
+
+    # One node per alert rule, so an edit only re-runs the rules reading what it changed
+    node("alert.high_rent", ("rent", "income", "city_tier"), detect_high_rent_alert, output=False)
+    node("alert.high_emi", ("total_emi", "income", "has_multiple_loans"), detect_high_emi_alert, output=False)
+    node("alert.negative_cashflow", ("income", "total_expenses"), detect_negative_cashflow_alert, output=False)
+    node("alert.low_savings", ("budget_amounts.savings", "income", "budget_split.savings_percent"),
+         detect_low_savings_alert, output=False)
+    node("alert.high_wants", ("budget_split.wants_percent", "budget_amounts.wants", "income", "budget_mode"),
+         detect_high_wants_alert, output=False)
+    node("alert.insufficient_emergency", ("total_expenses", "emergency_fund"),
+         detect_insufficient_emergency_alert, output=False)
+    alert_nodes = ("alert.high_rent", "alert.high_emi", "alert.negative_cashflow", "alert.low_savings",
+                   "alert.high_wants", "alert.insufficient_emergency")
+    node("alerts", alert_nodes, lambda *alerts: [_alert_payload(alert) for alert in _collect_alerts(*alerts)])
+
+    # Explanation fragments
+    for bucket, label in (("needs", "Needs"), ("wants", "Wants"), ("savings", "Savings")):
+        node(f"explanation.{bucket}", (f"budget_split.{bucket}_percent",),
+             lambda percent, label=label, bucket=bucket: change_line(label, ORIGINAL_SPLIT[bucket], percent),
+             output=False)
+    node("explanation.alerts", ("alerts",), lambda alerts: alerts_line(len(alerts)), output=False)
+    node("explanation", ("explanation.needs", "explanation.wants", "explanation.savings", "explanation.alerts"),
+         _explanation)
+    node("metadata.notes",
+         ("budget_split.needs_percent", "budget_split.wants_percent", "budget_split.savings_percent"),
+         lambda needs, wants, savings: f"Budget rebalanced. Original: 50/30/20, New: {needs}/{wants}/{savings}")
+    return graph
+
+
+REBALANCE_GRAPH = _build_rebalance_graph()
+
+# Inputs a client may change between events (the rest come from the original inputs)
+EDITABLE_INPUTS = ("income", "needs_percent", "wants_percent", "savings_percent")
+
+
+def rebalance_inputs(
+    edited_plan: Mapping[str, Any],
+    monthly_income: float,
+    rent: float,
+    loan_count: int,
+    city_tier: str,
+    budget_mode: str,
+) -> Dict[str, Any]:
+    """Graph inputs for a rebalance request."""
+    split = edited_plan.get("budget_split", {})
+    return {
+        "income": edited_plan.get("income", monthly_income),
+        "needs_percent": split.get("needs_percent", 0),
+        "wants_percent": split.get("wants_percent", 0),
+        "savings_percent": split.get("savings_percent", 0),
+        "rent": rent,
+        "total_emi": 0,
+        "has_multiple_loans": loan_count > 1,
+        "emergency_fund": 0,
+        "city_tier": city_tier,
+        "budget_mode": budget_mode,
+    }
+
+
+# ===========================================
+# SESSIONS
+# ===========================================
+
+@dataclass
+class RebalanceSession:
+    """Evaluated graph state for one editing session."""
+    id: str
+    values: Dict[str, Any]
+    revision: int = 0
+    touched_at: float = field(default_factory=time.time)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def outputs(self) -> Dict[str, Any]:
+        return {name: self.values[name] for name in REBALANCE_GRAPH.outputs}
+
+
+class RebalanceSessionStore:
+    """
+    Process-local LRU of editing sessions.
+    A session unknown to this worker (expired, evicted, other worker) is rebuilt from the full request.
+    """
+
+    def __init__(self, ttl_seconds: int = REBALANCE_SESSION_TTL, max_sessions: int = REBALANCE_MAX_SESSIONS):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, RebalanceSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, values: Dict[str, Any]) -> RebalanceSession:
+        session = RebalanceSession(id=uuid.uuid4().hex, values=values)
+        with self._lock:
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id: str) -> Optional[RebalanceSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.time() - session.touched_at > self.ttl_seconds:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            session.touched_at = time.time()
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+rebalance_sessions = RebalanceSessionStore()
+
+
+def start_session(inputs: Dict[str, Any]) -> RebalanceSession:
+    """Evaluate the whole graph for `inputs` and keep the state for later deltas."""
+    return rebalance_sessions.create(REBALANCE_GRAPH.evaluate(inputs))
+
+
+def apply_changes(session: RebalanceSession, changes: Mapping[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    Apply an edit to a session.
+
+    Returns:
+        (changed output fields, nodes recomputed)
+
+    Raises:
+        ValueError: If a change names a field that cannot be edited
+    """
+    unknown = set(changes) - set(EDITABLE_INPUTS)
+    if unknown:
+        raise ValueError(f"Cannot edit {sorted(unknown)}; editable fields: {list(EDITABLE_INPUTS)}")
+    with session.lock:
+        changed, recomputed = REBALANCE_GRAPH.update(session.values, changes)
+        if changed:
+            session.revision += 1
+        return changed, recomputed
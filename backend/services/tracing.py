@@ -0,0 +1,258 @@
+"""
+Lightweight request tracing: per-stage spans, Server-Timing summaries and optional span export
+Spans are collected per request through a context variable; export goes to a JSON-lines file or an OTLP/HTTP collector
+"""
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "").lower()  # "" (off) | file | otlp
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE", "traces.jsonl")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318").rstrip("/")
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "1.0"))  # Share of requests exported
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "vegakash-api")
+
+EXPORT_BATCH_SIZE = 100
+EXPORT_QUEUE_SIZE = 10000
+
+
+@dataclass
+class Span:
+    """A timed stage of a request."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    kind: int = 1  # OTLP SpanKind: 1 internal, 2 server
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+@dataclass
+class Trace:
+    """All spans recorded while handling one request."""
+    trace_id: str
+    root: Span
+    spans: List[Span] = field(default_factory=list)
+    sampled: bool = True
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def _parse_traceparent(header: Optional[str]) -> Optional[Dict[str, str]]:
+    """Parse a W3C traceparent header (version-traceid-parentid-flags)."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return {"trace_id": parts[1], "parent_id": parts[2], "sampled": parts[3][-1:] in "13579bdf"}
+
+
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Trace:
+    """
+    Begin a trace for the current request and make it the active one.
+
+    Args:
+        name: Root span name (e.g. "POST /api/v1/ai/travel/calculate-budget-hybrid")
+        traceparent: Incoming W3C traceparent header, continued when valid
+        **attributes: Root span attributes
+    """
+    parent = _parse_traceparent(traceparent)
+    root = Span(
+        name=name,
+        span_id=_new_span_id(),
+        parent_id=parent["parent_id"] if parent else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+        kind=2,
+    )
+    trace = Trace(
+        trace_id=parent["trace_id"] if parent else secrets.token_hex(16),
+        root=root,
+        sampled=bool(parent["sampled"]) if parent else random.random() < TRACE_SAMPLE_RATIO,
+    )
+    _current_trace.set(trace)
+    _current_span.set(root)
+    return trace
+
+
+def finish_trace(trace: Trace, **attributes: Any) -> None:
+    """Close the root span and queue the trace for export."""
+    trace.root.end_ns = time.time_ns()
+    trace.root.attributes.update(attributes)
+    _current_trace.set(None)
+    _current_span.set(None)
+    if TRACE_EXPORTER and trace.sampled:
+        _exporter().submit(trace)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a stage of the current request. A no-op outside a traced request.
+
+    Usage:
+        with span("ai-upstream", model=model):
+            response = client.chat.completions.create(...)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        span_id=_new_span_id(),
+        parent_id=parent.span_id if parent else trace.root.span_id,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def server_timing_header(trace: Trace) -> str:
+    """
+    Build a Server-Timing header value: one metric per stage name (durations summed
+    across repeats such as retries) plus the total elapsed so far.
+    """
+    durations: Dict[str, float] = {}
+    for recorded in list(trace.spans):
+        durations[recorded.name] = durations.get(recorded.name, 0.0) + recorded.duration_ms
+    entries = [f"{name};dur={duration:.1f}" for name, duration in durations.items()]
+    entries.append(f"total;dur={(time.time_ns() - trace.root.start_ns) / 1_000_000:.1f}")
+    return ", ".join(entries)
+
+
+# ===========================================
+# EXPORT
+# ===========================================
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace: Trace, recorded: Span) -> Dict[str, Any]:
+    otlp: Dict[str, Any] = {
+        "traceId": trace.trace_id,
+        "spanId": recorded.span_id,
+        "name": recorded.name,
+        "kind": recorded.kind,
+        "startTimeUnixNano": str(recorded.start_ns),
+        "endTimeUnixNano": str(recorded.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in recorded.attributes.items()],
+    }
+    if recorded.parent_id:
+        otlp["parentSpanId"] = recorded.parent_id
+    if "error" in recorded.attributes:
+        otlp["status"] = {"code": 2}
+    return otlp
+
+
+def to_otlp(traces: List[Trace]) -> Dict[str, Any]:
+    """Encode traces as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "vegakash.tracing"},
+                "spans": [
+                    _otlp_span(trace, recorded)
+                    for trace in traces
+                    for recorded in [trace.root, *trace.spans]
+                ],
+            }],
+        }]
+    }
+
+
+class SpanExporter:
+    """Exports finished traces from a background thread so requests never wait on I/O."""
+
+    def __init__(self, exporter: str):
+        self.exporter = exporter
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            logger.warning("Span export queue full, dropping trace")
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.export(batch)
+            except Exception as e:
+                logger.warning(f"Span export failed ({len(batch)} traces dropped): {e}")
+
+    def export(self, traces: List[Trace]) -> None:
+        payload = to_otlp(traces)
+        if self.exporter == "otlp":
+            import httpx
+
+            httpx.post(f"{OTLP_ENDPOINT}/v1/traces", json=payload, timeout=5.0).raise_for_status()
+        else:
+            with open(TRACE_EXPORT_FILE, "a") as f:
+                f.write(json.dumps(payload) + "\n")
+
+
+_span_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _exporter() -> SpanExporter:
+    global _span_exporter
+    with _exporter_lock:
+        if _span_exporter is None:
+            _span_exporter = SpanExporter(TRACE_EXPORTER)
+        return _span_exporter
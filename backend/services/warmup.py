@@ -0,0 +1,73 @@
+"""
+Background warm-up of lazily loaded subsystems
+Heavy imports (OpenAI SDK, PDF engine) are deferred at import time and loaded here after startup, off the request path
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Registered by the modules that own the lazy subsystem
+_warmers: Dict[str, Callable[[], None]] = {}
+_fork_safe: Set[str] = set()
+_durations: Dict[str, float] = {}
+_thread: Optional[threading.Thread] = None
+
+
+def register_warmer(name: str, warmer: Callable[[], None], fork_safe: bool = False) -> None:
+    """
+    Load a lazily imported subsystem during background warm-up (e.g. import an SDK, build a client).
+
+    Args:
+        name: Label reported by warmup_stats()
+        warmer: Callable doing the loading
+        fork_safe: Only imports modules or builds read-only data (no sockets, threads or
+            clients), so it may run once in the gunicorn master and be shared by all workers
+    """
+    _warmers[name] = warmer
+    if fork_safe:
+        _fork_safe.add(name)
+
+
+def run_warmup(names: Optional[Set[str]] = None) -> Dict[str, float]:
+    """Run registered warmers (all, or just `names`) that have not run yet; returns seconds spent per warmer."""
+    for name, warmer in list(_warmers.items()):
+        if name in _durations or (names is not None and name not in names):
+            continue  # Already loaded, possibly in the master before this worker was forked
+        started = time.perf_counter()
+        try:
+            warmer()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed (will load on first use): {e}")
+            continue
+        _durations[name] = round(time.perf_counter() - started, 4)
+    logger.info(f"Warm-up finished: {_durations}")
+    return dict(_durations)
+
+
+def preload_for_fork() -> Dict[str, float]:
+    """Run the fork-safe warmers in the gunicorn master (see gunicorn_config.when_ready)."""
+    return run_warmup(_fork_safe)
+
+
+async def start_warmup() -> None:
+    """
+    Start warm-up in a daemon thread so startup (and the first requests) are not held up.
+    Disabled with WARMUP_ENABLED=false, in which case everything loads on first use.
+    """
+    global _thread
+    if os.getenv("WARMUP_ENABLED", "true").lower() != "true" or _thread is not None:
+        return
+    _thread = threading.Thread(target=run_warmup, name="warmup", daemon=True)
+    _thread.start()
+
+
+def warmup_stats() -> Dict[str, object]:
+    return {
+        "running": bool(_thread and _thread.is_alive()),
+        "loaded": dict(_durations),
+        "pending": sorted(set(_warmers) - set(_durations)),
+    }
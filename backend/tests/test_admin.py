@@ -0,0 +1,79 @@
+"""
+Admin Diagnostics Tests
+=======================
+Tests for the token-protected CPU sampler and tracemalloc endpoints
+"""
+import threading
+from typing import Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.profiler import StackSampler
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def admin_token(monkeypatch: pytest.MonkeyPatch) -> Dict[str, str]:
+    monkeypatch.setenv("ADMIN_TOKEN", "test-admin-token")
+    return ADMIN_HEADERS
+
+
+class TestAdminAuth:
+    """Tests for admin token protection"""
+
+    def test_disabled_without_configured_token(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        response = client.get("/api/v1/admin/profile/cpu?seconds=0.1", headers=ADMIN_HEADERS)
+        assert response.status_code == 404
+
+    def test_wrong_token_is_rejected(self, client: TestClient, admin_token: Dict[str, str]) -> None:
+        response = client.get("/api/v1/admin/profile/cpu?seconds=0.1", headers={"X-Admin-Token": "nope"})
+        assert response.status_code == 401
+
+
+class TestProfiling:
+    """Tests for CPU sampling and memory diffs"""
+
+    def test_cpu_profile_returns_collapsed_stacks(self, client: TestClient, admin_token: Dict[str, str]) -> None:
+        response = client.get("/api/v1/admin/profile/cpu?seconds=0.2&interval_ms=5", headers=admin_token)
+
+        assert response.status_code == 200
+        assert int(response.headers["x-profile-samples"]) > 0
+        first_line = response.text.splitlines()[0]
+        stack, count = first_line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+    def test_sampler_sees_busy_thread(self) -> None:
+        stop = threading.Event()
+
+        def busy_loop() -> None:
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_loop, name="busy-worker")
+        worker.start()
+        try:
+            sampler = StackSampler(interval=0.002).run(0.1)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert any(stack.startswith("busy-worker;") and "busy_loop" in stack for stack in sampler.samples)
+
+    def test_memory_diff_reports_growth_and_containers(self, client: TestClient, admin_token: Dict[str, str]) -> None:
+        assert client.post("/api/v1/admin/profile/memory/start", headers=admin_token).status_code == 200
+        retained = [bytearray(1024) for _ in range(200)]
+
+        report = client.get("/api/v1/admin/profile/memory?limit=5", headers=admin_token).json()
+        client.post("/api/v1/admin/profile/memory/stop", headers=admin_token)
+
+        assert retained
+        assert len(report["top_growth"]) <= 5
+        assert "travel_session_ai_calls" in report["containers"]
+        assert report["traced_current_bytes"] > 0
+
+    def test_memory_diff_requires_tracing(self, client: TestClient, admin_token: Dict[str, str]) -> None:
+        response = client.get("/api/v1/admin/profile/memory", headers=admin_token)
+        assert response.status_code == 409
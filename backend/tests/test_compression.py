@@ -0,0 +1,105 @@
+"""
+Compression Tests
+=================
+Tests for response compression and precompressed static payloads
+"""
+import gzip
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import main
+from middleware.compression import CompressionMiddleware
+from services.compression import choose_encoding
+
+GZIP_ONLY = {"Accept-Encoding": "gzip"}
+
+
+class TestEncodingNegotiation:
+    """Tests for Accept-Encoding parsing"""
+
+    def test_gzip_and_identity(self) -> None:
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("identity") is None
+        assert choose_encoding("gzip;q=0, deflate") is None
+        assert choose_encoding("*") in ("br", "gzip")
+
+
+class TestStaticPayloads:
+    """Tests for precompressed reference data endpoints"""
+
+    def test_countries_precompressed_with_etag(self, client: TestClient) -> None:
+        response = client.get("/api/v1/ai/budget/countries", headers=GZIP_ONLY)
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"].startswith("public")
+        assert response.json()["total_countries"] == len(response.json()["countries"])
+
+        revalidated = client.get(
+            "/api/v1/ai/budget/countries", headers={**GZIP_ONLY, "If-None-Match": response.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
+    def test_etag_per_encoding(self, client: TestClient) -> None:
+        gzipped = client.get("/api/v1/ai/budget/countries", headers=GZIP_ONLY)
+        identity = client.get("/api/v1/ai/budget/countries", headers={"Accept-Encoding": "identity"})
+        assert gzipped.headers["etag"] != identity.headers["etag"]
+        assert "Accept-Encoding" in identity.headers["vary"]
+
+        # The gzip body's tag does not validate the identity body
+        mismatched = client.get(
+            "/api/v1/ai/budget/countries",
+            headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]},
+        )
+        assert mismatched.status_code == 200
+
+    def test_identity_when_not_accepted(self, client: TestClient) -> None:
+        response = client.get("/api/v1/ai/budget/budget-modes", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert [mode["code"] for mode in response.json()["modes"]][0] == "basic"
+
+
+class TestCompressionMiddleware:
+    """Tests for dynamic response compression"""
+
+    def test_large_json_compressed(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        loans = [
+            {"loan_id": f"l{i}", "loan_type": "personal", "loan_name": f"Loan {i}", "principal": 200000,
+             "interest_rate": 10 + i, "tenure_months": 60, "current_balance": 150000, "monthly_emi": 4000}
+            for i in range(3)
+        ]
+        response = client.post(
+            "/api/v1/compare-debt-strategies", json={"loans": loans, "extra_payment": 1000}, headers=GZIP_ONLY
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(response.content)
+
+    def test_small_response_not_compressed(self, client: TestClient) -> None:
+        response = client.get("/health", headers=GZIP_ONLY)
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_response_compressed_incrementally(self) -> None:
+        app = FastAPI()
+
+        @app.get("/stream")
+        async def stream() -> StreamingResponse:
+            def chunks() -> Iterator[bytes]:
+                for i in range(50):
+                    yield f"line {i}\n".encode() * 20
+
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        app.add_middleware(CompressionMiddleware, minimum_size=10)
+        with TestClient(app).stream("GET", "/stream", headers=GZIP_ONLY) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).count(b"line 49") == 20
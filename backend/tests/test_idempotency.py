@@ -0,0 +1,177 @@
+"""
+Idempotency-Key Tests
+=====================
+Tests for deduplicating AI plan, itinerary and PDF export requests
+"""
+import asyncio
+from typing import Any, Dict, Generator, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.ai_planner_v2 import create_fallback_response_v2
+from services.idempotency import IdempotencyStore, idempotency_store
+
+
+@pytest.fixture(autouse=True)
+def clear_idempotency_store() -> Generator[None, None, None]:
+    idempotency_store.clear()
+    yield
+    idempotency_store.clear()
+
+
+@pytest.fixture
+def pdf_calls(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """Replace the PDF renderer with a counting stub"""
+    calls: List[Any] = []
+
+    def fake_pdf(financial_input: Any, summary: Any, ai_plan: Any) -> bytes:
+        calls.append(financial_input)
+        return b"%PDF-1.4 fake"
+
+    monkeypatch.setattr(main, "generate_pdf_bytes", fake_pdf)
+    return calls
+
+
+def _pdf_payload(client: TestClient, financial_input: Dict[str, Any]) -> Dict[str, Any]:
+    summary = client.post("/api/v1/calculate-summary", json=financial_input).json()
+    return {"input": financial_input, "summary": summary}
+
+
+class TestIdempotentEndpoints:
+    """Tests for the Idempotency-Key header on expensive endpoints"""
+
+    def test_repeated_key_replays_pdf(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], pdf_calls: List[Any]
+    ) -> None:
+        """The same key renders the PDF once and replays it afterwards"""
+        payload = _pdf_payload(client, sample_financial_input)
+        headers = {"Idempotency-Key": "pdf-key-1"}
+
+        first = client.post("/api/v1/export-pdf", json=payload, headers=headers)
+        second = client.post("/api/v1/export-pdf", json=payload, headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert "idempotent-replayed" not in first.headers
+        assert second.headers["idempotent-replayed"] == "true"
+        assert len(pdf_calls) == 1
+
+    def test_requests_without_key_are_not_deduplicated(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], pdf_calls: List[Any]
+    ) -> None:
+        """Without the header every request does the work"""
+        payload = _pdf_payload(client, sample_financial_input)
+
+        client.post("/api/v1/export-pdf", json=payload)
+        client.post("/api/v1/export-pdf", json=payload)
+
+        assert len(pdf_calls) == 2
+
+    def test_key_reused_with_different_payload_is_rejected(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], pdf_calls: List[Any]
+    ) -> None:
+        """Reusing a key for a different body returns 422"""
+        payload = _pdf_payload(client, sample_financial_input)
+        headers = {"Idempotency-Key": "pdf-key-2"}
+        client.post("/api/v1/export-pdf", json=payload, headers=headers)
+
+        payload["input"]["monthly_income_primary"] = 123456
+        response = client.post("/api/v1/export-pdf", json=payload, headers=headers)
+
+        assert response.status_code == 422
+        assert len(pdf_calls) == 1
+
+    def test_ai_plan_v2_replays_result(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The V2 AI plan is generated once per key"""
+        calls: List[Any] = []
+
+        def fake_plan(financial_input: Any, summary: Any) -> Any:
+            calls.append(summary)
+            return create_fallback_response_v2(summary.total_income)
+
+        monkeypatch.setattr(main, "generate_ai_plan_v2", fake_plan)
+        payload = _pdf_payload(client, sample_financial_input)
+        headers = {"Idempotency-Key": "plan-key-1"}
+
+        first = client.post("/api/v2/generate-ai-plan", json=payload, headers=headers)
+        second = client.post("/api/v2/generate-ai-plan", json=payload, headers=headers)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert len(calls) == 1
+
+    def test_job_submission_returns_same_job(
+        self, client: TestClient, minimal_financial_input: Dict[str, Any]
+    ) -> None:
+        """Resubmitting a job with the same key returns the original job id"""
+        payload = _pdf_payload(client, minimal_financial_input)
+        headers = {"Idempotency-Key": "job-key-1"}
+
+        first = client.post("/api/v1/jobs/export-pdf", json=payload, headers=headers)
+        second = client.post("/api/v1/jobs/export-pdf", json=payload, headers=headers)
+
+        assert first.status_code == second.status_code == 202
+        assert first.json()["job_id"] == second.json()["job_id"]
+        assert second.headers["idempotent-replayed"] == "true"
+
+
+class TestIdempotencyStore:
+    """Tests for the store's in-flight and failure behaviour"""
+
+    def test_concurrent_requests_attach_to_in_flight_work(self) -> None:
+        """Concurrent callers with the same key share one computation"""
+        store = IdempotencyStore()
+        calls: List[int] = []
+
+        async def compute() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario() -> List[Any]:
+            return await asyncio.gather(
+                store.run("op", "key", "fp", compute),
+                store.run("op", "key", "fp", compute),
+            )
+
+        first, second = asyncio.run(scenario())
+
+        assert first == ("result", False)
+        assert second == ("result", True)
+        assert len(calls) == 1
+
+    def test_failures_are_not_stored(self) -> None:
+        """A failed computation can be retried with the same key"""
+        store = IdempotencyStore()
+        attempts: List[int] = []
+
+        async def flaky() -> str:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("upstream timeout")
+            return "ok"
+
+        async def scenario() -> Any:
+            with pytest.raises(RuntimeError):
+                await store.run("op", "key", "fp", flaky)
+            return await store.run("op", "key", "fp", flaky)
+
+        assert asyncio.run(scenario()) == ("ok", False)
+        assert len(attempts) == 2
+
+    def test_expired_keys_are_recomputed(self) -> None:
+        """Entries older than the TTL are dropped"""
+        store = IdempotencyStore(ttl_seconds=-1)
+
+        async def compute() -> str:
+            return "fresh"
+
+        async def scenario() -> Any:
+            await store.run("op", "key", "fp", compute)
+            return await store.run("op", "key", "fp", compute)
+
+        assert asyncio.run(scenario()) == ("fresh", False)
@@ -0,0 +1,190 @@
+"""
+Background Job API Tests
+========================
+Tests for /api/v1/jobs submit, poll, stream and result endpoints
+"""
+import time
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routes.jobs as jobs_module
+from services.ai_planner_v2 import create_fallback_response_v2
+from services import job_store
+from services.job_store import InMemoryJobStore, SQLiteJobStore
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """Poll a job until it finishes."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.get(f"/api/v1/jobs/{job_id}").json()
+        if data["status"] in ("succeeded", "failed"):
+            return data
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+
+def _summary(client: TestClient, financial_input: Dict[str, Any]) -> Dict[str, Any]:
+    response = client.post("/api/v1/calculate-summary", json=financial_input)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestJobSubmission:
+    """Tests for submitting and polling background jobs"""
+
+    def test_ai_plan_job_returns_202_and_result(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """AI plan job is accepted immediately and its result can be polled"""
+        monkeypatch.setattr(
+            jobs_module, "generate_ai_plan_v2",
+            lambda financial_input, summary: create_fallback_response_v2(summary.total_income),
+        )
+        summary = _summary(client, sample_financial_input)
+
+        response = client.post(
+            "/api/v1/jobs/generate-ai-plan",
+            json={"input": sample_financial_input, "summary": summary},
+        )
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "queued"
+        assert response.headers["location"] == body["status_url"]
+
+        job = _wait_for_job(client, body["job_id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["plan_mode"]
+
+    def test_pdf_export_job_result_is_downloadable(
+        self, client: TestClient, minimal_financial_input: Dict[str, Any]
+    ) -> None:
+        """PDF export job produces a downloadable PDF"""
+        summary = _summary(client, minimal_financial_input)
+
+        response = client.post(
+            "/api/v1/jobs/export-pdf",
+            json={"input": minimal_financial_input, "summary": summary},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"] is None  # Binary results are not inlined
+
+        result = client.get(f"/api/v1/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.headers["content-type"] == "application/pdf"
+        assert "attachment" in result.headers["content-disposition"]
+        assert result.content.startswith(b"%PDF")
+
+    def test_failed_job_reports_error(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Exceptions inside the job are recorded as a failed status"""
+        def boom(financial_input: Any, summary: Any) -> None:
+            raise RuntimeError("upstream unavailable")
+
+        monkeypatch.setattr(jobs_module, "generate_ai_plan_v2", boom)
+        summary = _summary(client, sample_financial_input)
+
+        job_id = client.post(
+            "/api/v1/jobs/generate-ai-plan",
+            json={"input": sample_financial_input, "summary": summary},
+        ).json()["job_id"]
+
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "failed"
+        assert "upstream unavailable" in job["error"]
+        assert client.get(f"/api/v1/jobs/{job_id}/result").status_code == 500
+
+    def test_unknown_job_returns_404(self, client: TestClient) -> None:
+        """Unknown job ids return 404"""
+        assert client.get("/api/v1/jobs/does-not-exist").status_code == 404
+        assert client.get("/api/v1/jobs/does-not-exist/stream").status_code == 404
+
+
+class TestJobStream:
+    """Tests for the SSE stream endpoint"""
+
+    def test_stream_ends_with_done_event(
+        self, client: TestClient, minimal_financial_input: Dict[str, Any]
+    ) -> None:
+        """The stream closes with a `done` event once the job finishes"""
+        summary = _summary(client, minimal_financial_input)
+        job_id = client.post(
+            "/api/v1/jobs/export-pdf",
+            json={"input": minimal_financial_input, "summary": summary},
+        ).json()["job_id"]
+
+        response = client.get(f"/api/v1/jobs/{job_id}/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: done" in response.text
+        assert '"status": "succeeded"' in response.text
+
+
+class TestJobStores:
+    """Tests for the job store backends"""
+
+    @pytest.mark.parametrize("backend", ["memory", "sqlite"])
+    def test_store_lifecycle(self, backend: str, tmp_path: Any) -> None:
+        """Both backends create, update and purge jobs the same way"""
+        store = InMemoryJobStore() if backend == "memory" else SQLiteJobStore(str(tmp_path / "jobs.db"))
+
+        job = store.create("pdf_export")
+        assert store.get(job.id).status == "queued"
+
+        store.update(job.id, status="succeeded", result=b"data", content_type="application/pdf")
+        stored = store.get(job.id)
+        assert stored.status == "succeeded"
+        assert stored.result == b"data"
+
+        store.ttl_seconds = -1
+        assert store.purge_expired() == 1
+        assert store.get(job.id) is None
+
+    @pytest.mark.parametrize("backend", ["memory", "sqlite"])
+    def test_stale_jobs_fail(self, backend: str, tmp_path: Any) -> None:
+        """Jobs left running by a worker that stopped are failed instead of running forever"""
+        store = (InMemoryJobStore(stale_seconds=60) if backend == "memory"
+                 else SQLiteJobStore(str(tmp_path / "jobs.db"), stale_seconds=60))
+        polled = store.create("ai_plan_v2")
+        swept = store.create("ai_plan_v2")
+        other = store.create("ai_plan_v2")
+        for job in (polled, swept, other):
+            store.update(job.id, status="running")
+        store.stale_seconds = -1
+        assert store.get(polled.id).status == "failed"
+        assert store.fail_stale() == 2
+
+        stopped = store.get(swept.id)
+        assert stopped.status == "failed"
+        assert stopped.error == job_store.STALE_JOB_ERROR
+
+    def test_backend_follows_worker_count(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """auto uses the shared SQLite store when several workers serve requests"""
+        monkeypatch.setattr(job_store, "JOB_STORE_BACKEND", "auto")
+        monkeypatch.setattr(job_store, "WORKER_COUNT", 1)
+        assert job_store.job_store_backend() == "memory"
+        monkeypatch.setattr(job_store, "WORKER_COUNT", 5)
+        assert job_store.job_store_backend() == "sqlite"
+        monkeypatch.setattr(job_store, "JOB_STORE_BACKEND", "memory")
+        assert job_store.job_store_backend() == "memory"
+
+    def test_memory_store_evicts_finished_jobs_first(self) -> None:
+        """A full in-memory store drops finished jobs before running ones"""
+        store = InMemoryJobStore(max_jobs=2)
+        running = store.create("itinerary")
+        finished = store.create("itinerary")
+        store.update(finished.id, status="succeeded")
+
+        store.create("itinerary")
+
+        assert store.get(running.id) is not None
+        assert store.get(finished.id) is None
@@ -0,0 +1,53 @@
+"""
+Load Test Harness Tests
+=======================
+Tests for the in-process benchmark runner and its result files
+"""
+import asyncio
+import json
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import pytest
+
+import main
+from benchmarks.loadtest import SCENARIOS, compare_results, percentile, run_scenario, save_results, summarize
+
+
+class TestPercentiles:
+    """Tests for latency summaries"""
+
+    def test_percentile_interpolates(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([], 95) == 0.0
+
+    def test_summary_counts_errors(self) -> None:
+        result = summarize("x", 2, [10.0, 20.0, 30.0], Counter({200: 2, 503: 1}), 1.5)
+        assert result.throughput_rps == 2.0
+        assert result.errors == 1
+        assert result.latency_ms["p50"] == 20.0
+
+
+class TestInProcessRun:
+    """Tests for driving the ASGI app in-process"""
+
+    def test_run_and_compare(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+
+        async def run():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                return await run_scenario(client, SCENARIOS["compare-debt-strategies"], {}, 4, 12, warmup=1)
+
+        result = asyncio.run(run())
+        assert result.requests == 12
+        assert result.errors == 0
+        assert result.latency_ms["p50"] <= result.latency_ms["p99"]
+
+        path = save_results([result], "asgi", tmp_path / "run.json")
+        saved = json.loads(path.read_text())
+        assert saved["results"][0]["scenario"] == "compare-debt-strategies"
+        assert len(compare_results(saved, [result])) == 1
@@ -0,0 +1,88 @@
+"""
+Metrics Endpoint Tests
+======================
+Tests for the Prometheus-style /metrics endpoint and multi-worker aggregation
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import metrics
+from services.metrics import REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def clean_registry() -> Generator[None, None, None]:
+    REGISTRY.clear()
+    yield
+    REGISTRY.clear()
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics"""
+
+    def test_requests_are_counted_per_route_template(self, client: TestClient) -> None:
+        client.get("/api/v1/jobs/does-not-exist")
+        client.get("/api/v1/health")
+
+        body = client.get("/metrics").text
+
+        assert 'vegakash_http_requests_total{method="GET",route="/api/v1/jobs/{job_id}",status="404"} 1' in body
+        assert 'vegakash_http_request_duration_seconds_count{method="GET",route="/api/v1/health"} 1' in body
+
+    def test_content_type_is_prometheus_text(self, client: TestClient) -> None:
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    def test_pdf_render_time_is_observed(self, client: TestClient, minimal_financial_input: Dict[str, Any]) -> None:
+        summary = client.post("/api/v1/calculate-summary", json=minimal_financial_input).json()
+
+        client.post("/api/v1/export-pdf", json={"input": minimal_financial_input, "summary": summary})
+
+        assert metrics.PDF_RENDER_LATENCY.count() == 1
+
+    def test_stats_report_cache_hit_ratios(self, client: TestClient) -> None:
+        metrics.record_cache_lookup("ai_plan_v2", hit=True)
+        metrics.record_cache_lookup("ai_plan_v2", hit=False)
+
+        data = client.get("/api/v1/stats").json()
+
+        assert data["cache"]["namespaces"]["ai_plan_v2"]["hit_ratio"] == 0.5
+
+
+class TestMetricsPrimitives:
+    """Tests for AI call tracking and multi-worker aggregation"""
+
+    def test_ai_call_outcomes(self) -> None:
+        with metrics.track_ai_call("site"):
+            pass
+        with pytest.raises(asyncio.TimeoutError):
+            with metrics.track_ai_call("site"):
+                raise asyncio.TimeoutError()
+        with pytest.raises(ValueError):
+            with metrics.track_ai_call("site"):
+                raise ValueError("bad json")
+
+        assert metrics.AI_CALLS.value(site="site", outcome="success") == 1
+        assert metrics.AI_CALLS.value(site="site", outcome="timeout") == 1
+        assert metrics.AI_CALLS.value(site="site", outcome="error") == 1
+        assert metrics.AI_LATENCY.count(site="site") == 3
+
+    def test_workers_are_aggregated(self, tmp_path: Path) -> None:
+        metrics.AI_TOKENS.inc(100, site="ai_plan_v2", kind="prompt")
+        metrics.AI_LATENCY.observe(1.5, site="ai_plan_v2")
+        other_worker = REGISTRY.dump()
+        (tmp_path / "metrics_1.json").write_text(json.dumps(other_worker))
+
+        body = metrics.render_metrics(str(tmp_path))
+
+        assert os.path.exists(tmp_path / f"metrics_{os.getpid()}.json")
+        assert 'vegakash_ai_tokens_total{site="ai_plan_v2",kind="prompt"} 200' in body
+        assert 'vegakash_ai_call_duration_seconds_count{site="ai_plan_v2"} 2' in body
@@ -0,0 +1,98 @@
+"""
+OpenAI Stub Tests
+=================
+Tests for the local OpenAI-compatible stub used by load and latency benchmarks
+"""
+import asyncio
+import json
+import random
+from typing import Iterator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+
+from benchmarks import openai_stub
+from benchmarks.openai_stub import StubConfig, app, sample_latency_ms
+
+
+@pytest.fixture
+def stub() -> Iterator[TestClient]:
+    original = openai_stub.config
+    openai_stub.config = StubConfig()
+    try:
+        yield TestClient(app)
+    finally:
+        openai_stub.config = original
+
+
+def _completion(stub: TestClient, prompt: str, **extra) -> httpx.Response:
+    return stub.post("/v1/chat/completions", json={
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": prompt}],
+        **extra,
+    })
+
+
+class TestStubCompletions:
+    """Tests for canned chat completions"""
+
+    def test_unit_price_prompt(self, stub: TestClient) -> None:
+        response = _completion(stub, 'Return JSON: {"flight_min": <number>, "flight_max": <number>}')
+        assert response.status_code == 200
+        body = response.json()
+        content = json.loads(body["choices"][0]["message"]["content"])
+        assert content["flight_min"] <= content["flight_max"]
+        assert body["usage"]["total_tokens"] > 0
+
+    def test_itinerary_has_requested_days(self, stub: TestClient) -> None:
+        response = _completion(stub, 'Create a 4-day itinerary. {"day_1": {...}}')
+        content = json.loads(response.json()["choices"][0]["message"]["content"])
+        assert sorted(content) == ["day_1", "day_2", "day_3", "day_4"]
+
+    def test_plan_breakdown_sums_to_income(self, stub: TestClient) -> None:
+        response = _completion(stub, 'Monthly Income: ₹85,000\n"plan_mode": "<basic | smart>"')
+        content = json.loads(response.json()["choices"][0]["message"]["content"])
+        total = sum(sum(bucket.values()) for bucket in content["breakdown"].values())
+        assert total == content["totals"]["income"] == 85000
+
+    def test_streaming_ends_with_done(self, stub: TestClient) -> None:
+        response = _completion(stub, "summary_text please", stream=True)
+        lines = [line for line in response.text.splitlines() if line.startswith("data: ")]
+        assert lines[-1] == "data: [DONE]"
+        content = "".join(
+            json.loads(line[6:])["choices"][0]["delta"].get("content", "") for line in lines[:-1]
+        )
+        assert "summary_text" in json.loads(content)
+
+    def test_openai_sdk_compatible(self) -> None:
+        async def call() -> str:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http_client:
+                client = AsyncOpenAI(api_key="stub", base_url="http://stub/v1", http_client=http_client)
+                response = await client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": 'Return {"flight_min": 1}'}],
+                )
+                return response.choices[0].message.content
+
+        assert "flight_min" in json.loads(asyncio.run(call()))
+
+
+class TestStubFaults:
+    """Tests for latency and fault injection"""
+
+    def test_injected_errors(self, stub: TestClient) -> None:
+        stub.post("/stub/config", json={"error_rate": 1.0})
+        assert _completion(stub, "hi").status_code == 500
+
+        stub.post("/stub/config", json={"error_rate": 0.0, "rate_limit_rate": 1.0})
+        assert _completion(stub, "hi").status_code == 429
+
+    def test_latency_distributions(self) -> None:
+        rng = random.Random(1)
+        assert sample_latency_ms("fixed:250", rng) == 250
+        assert all(100 <= sample_latency_ms("uniform:100,200", rng) <= 200 for _ in range(50))
+        assert all(sample_latency_ms("lognormal:800,0.4", rng) > 0 for _ in range(50))
+        with pytest.raises(ValueError):
+            sample_latency_ms("pareto:1", rng)
@@ -0,0 +1,111 @@
+"""
+Security & Rate Limit Middleware Tests
+======================================
+Tests for the pure ASGI security headers, request size limit and rate limit middleware
+"""
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware import rate_limiter
+from middleware.rate_limiter import RateLimitMiddleware
+from middleware.security import RequestSizeLimitMiddleware, SecurityHeadersMiddleware
+
+
+def _guarded_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request) -> dict:
+        return {"size": len(await request.body())}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    app.add_middleware(RequestSizeLimitMiddleware, max_size=100)
+    app.add_middleware(SecurityHeadersMiddleware, csp_exempt_paths=["/docs"])
+    return app
+
+
+class TestSecurityHeaders:
+    """Tests for security headers on application responses"""
+
+    def test_headers_on_api_responses(self, client: TestClient) -> None:
+        response = client.get("/health")
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert "default-src 'self'" in response.headers["content-security-policy"]
+        assert "strict-transport-security" not in response.headers
+
+    def test_docs_exempt_from_csp(self, client: TestClient) -> None:
+        response = client.get("/api/v1/docs")
+        assert response.status_code == 200
+        assert "content-security-policy" not in response.headers
+        assert response.headers["x-frame-options"] == "DENY"
+
+    def test_streaming_responses_pass_through(self) -> None:
+        response = TestClient(_guarded_app()).get("/stream")
+        assert response.text == "abc"
+        assert response.headers["x-content-type-options"] == "nosniff"
+
+
+class TestRequestSizeLimit:
+    """Tests for request body size enforcement"""
+
+    def test_declared_length_over_limit_rejected(self) -> None:
+        response = TestClient(_guarded_app()).post("/echo", content=b"x" * 101)
+        assert response.status_code == 413
+        assert response.json()["detail"]["max_size_bytes"] == 100
+        assert response.headers["x-frame-options"] == "DENY"
+
+    def test_chunked_body_over_limit_rejected(self) -> None:
+        def chunks() -> Iterator[bytes]:
+            for _ in range(5):
+                yield b"x" * 30
+
+        response = TestClient(_guarded_app()).post("/echo", content=chunks())
+        assert response.status_code == 413
+
+    def test_body_within_limit_accepted(self) -> None:
+        response = TestClient(_guarded_app()).post("/echo", content=b"x" * 100)
+        assert response.json() == {"size": 100}
+
+
+class TestRateLimitMiddleware:
+    """Tests for the per-IP sliding window limiter"""
+
+    @pytest.fixture
+    def limited_client(self, monkeypatch: pytest.MonkeyPatch) -> TestClient:
+        monkeypatch.setattr(rate_limiter, "RATE_LIMIT_REQUESTS", 2)
+        monkeypatch.setattr(rate_limiter, "_rate_limit_store", {})
+        app = FastAPI()
+
+        @app.get("/items")
+        async def items() -> dict:
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health() -> dict:
+            return {"status": "healthy"}
+
+        app.add_middleware(RateLimitMiddleware)
+        return TestClient(app)
+
+    def test_rejects_after_limit(self, limited_client: TestClient) -> None:
+        first = limited_client.get("/items")
+        assert first.headers["x-ratelimit-limit"] == "2"
+        assert first.headers["x-ratelimit-remaining"] == "2"
+        limited_client.get("/items")
+
+        rejected = limited_client.get("/items")
+        assert rejected.status_code == 429
+        assert rejected.json()["detail"]["error"] == "Rate limit exceeded"
+        assert rejected.headers["retry-after"] == "60"
+
+    def test_health_exempt(self, limited_client: TestClient) -> None:
+        for _ in range(4):
+            assert limited_client.get("/health").status_code == 200
@@ -0,0 +1,87 @@
+"""
+Server-Timing Tests
+===================
+Tests for per-stage spans and the Server-Timing response header
+"""
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routes.travel_ai_enhancement as enhancement
+from services import tracing
+from services.tracing import span, start_trace, finish_trace, to_otlp
+
+
+def _stages(header: str) -> Dict[str, float]:
+    stages = {}
+    for entry in header.split(","):
+        name, duration = entry.strip().split(";dur=")
+        stages[name] = float(duration)
+    return stages
+
+
+class TestServerTimingHeader:
+    """Tests for the Server-Timing header on real endpoints"""
+
+    def test_hybrid_budget_reports_pipeline_stages(self, client: TestClient) -> None:
+        enhancement.SESSION_AI_CALLS["timing-session"] = enhancement.MAX_AI_CALLS_PER_SESSION  # No AI call
+        response = client.post(
+            "/api/v1/ai/travel/calculate-budget-hybrid",
+            json={
+                "originCity": "Mumbai", "originCountry": "India",
+                "destinationCity": "Paris", "destinationCountry": "France",
+                "startDate": "2026-05-04", "endDate": "2026-05-08",
+                "adults": 2, "children": 0, "infants": 0,
+                "travelStyle": "standard", "localTransport": "public", "homeCurrency": "USD",
+            },
+            headers={"X-Session-Id": "timing-session"},
+        )
+        enhancement.SESSION_AI_CALLS.pop("timing-session", None)
+
+        stages = _stages(response.headers["server-timing"])
+
+        assert {"fallback", "cache", "merge", "totals", "total"} <= set(stages)
+        assert "ai" not in stages
+        assert stages["total"] >= stages["fallback"]
+
+    def test_threadpool_work_is_attributed(
+        self, client: TestClient, sample_financial_input: Dict[str, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Spans recorded inside run_in_threadpool reach the request's trace"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        summary = client.post("/api/v1/calculate-summary", json=sample_financial_input).json()
+
+        response = client.post("/api/v2/generate-ai-plan", json={"input": sample_financial_input, "summary": summary})
+
+        assert "cache" in _stages(response.headers["server-timing"])
+
+
+class TestSpans:
+    """Tests for the span API and OTLP encoding"""
+
+    def test_span_outside_request_is_noop(self) -> None:
+        with span("orphan") as recorded:
+            pass
+        assert recorded is None
+
+    def test_nested_spans_and_traceparent(self) -> None:
+        async def handle() -> tracing.Trace:
+            trace = start_trace("GET /x", "00-" + "a" * 32 + "-" + "b" * 16 + "-01")
+            with span("outer"):
+                with span("inner"):
+                    pass
+            finish_trace(trace)
+            return trace
+
+        trace = asyncio.run(handle())
+        inner, outer = trace.spans
+
+        assert trace.trace_id == "a" * 32
+        assert trace.root.parent_id == "b" * 16
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id == trace.root.span_id
+
+        otlp_spans = to_otlp([trace])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in otlp_spans] == ["GET /x", "inner", "outer"]
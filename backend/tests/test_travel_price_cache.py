@@ -0,0 +1,120 @@
+"""
+Travel Unit-Price Cache Tests
+=============================
+Tests for season/month-bucketed AI unit-price caching in the hybrid travel budget
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routes.travel_ai_enhancement as enhancement
+from services.heavy_hitters import clear_trackers, get_tracker
+
+
+@pytest.fixture(autouse=True)
+def clean_cache() -> Generator[None, None, None]:
+    enhancement.AI_CACHE.clear()
+    enhancement.SESSION_AI_CALLS.clear()
+    yield
+    enhancement.AI_CACHE.clear()
+    enhancement.SESSION_AI_CALLS.clear()
+
+
+def _seed_unit_prices(start_date: str, style: str = "standard") -> None:
+    key = enhancement.unit_price_cache_key("Mumbai", "India", "Paris", "France", start_date, style)
+    enhancement.AI_CACHE[key] = {
+        "data": {
+            "flight_min": 500, "flight_max": 700, "hotel_per_night": 150, "food_per_day": 40,
+            "confidence": "high", "reasoning": "seeded", "latency_ms": 900.0, "source": "ai",
+        },
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+def _hybrid_request(start: str, end: str, adults: int) -> Dict[str, Any]:
+    return {
+        "originCity": "Mumbai", "originCountry": "India",
+        "destinationCity": "Paris", "destinationCountry": "France",
+        "startDate": start, "endDate": end,
+        "adults": adults, "children": 0, "infants": 0,
+        "travelStyle": "standard", "localTransport": "public",
+        "homeCurrency": "USD",
+    }
+
+
+class TestPeriodBuckets:
+    """Tests for travel month/season bucketing"""
+
+    def test_month_bucket(self) -> None:
+        assert enhancement.travel_period_bucket("2025-12-03", "month") == "2025-12"
+
+    def test_december_belongs_to_next_winter(self) -> None:
+        assert enhancement.travel_period_bucket("2025-12-20", "season") == "2026-winter"
+        assert enhancement.travel_period_bucket("2026-02-10", "season") == "2026-winter"
+        assert enhancement.travel_period_bucket("2026-07-01", "season") == "2026-summer"
+
+    def test_describe_period(self) -> None:
+        assert enhancement.describe_travel_period("2025-12") == "December 2025"
+        assert enhancement.describe_travel_period("2026-winter") == "winter 2026"
+
+    def test_key_ignores_exact_dates_and_case(self) -> None:
+        first = enhancement.unit_price_cache_key("Mumbai", "India", "Paris", "France", "2026-05-02", "standard")
+        second = enhancement.unit_price_cache_key("mumbai ", "India", "PARIS", "France", "2026-05-20", "standard")
+        other_month = enhancement.unit_price_cache_key("Mumbai", "India", "Paris", "France", "2026-06-02", "standard")
+        assert first == second
+        assert first != other_month
+
+
+class TestUnitPriceCache:
+    """Tests for serving cached unit prices"""
+
+    def test_enhance_with_ai_uses_cache_without_upstream_call(self) -> None:
+        _seed_unit_prices("2026-05-01")
+
+        result = asyncio.run(enhancement.enhance_with_ai(
+            origin_city="Mumbai", origin_country="India",
+            destination_city="Paris", destination_country="France",
+            start_date="2026-05-18", travel_style="standard",
+            fallback_flight_range={"min": 1, "max": 2}, fallback_hotel=1, fallback_food=1,
+        ))
+
+        assert result is not None
+        assert result["cached"] is True
+        assert result["hotel_per_night"] == 150
+
+    def test_hybrid_totals_computed_locally_from_cached_unit_prices(self, client: TestClient) -> None:
+        """Different dates and party sizes in the same month reuse one cache entry"""
+        _seed_unit_prices("2026-05-01")
+
+        short_trip = client.post(
+            "/api/v1/ai/travel/calculate-budget-hybrid",
+            json=_hybrid_request("2026-05-04", "2026-05-08", adults=2),
+        ).json()
+        long_trip = client.post(
+            "/api/v1/ai/travel/calculate-budget-hybrid",
+            json=_hybrid_request("2026-05-10", "2026-05-20", adults=3),
+        ).json()
+
+        for trip, travelers in ((short_trip, 2), (long_trip, 3)):
+            assert trip["ai_status"] == "ai-enhanced"
+            assert trip["ai_calls_remaining"] == enhancement.MAX_AI_CALLS_PER_SESSION
+            assert trip["total_hotel_cost"] == pytest.approx(150 * trip["trip_days"])
+            assert trip["total_food_cost"] == pytest.approx(40 * travelers * trip["trip_days"])
+            assert trip["total_flight_cost"] == pytest.approx(600 * travelers)
+
+    def test_hybrid_requests_are_tracked_for_prewarming(self, client: TestClient) -> None:
+        """Hybrid requests feed the popular-route tracker with a refreshable payload"""
+        clear_trackers()
+        _seed_unit_prices("2026-05-01")
+
+        for _ in range(2):
+            client.post("/api/v1/ai/travel/calculate-budget-hybrid", json=_hybrid_request("2026-05-04", "2026-05-08", 2))
+
+        hot = get_tracker(enhancement.ROUTE_TRACKER).top(1)[0]
+        assert hot.key == enhancement.unit_price_cache_key("Mumbai", "India", "Paris", "France", "2026-05-01", "standard")
+        assert hot.count == 2
+        assert hot.payload["destination_city"] == "Paris"
+        clear_trackers()
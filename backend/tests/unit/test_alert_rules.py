@@ -0,0 +1,102 @@
+"""
+Alert Rule Engine Tests
+=======================
+Tests for the alert rule table: single-profile evaluation, batch bitmasks and adding rules
+"""
+import numpy as np
+
+from utils.alert_detector import (
+    ALERT_RULES,
+    AlertCode,
+    AlertRule,
+    AlertRuleSet,
+    SeverityLevel,
+    decode_alert_mask,
+    evaluate_alerts_batch,
+    generate_alerts,
+)
+
+PROFILE = {
+    "income": 80000, "rent": 36000, "total_emi": 35000, "total_expenses": 90000,
+    "wants_percent": 42, "wants_amount": 33600, "savings_amount": 3200, "savings_percent": 4,
+    "emergency_fund": 100000, "city_tier": "tier_1", "budget_mode": "smart_balanced",
+}
+
+# Severity of rules that escalate (negative cashflow is critical either way)
+ESCALATED_SEVERITY = {rule.code: rule.severities[1] for rule in ALERT_RULES if rule.severities[0] != rule.severities[1]}
+
+
+class TestCompiledRules:
+    """Tests for single-profile evaluation"""
+
+    def test_alerts_sorted_by_severity_then_rule_order(self) -> None:
+        alerts = generate_alerts(loans=[{}, {}], **PROFILE)
+
+        assert [a["code"] for a in alerts] == [
+            AlertCode.HIGH_EMI, AlertCode.NEGATIVE_CASHFLOW, AlertCode.LOW_SAVINGS,
+            AlertCode.HIGH_RENT, AlertCode.HIGH_WANTS, AlertCode.INSUFFICIENT_EMERGENCY,
+        ]
+        emi = alerts[0]
+        assert emi["severity"] == SeverityLevel.CRITICAL
+        assert emi["suggestion"].endswith("Consider consolidating loans to reduce interest burden")
+        assert alerts[3]["metadata"]["threshold"] == 0.40
+
+    def test_no_alerts(self) -> None:
+        healthy = {**PROFILE, "rent": 10000, "total_emi": 0, "total_expenses": 50000,
+                   "wants_percent": 30, "savings_percent": 20, "emergency_fund": 400000}
+        assert generate_alerts(loans=[], **healthy) == []
+
+    def test_rule_added_without_touching_the_evaluator(self) -> None:
+        extra = AlertRule(
+            AlertCode.HIGH_WANTS,
+            metric=lambda p: p["wants_amount"] / p["income"],
+            threshold=0.5,
+            render=lambda p, value, threshold, escalated: ("Wants above half of income", "Cut back", {}),
+        )
+        rules = AlertRuleSet(ALERT_RULES + (extra,))
+        profile = {**PROFILE, "has_multiple_loans": False, "wants_amount": 60000}
+
+        assert "Wants above half of income" in [a["message"] for a in rules.evaluate(profile)]
+        assert rules.decode(rules.evaluate_batch(profile)[0]).count(AlertCode.HIGH_WANTS) == 2
+
+
+class TestBatchEvaluation:
+    """Tests for bitmask evaluation over arrays of profiles"""
+
+    def profiles(self, count: int) -> dict:
+        rng = np.random.default_rng(3)
+        income = rng.choice([0.0, 50000.0, 120000.0], count)
+        return {
+            "income": income,
+            "rent": rng.uniform(0, 60000, count),
+            "total_emi": rng.uniform(0, 50000, count),
+            "total_expenses": rng.choice([0.0, 40000.0, 130000.0], count),
+            "wants_percent": rng.uniform(10, 50, count),
+            "wants_amount": rng.uniform(0, 40000, count),
+            "savings_amount": rng.uniform(0, 20000, count),
+            "savings_percent": rng.uniform(0, 25, count),
+            "emergency_fund": rng.uniform(0, 400000, count),
+            "city_tier": rng.choice(["tier_1", "tier_2", "tier_3", "other", "unknown"], count),
+            "budget_mode": rng.choice(["basic", "smart_balanced", "aggressive_savings"], count),
+            "has_multiple_loans": rng.random(count) < 0.5,
+        }
+
+    def test_matches_single_profile_evaluation(self) -> None:
+        columns = self.profiles(500)
+        fired, escalated = evaluate_alerts_batch(columns)
+
+        assert fired.dtype == np.uint8
+        for i in range(500):
+            profile = {name: column[i].item() for name, column in columns.items()}
+            if profile["income"] == 0 and profile["total_expenses"] > 0:
+                continue  # The cashflow message divides by income
+            alerts = generate_alerts(loans=[{}, {}] if profile.pop("has_multiple_loans") else [], **profile)
+            assert sorted(decode_alert_mask(fired[i])) == sorted(a["code"] for a in alerts)
+            higher = {a["code"] for a in alerts if ESCALATED_SEVERITY.get(a["code"]) == a["severity"]}
+            assert set(decode_alert_mask(escalated[i])) == higher
+
+    def test_scalars_broadcast(self) -> None:
+        fired, _ = evaluate_alerts_batch({**PROFILE, "has_multiple_loans": False, "income": [80000, 200000]})
+        assert fired.shape == (2,)
+        assert AlertCode.NEGATIVE_CASHFLOW in decode_alert_mask(fired[0])
+        assert AlertCode.NEGATIVE_CASHFLOW not in decode_alert_mask(fired[1])
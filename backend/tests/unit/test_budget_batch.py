@@ -0,0 +1,84 @@
+"""
+Budget Batch Tests
+==================
+Tests that the vectorized allocation pipeline matches the single-household path
+"""
+import random
+
+import numpy as np
+import pytest
+
+import main
+from budget_schemas.budget_planner import BudgetGenerateRequest
+from services.budget_planner_service import BudgetPlannerService
+from utils.budget_batch import FIXED_EXPENSE_FIELDS, VARIABLE_EXPENSE_FIELDS, round_half_even
+
+
+def random_requests(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        income = rng.choice([10001, 24999.99, 25000, rng.uniform(10001, 40000), rng.uniform(10001, 400000)])
+
+        def amount(share: float) -> float:
+            return rng.choice([0, round(rng.uniform(0, share * income), 2)])
+
+        requests.append(BudgetGenerateRequest(
+            monthly_income=income,
+            col_multiplier=rng.choice([0.5, 0.9, 1.0, 1.25, 2.0, round(rng.uniform(0.5, 2.0), 3)]),
+            lifestyle=rng.choice(["minimal", "moderate", "comfort", "premium"]),
+            mode=rng.choice(["basic", "aggressive_savings", "smart_balanced"]),
+            city_tier=rng.choice(["tier_1", "tier_2", "tier_3", "other"]),
+            fixed_expenses={name: amount(0.3) for name in FIXED_EXPENSE_FIELDS},
+            variable_expenses={name: amount(0.15) for name in VARIABLE_EXPENSE_FIELDS},
+            loans=[
+                {"principal": rng.uniform(1e4, 2e6), "rate": rng.choice([0, 8.5, 12]), "tenure_months": rng.randint(1, 360)}
+                for _ in range(rng.randint(0, 3))
+            ],
+        ))
+    return requests
+
+
+class TestRounding:
+    """Tests for element-wise Python rounding"""
+
+    def test_matches_builtin_round(self) -> None:
+        values = np.concatenate([
+            np.array([2.675, 1.005, 0.125, 0.135, -2.675, 1e-9, 33.333333, 99.995]),
+            np.random.default_rng(0).uniform(-1000, 1000, 5000),
+            np.arange(0, 100, 0.005),
+        ])
+        assert round_half_even(values).tolist() == [round(float(value), 2) for value in values]
+
+
+class TestGenerateBudgetBatch:
+    """Tests for the batch pipeline against generate_budget"""
+
+    def test_identical_to_scalar_path(self) -> None:
+        requests = random_requests(300)
+        plans = BudgetPlannerService.generate_budget_batch(requests)
+
+        for request, batch_plan in zip(requests, plans):
+            plan = BudgetPlannerService.generate_budget(request)
+            assert batch_plan["budget_split"] == plan.budget_split.model_dump()
+            assert batch_plan["budget_amounts"] == plan.budget_amounts.model_dump()
+            assert batch_plan["categories"] == plan.categories.model_dump()
+            assert sorted(batch_plan["alert_codes"]) == sorted(alert.code.split(".")[-1] for alert in plan.alerts)
+
+    def test_endpoint(self, client, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        requests = random_requests(20, seed=9)
+        response = client.post("/api/v1/ai/budget/generate/batch", json={
+            "profiles": [request.model_dump() for request in requests],
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 20
+        expected = BudgetPlannerService.generate_budget(requests[3])
+        assert data["plans"][3]["budget_amounts"] == expected.budget_amounts.model_dump()
+
+    def test_batch_size_limit(self, client, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        response = client.post("/api/v1/ai/budget/generate/batch", json={"profiles": []})
+        assert response.status_code == 422
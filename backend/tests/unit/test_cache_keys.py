@@ -0,0 +1,122 @@
+"""
+Unit tests for normalized AI plan cache keys
+"""
+import copy
+from typing import Any, Dict
+
+import pytest
+
+from schemas import FinancialInput
+from services import cache
+from services.ai_planner_v2 import create_fallback_response_v2, rehydrate_cached_plan_v2
+from services.calculations import calculate_summary
+
+
+@pytest.fixture
+def profile() -> Dict[str, Any]:
+    return {
+        "currency": "INR",
+        "monthly_income_primary": 50000,
+        "monthly_income_additional": 0,
+        "city": "Pune",
+        "city_tier": "tier_2",
+        "expenses": {
+            "housing_rent": 15000,
+            "groceries_food": 8000,
+            "transport": 3000,
+            "entertainment": 2000,
+        },
+        "loans": [
+            {"name": "Car Loan", "input_mode": "emi", "monthly_emi": 6000,
+             "interest_rate_annual": 9.5, "remaining_months": 36},
+            {"name": "Personal", "input_mode": "emi", "monthly_emi": 2000,
+             "interest_rate_annual": 14, "remaining_months": 12},
+        ],
+    }
+
+
+def _with(profile: Dict[str, Any], **changes: Any) -> Dict[str, Any]:
+    updated = copy.deepcopy(profile)
+    for path, value in changes.items():
+        target = updated
+        *parents, leaf = path.split("__")
+        for parent in parents:
+            target = target[parent]
+        target[leaf] = value
+    return updated
+
+
+class TestBandedKeys:
+    """Tests for the banded normalization strategy"""
+
+    def test_nearby_incomes_share_a_key(self, profile: Dict[str, Any]) -> None:
+        similar = _with(profile, monthly_income_primary=50100)
+        assert cache._generate_cache_key(profile, "banded") == cache._generate_cache_key(similar, "banded")
+        assert cache._generate_cache_key(profile, "exact") != cache._generate_cache_key(similar, "exact")
+
+    def test_different_incomes_do_not_share_a_key(self, profile: Dict[str, Any]) -> None:
+        richer = _with(profile, monthly_income_primary=80000)
+        assert cache._generate_cache_key(profile, "banded") != cache._generate_cache_key(richer, "banded")
+
+    def test_loan_order_and_names_are_ignored(self, profile: Dict[str, Any]) -> None:
+        reordered = copy.deepcopy(profile)
+        reordered["loans"].reverse()
+        reordered["loans"][0]["name"] = "Renamed"
+        assert cache._generate_cache_key(profile, "banded") == cache._generate_cache_key(reordered, "banded")
+
+    def test_categorical_fields_must_match(self, profile: Dict[str, Any]) -> None:
+        other_city = _with(profile, city="Mumbai", city_tier="tier_1")
+        assert cache._generate_cache_key(profile, "banded") != cache._generate_cache_key(other_city, "banded")
+
+    def test_namespaces_are_separate(self, profile: Dict[str, Any]) -> None:
+        assert cache._generate_cache_key(profile, "banded", "v1") != cache._generate_cache_key(profile, "banded", "v2")
+
+
+class TestSimHashKeys:
+    """Tests for the SimHash clustering strategy"""
+
+    def test_similar_ratios_share_a_key(self, profile: Dict[str, Any]) -> None:
+        similar = _with(profile, expenses__groceries_food=8150, expenses__transport=2950)
+        assert cache._generate_cache_key(profile, "simhash") == cache._generate_cache_key(similar, "simhash")
+
+    def test_signature_is_deterministic(self) -> None:
+        features = {"expenses.rent": 0.3, "debt.emi": 0.16}
+        assert cache.simhash_signature(features) == cache.simhash_signature(dict(reversed(features.items())))
+
+    def test_opposite_vectors_differ(self) -> None:
+        features = {"a": 0.4, "b": 0.1}
+        assert cache.simhash_signature(features) != cache.simhash_signature({k: -v for k, v in features.items()})
+
+
+class TestPlanCache:
+    """Tests for cache operations and plan rehydration"""
+
+    def test_similar_profile_hits_cache(self, profile: Dict[str, Any]) -> None:
+        cache.clear_cache()
+        cache.set_cached_plan(profile, {"plan": 1}, namespace="test", strategy="banded")
+
+        hit = cache.get_cached_plan(_with(profile, monthly_income_primary=50100), namespace="test", strategy="banded")
+
+        assert hit == {"plan": 1}
+        assert cache.get_cache_stats()["hits"] == 1
+        cache.clear_cache()
+
+    def test_rehydrated_plan_uses_exact_summary_numbers(self, profile: Dict[str, Any]) -> None:
+        cached_input = FinancialInput(**profile)
+        cached_plan = create_fallback_response_v2(calculate_summary(cached_input).total_income)
+        cached_plan.totals.income = 50000
+        cached_plan.breakdown.needs = {"rent": 20000}
+        cached_plan.breakdown.wants = {"dining": 15000}
+        cached_plan.breakdown.savings = {"emergency": 10000, "sips_investment": 5000}
+
+        new_input = FinancialInput(**_with(profile, monthly_income_primary=50100))
+        new_summary = calculate_summary(new_input)
+        plan = rehydrate_cached_plan_v2(cached_plan.model_dump(), new_input, new_summary)
+
+        assert plan.totals.income == int(new_summary.total_income)
+        breakdown_total = sum(
+            sum(bucket.values()) for bucket in (plan.breakdown.needs, plan.breakdown.wants, plan.breakdown.savings)
+        )
+        assert breakdown_total == plan.totals.income
+        assert plan.totals.net_savings == sum(plan.breakdown.savings.values())
+        assert cached_plan.breakdown.needs == {"rent": 20000}  # Cached data untouched
@@ -0,0 +1,87 @@
+"""
+Unit tests for persistent cache snapshots and warm restarts
+"""
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator
+
+import pytest
+
+import routes.travel_ai_enhancement as enhancement
+from services import cache, cache_snapshot
+from services.cache_service import budget_cache
+from services.cache_snapshot import CacheSnapshotStore
+
+
+@pytest.fixture(autouse=True)
+def empty_caches() -> Generator[None, None, None]:
+    cache.clear_cache()
+    enhancement.AI_CACHE.clear()
+    budget_cache.clear()
+    yield
+    cache.clear_cache()
+    enhancement.AI_CACHE.clear()
+    budget_cache.clear()
+
+
+@pytest.fixture
+def profile() -> Dict[str, Any]:
+    return {"currency": "INR", "monthly_income_primary": 60000, "city": "Pune", "expenses": {"housing_rent": 18000}}
+
+
+class TestCacheSnapshotStore:
+    """Tests for saving and restoring cache snapshots"""
+
+    def test_round_trip_restores_all_caches(self, tmp_path: Path, profile: Dict[str, Any]) -> None:
+        store = CacheSnapshotStore(str(tmp_path / "snapshot.sqlite3"))
+        cache.set_cached_plan(profile, {"plan": "cached"}, namespace="test")
+        enhancement.AI_CACHE["route"] = {"data": {"hotel_per_night": 120}, "timestamp": "2100-01-01T00:00:00"}
+        budget_cache.set({"income": 1}, {"budget": 42})
+
+        assert cache_snapshot.save_snapshot(store) == 3
+
+        cache.clear_cache()
+        enhancement.AI_CACHE.clear()
+        budget_cache.clear()
+        restored = cache_snapshot.restore_snapshot(cache_snapshot.read_snapshot(CacheSnapshotStore(store.path)))
+
+        assert restored == 3
+        assert cache.get_cached_plan(profile, namespace="test") == {"plan": "cached"}
+        assert enhancement.AI_CACHE["route"]["data"] == {"hotel_per_night": 120}
+        assert budget_cache.get({"income": 1}) == {"budget": 42}
+
+    def test_unchanged_entries_are_not_rewritten(self, tmp_path: Path, profile: Dict[str, Any]) -> None:
+        store = CacheSnapshotStore(str(tmp_path / "snapshot.sqlite3"))
+        cache.set_cached_plan(profile, {"plan": "cached"}, namespace="test")
+
+        assert cache_snapshot.save_snapshot(store) == 1
+        assert cache_snapshot.save_snapshot(store) == 0
+
+    def test_expired_entries_are_skipped(self, tmp_path: Path, profile: Dict[str, Any]) -> None:
+        store = CacheSnapshotStore(str(tmp_path / "snapshot.sqlite3"))
+        store.save("ai_plan", [("stale", {"plan": "old"}, time.time() - cache.CACHE_TTL - 60)], ttl_seconds=1e9)
+
+        snapshot = cache_snapshot.read_snapshot(store)
+
+        assert snapshot["ai_plan"] == []
+
+    def test_lifecycle_restores_and_persists(self, tmp_path: Path, profile: Dict[str, Any]) -> None:
+        path = str(tmp_path / "snapshot.sqlite3")
+
+        async def first_run() -> None:
+            await cache_snapshot.start_cache_snapshots(path)
+            cache.set_cached_plan(profile, {"plan": "persisted"}, namespace="test")
+            await cache_snapshot.stop_cache_snapshots()
+
+        async def second_run() -> Any:
+            await cache_snapshot.start_cache_snapshots(path)
+            await asyncio.sleep(0.2)  # Let the background restore finish
+            result = cache.get_cached_plan(profile, namespace="test")
+            await cache_snapshot.stop_cache_snapshots()
+            return result
+
+        asyncio.run(first_run())
+        cache.clear_cache()
+
+        assert asyncio.run(second_run()) == {"plan": "persisted"}
@@ -0,0 +1,64 @@
+"""
+Currency Tests
+==============
+Tests for the cross-rate matrix and response money-field conversion
+"""
+from dataclasses import replace
+
+import pytest
+
+from services import pricing_store
+from services.currency import MoneyFields, RateMatrix, UnsupportedCurrencyError, rate_matrix, usd_rate
+
+RATES = {"USD": 1.0, "INR": 80.0, "EUR": 0.8}
+
+
+class TestRateMatrix:
+    """Tests for cross rates"""
+
+    def test_any_pair(self) -> None:
+        matrix = RateMatrix(RATES, as_of="2025-01-01")
+        assert matrix.rate("USD", "INR") == 80.0
+        assert matrix.rate("eur", "inr") == pytest.approx(100.0)
+        assert matrix.rate("INR", "EUR") == pytest.approx(0.01)
+        assert matrix.rates_from("EUR", ["USD", "INR"]) == pytest.approx([1.25, 100.0])
+
+    def test_unknown_currency(self) -> None:
+        with pytest.raises(UnsupportedCurrencyError):
+            RateMatrix(RATES).rate("USD", "XYZ")
+        assert usd_rate("XYZ") == 1.0
+
+    def test_matrix_follows_pricing_snapshot(self) -> None:
+        assert rate_matrix() is rate_matrix()
+        assert usd_rate("INR") == rate_matrix().rate("USD", "INR")
+
+    def test_matrix_for_snapshot_taken_before_reload(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        taken = pricing_store.current_pricing()
+        reloaded = replace(
+            taken, version="reloaded", currency_rates={**taken.currency_rates, "INR": 1.0}, currency_rates_as_of="later",
+        )
+        monkeypatch.setattr(pricing_store, "_snapshot", reloaded)
+
+        matrix = rate_matrix(taken)
+        assert usd_rate("INR", matrix) == taken.currency_rates["INR"]
+        assert matrix.as_of == taken.currency_rates_as_of
+        assert usd_rate("INR") == 1.0
+
+
+class TestMoneyFields:
+    """Tests for one-pass conversion of payloads"""
+
+    FIELDS = MoneyFields("total", "flight.min", "flight.max")
+
+    def test_convert_in_place(self) -> None:
+        payload = {"total": 10.0, "flight": {"min": 1.0, "max": 2.0, "source": "ai"}, "days": 3}
+        self.FIELDS.convert(payload, 80.0)
+        assert payload == {"total": 800.0, "flight": {"min": 80.0, "max": 160.0, "source": "ai"}, "days": 3}
+
+    def test_quote_several_currencies(self) -> None:
+        payload = {"total": 8300.0, "flight": {"min": 835.0, "max": 1670.0}}
+        quotes = self.FIELDS.quote(payload, "INR", ["usd", "USD", "INR"])
+
+        assert list(quotes) == ["USD", "INR"]
+        assert quotes["INR"] == payload
+        assert quotes["USD"]["flight"]["max"] == round(1670.0 / rate_matrix().rate("USD", "INR"), 2)
@@ -0,0 +1,115 @@
+"""
+Goal Simulator Tests
+====================
+Tests for the Monte Carlo goal feasibility engine and the /goals/simulate endpoint
+"""
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+import main
+from budget_schemas.budget_planner import GoalSimulationRequest
+from services import budget_planner_service
+from services.cache_service import ResultCache, goal_simulation_cache
+from utils.goal_simulator import _accumulate, goal_shares, simulate_goals
+
+GOALS = [
+    {"name": "Trip", "target": 60000, "target_months": 12, "priority": 4},
+    {"name": "Car", "target": 500000, "target_months": 36, "priority": 2},
+]
+INPUTS = {"monthly_income": 150000, "fixed_expenses": {"rent": 30000}, "goals": GOALS}
+
+
+class TestGoalSimulator:
+    """Tests for the simulation kernel"""
+
+    def test_accumulate_matches_monthly_loop(self) -> None:
+        rng = np.random.default_rng(0)
+        contributions, growth = rng.uniform(0, 10, (3, 40)), rng.uniform(0.98, 1.03, (3, 40))
+        balance, expected = np.zeros(3), []
+        for month in range(40):
+            balance = (balance + contributions[:, month]) * growth[:, month]
+            expected.append(balance)
+        assert np.allclose(_accumulate(contributions, growth), np.array(expected).T)
+
+    def test_shares_move_to_open_goals(self) -> None:
+        shares = goal_shares(GOALS, 36)
+        assert np.allclose(shares.sum(axis=0), 1)
+        assert shares[0, 0] > 0 and shares[0, 12] == 0
+        assert shares[1, 12] == 1
+
+    def test_seeded_and_monotonic_in_savings(self) -> None:
+        low = simulate_goals(GOALS, sip=5000, fd_rd=2000, goal_saving=5000, paths=1000, seed=7)
+        assert simulate_goals(GOALS, sip=5000, fd_rd=2000, goal_saving=5000, paths=1000, seed=7) == low
+        high = simulate_goals(GOALS, sip=5000, fd_rd=2000, goal_saving=40000, paths=1000, seed=7)
+
+        assert low["paths_simulated"] == 1000 and not low["truncated"]
+        for before, after in zip(low["goals"], high["goals"]):
+            assert 0 <= before["probability"] <= after["probability"] <= 1
+        assert high["goals"][1]["probability"] > 0.9
+        assert low["buckets"]["sip"]["p10"] < low["buckets"]["sip"]["p90"]
+
+    def test_time_budget_truncates(self) -> None:
+        result = simulate_goals(GOALS, sip=0, fd_rd=0, goal_saving=10000, paths=20000, time_budget_ms=0)
+        assert result["truncated"] is True
+        assert result["paths_simulated"] == 500
+
+
+class TestGoalSimulationEndpoint:
+    """Tests for POST /api/v1/ai/budget/goals/simulate"""
+
+    URL = "/api/v1/ai/budget/goals/simulate"
+
+    @pytest.fixture(autouse=True)
+    def no_rate_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        goal_simulation_cache.clear()
+
+    def test_simulate_then_cached(self, client) -> None:
+        response = client.post(self.URL, json={"inputs": INPUTS, "paths": 1000})
+        assert response.status_code == 200
+        data = response.json()
+        assert [goal["name"] for goal in data["goals"]] == ["Trip", "Car"]
+        assert data["cached"] is False
+        assert set(data["buckets"]) == {"sip", "fd_rd"}
+
+        again = client.post(self.URL, json={"inputs": INPUTS, "paths": 1000}).json()
+        assert again["cached"] is True
+        assert again["goals"] == data["goals"]
+
+    def test_truncated_results_not_cached(self, client, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(budget_planner_service, "GOAL_SIMULATION_TIME_BUDGET_MS", 0)
+        for _ in range(2):
+            data = client.post(self.URL, json={"inputs": INPUTS, "paths": 2000}).json()
+            assert data["truncated"] is True
+            assert data["cached"] is False
+        assert len(goal_simulation_cache.cache) == 0
+
+    def test_default_request_at_max_horizon_completes(self, client) -> None:
+        inputs = {**INPUTS, "goals": [*GOALS, {"name": "Retirement", "target": 9000000, "target_months": 360}]}
+        data = client.post(self.URL, json={"inputs": inputs}).json()
+        assert data["truncated"] is False
+        assert data["paths_simulated"] == 5000
+
+        capped = client.post(self.URL, json={"inputs": inputs, "paths": 20000}).json()
+        assert capped["truncated"] is False
+        assert capped["paths_simulated"] == 5000
+        assert capped["goals"] == data["goals"]
+
+    def test_goals_required(self) -> None:
+        with pytest.raises(ValidationError):
+            GoalSimulationRequest(inputs={**INPUTS, "goals": []})
+
+
+class TestResultCacheBound:
+    """Tests for the size limit on result caches"""
+
+    def test_oldest_entry_evicted(self) -> None:
+        bounded = ResultCache(name="test", max_size=2)
+        for seed in range(3):
+            bounded.set({"seed": seed}, {"seed": seed})
+
+        assert len(bounded.cache) == 2
+        assert bounded.get({"seed": 0}) is None
+        assert bounded.get({"seed": 2}) == {"seed": 2}
+        assert goal_simulation_cache.max_size is not None
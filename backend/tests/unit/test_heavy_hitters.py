@@ -0,0 +1,118 @@
+"""
+Unit tests for heavy-hitter tracking and the cache pre-warmer
+"""
+import asyncio
+import time
+from typing import Any, Dict, Generator, List, Optional
+
+import pytest
+
+from services import cache_prewarmer
+from services.heavy_hitters import SpaceSaving, clear_trackers, get_tracker
+
+
+@pytest.fixture
+def prewarm_target() -> Generator[Dict[str, Any], None, None]:
+    """A fake cache registered with the pre-warmer"""
+    clear_trackers()
+    state: Dict[str, Any] = {"expiry": {}, "refreshed": []}
+
+    def expires_at(key: str) -> Optional[float]:
+        return state["expiry"].get(key)
+
+    async def refresh(payload: Any) -> None:
+        state["refreshed"].append(payload)
+
+    cache_prewarmer.register_prewarm_target("test_target", "test_tracker", expires_at, refresh, default_tokens=100)
+    yield state
+    cache_prewarmer._targets.pop("test_target", None)
+    cache_prewarmer._token_estimates.pop("test_target", None)
+    clear_trackers()
+
+
+class TestSpaceSaving:
+    """Tests for the Space-Saving sketch"""
+
+    def test_frequent_keys_survive_eviction(self) -> None:
+        sketch = SpaceSaving(capacity=4)
+        for i in range(200):
+            sketch.offer("hot-a")
+            if i % 2 == 0:
+                sketch.offer("hot-b")
+            sketch.offer(f"rare-{i}")
+
+        top = [hitter.key for hitter in sketch.top(2)]
+
+        assert top == ["hot-a", "hot-b"]
+        assert len(sketch) == 4
+
+    def test_counts_never_underestimate(self) -> None:
+        sketch = SpaceSaving(capacity=2)
+        for key in ["a", "b", "c", "a", "c", "c"]:
+            sketch.offer(key)
+
+        counts = {hitter.key: hitter for hitter in sketch.top(2)}
+
+        assert counts["c"].count >= 3
+        assert counts["c"].count - counts["c"].error <= 3
+
+    def test_latest_payload_is_kept_and_decay_scales_counts(self) -> None:
+        sketch = SpaceSaving()
+        sketch.offer("route", payload={"v": 1})
+        sketch.offer("route", payload={"v": 2})
+        sketch.decay(0.5)
+
+        hitter = sketch.top(1)[0]
+
+        assert hitter.payload == {"v": 2}
+        assert hitter.count == 1.0
+
+
+class TestCachePrewarmer:
+    """Tests for budgeted pre-warming of hot keys"""
+
+    def test_refreshes_hot_keys_near_expiry(self, prewarm_target: Dict[str, Any]) -> None:
+        tracker = get_tracker("test_tracker")
+        for _ in range(5):
+            tracker.offer("expiring", payload="expiring")
+            tracker.offer("fresh", payload="fresh")
+        tracker.offer("cold", payload="cold")
+        prewarm_target["expiry"] = {"expiring": time.time() + 10, "fresh": time.time() + 3600}
+
+        summary = asyncio.run(cache_prewarmer.run_prewarm_cycle(token_budget=1000, horizon=60))
+
+        assert prewarm_target["refreshed"] == ["expiring"]
+        assert summary["refreshed"] == 1
+
+    def test_token_budget_limits_refreshes(self, prewarm_target: Dict[str, Any]) -> None:
+        tracker = get_tracker("test_tracker")
+        for count, key in ((9, "hottest"), (6, "warm"), (4, "lukewarm")):
+            for _ in range(count):
+                tracker.offer(key, payload=key)
+        cache_prewarmer.record_token_usage("test_target", 400)
+
+        summary = asyncio.run(cache_prewarmer.run_prewarm_cycle(token_budget=900, horizon=60))
+
+        assert prewarm_target["refreshed"] == ["hottest", "warm"]
+        assert summary["skipped_over_budget"] == 1
+        assert summary["tokens_spent_estimate"] == 800
+
+    def test_hotness_decays_between_cycles(self, prewarm_target: Dict[str, Any]) -> None:
+        tracker = get_tracker("test_tracker")
+        for _ in range(4):
+            tracker.offer("once-hot", payload="once-hot")
+
+        refreshed: List[Any] = prewarm_target["refreshed"]
+        asyncio.run(cache_prewarmer.run_prewarm_cycle(token_budget=1000, horizon=60))
+        asyncio.run(cache_prewarmer.run_prewarm_cycle(token_budget=1000, horizon=60))
+
+        assert refreshed == ["once-hot"]
+
+    def test_plan_refresh_that_falls_back_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from services import ai_planner_v2
+
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        with pytest.raises(RuntimeError):
+            asyncio.run(ai_planner_v2._refresh_cached_plan({
+                "monthly_income_primary": 50000, "expenses": {"housing_rent": 15000},
+            }))
@@ -0,0 +1,29 @@
+"""
+Unit tests for the fast JSON response class
+"""
+import json
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.microbench import _debt_loans
+from schemas import MultiLoanInput
+from services.json_response import FastJSONResponse, dump_json
+from services.multi_loan import compare_debt_strategies
+
+
+def test_model_output_matches_default_encoder() -> None:
+    comparison = compare_debt_strategies(MultiLoanInput(loans=_debt_loans(3, 24), extra_payment=1000))
+
+    assert json.loads(FastJSONResponse(comparison).body) == jsonable_encoder(comparison)
+
+
+def test_plain_content_with_nested_models_and_dates() -> None:
+    comparison = compare_debt_strategies(MultiLoanInput(loans=_debt_loans(1, 12), extra_payment=0))
+    content = {"when": date(2026, 5, 4), 3: "int key", "nested": [comparison.snowball]}
+
+    decoded = json.loads(dump_json(content))
+
+    assert decoded["when"] == "2026-05-04"
+    assert decoded["3"] == "int key"
+    assert decoded["nested"][0]["strategy_type"] == "snowball"
@@ -0,0 +1,35 @@
+"""
+Unit tests for the calculation microbenchmark harness
+"""
+from pathlib import Path
+
+from benchmarks.microbench import build_cases, compare_to_baseline, load_baseline, run_cases, save_baseline
+
+
+def test_every_case_runs() -> None:
+    cases = build_cases()
+    assert len({case.key for case in cases}) == len(cases)
+    for case in cases:
+        case.func()
+
+
+def test_regressions_beyond_threshold_are_flagged() -> None:
+    baseline = {"a[n=1]": {"best_us": 10.0}, "b[n=1]": {"best_us": 10.0}}
+    results = {"a[n=1]": {"best_us": 11.0}, "b[n=1]": {"best_us": 13.0}, "c[n=1]": {"best_us": 1.0}}
+
+    comparisons = {c.key: c for c in compare_to_baseline(results, baseline, threshold=0.15)}
+
+    assert not comparisons["a[n=1]"].regressed
+    assert comparisons["b[n=1]"].regressed
+    assert "c[n=1]" not in comparisons
+
+
+def test_baseline_round_trip(tmp_path: Path) -> None:
+    cases = [case for case in build_cases() if "calculate_emi" in case.key]
+    results = run_cases(cases, repeat=1, min_run_seconds=0.001)
+    path = tmp_path / "baseline.json"
+
+    save_baseline(results, path)
+
+    assert load_baseline(path) == results
+    assert load_baseline(tmp_path / "missing.json") is None
@@ -0,0 +1,70 @@
+"""
+Pricing Store Tests
+===================
+Tests for the versioned, hot-reloadable pricing data
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from services import pricing_store
+from utils.auto_loan_calculator import get_auto_loan_interest_rates
+
+
+@pytest.fixture
+def pricing_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A private copy of the shipped data file, made the live source."""
+    path = tmp_path / "pricing.json"
+    path.write_text(Path(pricing_store.PRICING_DATA_PATH).read_text())
+    monkeypatch.setattr(pricing_store, "PRICING_DATA_PATH", str(path))
+    monkeypatch.setattr(pricing_store, "_snapshot", pricing_store.load_snapshot(str(path)))
+    return path
+
+
+def _rewrite(path: Path, **changes: object) -> None:
+    data = json.loads(path.read_text())
+    data.update(changes)
+    path.write_text(json.dumps(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestSnapshot:
+    """Tests for the shipped data and lookups"""
+
+    def test_shipped_data_matches_previous_tables(self) -> None:
+        pricing = pricing_store.current_pricing()
+        assert pricing.currency_rates["INR"] == 83.5
+        assert pricing.travel_cost("hotel_per_night", "budget", "premium_destinations") == 80
+        assert get_auto_loan_interest_rates("used_car", credit_score=680, bank_type="nbfc")["typical_rate"] == 14.0
+        assert get_auto_loan_interest_rates("unknown", credit_score=820)["typical_rate"] == 8.0
+
+    def test_snapshot_is_read_only(self) -> None:
+        with pytest.raises(TypeError):
+            pricing_store.current_pricing().currency_rates["USD"] = 2.0  # type: ignore[index]
+
+
+class TestReload:
+    """Tests for hot reloading"""
+
+    def test_changed_file_swapped_in(self, pricing_file: Path) -> None:
+        before = pricing_store.current_pricing()
+        assert pricing_store.reload_pricing() is False  # Unchanged file
+
+        rates = {**before.currency_rates, "INR": 90.0}
+        _rewrite(pricing_file, version="2025.2", currency_rates=rates)
+        assert pricing_store.reload_pricing() is True
+
+        assert pricing_store.current_pricing().version == "2025.2"
+        assert pricing_store.current_pricing().currency_rates["INR"] == 90.0
+        assert before.currency_rates["INR"] == 83.5  # Snapshots taken earlier are unaffected
+
+    def test_invalid_file_keeps_previous_version(self, pricing_file: Path) -> None:
+        version = pricing_store.current_pricing().version
+        _rewrite(pricing_file, version="broken", currency_rates={"USD": 1.0, "INR": "lots"})
+
+        assert pricing_store.reload_pricing() is False
+        assert pricing_store.current_pricing().version == version
+        assert pricing_store.pricing_stats()["reload_failures"] >= 1
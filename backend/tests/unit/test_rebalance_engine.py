@@ -0,0 +1,190 @@
+"""
+Rebalance Engine Tests
+======================
+Tests for the incremental rebalance graph, the /rebalance/delta endpoint and the editing WebSocket
+"""
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+import main
+from budget_schemas.budget_planner import BudgetGenerateRequest, BudgetRebalanceRequest
+from services import rebalance_channel
+from services.budget_planner_service import BudgetPlannerService
+from services.rebalance_engine import (
+    REBALANCE_GRAPH,
+    DependencyGraph,
+    RebalanceSessionStore,
+    apply_changes,
+    start_session,
+)
+
+ORIGINAL_INPUTS = {"monthly_income": 80000, "fixed_expenses": {"rent": 30000}, "mode": "smart_balanced"}
+EDITED_PLAN = {"income": 80000, "budget_split": {"needs_percent": 50, "wants_percent": 30, "savings_percent": 20}}
+
+
+def rebalance_request(needs: float, wants: float, savings: float) -> BudgetRebalanceRequest:
+    return BudgetRebalanceRequest(
+        edited_plan={"income": 80000, "budget_split": {
+            "needs_percent": needs, "wants_percent": wants, "savings_percent": savings,
+        }},
+        original_inputs=BudgetGenerateRequest(**ORIGINAL_INPUTS),
+    )
+
+
+class TestDependencyGraph:
+    """Tests for dirty tracking"""
+
+    def build(self, calls: list) -> DependencyGraph:
+        graph = DependencyGraph(inputs=("a", "b"))
+        graph.node("double_a", ("a",), lambda a: calls.append("double_a") or a * 2)
+        graph.node("sign_b", ("b",), lambda b: calls.append("sign_b") or b >= 0, output=False)
+        graph.node("label", ("sign_b",), lambda positive: calls.append("label") or ("+" if positive else "-"))
+        return graph
+
+    def test_only_dependents_recompute(self) -> None:
+        calls: list = []
+        graph = self.build(calls)
+        values = graph.evaluate({"a": 1, "b": 1})
+        calls.clear()
+
+        changed, recomputed = graph.update(values, {"a": 5})
+        assert changed == {"double_a": 10}
+        assert recomputed == 1
+        assert calls == ["double_a"]
+
+    def test_unchanged_value_stops_propagation(self) -> None:
+        calls: list = []
+        graph = self.build(calls)
+        values = graph.evaluate({"a": 1, "b": 1})
+        calls.clear()
+
+        changed, _ = graph.update(values, {"b": 7})
+        assert changed == {}
+        assert calls == ["sign_b"]
+        changed, _ = graph.update(values, {"b": -1})
+        assert changed == {"label": "-"}
+
+    def test_unknown_dependency(self) -> None:
+        with pytest.raises(ValueError):
+            DependencyGraph(inputs=("a",)).node("x", ("missing",), lambda m: m)
+
+
+class TestRebalanceGraph:
+    """Tests that incremental updates match a full rebalance"""
+
+    def test_full_evaluation_matches_rebalance_explanation(self) -> None:
+        plan = BudgetPlannerService.rebalance_budget(rebalance_request(55, 25, 20))
+        assert plan.explanation == (
+            "Your budget has been rebalanced:\n\n"
+            "📈 Changes:\n"
+            "- Needs: +5.0% (now 55.0%)\n"
+            "- Wants: -5.0% (now 25.0%)\n"
+            "\n⚠️ 1 alert(s) for your attention."
+        )
+        assert plan.budget_amounts.needs == 44000
+
+    def test_update_matches_full_evaluation(self) -> None:
+        session = start_session(BudgetPlannerService.rebalance_inputs(rebalance_request(50, 30, 20)))
+        changed, recomputed = apply_changes(session, {"wants_percent": 45, "savings_percent": 5})
+
+        expected = REBALANCE_GRAPH.evaluate(BudgetPlannerService.rebalance_inputs(rebalance_request(50, 45, 5)))
+        assert session.outputs() == {name: expected[name] for name in REBALANCE_GRAPH.outputs}
+        assert "budget_amounts.needs" not in changed
+        assert changed["budget_amounts.wants"] == 36000
+        assert recomputed < len(REBALANCE_GRAPH.outputs) + 10
+        assert session.revision == 1
+
+    def test_rejects_non_editable_inputs(self) -> None:
+        session = start_session(BudgetPlannerService.rebalance_inputs(rebalance_request(50, 30, 20)))
+        with pytest.raises(ValueError):
+            apply_changes(session, {"rent": 0})
+
+    def test_session_store_expiry_and_eviction(self) -> None:
+        store = RebalanceSessionStore(ttl_seconds=60, max_sessions=2)
+        first = store.create({})
+        store.create({})
+        store.create({})
+        assert store.get(first.id) is None
+        assert len(store) == 2
+
+        expired = RebalanceSessionStore(ttl_seconds=-1).create({})
+        assert RebalanceSessionStore(ttl_seconds=-1).get(expired.id) is None
+
+
+class TestRebalanceDeltaEndpoint:
+    """Tests for POST /api/v1/ai/budget/rebalance/delta"""
+
+    URL = "/api/v1/ai/budget/rebalance/delta"
+
+    @pytest.fixture(autouse=True)
+    def no_rate_limit(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(main.limiter, "enabled", False)
+
+    def test_session_round_trip(self, client) -> None:
+        response = client.post(self.URL, json={"edited_plan": EDITED_PLAN, "original_inputs": ORIGINAL_INPUTS})
+        assert response.status_code == 200
+        started = response.json()
+        assert started["full"] is True
+        assert started["changed"]["budget_amounts.needs"] == 40000
+
+        response = client.post(self.URL, json={"session_id": started["session_id"], "changes": {"needs_percent": 55}})
+        assert response.status_code == 200
+        delta = response.json()
+        assert delta["full"] is False
+        assert delta["revision"] == started["revision"] + 1
+        assert delta["changed"]["budget_amounts.needs"] == 44000
+        assert "budget_amounts.wants" not in delta["changed"]
+
+    def test_unknown_session_without_context(self, client) -> None:
+        response = client.post(self.URL, json={"session_id": "missing", "changes": {"needs_percent": 55}})
+        assert response.status_code == 404
+
+    def test_invalid_change(self, client) -> None:
+        response = client.post(self.URL, json={
+            "edited_plan": EDITED_PLAN, "original_inputs": ORIGINAL_INPUTS, "changes": {"rent": 1},
+        })
+        assert response.status_code == 400
+
+
+class TestRebalanceChannel:
+    """Tests for the /api/v1/ai/budget/ws editing channel"""
+
+    URL = "/api/v1/ai/budget/ws"
+
+    def test_coalesces_edits(self, client, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(rebalance_channel, "REBALANCE_WS_DEBOUNCE", 0.2)
+        with client.websocket_connect(self.URL) as ws:
+            ws.send_json({"edited_plan": EDITED_PLAN, "original_inputs": ORIGINAL_INPUTS})
+            started = ws.receive_json()
+            assert started["full"] is True
+
+            for seq, needs in enumerate((52, 54, 56), start=1):
+                ws.send_json({"seq": seq, "changes": {"needs_percent": needs}})
+            update = ws.receive_json()
+            assert update["coalesced"] == 3
+            assert update["seq"] == 3
+            assert update["changed"]["budget_amounts.needs"] == 44800
+            assert "budget_amounts.wants" not in update["changed"]
+
+    def test_rejected_edit_keeps_connection(self, client) -> None:
+        with client.websocket_connect(self.URL) as ws:
+            ws.send_json({"edited_plan": EDITED_PLAN, "original_inputs": ORIGINAL_INPUTS})
+            session_id = ws.receive_json()["session_id"]
+            ws.send_json({"changes": {"rent": 1}})
+            assert ws.receive_json()["success"] is False
+            ws.send_json({"changes": {"wants_percent": 25}})
+            assert ws.receive_json()["changed"]["budget_amounts.wants"] == 20000
+
+        # Reconnect and resume: every field again, with the edit kept
+        with client.websocket_connect(self.URL) as ws:
+            ws.send_json({"session_id": session_id})
+            resumed = ws.receive_json()
+            assert resumed["full"] is True
+            assert resumed["changed"]["budget_split.wants_percent"] == 25
+
+    def test_unknown_session_closes(self, client) -> None:
+        with client.websocket_connect(self.URL) as ws:
+            ws.send_json({"session_id": "missing"})
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+            assert closed.value.code == rebalance_channel.CLOSE_UNKNOWN_SESSION
@@ -0,0 +1,110 @@
+"""
+Split Table Tests
+=================
+Tests that the precomputed budget split table matches the calculator chain
+"""
+import random
+
+import pytest
+
+from budget_schemas.budget_planner import BudgetGenerateRequest
+from services.budget_planner_service import BudgetPlannerService
+from utils import split_table
+from utils.budget_calculator import (
+    apply_income_based_tuning,
+    apply_lifestyle_modifier,
+    calculate_col_adjusted_budget,
+    get_mode_adjustment,
+)
+from utils.split_table import SPLIT_TABLE, SplitTable, _band_inputs, compute_split
+
+
+def chain_split(col_multiplier, lifestyle, mode, income, rent, total_emi):
+    # The split steps generate_budget ran inline before the table, kept verbatim as the reference
+    col_adjusted = calculate_col_adjusted_budget(base_needs=50, col_multiplier=col_multiplier, min_savings=5.0)
+    needs_percent = col_adjusted['needs']
+    wants_percent = apply_lifestyle_modifier(col_adjusted['wants'], lifestyle)
+    needs_percent = max(needs_percent, 0)
+    savings_percent = max(100 - needs_percent - wants_percent, 0)
+    wants_percent = 100 - needs_percent - savings_percent
+    tuned = apply_income_based_tuning(income, needs_percent, wants_percent, savings_percent, rent, total_emi)
+    needs_percent, wants_percent, savings_percent = tuned['needs'], tuned['wants'], tuned['savings']
+    mode_adj = get_mode_adjustment(mode)
+    if mode != 'smart_balanced':
+        if mode == 'basic':
+            needs_percent = 45
+            wants_percent = 30
+            savings_percent = 25
+        elif mode == 'aggressive_savings':
+            wants_reduction = wants_percent * (mode_adj['wants_reduction'] / 100)
+            wants_percent = max(wants_percent - wants_reduction, 5)
+            savings_percent = min(savings_percent + mode_adj['savings_boost'], 40)
+            needs_percent = 100 - wants_percent - savings_percent
+    return needs_percent, wants_percent, savings_percent
+
+
+class TestSplitTable:
+    """Tests for table lookups"""
+
+    def test_every_entry_matches_chain(self) -> None:
+        assert len(SPLIT_TABLE.splits) == 151 * 4 * 3 * 8
+        for (col, lifestyle, mode, *band), split in SPLIT_TABLE.splits.items():
+            expected = compute_split(col, lifestyle, mode, *_band_inputs(*band))
+            assert split == expected
+            assert [type(value) for value in split] == [type(value) for value in expected]
+
+    def test_lookup_matches_chain_for_any_household(self) -> None:
+        rng = random.Random(2)
+        for _ in range(2000):
+            col = rng.choice([round(rng.uniform(0.5, 2.0), 2), rng.uniform(0.5, 2.0), 1.25, 0.9])
+            lifestyle = rng.choice(["minimal", "moderate", "comfort", "premium", "unknown"])
+            mode = rng.choice(["basic", "smart_balanced", "aggressive_savings", "unknown"])
+            income = rng.uniform(10001, 200000)
+            rent = rng.uniform(0, income * 0.6)
+            total_emi = rng.choice([0, rng.uniform(0, income * 0.5)])
+            assert SPLIT_TABLE.lookup(col, lifestyle, mode, income, rent, total_emi) == \
+                compute_split(col, lifestyle, mode, income, rent, total_emi)
+
+    def test_interpolation_between_grid_points(self) -> None:
+        table = SplitTable(interpolate=True)
+        needs, wants, savings = table.lookup(1.255, "moderate", "smart_balanced", 80000, 0, 0)
+        exact = compute_split(1.255, "moderate", "smart_balanced", 80000, 0, 0)
+
+        assert needs + wants + savings == 100
+        assert all(abs(a - b) <= 0.1 for a, b in zip((needs, wants, savings), exact))
+        assert table.lookup(1.25, "moderate", "smart_balanced", 80000, 0, 0) == \
+            compute_split(1.25, "moderate", "smart_balanced", 80000, 0, 0)
+
+    def test_generate_budget_uses_table_split(self) -> None:
+        request = BudgetGenerateRequest(
+            monthly_income=20000, col_multiplier=1.3, lifestyle="premium", mode="aggressive_savings",
+            fixed_expenses={"rent": 9000},
+        )
+        plan = BudgetPlannerService.generate_budget(request)
+        needs, wants, savings = compute_split(1.3, "premium", "aggressive_savings", 20000, 9000, 0)
+
+        assert (plan.budget_split.needs_percent, plan.budget_split.wants_percent,
+                plan.budget_split.savings_percent) == (needs, wants, savings)
+        assert plan.budget_amounts.savings == 20000 * savings / 100
+
+    def test_generate_budget_output_unchanged(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        rng = random.Random(4)
+        requests = [
+            BudgetGenerateRequest(
+                monthly_income=rng.choice([12000, 24000, rng.uniform(10001, 300000)]),
+                col_multiplier=rng.choice([0.5, 1.0, 1.25, 2.0, round(rng.uniform(0.5, 2.0), 2), rng.uniform(0.5, 2.0)]),
+                lifestyle=rng.choice(["minimal", "moderate", "comfort", "premium"]),
+                mode=rng.choice(["basic", "aggressive_savings", "smart_balanced"]),
+                fixed_expenses={"rent": rng.uniform(0, 12000)},
+                loans=[{"principal": rng.uniform(1e5, 2e6), "rate": 10, "tenure_months": 60}] * rng.randint(0, 2),
+            )
+            for _ in range(300)
+        ]
+        plans = [BudgetPlannerService.generate_budget(request).model_dump() for request in requests]
+
+        monkeypatch.setattr(split_table.SplitTable, "lookup", lambda self, **kwargs: chain_split(**kwargs))
+        for request, plan in zip(requests, plans):
+            assert plan == BudgetPlannerService.generate_budget(request).model_dump()
+        # Clamped savings are ints in the chain, and alert text prints them as such
+        messages = [alert["message"] for plan in plans for alert in plan["alerts"]]
+        assert "Low savings rate: Only 3% of income" in messages
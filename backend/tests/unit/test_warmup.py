@@ -0,0 +1,55 @@
+"""
+Startup Warm-up Tests
+=====================
+Tests for deferred heavy imports and background warm-up
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from services import warmup
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class TestLazyImports:
+    """Heavy subsystems must not load when the application is imported"""
+
+    def test_main_import_skips_openai_and_reportlab(self) -> None:
+        code = "import sys, main; print(sorted({'openai', 'reportlab'} & set(sys.modules)))"
+        env = {**os.environ, "OPENAI_API_KEY": "test-key-for-ci", "WARMUP_ENABLED": "false"}
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+class TestWarmup:
+    """Tests for the warm-up registry"""
+
+    def test_failed_warmer_stays_pending(self, monkeypatch) -> None:
+        calls = []
+        monkeypatch.setattr(warmup, "_warmers", {"ok": lambda: calls.append("ok"), "broken": lambda: 1 / 0})
+        monkeypatch.setattr(warmup, "_durations", {})
+
+        durations = warmup.run_warmup()
+
+        assert calls == ["ok"]
+        assert set(durations) == {"ok"}
+        assert warmup.warmup_stats()["pending"] == ["broken"]
+
+    def test_preload_runs_only_fork_safe_warmers(self, monkeypatch) -> None:
+        calls = []
+        monkeypatch.setattr(warmup, "_warmers", {})
+        monkeypatch.setattr(warmup, "_fork_safe", set())
+        monkeypatch.setattr(warmup, "_durations", {})
+        warmup.register_warmer("sdk", lambda: calls.append("sdk"), fork_safe=True)
+        warmup.register_warmer("client", lambda: calls.append("client"))
+
+        warmup.preload_for_fork()
+        assert calls == ["sdk"]
+
+        # In the forked worker only what the master did not load runs
+        warmup.run_warmup()
+        assert calls == ["sdk", "client"]
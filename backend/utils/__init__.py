@@ -20,6 +20,8 @@ from .alert_detector import (
     detect_insufficient_emergency_alert,
     generate_alerts,
     get_alert_count_by_severity,
+    evaluate_alerts_batch,
+    decode_alert_mask,
 )
 
 __all__ = [
@@ -38,4 +40,6 @@ __all__ = [
     "detect_insufficient_emergency_alert",
     "generate_alerts",
     "get_alert_count_by_severity",
+    "evaluate_alerts_batch",
+    "decode_alert_mask",
 ]
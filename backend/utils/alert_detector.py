@@ -1,10 +1,14 @@
 """
 Budget Planner V1.2 - Alert Detection System
-Rules-based alert detection for risk identification
+Rules-based alert detection for risk identification, driven by a rule table that runs on one profile or on NumPy arrays of profiles
 """
 
-from typing import List, Dict, Optional
+import operator
+from dataclasses import dataclass
 from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
 
 
 class SeverityLevel(str, Enum):
@@ -16,6 +20,15 @@ class SeverityLevel(str, Enum):
     CRITICAL = "critical"
 
 
+SEVERITY_ORDER = {
+    SeverityLevel.CRITICAL: 0,
+    SeverityLevel.HIGH: 1,
+    SeverityLevel.MODERATE: 2,
+    SeverityLevel.WARNING: 3,
+    SeverityLevel.INFO: 4,
+}
+
+
 class AlertCode(str, Enum):
     """Alert codes for categorization"""
     HIGH_RENT = "HIGH_RENT"
@@ -26,6 +39,353 @@ class AlertCode(str, Enum):
     INSUFFICIENT_EMERGENCY = "INSUFFICIENT_EMERGENCY"
 
 
+# ============================================
+# RULE TABLE
+# ============================================
+
+# Profile fields by name: floats for one profile, arrays (or broadcastable scalars) for a batch
+Profile = Mapping[str, Any]
+# (message, suggestion, metadata) for a fired rule, given the profile, metric value, threshold and escalation
+Renderer = Callable[[Profile, float, float, bool], Tuple[str, str, Dict[str, object]]]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """
+    One alert as data.
+
+    The rule fires when `compare(metric(profile), threshold)` holds and escalates from
+    `severities[0]` to `severities[1]` when the metric is beyond the threshold by more
+    than `escalate_by`. Metric getters are plain arithmetic on profile fields, so the
+    same rule evaluates one profile or whole arrays of them.
+    """
+    code: AlertCode
+    metric: Callable[[Profile], Any]  # e.g. rent / income
+    threshold: float
+    render: Renderer
+    compare: Callable[[Any, Any], Any] = operator.gt  # operator.gt (fires above) or operator.lt (below)
+    escalate_by: float = float("inf")
+    severities: Tuple[SeverityLevel, SeverityLevel] = (SeverityLevel.HIGH, SeverityLevel.CRITICAL)
+    # Threshold picked by a categorical field, e.g. ("city_tier", {"tier_1": 0.40}); `threshold` is the default
+    threshold_by: Optional[Tuple[str, Mapping[str, float]]] = None
+    # The rule only applies when this field is positive (it is the metric's denominator)
+    guard: Optional[str] = None
+
+    def limits(self, threshold: float) -> Tuple[float, float]:
+        """(threshold, escalation limit): escalate_by further in the direction the rule fires."""
+        offset = self.escalate_by if self.compare is operator.gt else -self.escalate_by
+        return threshold, threshold + offset
+
+
+def _rent_ratio(p: Profile) -> Any:
+    return p['rent'] / p['income']
+
+
+def _emi_ratio(p: Profile) -> Any:
+    return p['total_emi'] / p['income']
+
+
+def _deficit(p: Profile) -> Any:
+    return p['total_expenses'] - p['income']
+
+
+def _months_covered(p: Profile) -> Any:
+    return p['emergency_fund'] / p['total_expenses']
+
+
+def _render_high_rent(p: Profile, ratio: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    return (
+        f'High rent burden: {round(ratio * 100, 1)}% of income',
+        'Consider relocating to more affordable area or seeking additional income',
+        {
+            'rent': p['rent'],
+            'income': p['income'],
+            'ratio': round(ratio, 2),
+            'threshold': threshold,
+        },
+    )
+
+
+def _render_high_emi(p: Profile, ratio: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    if escalated:
+        suggestion = 'Your EMI burden is excessive. Consider loan restructuring or refinancing at lower rates'
+    else:
+        suggestion = 'High EMI burden affecting budget flexibility. Monitor your finances closely'
+    if p['has_multiple_loans']:
+        suggestion += '. Consider consolidating loans to reduce interest burden'
+    return (
+        f'High loan burden: {round(ratio * 100, 1)}% of income',
+        suggestion,
+        {
+            'total_emi': p['total_emi'],
+            'income': p['income'],
+            'ratio': round(ratio, 2),
+            'threshold': threshold,
+            'multiple_loans': p['has_multiple_loans'],
+        },
+    )
+
+
+def _render_negative_cashflow(p: Profile, deficit: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    percentage = round((deficit / p['income']) * 100, 1)
+    return (
+        f'Negative cashflow: Deficit of ₹{deficit:,.0f} ({percentage}%)',
+        'You are spending more than you earn. Immediately reduce expenses or increase income',
+        {
+            'income': p['income'],
+            'total_expenses': p['total_expenses'],
+            'deficit': deficit,
+            'deficit_percentage': percentage,
+        },
+    )
+
+
+def _render_low_savings(p: Profile, savings_percent: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    if escalated:
+        suggestion = 'Critically low savings rate. You are at risk during emergencies. Increase savings immediately'
+    else:
+        suggestion = 'Low savings rate. Try to increase to at least 15% for better financial security'
+    return (
+        f'Low savings rate: Only {round(savings_percent, 1)}% of income',
+        suggestion,
+        {
+            'savings_amount': p['savings_amount'],
+            'income': p['income'],
+            'savings_percent': savings_percent,
+            'recommended_percent': 15,
+        },
+    )
+
+
+def _render_high_wants(p: Profile, wants_percent: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    excess_amount = round(p['wants_amount'] - (p['income'] * threshold / 100), 2)
+    return (
+        f'High discretionary spending: {round(wants_percent, 1)}% of income (₹{excess_amount:,.0f} excess)',
+        'Review your dining, entertainment, and shopping expenses. Look for areas to cut back',
+        {
+            'wants_percent': wants_percent,
+            'wants_amount': p['wants_amount'],
+            'threshold_percent': threshold,
+            'excess_percent': round(wants_percent - threshold, 1),
+            'excess_amount': excess_amount,
+            'budget_mode': p['budget_mode'],
+        },
+    )
+
+
+def _render_insufficient_emergency(p: Profile, months_covered: float, threshold: float, escalated: bool) -> Tuple[str, str, Dict[str, object]]:
+    if escalated:
+        suggestion = 'Critical: You have less than 1 month of expenses saved. Build your emergency fund urgently'
+    else:
+        suggestion = 'Your emergency fund covers less than 3 months. Build it to at least 3-6 months'
+    return (
+        f'Insufficient emergency fund: {round(months_covered, 1)} months of expenses',
+        suggestion,
+        {
+            'emergency_fund': p['emergency_fund'],
+            'monthly_expenses': p['total_expenses'],
+            'months_covered': round(months_covered, 2),
+            'recommended_months': 6,
+            'recommended_amount': p['total_expenses'] * 6,
+        },
+    )
+
+
+# Order matters: it is the order alerts of equal severity are listed in, and bit i of a batch mask is rule i
+ALERT_RULES: Tuple[AlertRule, ...] = (
+    AlertRule(
+        AlertCode.HIGH_RENT,
+        metric=_rent_ratio,
+        threshold=0.30,
+        threshold_by=('city_tier', {'tier_1': 0.40, 'tier_2': 0.35, 'tier_3': 0.30, 'other': 0.25}),
+        escalate_by=0.10,
+        guard='income',
+        render=_render_high_rent,
+    ),
+    AlertRule(
+        AlertCode.HIGH_EMI,
+        metric=_emi_ratio,
+        threshold=0.30,
+        escalate_by=0.10,
+        guard='income',
+        render=_render_high_emi,
+    ),
+    AlertRule(
+        AlertCode.NEGATIVE_CASHFLOW,
+        metric=_deficit,
+        threshold=0,
+        severities=(SeverityLevel.CRITICAL, SeverityLevel.CRITICAL),
+        render=_render_negative_cashflow,
+    ),
+    AlertRule(
+        AlertCode.LOW_SAVINGS,
+        metric=operator.itemgetter('savings_percent'),
+        threshold=10,
+        compare=operator.lt,
+        escalate_by=5,
+        severities=(SeverityLevel.MODERATE, SeverityLevel.CRITICAL),
+        guard='income',
+        render=_render_low_savings,
+    ),
+    AlertRule(
+        AlertCode.HIGH_WANTS,
+        metric=operator.itemgetter('wants_percent'),
+        threshold=35,
+        threshold_by=('budget_mode', {'basic': 40, 'smart_balanced': 35, 'aggressive_savings': 30}),
+        escalate_by=5,
+        severities=(SeverityLevel.WARNING, SeverityLevel.HIGH),
+        render=_render_high_wants,
+    ),
+    AlertRule(
+        AlertCode.INSUFFICIENT_EMERGENCY,
+        metric=_months_covered,
+        threshold=3,
+        compare=operator.lt,
+        escalate_by=2,
+        severities=(SeverityLevel.MODERATE, SeverityLevel.CRITICAL),
+        guard='total_expenses',
+        render=_render_insufficient_emergency,
+    ),
+)
+
+
+# ============================================
+# RULE EVALUATION
+# ============================================
+
+# A fired rule: (severity rank, rule index, metric value, threshold, escalated)
+FiredRule = Tuple[int, int, Any, float, bool]
+
+
+class AlertRuleSet:
+    """
+    A rule table evaluated for one profile or for NumPy arrays of profiles.
+
+    Both paths walk the same rules: the getter computes the metric, and the rule's
+    comparison checks it against the (possibly per-category) threshold and
+    escalation limit. Only fired rules pay for building their message.
+    """
+
+    def __init__(self, rules: Tuple[AlertRule, ...]):
+        if len(rules) > 64:
+            raise ValueError("At most 64 alert rules fit in a batch mask")
+        self.rules = rules
+        self.bits: Dict[AlertCode, int] = {rule.code: 1 << i for i, rule in enumerate(rules)}
+        self.mask_dtype = np.uint8 if len(rules) <= 8 else np.uint16 if len(rules) <= 16 else np.uint64
+        self._index = {rule.code: i for i, rule in enumerate(rules)}
+        self._ranks = tuple(tuple(SEVERITY_ORDER[severity] for severity in rule.severities) for rule in rules)
+
+    @staticmethod
+    def _limits(rule: AlertRule, profile: Profile) -> Tuple[float, float]:
+        threshold = rule.threshold
+        if rule.threshold_by:
+            field, by_category = rule.threshold_by
+            threshold = by_category.get(profile[field], rule.threshold)
+        return rule.limits(threshold)
+
+    def _fire(self, index: int, profile: Profile) -> Optional[FiredRule]:
+        """Evaluate one rule on one profile; None when it does not fire."""
+        rule = self.rules[index]
+        if rule.guard and not profile[rule.guard] > 0:
+            return None
+        value = rule.metric(profile)
+        threshold, escalate_at = self._limits(rule, profile)
+        if not rule.compare(value, threshold):
+            return None
+        escalated = bool(rule.compare(value, escalate_at))
+        return self._ranks[index][escalated], index, value, threshold, escalated
+
+    def _alerts(self, profile: Profile, fired: List[FiredRule]) -> List[Dict[str, object]]:
+        if len(fired) > 1:
+            fired.sort()  # (rank, rule index, ...): indexes are unique, so the sort is by severity then rule order
+        alerts = []
+        for _, index, value, threshold, escalated in fired:
+            rule = self.rules[index]
+            message, suggestion, metadata = rule.render(profile, value, threshold, escalated)
+            alerts.append({
+                'code': rule.code,
+                'message': message,
+                'severity': rule.severities[escalated],
+                'suggestion': suggestion,
+                'metadata': metadata,
+            })
+        return alerts
+
+    def evaluate(self, profile: Profile) -> List[Dict[str, object]]:
+        """Alerts for one profile, sorted by severity (critical first), then rule order."""
+        fired = [hit for hit in (self._fire(index, profile) for index in range(len(self.rules))) if hit is not None]
+        return self._alerts(profile, fired)
+
+    def evaluate_one(self, code: AlertCode, profile: Profile) -> Optional[Dict[str, object]]:
+        """A single rule's alert for one profile, or None."""
+        hit = self._fire(self._index[code], profile)
+        return self._alerts(profile, [hit])[0] if hit is not None else None
+
+    def evaluate_batch(self, profiles: Profile) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate every rule over arrays of profiles at once.
+
+        Args:
+            profiles: Field name -> array (scalars broadcast); categorical fields
+                (city_tier, budget_mode) as arrays of strings
+
+        Returns:
+            (fired, escalated): integer bitmasks per profile; bit `bits[code]` is set when
+            that rule fired, and in `escalated` when it fired at its higher severity
+        """
+        columns = {name: np.asarray(value) for name, value in profiles.items()}
+        shape = np.broadcast_shapes(*(column.shape for column in columns.values()))
+        fired_mask = np.zeros(shape, dtype=self.mask_dtype)
+        escalated_mask = np.zeros(shape, dtype=self.mask_dtype)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for index, rule in enumerate(self.rules):
+                value = rule.metric(columns)
+                threshold, escalate_at = self._batch_limits(columns, rule, shape)
+                fired = rule.compare(value, threshold)
+                escalated = rule.compare(value, escalate_at)
+                if rule.guard:
+                    fired = fired & (columns[rule.guard] > 0)
+                bit = self.mask_dtype(1 << index)
+                fired_mask |= np.where(fired, bit, 0).astype(self.mask_dtype)
+                escalated_mask |= np.where(fired & escalated, bit, 0).astype(self.mask_dtype)
+        return fired_mask, escalated_mask
+
+    @staticmethod
+    def _batch_limits(columns: Mapping[str, np.ndarray], rule: AlertRule, shape: Tuple[int, ...]) -> Tuple[Any, Any]:
+        default = rule.limits(rule.threshold)
+        if rule.threshold_by is None:
+            return default
+        field, by_category = rule.threshold_by
+        keys = columns[field]
+        threshold = np.full(shape, default[0], dtype=float)
+        escalate_at = np.full(shape, default[1], dtype=float)
+        for key, key_threshold in by_category.items():
+            selected = np.broadcast_to(keys == key, shape)
+            threshold[selected], escalate_at[selected] = rule.limits(key_threshold)
+        return threshold, escalate_at
+
+    def decode(self, mask: int) -> List[AlertCode]:
+        """Alert codes set in one batch mask, in rule order."""
+        mask = int(mask)
+        return [rule.code for index, rule in enumerate(self.rules) if mask >> index & 1]
+
+
+ALERT_RULE_SET = AlertRuleSet(ALERT_RULES)
+
+
+def evaluate_alerts_batch(profiles: Profile) -> Tuple[np.ndarray, np.ndarray]:
+    """Batch alert bitmasks for arrays of profiles (see AlertRuleSet.evaluate_batch)."""
+    return ALERT_RULE_SET.evaluate_batch(profiles)
+
+
+def decode_alert_mask(mask: int) -> List[AlertCode]:
+    return ALERT_RULE_SET.decode(mask)
+
+
+# ============================================
+# SINGLE-RULE DETECTORS
+# ============================================
+
 def detect_high_rent_alert(
     rent: float,
     income: float,
@@ -48,38 +408,9 @@ def detect_high_rent_alert(
     Returns:
         Alert dict or None
     """
-    if income <= 0:
-        return None
-    
-    rent_ratio = rent / income
-    
-    thresholds = {
-        'tier_1': 0.40,
-        'tier_2': 0.35,
-        'tier_3': 0.30,
-        'other': 0.25,
-    }
-    
-    threshold = thresholds.get(city_tier, 0.30)
-    
-    if rent_ratio > threshold:
-        percentage = round(rent_ratio * 100, 1)
-        severity = SeverityLevel.CRITICAL if rent_ratio > threshold + 0.10 else SeverityLevel.HIGH
-        
-        return {
-            'code': AlertCode.HIGH_RENT,
-            'message': f'High rent burden: {percentage}% of income',
-            'severity': severity,
-            'suggestion': 'Consider relocating to more affordable area or seeking additional income',
-            'metadata': {
-                'rent': rent,
-                'income': income,
-                'ratio': round(rent_ratio, 2),
-                'threshold': threshold,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.HIGH_RENT, {'rent': rent, 'income': income, 'city_tier': city_tier}
+    )
 
 
 def detect_high_emi_alert(
@@ -103,39 +434,9 @@ def detect_high_emi_alert(
     Returns:
         Alert dict or None
     """
-    if income <= 0:
-        return None
-    
-    emi_ratio = total_emi / income
-    
-    if emi_ratio > 0.30:
-        percentage = round(emi_ratio * 100, 1)
-        
-        if emi_ratio > 0.40:
-            severity = SeverityLevel.CRITICAL
-            suggestion = 'Your EMI burden is excessive. Consider loan restructuring or refinancing at lower rates'
-        else:
-            severity = SeverityLevel.HIGH
-            suggestion = 'High EMI burden affecting budget flexibility. Monitor your finances closely'
-        
-        if has_multiple_loans:
-            suggestion += '. Consider consolidating loans to reduce interest burden'
-        
-        return {
-            'code': AlertCode.HIGH_EMI,
-            'message': f'High loan burden: {percentage}% of income',
-            'severity': severity,
-            'suggestion': suggestion,
-            'metadata': {
-                'total_emi': total_emi,
-                'income': income,
-                'ratio': round(emi_ratio, 2),
-                'threshold': 0.30,
-                'multiple_loans': has_multiple_loans,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.HIGH_EMI, {'total_emi': total_emi, 'income': income, 'has_multiple_loans': has_multiple_loans}
+    )
 
 
 def detect_negative_cashflow_alert(
@@ -152,25 +453,9 @@ def detect_negative_cashflow_alert(
     Returns:
         Alert dict or None
     """
-    
-    if total_expenses > income:
-        deficit = total_expenses - income
-        percentage = round((deficit / income) * 100, 1)
-        
-        return {
-            'code': AlertCode.NEGATIVE_CASHFLOW,
-            'message': f'Negative cashflow: Deficit of ₹{deficit:,.0f} ({percentage}%)',
-            'severity': SeverityLevel.CRITICAL,
-            'suggestion': 'You are spending more than you earn. Immediately reduce expenses or increase income',
-            'metadata': {
-                'income': income,
-                'total_expenses': total_expenses,
-                'deficit': deficit,
-                'deficit_percentage': percentage,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.NEGATIVE_CASHFLOW, {'income': income, 'total_expenses': total_expenses}
+    )
 
 
 def detect_low_savings_alert(
@@ -194,33 +479,10 @@ def detect_low_savings_alert(
     Returns:
         Alert dict or None
     """
-    if income <= 0:
-        return None
-    
-    if savings_percent < 10:
-        percentage = round(savings_percent, 1)
-        
-        if savings_percent < 5:
-            severity = SeverityLevel.CRITICAL
-            suggestion = 'Critically low savings rate. You are at risk during emergencies. Increase savings immediately'
-        else:
-            severity = SeverityLevel.MODERATE
-            suggestion = 'Low savings rate. Try to increase to at least 15% for better financial security'
-        
-        return {
-            'code': AlertCode.LOW_SAVINGS,
-            'message': f'Low savings rate: Only {percentage}% of income',
-            'severity': severity,
-            'suggestion': suggestion,
-            'metadata': {
-                'savings_amount': savings_amount,
-                'income': income,
-                'savings_percent': savings_percent,
-                'recommended_percent': 15,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.LOW_SAVINGS,
+        {'savings_amount': savings_amount, 'income': income, 'savings_percent': savings_percent},
+    )
 
 
 def detect_high_wants_alert(
@@ -246,37 +508,10 @@ def detect_high_wants_alert(
     Returns:
         Alert dict or None
     """
-    
-    mode_thresholds = {
-        'basic': 40,
-        'smart_balanced': 35,
-        'aggressive_savings': 30,
-    }
-    
-    threshold = mode_thresholds.get(budget_mode, 35)
-    
-    if wants_percent > threshold:
-        excess_percent = round(wants_percent - threshold, 1)
-        excess_amount = round(wants_amount - (income * threshold / 100), 2)
-        
-        severity = SeverityLevel.HIGH if wants_percent > threshold + 5 else SeverityLevel.WARNING
-        
-        return {
-            'code': AlertCode.HIGH_WANTS,
-            'message': f'High discretionary spending: {round(wants_percent, 1)}% of income (₹{excess_amount:,.0f} excess)',
-            'severity': severity,
-            'suggestion': 'Review your dining, entertainment, and shopping expenses. Look for areas to cut back',
-            'metadata': {
-                'wants_percent': wants_percent,
-                'wants_amount': wants_amount,
-                'threshold_percent': threshold,
-                'excess_percent': excess_percent,
-                'excess_amount': excess_amount,
-                'budget_mode': budget_mode,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.HIGH_WANTS,
+        {'wants_percent': wants_percent, 'wants_amount': wants_amount, 'income': income, 'budget_mode': budget_mode},
+    )
 
 
 def detect_insufficient_emergency_alert(
@@ -300,35 +535,9 @@ def detect_insufficient_emergency_alert(
     Returns:
         Alert dict or None
     """
-    
-    if total_expenses <= 0:
-        return None
-    
-    months_covered = emergency_fund / total_expenses if total_expenses > 0 else 0
-    
-    if months_covered < 3:
-        if months_covered < 1:
-            severity = SeverityLevel.CRITICAL
-            suggestion = 'Critical: You have less than 1 month of expenses saved. Build your emergency fund urgently'
-        else:
-            severity = SeverityLevel.MODERATE
-            suggestion = 'Your emergency fund covers less than 3 months. Build it to at least 3-6 months'
-        
-        return {
-            'code': AlertCode.INSUFFICIENT_EMERGENCY,
-            'message': f'Insufficient emergency fund: {round(months_covered, 1)} months of expenses',
-            'severity': severity,
-            'suggestion': suggestion,
-            'metadata': {
-                'emergency_fund': emergency_fund,
-                'monthly_expenses': total_expenses,
-                'months_covered': round(months_covered, 2),
-                'recommended_months': 6,
-                'recommended_amount': total_expenses * 6,
-            }
-        }
-    
-    return None
+    return ALERT_RULE_SET.evaluate_one(
+        AlertCode.INSUFFICIENT_EMERGENCY, {'total_expenses': total_expenses, 'emergency_fund': emergency_fund}
+    )
 
 
 # ============================================
@@ -369,44 +578,25 @@ def generate_alerts(
     Returns:
         List of detected alerts sorted by severity
     """
-    alerts: List[Dict[str, object]] = []
-    
-    # Run all detection rules
-    high_rent = detect_high_rent_alert(rent, income, city_tier)
-    if high_rent:
-        alerts.append(high_rent)
-    
-    high_emi = detect_high_emi_alert(total_emi, income, len(loans) > 1)
-    if high_emi:
-        alerts.append(high_emi)
-    
-    negative_cashflow = detect_negative_cashflow_alert(income, total_expenses)
-    if negative_cashflow:
-        alerts.append(negative_cashflow)
-    
-    low_savings = detect_low_savings_alert(savings_amount, income, savings_percent)
-    if low_savings:
-        alerts.append(low_savings)
-    
-    high_wants = detect_high_wants_alert(wants_percent, wants_amount, income, budget_mode)
-    if high_wants:
-        alerts.append(high_wants)
-    
-    insufficient_emergency = detect_insufficient_emergency_alert(total_expenses, emergency_fund)
-    if insufficient_emergency:
-        alerts.append(insufficient_emergency)
-    
-    # Sort by severity (critical first)
-    severity_order = {
-        SeverityLevel.CRITICAL: 0,
-        SeverityLevel.HIGH: 1,
-        SeverityLevel.MODERATE: 2,
-        SeverityLevel.WARNING: 3,
-        SeverityLevel.INFO: 4,
-    }
-    
-    alerts.sort(key=lambda a: severity_order.get(a.get('severity'), 5))  # type: ignore
-    
+    return ALERT_RULE_SET.evaluate({
+        'income': income,
+        'rent': rent,
+        'total_emi': total_emi,
+        'total_expenses': total_expenses,
+        'wants_percent': wants_percent,
+        'wants_amount': wants_amount,
+        'savings_amount': savings_amount,
+        'emergency_fund': emergency_fund,
+        'city_tier': city_tier,
+        'has_multiple_loans': len(loans) > 1,
+        'budget_mode': budget_mode,
+        'savings_percent': savings_percent,
+    })
+
+
+def sort_alerts(alerts: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Sort alerts by severity (critical first), in place; returns the list."""
+    alerts.sort(key=lambda a: SEVERITY_ORDER.get(a.get('severity'), 5))  # type: ignore
     return alerts
 
 
@@ -24,6 +24,7 @@ from typing import Dict, List, Any
 
 # Import EMI calculation from budget_calculator
 from .budget_calculator import calculate_emi
+from services.pricing_store import current_pricing
 
 
 # ============================================
@@ -418,7 +419,7 @@ def get_auto_loan_interest_rates(
     bank_type: str = 'bank'
 ) -> Dict[str, float]:
     """
-    Get typical auto loan interest rates in India (2024-25).
+    Get typical auto loan interest rates in India.
     
     Rates vary by:
     - Vehicle type (new vs used)
@@ -433,28 +434,10 @@ def get_auto_loan_interest_rates(
     Returns:
         Dict with rate ranges
     """
-    # Base rates (as of 2024-25)
-    base_rates = {
-        'new_car': {'bank': 8.5, 'nbfc': 10.0, 'dealer': 9.5},
-        'used_car': {'bank': 11.0, 'nbfc': 13.0, 'dealer': 12.5},
-        'new_two_wheeler': {'bank': 9.5, 'nbfc': 11.0, 'dealer': 10.5},
-        'used_two_wheeler': {'bank': 12.0, 'nbfc': 14.0, 'dealer': 13.0},
-        'electric_vehicle': {'bank': 8.0, 'nbfc': 9.5, 'dealer': 9.0},
-    }
-    
-    base_rate = base_rates.get(vehicle_type, base_rates['new_car']).get(bank_type, 9.5)
-    
-    # Credit score adjustment
-    if credit_score >= 800:
-        rate_adjustment = -0.5
-    elif credit_score >= 750:
-        rate_adjustment = 0
-    elif credit_score >= 700:
-        rate_adjustment = 0.5
-    elif credit_score >= 650:
-        rate_adjustment = 1.0
-    else:
-        rate_adjustment = 2.0
+    # Rate tables live in data/pricing.json (hot-reloaded, no redeploy needed)
+    pricing = current_pricing()
+    base_rate = pricing.auto_loan_base_rate(vehicle_type, bank_type)
+    rate_adjustment = pricing.credit_score_adjustment(credit_score)
     
     final_rate = base_rate + rate_adjustment
     
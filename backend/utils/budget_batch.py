@@ -0,0 +1,278 @@
+"""
+Budget Planner V1.2 - Vectorized Budget Allocation
+The budget generation pipeline (split, modifiers, tuning, mode, category allocation) over NumPy arrays of profiles,
+step for step the same arithmetic as the single-household functions in utils.budget_calculator
+"""
+
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+
+from utils.budget_calculator import get_mode_adjustment
+
+# Column names of the inputs, in the order the scalar path sums them
+FIXED_EXPENSE_FIELDS = ("rent", "utilities", "insurance", "medical", "other")
+VARIABLE_EXPENSE_FIELDS = ("groceries", "transport", "subscriptions", "entertainment", "shopping", "dining_out", "other")
+NEEDS_CATEGORIES = ("rent", "utilities", "groceries", "transport", "insurance", "medical", "emi", "other")
+WANTS_CATEGORIES = ("dining", "entertainment", "shopping", "subscriptions", "other")
+SAVINGS_SHARES = (("emergency", 0.40), ("sip", 0.40), ("fd_rd", 0.15), ("goals", 0.05))
+
+LIFESTYLE_MODIFIERS: Dict[str, float] = {
+    'minimal': -7.5,
+    'moderate': 0,
+    'comfort': 5,
+    'premium': 12.5,
+}
+
+
+def round_half_even(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """
+    Element-wise Python round(value, decimals).
+
+    np.round scales, rounds and unscales, which can land on the other side of a
+    half-way point than Python's correctly rounded round(); the few values within
+    a hair of a half-way point are rounded with round() so results match exactly.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        index = np.flatnonzero(near_tie)
+        rounded.flat[index] = [round(float(value), decimals) for value in values.flat[index]]
+    return rounded
+
+
+def _sum_in_order(columns: Sequence[np.ndarray]) -> np.ndarray:
+    # Left to right from 0, like sum(); np.sum's pairwise summation can differ in the last bit
+    total = np.zeros_like(columns[0], dtype=float)
+    for column in columns:
+        total = total + column
+    return total
+
+
+def budget_split_batch(
+    income: np.ndarray,
+    col_multiplier: np.ndarray,
+    lifestyle: np.ndarray,
+    mode: np.ndarray,
+    rent: np.ndarray,
+    total_emi: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Needs/wants/savings percentages for many households.
+
+    Same steps as BudgetPlannerService.generate_budget: COL-adjusted split,
+    lifestyle modifier, income-based tuning, then the budget mode.
+
+    Args:
+        income: Monthly incomes
+        col_multiplier: Cost-of-living multipliers
+        lifestyle: Lifestyle names (minimal, moderate, comfort, premium)
+        mode: Budget modes (basic, aggressive_savings, smart_balanced)
+        rent: Monthly rents
+        total_emi: Total EMI per household
+
+    Returns:
+        Dict with needs, wants, savings percentage arrays
+    """
+    income = np.asarray(income, dtype=float)
+    shape = income.shape
+
+    # Step 1: calculate_col_adjusted_budget(base_needs=50, min_savings=5.0)
+    col_factor = (np.asarray(col_multiplier, dtype=float) - 1) * 0.8
+    needs = 50 * (1 + col_factor)
+    reduction = needs - 50
+    savings = np.maximum(20.0 - reduction, 5.0)
+    wants = 100 - needs - savings
+    negative_wants = wants < 0
+    wants = np.where(negative_wants, 0.0, wants)
+    savings = np.where(negative_wants, 100 - needs, savings)
+    needs, wants, savings = (round_half_even(needs), round_half_even(wants), round_half_even(savings))
+
+    # Step 2: apply_lifestyle_modifier, then rebalance to 100%
+    modifier = np.zeros(shape)
+    lifestyle = np.broadcast_to(np.asarray(lifestyle), shape)
+    for name, value in LIFESTYLE_MODIFIERS.items():
+        modifier[lifestyle == name] = value
+    wants = np.maximum(wants + modifier, 0)
+    needs = np.maximum(needs, 0)
+    savings = np.maximum(100 - needs - wants, 0)
+    wants = 100 - needs - savings
+
+    # Step 3: apply_income_based_tuning
+    rent = np.asarray(rent, dtype=float)
+    total_emi = np.asarray(total_emi, dtype=float)
+    low_income = income < 25000
+    tuned_needs = np.minimum(needs + 5, 75)
+    tuned_savings = np.maximum(savings - (tuned_needs - needs), 3)
+    needs = np.where(low_income, tuned_needs, needs)
+    savings = np.where(low_income, tuned_savings, savings)
+    wants = np.where(low_income, 100 - tuned_needs - tuned_savings, wants)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rent_ratio = np.where(income > 0, rent / income, 0)
+        emi_ratio = np.where(income > 0, total_emi / income, 0)
+    for ratio, limit, cap in ((rent_ratio, 0.35, 10), (emi_ratio, 0.25, 8)):
+        reduced_wants = wants - np.minimum(wants * 0.10, cap)
+        applies = ratio > limit
+        wants = np.where(applies, reduced_wants, wants)
+        savings = np.where(applies, 100 - needs - reduced_wants, savings)
+
+    savings = np.where(needs + wants + savings != 100, 100 - needs - wants, savings)
+    needs = round_half_even(np.maximum(needs, 0))
+    wants = round_half_even(np.maximum(wants, 0))
+    savings = round_half_even(np.maximum(savings, 0))
+
+    # Budget mode: basic is a fixed 45/30/25; aggressive_savings trims wants into savings
+    mode = np.broadcast_to(np.asarray(mode), shape)
+    basic = mode == 'basic'
+    needs = np.where(basic, 45.0, needs)
+    wants = np.where(basic, 30.0, wants)
+    savings = np.where(basic, 25.0, savings)
+
+    aggressive = mode == 'aggressive_savings'
+    adjustment = get_mode_adjustment('aggressive_savings')
+    aggressive_wants = np.maximum(wants - wants * (adjustment['wants_reduction'] / 100), 5)
+    aggressive_savings = np.minimum(savings + adjustment['savings_boost'], 40)
+    needs = np.where(aggressive, 100 - aggressive_wants - aggressive_savings, needs)
+    wants = np.where(aggressive, aggressive_wants, wants)
+    savings = np.where(aggressive, aggressive_savings, savings)
+
+    return {"needs": needs, "wants": wants, "savings": savings}
+
+
+def allocate_budget_batch(
+    needs_amount: np.ndarray,
+    wants_amount: np.ndarray,
+    savings_amount: np.ndarray,
+    fixed_expenses: Mapping[str, np.ndarray],
+    variable_expenses: Mapping[str, np.ndarray],
+    total_emi: np.ndarray,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Subcategory allocation for many households (allocate_budget over arrays).
+
+    Args:
+        needs_amount: Total needs amounts
+        wants_amount: Total wants amounts
+        savings_amount: Total savings amounts
+        fixed_expenses: Fixed expense field -> array (missing fields count as 0)
+        variable_expenses: Variable expense field -> array (missing fields count as 0)
+        total_emi: Total EMI per household
+
+    Returns:
+        Dict with needs, wants, savings category arrays, rounded to 2 decimals
+    """
+    needs_amount = np.asarray(needs_amount, dtype=float)
+    zeros = np.zeros_like(needs_amount)
+
+    def column(source: Mapping[str, np.ndarray], name: str) -> np.ndarray:
+        return np.asarray(source.get(name, zeros), dtype=float)
+
+    # NEEDS: scale down to needs_amount, or top up "other"
+    needs = {
+        'rent': column(fixed_expenses, 'rent'),
+        'utilities': column(fixed_expenses, 'utilities'),
+        'groceries': column(variable_expenses, 'groceries'),
+        'transport': column(variable_expenses, 'transport'),
+        'insurance': column(fixed_expenses, 'insurance'),
+        'medical': column(fixed_expenses, 'medical'),
+        'emi': np.asarray(total_emi, dtype=float),
+        'other': column(fixed_expenses, 'other'),
+    }
+    input_needs_total = _sum_in_order([needs[name] for name in NEEDS_CATEGORIES])
+    over = input_needs_total > needs_amount
+    difference = needs_amount - input_needs_total
+    topped_up = needs['other'] + difference >= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        over_scale = np.where(input_needs_total > 0, needs_amount / input_needs_total, 1)
+        under_scale = needs_amount / input_needs_total
+        for name in NEEDS_CATEGORIES:
+            if name == 'other':
+                under = np.where(topped_up, needs[name] + difference, 0.0)
+            else:
+                under = np.where(topped_up, needs[name], needs[name] * under_scale)
+            needs[name] = np.where(over, needs[name] * over_scale, under)
+
+    # WANTS: proportional to the inputs, or even when there are none
+    wants = {
+        'dining': column(variable_expenses, 'dining_out'),
+        'entertainment': column(variable_expenses, 'entertainment'),
+        'shopping': column(variable_expenses, 'shopping'),
+        'subscriptions': column(variable_expenses, 'subscriptions'),
+        'other': column(variable_expenses, 'other'),
+    }
+    wants_amount = np.asarray(wants_amount, dtype=float)
+    input_wants_total = _sum_in_order([wants[name] for name in WANTS_CATEGORIES])
+    per_category = wants_amount / len(WANTS_CATEGORIES)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        wants_scale = wants_amount / input_wants_total
+        for name in WANTS_CATEGORIES:
+            wants[name] = np.where(input_wants_total > 0, wants[name] * wants_scale, per_category)
+
+    # SAVINGS: fixed shares (allocate_savings)
+    savings_amount = np.asarray(savings_amount, dtype=float)
+    savings = {name: savings_amount * share for name, share in SAVINGS_SHARES}
+
+    return {
+        'needs': {name: round_half_even(value) for name, value in needs.items()},
+        'wants': {name: round_half_even(value) for name, value in wants.items()},
+        'savings': {name: round_half_even(value) for name, value in savings.items()},
+    }
+
+
+def generate_budget_batch(
+    income: np.ndarray,
+    col_multiplier: np.ndarray,
+    lifestyle: np.ndarray,
+    mode: np.ndarray,
+    fixed_expenses: Mapping[str, np.ndarray],
+    variable_expenses: Mapping[str, np.ndarray],
+    total_emi: np.ndarray,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Full allocation pipeline for N households at once.
+
+    Args:
+        income: Monthly incomes, shape (N,)
+        col_multiplier: Cost-of-living multipliers
+        lifestyle: Lifestyle names
+        mode: Budget modes
+        fixed_expenses: Fixed expense field -> array
+        variable_expenses: Variable expense field -> array
+        total_emi: Total EMI per household (calculate_total_emi of its loans)
+
+    Returns:
+        Arrays laid out like BudgetPlan: budget_split, budget_amounts, categories
+        (values identical to generate_budget for each household)
+    """
+    income = np.asarray(income, dtype=float)
+    zeros = np.zeros_like(income)
+    split = budget_split_batch(
+        income, col_multiplier, lifestyle, mode,
+        rent=fixed_expenses.get('rent', zeros), total_emi=total_emi,
+    )
+    amounts = {name: (income * percent) / 100 for name, percent in split.items()}
+    categories = allocate_budget_batch(
+        amounts['needs'], amounts['wants'], amounts['savings'],
+        fixed_expenses, variable_expenses, total_emi,
+    )
+    return {
+        'budget_split': {f"{name}_percent": percent for name, percent in split.items()},
+        'budget_amounts': amounts,
+        'categories': categories,
+    }
+
+
+def total_expenses_batch(
+    fixed_expenses: Mapping[str, np.ndarray],
+    variable_expenses: Mapping[str, np.ndarray],
+    total_emi: np.ndarray,
+) -> np.ndarray:
+    """Fixed + variable expenses + EMI per household, summed in the scalar path's order."""
+    total_emi = np.asarray(total_emi, dtype=float)
+    zeros = np.zeros_like(total_emi)
+    fixed = _sum_in_order([np.asarray(fixed_expenses.get(name, zeros), dtype=float) for name in FIXED_EXPENSE_FIELDS])
+    variable = _sum_in_order([np.asarray(variable_expenses.get(name, zeros), dtype=float) for name in VARIABLE_EXPENSE_FIELDS])
+    return fixed + variable + total_emi
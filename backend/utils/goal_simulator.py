@@ -0,0 +1,202 @@
+"""
+Budget Planner V1.2 - Monte Carlo Goal Simulator
+Simulates return, inflation and income paths for the SIP, FD/RD and goal savings buckets
+and estimates the probability of reaching each savings goal by its target month
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# ============================================
+# ASSUMPTIONS (annual, nominal)
+# ============================================
+
+@dataclass(frozen=True)
+class ReturnAssumption:
+    """Annual mean return and volatility of one savings bucket."""
+    mean: float
+    volatility: float
+
+
+BUCKET_RETURNS: Dict[str, ReturnAssumption] = {
+    'sip': ReturnAssumption(mean=0.12, volatility=0.16),      # Equity mutual fund SIP
+    'fd_rd': ReturnAssumption(mean=0.065, volatility=0.005),  # Fixed / recurring deposits
+    'goals': ReturnAssumption(mean=0.075, volatility=0.04),   # Debt/hybrid funds for goal money
+}
+INFLATION = ReturnAssumption(mean=0.055, volatility=0.01)
+INCOME_GROWTH = ReturnAssumption(mean=0.06, volatility=0.04)  # Yearly raise, applied every 12 months
+MIN_INCOME_GROWTH = -0.10
+
+CHUNK_PATHS = 500  # Paths per chunk; the time budget is checked between chunks
+PERCENTILES = (10, 50, 90)
+
+
+def _monthly_returns(rng: np.random.Generator, assumption: ReturnAssumption, shape: tuple) -> np.ndarray:
+    # Lognormal monthly growth factors whose compounded mean is the annual mean
+    sigma = assumption.volatility / np.sqrt(12)
+    mu = np.log1p(assumption.mean) / 12 - sigma ** 2 / 2
+    return np.exp(mu + sigma * rng.standard_normal(shape))
+
+
+def _accumulate(contributions: np.ndarray, growth: np.ndarray) -> np.ndarray:
+    """
+    Balance at the end of every month: balance_m = (balance_{m-1} + contribution_m) * growth_m.
+
+    Closed form over cumulative growth, so there is no loop over months:
+    balance_m = G_m * sum_{k<=m} contribution_k / G_{k-1}
+    """
+    cumulative = np.cumprod(growth, axis=-1)
+    previous = np.concatenate([np.ones(cumulative.shape[:-1] + (1,)), cumulative[..., :-1]], axis=-1)
+    return cumulative * np.cumsum(contributions / previous, axis=-1)
+
+
+def goal_shares(goals: List[Dict[str, Any]], months: int) -> np.ndarray:
+    """
+    Share of the goal bucket's contribution going to each goal, per month.
+
+    Goals get money in proportion to their required monthly saving (target / months),
+    weighted by priority (1 = highest). Once a goal's deadline passes its share goes
+    to the goals still open.
+
+    Args:
+        goals: Goals with target, target_months, priority
+        months: Simulation horizon
+
+    Returns:
+        Array (goals, months) of shares; each month's open goals sum to 1
+    """
+    required = np.array([goal['target'] / goal['target_months'] for goal in goals], dtype=float)
+    weight = required * np.array([6 - goal.get('priority', 3) for goal in goals], dtype=float)
+    deadlines = np.array([goal['target_months'] for goal in goals])
+    open_goals = np.arange(months)[None, :] < deadlines[:, None]
+    weights = weight[:, None] * open_goals
+    total = weights.sum(axis=0)
+    return np.divide(weights, total, out=np.zeros_like(weights), where=total > 0)
+
+
+def _simulate_chunk(
+    rng: np.random.Generator,
+    paths: int,
+    months: int,
+    contributions: Dict[str, float],
+    shares: np.ndarray,
+    deadlines: np.ndarray,
+    targets: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    years = -(-months // 12)
+    raises = np.maximum(
+        INCOME_GROWTH.mean + INCOME_GROWTH.volatility * rng.standard_normal((paths, years)), MIN_INCOME_GROWTH,
+    )
+    # Year 0 is at today's income; each later year compounds one raise
+    income_factor = np.repeat(np.cumprod(np.column_stack([np.ones(paths), 1 + raises[:, :-1]]), axis=1), 12, axis=1)
+    income_factor = income_factor[:, :months]
+    price_level = np.cumprod(_monthly_returns(rng, INFLATION, (paths, months)), axis=1)
+
+    balances = {
+        bucket: _accumulate(amount * income_factor, _monthly_returns(rng, BUCKET_RETURNS[bucket], (paths, months)))
+        for bucket, amount in contributions.items() if bucket != 'goals'
+    }
+
+    # Each goal's sub-balance at its deadline: one matmul over the months before the deadline
+    growth = _monthly_returns(rng, BUCKET_RETURNS['goals'], (paths, months))
+    cumulative = np.cumprod(growth, axis=1)
+    previous = np.column_stack([np.ones(paths), cumulative[:, :-1]])
+    funded = (contributions['goals'] * income_factor / previous) @ shares.T
+    last_month = deadlines - 1
+    goal_balances = cumulative[:, last_month] * funded
+    inflated_targets = targets * price_level[:, last_month]
+
+    return {
+        'hit': goal_balances >= inflated_targets,
+        'goal_balances': goal_balances,
+        'shortfall': np.maximum(inflated_targets - goal_balances, 0),
+        'sip': balances.get('sip', np.zeros((paths, months)))[:, -1],
+        'fd_rd': balances.get('fd_rd', np.zeros((paths, months)))[:, -1],
+    }
+
+
+def required_monthly_saving(target: float, months: int, annual_return: float = BUCKET_RETURNS['goals'].mean) -> float:
+    """Level monthly saving that reaches target in months at the expected return (today's money)."""
+    real_rate = (1 + annual_return) / (1 + INFLATION.mean) - 1
+    monthly_rate = (1 + real_rate) ** (1 / 12) - 1
+    growth = ((1 + monthly_rate) ** months - 1) / monthly_rate * (1 + monthly_rate)
+    return target / growth
+
+
+def simulate_goals(
+    goals: List[Dict[str, Any]],
+    sip: float,
+    fd_rd: float,
+    goal_saving: float,
+    paths: int = 5000,
+    seed: int = 42,
+    time_budget_ms: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo probability of reaching each savings goal.
+
+    Paths are simulated in chunks of CHUNK_PATHS with seeds spawned from `seed`,
+    so a given chunk is the same on every run. When `time_budget_ms` runs out the
+    remaining chunks are skipped and the result is marked truncated.
+
+    Args:
+        goals: Goals with name, target (today's money), target_months, priority
+        sip: Monthly SIP contribution
+        fd_rd: Monthly FD/RD contribution
+        goal_saving: Monthly contribution to the goal bucket
+        paths: Number of simulated paths
+        seed: Random seed
+        time_budget_ms: Stop after this many milliseconds (at least one chunk runs)
+
+    Returns:
+        Dict with per-goal probabilities and balance percentiles, bucket percentiles,
+        paths_simulated and truncated
+    """
+    started = time.perf_counter()
+    months = max(goal['target_months'] for goal in goals)
+    shares = goal_shares(goals, months)
+    deadlines = np.array([goal['target_months'] for goal in goals])
+    targets = np.array([goal['target'] for goal in goals], dtype=float)
+    contributions = {'sip': sip, 'fd_rd': fd_rd, 'goals': goal_saving}
+
+    chunk_sizes = [CHUNK_PATHS] * (paths // CHUNK_PATHS) + ([paths % CHUNK_PATHS] if paths % CHUNK_PATHS else [])
+    chunks = []
+    for size, chunk_seed in zip(chunk_sizes, np.random.SeedSequence(seed).spawn(len(chunk_sizes))):
+        chunks.append(_simulate_chunk(
+            np.random.default_rng(chunk_seed), size, months, contributions, shares, deadlines, targets,
+        ))
+        if time_budget_ms is not None and (time.perf_counter() - started) * 1000 >= time_budget_ms:
+            break
+    results = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+    def percentiles(values: np.ndarray) -> Dict[str, float]:
+        return {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+    goal_results = []
+    for i, goal in enumerate(goals):
+        monthly_share = float(shares[i, 0]) * goal_saving
+        goal_results.append({
+            'name': goal['name'],
+            'target': goal['target'],
+            'target_months': goal['target_months'],
+            'probability': round(float(results['hit'][:, i].mean()), 4),
+            'monthly_contribution': round(monthly_share, 2),
+            'required_monthly': round(required_monthly_saving(goal['target'], goal['target_months']), 2),
+            'balance': percentiles(results['goal_balances'][:, i]),
+            'median_shortfall': round(float(np.median(results['shortfall'][:, i])), 2),
+        })
+
+    return {
+        'goals': goal_results,
+        'buckets': {
+            'sip': percentiles(results['sip']),
+            'fd_rd': percentiles(results['fd_rd']),
+        },
+        'horizon_months': months,
+        'paths_simulated': len(results['hit']),
+        'truncated': len(chunks) < len(chunk_sizes),
+        'seed': seed,
+    }
@@ -0,0 +1,199 @@
+"""
+Budget Planner V1.2 - Precomputed Budget Split Table
+Needs/wants/savings percentages for every lifestyle, mode, income band and COL multiplier grid point,
+built once at import so generate_budget does a single dict lookup
+"""
+
+import logging
+import os
+import time
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Tuple
+
+import numpy as np
+
+from utils.budget_batch import LIFESTYLE_MODIFIERS
+from utils.budget_calculator import (
+    apply_income_based_tuning,
+    apply_lifestyle_modifier,
+    calculate_col_adjusted_budget,
+    get_mode_adjustment,
+)
+
+logger = logging.getLogger(__name__)
+
+# COL multipliers are validated to [0.5, 2.0]; the grid covers every 2-decimal value in that range
+SPLIT_TABLE_COL_MIN = 50  # In hundredths
+SPLIT_TABLE_COL_MAX = 200
+# Off-grid multipliers: interpolate between grid points (approximate) instead of computing exactly
+SPLIT_TABLE_INTERPOLATE = os.getenv("SPLIT_TABLE_INTERPOLATE", "false").lower() == "true"
+
+BUDGET_MODES = ("basic", "smart_balanced", "aggressive_savings")
+
+# Income band thresholds (apply_income_based_tuning)
+LOW_INCOME_THRESHOLD = 25000
+HIGH_RENT_RATIO = 0.35
+HIGH_EMI_RATIO = 0.25
+
+SplitKey = Tuple[float, str, str, bool, bool, bool]
+Split = Tuple[float, float, float]
+
+
+def income_band(income: float, rent: float, total_emi: float) -> Tuple[bool, bool, bool]:
+    """
+    The three income-based tuning conditions: low income, high rent ratio, high EMI ratio.
+
+    Args:
+        income: Monthly income
+        rent: Monthly rent
+        total_emi: Total EMI amount
+
+    Returns:
+        (low_income, high_rent, high_emi)
+    """
+    rent_ratio = (rent / income) if income > 0 else 0
+    emi_ratio = (total_emi / income) if income > 0 else 0
+    return income < LOW_INCOME_THRESHOLD, rent_ratio > HIGH_RENT_RATIO, emi_ratio > HIGH_EMI_RATIO
+
+
+def compute_split(
+    col_multiplier: float,
+    lifestyle: str,
+    mode: str,
+    income: float,
+    rent: float,
+    total_emi: float,
+) -> Split:
+    """
+    Budget split through the full chain of calculator functions (the reference for the table).
+
+    Steps: COL-adjusted split, lifestyle modifier, income-based tuning, budget mode.
+
+    Args:
+        col_multiplier: Cost-of-living multiplier
+        lifestyle: Lifestyle type
+        mode: Budget mode
+        income: Monthly income
+        rent: Monthly rent
+        total_emi: Total EMI amount
+
+    Returns:
+        (needs_percent, wants_percent, savings_percent), with the chain's own types
+        (the clamped branches give ints, e.g. 3 or 0, which alert messages print as "3%")
+    """
+    col_adjusted = calculate_col_adjusted_budget(base_needs=50, col_multiplier=col_multiplier, min_savings=5.0)
+    needs_percent = col_adjusted['needs']
+    wants_percent = apply_lifestyle_modifier(col_adjusted['wants'], lifestyle)
+
+    # Recalculate needs and savings to maintain 100%
+    needs_percent = max(needs_percent, 0)
+    savings_percent = max(100 - needs_percent - wants_percent, 0)
+    wants_percent = 100 - needs_percent - savings_percent
+
+    tuned_split = apply_income_based_tuning(
+        income=income,
+        needs_percent=needs_percent,
+        wants_percent=wants_percent,
+        savings_percent=savings_percent,
+        rent=rent,
+        total_emi=total_emi,
+    )
+    needs_percent = tuned_split['needs']
+    wants_percent = tuned_split['wants']
+    savings_percent = tuned_split['savings']
+
+    mode_adj = get_mode_adjustment(mode)
+    if mode == 'basic':
+        needs_percent, wants_percent, savings_percent = 45, 30, 25
+    elif mode == 'aggressive_savings':
+        wants_reduction = wants_percent * (mode_adj['wants_reduction'] / 100)
+        wants_percent = max(wants_percent - wants_reduction, 5)
+        savings_percent = min(savings_percent + mode_adj['savings_boost'], 40)
+        needs_percent = 100 - wants_percent - savings_percent
+
+    return needs_percent, wants_percent, savings_percent
+
+
+@lru_cache(maxsize=1024)
+def _compute_band_split(
+    col_multiplier: float, lifestyle: str, mode: str, low_income: bool, high_rent: bool, high_emi: bool,
+) -> Split:
+    income, rent, total_emi = _band_inputs(low_income, high_rent, high_emi)
+    return compute_split(col_multiplier, lifestyle, mode, income, rent, total_emi)
+
+
+def _band_inputs(low_income: bool, high_rent: bool, high_emi: bool) -> Tuple[float, float, float]:
+    # Representative income, rent and EMI for an income band
+    income = 10000.0 if low_income else 100000.0
+    return income, income * 0.5 if high_rent else 0.0, income * 0.5 if high_emi else 0.0
+
+
+class SplitTable:
+    """Budget splits for every (COL grid point, lifestyle, mode, income band) combination."""
+
+    def __init__(self, interpolate: bool = SPLIT_TABLE_INTERPOLATE):
+        self.interpolate = interpolate
+        self.col_grid = np.arange(SPLIT_TABLE_COL_MIN, SPLIT_TABLE_COL_MAX + 1) / 100
+
+        # Built through the calculator chain itself, so values and their types are what it returns
+        started = time.perf_counter()
+        self.splits: Dict[SplitKey, Split] = {
+            (col, lifestyle, mode, *band): compute_split(col, lifestyle, mode, *_band_inputs(*band))
+            for col, lifestyle, mode, *band in product(
+                self.col_grid.tolist(), LIFESTYLE_MODIFIERS, BUDGET_MODES, (False, True), (False, True), (False, True),
+            )
+        }
+        logger.debug(f"Split table: {len(self.splits)} entries in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def lookup(
+        self,
+        col_multiplier: float,
+        lifestyle: str,
+        mode: str,
+        income: float,
+        rent: float,
+        total_emi: float,
+    ) -> Split:
+        """
+        Budget split for one household (same values as compute_split).
+
+        Multipliers off the 0.01 grid are computed exactly and memoized, or
+        interpolated between the neighbouring grid points when interpolation is on.
+
+        Args:
+            col_multiplier: Cost-of-living multiplier
+            lifestyle: Lifestyle type
+            mode: Budget mode
+            income: Monthly income
+            rent: Monthly rent
+            total_emi: Total EMI amount
+
+        Returns:
+            (needs_percent, wants_percent, savings_percent)
+        """
+        if lifestyle not in LIFESTYLE_MODIFIERS:
+            lifestyle = 'moderate'  # No modifier, like apply_lifestyle_modifier
+        if mode not in BUDGET_MODES:
+            mode = 'smart_balanced'
+        band = income_band(income, rent, total_emi)
+
+        split = self.splits.get((col_multiplier, lifestyle, mode, *band))
+        if split is not None:
+            return split
+        if not SPLIT_TABLE_COL_MIN <= col_multiplier * 100 <= SPLIT_TABLE_COL_MAX:
+            return compute_split(col_multiplier, lifestyle, mode, income, rent, total_emi)
+        if self.interpolate:
+            return self._interpolate(col_multiplier, lifestyle, mode, band)
+        return _compute_band_split(col_multiplier, lifestyle, mode, *band)
+
+    def _interpolate(self, col_multiplier: float, lifestyle: str, mode: str, band: Tuple[bool, bool, bool]) -> Split:
+        lower = min(int(col_multiplier * 100), SPLIT_TABLE_COL_MAX - 1)
+        weight = col_multiplier * 100 - lower
+        low = self.splits[(lower / 100, lifestyle, mode, *band)]
+        high = self.splits[((lower + 1) / 100, lifestyle, mode, *band)]
+        needs, wants = (round(a + (b - a) * weight, 2) for a, b in zip(low[:2], high[:2]))
+        return needs, wants, round(100 - needs - wants, 2)
+
+
+SPLIT_TABLE = SplitTable()